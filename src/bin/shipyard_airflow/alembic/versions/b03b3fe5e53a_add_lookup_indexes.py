@@ -0,0 +1,70 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add lookup indexes
+
+Revision ID: b03b3fe5e53a
+Revises: 7486ddec1979
+Create Date: 2026-10-18 09:12:41.512034
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b03b3fe5e53a'
+down_revision = '7486ddec1979'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Create indexes for the columns used to look up rows by Shipyard
+    """
+    # Validation failures and audit records are looked up by action
+    op.create_index(
+        'ix_preflight_validation_failures_action_id',
+        'preflight_validation_failures',
+        ['action_id'])
+    op.create_index(
+        'ix_action_command_audit_action_id',
+        'action_command_audit',
+        ['action_id'])
+    # Active locks are looked up by type and released flag, newest first
+    op.create_index(
+        'ix_api_locks_lock_type_released_datetime',
+        'api_locks',
+        ['lock_type', 'released', 'datetime'])
+    # Notes are looked up by prefix (LIKE 'prefix%') as well as exact value
+    # of assoc_id. The text_pattern_ops operator class allows the index to
+    # be used for prefix matches regardless of the database collation.
+    op.create_index(
+        'ix_notes_assoc_id',
+        'notes',
+        ['assoc_id'],
+        postgresql_ops={'assoc_id': 'text_pattern_ops'})
+
+
+def downgrade():
+    """
+    Remove the database objects created by this revision
+    """
+    op.drop_index('ix_notes_assoc_id', table_name='notes')
+    op.drop_index('ix_api_locks_lock_type_released_datetime',
+                  table_name='api_locks')
+    op.drop_index('ix_action_command_audit_action_id',
+                  table_name='action_command_audit')
+    op.drop_index('ix_preflight_validation_failures_action_id',
+                  table_name='preflight_validation_failures')
@@ -17,7 +17,9 @@
 Encapsulates classes and functions related to the management and use of
 deployment groups used during baremetal provisioning.
 """
+import heapq
 import logging
+import threading
 
 import networkx as nx
 
@@ -38,11 +40,21 @@ class DeploymentGroupManager:
     :param group_dict_list: list of group entries translated from a
         DeploymentStrategy document.
     :param node_lookup: function to lookup nodes based on group selectors
+
+    The stages of groups and nodes may be read and updated from multiple
+    threads, allowing independent groups to be processed concurrently.
+
+    Groups and nodes are indexed by stage, and the groups depending on each
+    group are cached, such that selecting the next group and checking the
+    success criteria of a group do not scan all groups and nodes.
     """
 
     def __init__(self, group_dict_list, node_lookup):
         LOG.debug("Initializing DeploymentGroupManager")
 
+        # guards the stages of groups and nodes
+        self._lock = threading.RLock()
+
         # the raw input
         self._group_dict_list = group_dict_list
 
@@ -59,6 +71,20 @@ class DeploymentGroupManager:
             self._all_groups.values()
         )
         self._group_order = list(nx.topological_sort(self._group_graph))
+        # The position of each group in group order
+        self._group_index = {
+            name: index for index, name in enumerate(self._group_order)
+        }
+        # For each stage, a heap of the positions of the groups that have
+        # reached the stage. As groups only move forward through the stages,
+        # the positions of groups that have left a stage are discarded when
+        # found at the top of its heap.
+        self._groups_by_stage = {stage: [] for stage in Stage}
+        self._groups_by_stage[Stage.NOT_STARTED] = list(
+            range(len(self._group_order)))
+        # The groups depending directly or indirectly on each group, in
+        # group order, calculated when first needed
+        self._descendants = {}
 
         # Setup nodes.
         # self.all_nodes is a dictionary of all nodes by node name,
@@ -68,6 +94,12 @@ class DeploymentGroupManager:
         # each group is also updated with group.actionable_nodes based on group
         # ordering (deduplication)
         self._all_nodes = {}
+        # The position of each node in self._all_nodes
+        self._node_index = {}
+        # The names of the nodes in each stage
+        self._nodes_by_stage = {stage: set() for stage in Stage}
+        # The names of the groups including each node, in group order
+        self._node_groups = {}
         self._calculate_nodes()
 
     def get_next_group(self, stage):
@@ -78,11 +110,76 @@ class DeploymentGroupManager:
         Returns None if there are no groups ready for the stage
         """
         prev_stage = Stage.previous_stage(stage)
-        for group in self._group_order:
-            if self._all_groups[group].stage in prev_stage:
-                return self._all_groups[group]
+        with self._lock:
+            positions = [position for position in (
+                self._first_group_position(prev) for prev in prev_stage)
+                if position is not None]
+            if positions:
+                return self._all_groups[self._group_order[min(positions)]]
         return None
 
+    def _first_group_position(self, stage):
+        """The first position in group order of a group in the stage, or
+        None
+        """
+        heap = self._groups_by_stage[stage]
+        while heap:
+            if self._all_groups[self._group_order[heap[0]]].stage == stage:
+                return heap[0]
+            # the group has moved on to a later stage
+            heapq.heappop(heap)
+        return None
+
+    def _groups_in_stage(self, stage):
+        """The groups in the stage, in group order"""
+        positions = [position for position
+                     in sorted(self._groups_by_stage[stage])
+                     if self._all_groups[self._group_order[position]].stage ==
+                     stage]
+        # a sorted list is a heap
+        self._groups_by_stage[stage] = positions
+        return [self._all_groups[self._group_order[position]]
+                for position in positions]
+
+    def get_ready_groups(self, exclude=None):
+        """Get the groups that are ready to be prepared and deployed
+
+        :param exclude: optional, an iterable of the names of groups to leave
+            out of the result, e.g. groups already being processed
+        Returns the list of DeploymentGroups, in group order, that have not
+        been started and have no group they depend upon that is not yet
+        deployed. A group sharing nodes with a group that precedes it in
+        group order is only ready once the preceding group is complete, as
+        the shared nodes are deployed by the preceding group.
+        """
+        exclude = set(exclude or [])
+        ready = []
+        with self._lock:
+            for group in self._groups_in_stage(Stage.NOT_STARTED):
+                name = group.name
+                if name in exclude:
+                    continue
+                if not all(self._all_groups[pred].stage == Stage.DEPLOYED
+                           for pred in self._group_graph.predecessors(name)):
+                    continue
+                if self._shares_incomplete_nodes(group):
+                    continue
+                ready.append(group)
+        return ready
+
+    def _shares_incomplete_nodes(self, group):
+        """Whether a group preceding the group in group order, and having
+        nodes in common with it, is not complete
+        """
+        index = self._group_index[group.name]
+        for node in group.full_nodes:
+            for prev in self._node_groups[node]:
+                if self._group_index[prev] >= index:
+                    break
+                if not Stage.is_complete(self._all_groups[prev].stage):
+                    return True
+        return False
+
     def group_list(self):
         """Return a list of DeploymentGroup objects in group order"""
         summary = []
@@ -93,9 +190,11 @@ class DeploymentGroupManager:
 
     def critical_groups_failed(self):
         """Return True if any critical groups have failed"""
-        for group in self._all_groups.values():
-            if group.stage == Stage.FAILED and group.critical:
-                return True
+        with self._lock:
+            # Failed groups stay failed
+            for position in self._groups_by_stage[Stage.FAILED]:
+                if self._all_groups[self._group_order[position]].critical:
+                    return True
         return False
 
     def evaluate_group_succ_criteria(self, group_name, stage):
@@ -105,6 +204,10 @@ class DeploymentGroupManager:
         :param stage: Stage.PREPARED or Stage.DEPLOYED
         Returns a boolean: True = success, False = failure.
         """
+        with self._lock:
+            return self._evaluate_group_succ_criteria(group_name, stage)
+
+    def _evaluate_group_succ_criteria(self, group_name, stage):
         failed_criteria = self.get_group_failures_for_stage(group_name, stage)
         if failed_criteria:
             # Logging of criteria has already occurred during checking.
@@ -165,10 +268,16 @@ class DeploymentGroupManager:
         """
         for name in self._group_order:
             group = self._all_groups[name]
-            known_nodes = set(self._all_nodes.keys())
-            _update_group_actionable_nodes(group, known_nodes)
+            _update_group_actionable_nodes(group, self._all_nodes)
             for node in group.full_nodes:
-                self._all_nodes[node] = Stage.NOT_STARTED
+                if node not in self._all_nodes:
+                    self._node_index[node] = len(self._all_nodes)
+                    self._all_nodes[node] = Stage.NOT_STARTED
+                    self._node_groups[node] = []
+                node_groups = self._node_groups[node]
+                if not node_groups or node_groups[-1] != name:
+                    node_groups.append(name)
+        self._nodes_by_stage[Stage.NOT_STARTED].update(self._all_nodes)
 
     #
     # Methods for managing marking the stage of processing for a group
@@ -180,23 +289,46 @@ class DeploymentGroupManager:
         :param group_name: The name of the group to fail
         """
         group = self._find_group(group_name)
-        group.stage = Stage.FAILED
-        successors = list(self._group_graph.successors(group_name))
-        if successors:
-            LOG.info("Group %s (now FAILED) has dependent groups %s",
-                     group_name, ", ".join(successors))
-            for name in successors:
-                self.mark_group_failed(name)
+        with self._lock:
+            self._set_group_stage(group, Stage.FAILED)
+            descendants = self._get_descendants(group_name)
+            if descendants:
+                LOG.info("Group %s (now FAILED) has dependent groups %s",
+                         group_name, ", ".join(descendants))
+                for name in descendants:
+                    self._set_group_stage(self._all_groups[name],
+                                          Stage.FAILED)
 
     def mark_group_prepared(self, group_name):
         """Sets a group to the Stage.PREPARED stage"""
         group = self._find_group(group_name)
-        group.stage = Stage.PREPARED
+        with self._lock:
+            self._set_group_stage(group, Stage.PREPARED)
 
     def mark_group_deployed(self, group_name):
         """Sets a group to the Stage.DEPLOYED stage"""
         group = self._find_group(group_name)
-        group.stage = Stage.DEPLOYED
+        with self._lock:
+            self._set_group_stage(group, Stage.DEPLOYED)
+
+    def _set_group_stage(self, group, stage):
+        """Set a group's stage, indexing the group by its new stage"""
+        if group.stage == stage:
+            return
+        group.stage = stage
+        heapq.heappush(self._groups_by_stage[stage],
+                       self._group_index[group.name])
+
+    def _get_descendants(self, group_name):
+        """The names of the groups depending directly or indirectly on a
+        group, in group order
+        """
+        descendants = self._descendants.get(group_name)
+        if descendants is None:
+            descendants = sorted(nx.descendants(self._group_graph, group_name),
+                                 key=self._group_index.get)
+            self._descendants[group_name] = descendants
+        return descendants
 
     def _find_group(self, group_name):
         """Wrapper for accessing groups from self.all_groups"""
@@ -223,12 +355,15 @@ class DeploymentGroupManager:
             raise DeploymentGroupStageError(
                 "The stage {} is not valid for checking group"
                 " failures.".format(stage))
-        success_nodes = set()
         # deployed nodes count as success for prepared and deployed
-        success_nodes.update(self.get_nodes(Stage.DEPLOYED))
+        success_stages = {Stage.DEPLOYED}
         if stage == Stage.PREPARED:
-            success_nodes.update(self.get_nodes(Stage.PREPARED))
+            success_stages.add(Stage.PREPARED)
         group = self._find_group(group_name)
+        with self._lock:
+            # only the group's nodes are evaluated by its success criteria
+            success_nodes = {node for node in group.full_nodes
+                             if self._all_nodes[node] in success_stages}
         return group.get_failed_success_criteria(success_nodes)
 
     #
@@ -248,8 +383,9 @@ class DeploymentGroupManager:
         """
         # Mark non-successes as failed
         failed_nodes = set(group.actionable_nodes).difference(set(successes))
-        for node_name in failed_nodes:
-            self.mark_node_failed(node_name)
+        with self._lock:
+            for node_name in failed_nodes:
+                self.mark_node_failed(node_name)
 
     def mark_node_deployed(self, node_name):
         """Mark a node as deployed"""
@@ -265,20 +401,24 @@ class DeploymentGroupManager:
 
     def _set_node_stage(self, node_name, stage):
         """Find and set a node's stage to the specified stage"""
-        if node_name in self._all_nodes:
-            self._all_nodes[node_name] = stage
-        else:
-            raise UnknownNodeError("The specified node {} does not"
-                                   " exist in this manager".format(node_name))
+        with self._lock:
+            if node_name in self._all_nodes:
+                self._nodes_by_stage[self._all_nodes[node_name]].discard(
+                    node_name)
+                self._nodes_by_stage[stage].add(node_name)
+                self._all_nodes[node_name] = stage
+                return
+        raise UnknownNodeError("The specified node {} does not"
+                               " exist in this manager".format(node_name))
 
     def get_nodes(self, stage=None):
         """Get a list of nodes that have the specified status"""
-        if stage is None:
-            return [name for name in self._all_nodes]
+        with self._lock:
+            if stage is None:
+                return [name for name in self._all_nodes]
 
-        return [name for name, n_stage
-                in self._all_nodes.items()
-                if n_stage == stage]
+            return sorted(self._nodes_by_stage.get(stage, ()),
+                          key=self._node_index.get)
 
 
 def _update_group_actionable_nodes(group, known_nodes):
@@ -286,9 +426,10 @@ def _update_group_actionable_nodes(group, known_nodes):
 
     Acitonable nodes is the group's (full_nodes - known_nodes)
     """
-    LOG.debug("Known nodes before processing group %s is %s",
-              group.name,
-              ", ".join(known_nodes))
+    if LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug("Known nodes before processing group %s is %s",
+                  group.name,
+                  ", ".join(known_nodes))
 
     group_nodes = set(group.full_nodes)
     group.actionable_nodes = list(group_nodes.difference(known_nodes))
@@ -14,8 +14,13 @@
 #
 """A node_lookup class with a lookup method that can be used to access Drydock
 to retrieve nodes based on a list of GroupNodeSelector objects
+
+Also provides a NodeInventoryLookup, which retrieves the nodes of the site
+design once and resolves GroupNodeSelectors locally, in the same way Drydock
+processes a node filter.
 """
 import logging
+import threading
 import time
 
 from .deployment_group import GroupNodeSelector
@@ -88,6 +93,177 @@ class NodeLookup:
                     raise
 
 
+BAREMETAL_NODE_SCHEMA = 'drydock/BaremetalNode/v1'
+HOST_PROFILE_SCHEMA = 'drydock/HostProfile/v1'
+
+
+class InventoryNode:
+    """A node of the site design with the attributes used by node selectors
+
+    :param name: the name of the node
+    :param rack: the name of the rack of the node
+    :param tags: the tags of the node
+    :param labels: the dictionary of labels (owner_data) of the node
+    """
+    def __init__(self, name, rack=None, tags=None, labels=None):
+        self.name = name
+        self.rack = rack
+        self.tags = set(tags or [])
+        self.labels = dict(labels or {})
+
+
+class NodeInventoryLookup:
+    """Provides a node lookup that evaluates selectors against an inventory
+    of the nodes of a site design
+
+    :param get_docs: a function accepting a schema and returning the rendered
+        documents of the site design having that schema. Each document has
+        metadata and data attributes.
+    :param retries: the number of times to retry retrieving the inventory if
+        an exception is raised. Defaults to 2 retries.
+    :param retry_delay: seconds to wait between retries. Defaults to 30s.
+    :param inventory: optional, a list of InventoryNode to use instead of
+        retrieving the inventory, e.g. when simulating a deployment.
+
+    The inventory is retrieved once, on the first lookup, and the nodes
+    selected by each distinct selector are remembered. A selector matches
+    nodes by the same rules as a Drydock node filter: a node matches a field
+    of the selector if it matches any of the field's values, and must match
+    all the fields specified. The nodes of a list of selectors are the union
+    of the nodes of each selector.
+    """
+    def __init__(self, get_docs, retries=2, retry_delay=30, inventory=None):
+        if get_docs is None and inventory is None:
+            raise TypeError('A function to retrieve documents is required.')
+        self.get_docs = get_docs
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._inventory = None if inventory is None else list(inventory)
+        self._selected = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, selectors):
+        """Lookup method
+
+        :param selectors: list of GroupNodeSelector objects to resolve to
+            node names
+        """
+        sel_list = _validate_selectors(selectors)
+        inventory = self._get_inventory()
+        nodes = set()
+        for sel in sel_list:
+            key = _selector_key(sel)
+            selected = self._selected.get(key)
+            if selected is None:
+                selected = _select_nodes(inventory, sel)
+                self._selected[key] = selected
+            nodes.update(selected)
+        return nodes
+
+    def _get_inventory(self):
+        """Retrieve the inventory of nodes, once"""
+        with self._lock:
+            if self._inventory is None:
+                self._inventory = self._retrieve_inventory()
+            return self._inventory
+
+    def _retrieve_inventory(self):
+        retries_remaining = self.retries or 0
+        while True:
+            try:
+                inventory = build_node_inventory(
+                    self.get_docs(BAREMETAL_NODE_SCHEMA),
+                    self.get_docs(HOST_PROFILE_SCHEMA))
+                LOG.info("Retrieved an inventory of %d nodes for node "
+                         "lookup", len(inventory))
+                return inventory
+            except Exception:
+                if retries_remaining > 0:
+                    LOG.exception("Retrieval of the node inventory "
+                                  "encountered a problem, but will be "
+                                  "retried. Retries remaining: %d",
+                                  retries_remaining)
+                    retries_remaining -= 1
+                    time.sleep(self.retry_delay)
+                else:
+                    LOG.exception("Retrieval of the node inventory failed. "
+                                  "No retries available")
+                    raise
+
+
+def build_node_inventory(node_docs, profile_docs):
+    """Create the inventory of nodes from the documents of a site design
+
+    :param node_docs: the drydock/BaremetalNode/v1 documents
+    :param profile_docs: the drydock/HostProfile/v1 documents
+    Returns a list of InventoryNode. The rack, tags and labels (owner_data)
+    of a node include those inherited from its host profiles, as Drydock
+    applies them: tags are combined, and the values of a node or profile
+    take precedence over those of its parent profile.
+    """
+    profiles = {doc.metadata['name']: doc.data or {} for doc in profile_docs}
+    inventory = []
+    for doc in node_docs:
+        rack, tags, labels = _node_attributes(doc.data or {}, profiles)
+        inventory.append(InventoryNode(doc.metadata['name'], rack=rack,
+                                       tags=tags, labels=labels))
+    return inventory
+
+
+def _node_attributes(data, profiles):
+    """Returns the rack, tags and labels of a node or profile, following the
+    chain of host profiles it inherits from
+    """
+    rack = None
+    tags = set()
+    labels = {}
+    seen = set()
+    while data is not None:
+        metadata = data.get('metadata') or {}
+        if rack is None:
+            rack = metadata.get('rack')
+        tags.update(metadata.get('tags') or [])
+        for key, value in (metadata.get('owner_data') or {}).items():
+            labels.setdefault(key, value)
+        parent = data.get('host_profile')
+        if parent is None or parent in seen:
+            break
+        seen.add(parent)
+        data = profiles.get(parent)
+    return rack, tags, labels
+
+
+def _selector_key(selector):
+    """A hashable representation of the criteria of a GroupNodeSelector"""
+    return (frozenset(selector.node_names),
+            frozenset(selector.get_node_labels_as_dict().items()),
+            frozenset(selector.node_tags),
+            frozenset(selector.rack_names))
+
+
+def _select_nodes(inventory, selector):
+    """Returns the set of names of the nodes matching the selector"""
+    if selector.all_selector:
+        return {node.name for node in inventory}
+    names = set(selector.node_names)
+    labels = selector.get_node_labels_as_dict()
+    tags = set(selector.node_tags)
+    racks = set(selector.rack_names)
+    selected = set()
+    for node in inventory:
+        if names and node.name not in names:
+            continue
+        if labels and not any(node.labels.get(k) == v
+                              for k, v in labels.items()):
+            continue
+        if tags and not tags.intersection(node.tags):
+            continue
+        if racks and node.rack not in racks:
+            continue
+        selected.add(node.name)
+    return selected
+
+
 def _validate_selectors(selectors):
     """Validate that the selectors are in a valid format and return a list"""
     try:
@@ -0,0 +1,420 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Deployment strategy simulator
+
+Estimates how long deploying the nodes of a site using a deployment strategy
+takes, without Drydock or any other service. The groups of the strategy are
+processed by a DeploymentGroupManager in the same way as the
+DrydockNodesOperator processes them: one group at a time, or each group as
+soon as it is ready, up to a number of concurrent groups. Preparing and
+deploying the nodes of a group is simulated, each node taking a duration
+drawn from the distributions of its NodeProfile and failing at the rate of
+its profile, and the success criteria of each group are evaluated as they
+would be during a deployment.
+
+Example usage:
+
+    sim = DeploymentSimulator(
+        strategy,
+        inventory_from_documents(site_documents),
+        NodeProfile(prepare=uniform(600, 900),
+                    deploy=normal(1800, 300),
+                    deploy_failure_rate=0.02),
+        max_concurrent_groups=4)
+    result = sim.run(seed=1)
+    LOG.info("Makespan %s, critical path %s",
+             result.makespan, ", ".join(result.critical_path))
+    summary = summarize(sim.run_many(100))
+"""
+from collections import namedtuple
+import heapq
+import itertools
+import logging
+import random
+
+from .deployment_group import Stage
+from .deployment_group_manager import DeploymentGroupManager
+from .node_lookup import BAREMETAL_NODE_SCHEMA
+from .node_lookup import build_node_inventory
+from .node_lookup import HOST_PROFILE_SCHEMA
+from .node_lookup import NodeInventoryLookup
+
+LOG = logging.getLogger(__name__)
+
+# A document of the site design, as used to build the node inventory
+_Document = namedtuple('_Document', ['metadata', 'data'])
+
+
+def fixed(seconds):
+    """A distribution of durations that are always the same"""
+    return lambda rng: seconds
+
+
+def uniform(low, high):
+    """A distribution of durations uniformly distributed from low to high"""
+    return lambda rng: rng.uniform(low, high)
+
+
+def normal(mean, stddev, minimum=0):
+    """A normal distribution of durations, none shorter than minimum"""
+    return lambda rng: max(rng.gauss(mean, stddev), minimum)
+
+
+def inventory_from_documents(documents):
+    """Create the inventory of nodes from the documents of a site design
+
+    :param documents: an iterable of documents as dictionaries, having
+        schema, metadata and data. The drydock/BaremetalNode/v1 and
+        drydock/HostProfile/v1 documents are used.
+    Returns a list of InventoryNode
+    """
+    by_schema = {BAREMETAL_NODE_SCHEMA: [], HOST_PROFILE_SCHEMA: []}
+    for doc in documents:
+        if doc.get('schema') in by_schema:
+            by_schema[doc['schema']].append(
+                _Document(doc.get('metadata') or {}, doc.get('data') or {}))
+    return build_node_inventory(by_schema[BAREMETAL_NODE_SCHEMA],
+                                by_schema[HOST_PROFILE_SCHEMA])
+
+
+class NodeProfile:
+    """The behavior of a node while it is prepared and deployed
+
+    :param prepare: the distribution of the seconds taken to prepare the node
+    :param deploy: the distribution of the seconds taken to deploy the node
+    :param prepare_failure_rate: optional, the probability of the node
+        failing to be prepared. Defaults to 0
+    :param deploy_failure_rate: optional, the probability of the node failing
+        to be deployed. Defaults to 0
+
+    A distribution is a function accepting a random.Random and returning a
+    number of seconds, e.g. fixed(600), uniform(600, 900) or
+    normal(1800, 300). A node that fails takes the drawn duration to fail.
+    """
+    def __init__(self, prepare, deploy, prepare_failure_rate=0,
+                 deploy_failure_rate=0):
+        self.prepare = prepare
+        self.deploy = deploy
+        self.prepare_failure_rate = prepare_failure_rate
+        self.deploy_failure_rate = deploy_failure_rate
+
+
+class GroupResult:
+    """The outcome of a group in a simulated deployment
+
+    :param name: the name of the group
+    :param critical: whether the group is critical
+
+    started and ended are the seconds from the start of the deployment at
+    which the group was processed, or None if it was never processed, e.g.
+    because a group it depends upon failed. started_after is the name of the
+    group whose completion allowed this group to start, if any.
+    failed_stage and failed_criteria are the stage at which the group failed
+    its success criteria, and the failed criteria.
+    """
+    def __init__(self, name, critical):
+        self.name = name
+        self.critical = critical
+        self.stage = Stage.NOT_STARTED
+        self.started = None
+        self.ended = None
+        self.started_after = None
+        self.actionable_nodes = 0
+        self.failed_stage = None
+        self.failed_criteria = []
+
+    @property
+    def duration(self):
+        if self.started is None or self.ended is None:
+            return None
+        return self.ended - self.started
+
+
+class SimulationResult:
+    """The outcome of a simulated deployment
+
+    :param groups: the GroupResults, in group order
+    :param nodes: a dictionary of the number of nodes by Stage
+    :param peak_concurrency: the largest number of groups processed at the
+        same time
+    :param peak_nodes: the largest number of nodes prepared or deployed at
+        the same time
+    :param critical_groups_failed: whether any critical group failed, failing
+        the deployment
+    """
+    def __init__(self, groups, nodes, peak_concurrency, peak_nodes,
+                 critical_groups_failed):
+        self.groups = groups
+        self.nodes = nodes
+        self.peak_concurrency = peak_concurrency
+        self.peak_nodes = peak_nodes
+        self.critical_groups_failed = critical_groups_failed
+
+    @property
+    def makespan(self):
+        """The seconds from the start to the end of the deployment"""
+        return max([group.ended for group in self.groups.values()
+                    if group.ended is not None] or [0])
+
+    @property
+    def critical_path(self):
+        """The names of the chain of groups ending last, each started when
+        the group before it completed
+        """
+        processed = [group for group in self.groups.values()
+                     if group.ended is not None]
+        if not processed:
+            return []
+        group = max(processed, key=lambda group: group.ended)
+        path = [group.name]
+        while group.started_after is not None:
+            group = self.groups[group.started_after]
+            path.append(group.name)
+        return list(reversed(path))
+
+
+class DeploymentSimulator:
+    """Simulates deployments of the nodes of a site using a strategy
+
+    :param strategy: the data of a shipyard/DeploymentStrategy/v1 document,
+        or the whole document
+    :param inventory: a list of InventoryNode, the nodes of the site
+    :param default_profile: the NodeProfile of the nodes
+    :param node_profiles: optional, a dictionary of NodeProfiles by node
+        name, for the nodes that behave differently from the default
+    :param max_concurrent_groups: optional, the number of groups processed
+        at the same time, as the physical_provisioner.max_concurrent_groups
+        of the deployment-configuration. Defaults to 1
+    :param task_overhead: optional, the seconds added to each Drydock task
+        preparing or deploying the nodes of a group, e.g. for polling.
+        Defaults to 0
+    """
+    def __init__(self, strategy, inventory, default_profile,
+                 node_profiles=None, max_concurrent_groups=1,
+                 task_overhead=0):
+        if 'data' in strategy:
+            strategy = strategy['data']
+        self.groups = strategy.get('groups', [])
+        self.default_profile = default_profile
+        self.node_profiles = node_profiles or {}
+        self.max_concurrent_groups = max(max_concurrent_groups, 1)
+        self.task_overhead = task_overhead
+        self._node_lookup = NodeInventoryLookup(None, inventory=inventory)
+
+    def run(self, seed=None):
+        """Simulates a deployment
+
+        :param seed: optional, the seed of the random numbers used to draw
+            the durations and failures of nodes, to repeat a simulation
+        Returns a SimulationResult
+        """
+        dgm = DeploymentGroupManager(self.groups, self._node_lookup.lookup)
+        return _Simulation(self, dgm, random.Random(seed)).run()
+
+    def run_many(self, runs, seed=None):
+        """Simulates several deployments
+
+        :param runs: the number of deployments to simulate
+        :param seed: optional, the seed of the random numbers of the first
+            deployment, incremented for each following deployment
+        Returns a list of SimulationResults
+        """
+        return [self.run(None if seed is None else seed + run)
+                for run in range(runs)]
+
+    def profile(self, node_name):
+        """The NodeProfile of a node"""
+        return self.node_profiles.get(node_name, self.default_profile)
+
+
+def summarize(results):
+    """Summarize the results of several simulated deployments
+
+    :param results: a list of SimulationResults
+    Returns a dictionary of the number of runs, the minimum, mean, median,
+    90th percentile and maximum makespan, the fraction of runs without a
+    critical group failing, and the fraction of runs in which each group
+    failed.
+    """
+    if not results:
+        return {'runs': 0}
+    makespans = sorted(result.makespan for result in results)
+    group_failures = {}
+    for result in results:
+        for name, group in result.groups.items():
+            group_failures.setdefault(name, 0)
+            if group.stage == Stage.FAILED:
+                group_failures[name] += 1
+    runs = len(results)
+    return {
+        'runs': runs,
+        'makespan': {
+            'min': makespans[0],
+            'mean': sum(makespans) / runs,
+            'p50': _percentile(makespans, 50),
+            'p90': _percentile(makespans, 90),
+            'max': makespans[-1],
+        },
+        'success_rate': sum(
+            1 for result in results if not result.critical_groups_failed
+        ) / runs,
+        'group_failure_rates': {
+            name: failures / runs for name, failures in group_failures.items()
+        },
+    }
+
+
+def _percentile(ordered, percent):
+    """The nearest-rank percentile of an ordered list of values"""
+    rank = max(int(-(-len(ordered) * percent // 100)), 1)
+    return ordered[rank - 1]
+
+
+class _Simulation:
+    """A simulated deployment, processing groups as the operator does
+
+    Time only advances when a Drydock task preparing or deploying the nodes
+    of a group ends. The processing of each group is a generator yielding
+    the duration of each task.
+    """
+    def __init__(self, simulator, dgm, rng):
+        self.sim = simulator
+        self.dgm = dgm
+        self.rng = rng
+        self.now = 0
+        self.results = {group.name: GroupResult(group.name, group.critical)
+                        for group in dgm.group_list()}
+        self._events = []
+        self._sequence = itertools.count()
+        self._in_progress = {}
+        self._last_completed = None
+        self._active_nodes = 0
+        self._peak_concurrency = 0
+        self._peak_nodes = 0
+
+    def run(self):
+        self._start_groups()
+        while self._events:
+            self.now, _, name = heapq.heappop(self._events)
+            self._advance(name)
+            self._start_groups()
+        for group in self.dgm.group_list():
+            self.results[group.name].stage = group.stage
+        return SimulationResult(
+            groups=self.results,
+            nodes={stage: len(self.dgm.get_nodes(stage)) for stage in Stage},
+            peak_concurrency=self._peak_concurrency,
+            peak_nodes=self._peak_nodes,
+            critical_groups_failed=self.dgm.critical_groups_failed())
+
+    def _start_groups(self):
+        """Start the groups eligible for processing, as the operator would"""
+        started = True
+        while started:
+            started = False
+            if self.sim.max_concurrent_groups == 1:
+                if not self._in_progress:
+                    group = self.dgm.get_next_group(Stage.PREPARED)
+                    if group is not None:
+                        self._start(group)
+                        started = True
+                continue
+            for group in self.dgm.get_ready_groups(
+                    exclude=list(self._in_progress)):
+                if len(self._in_progress) >= self.sim.max_concurrent_groups:
+                    break
+                self._start(group)
+                started = True
+
+    def _start(self, group):
+        result = self.results[group.name]
+        result.started = self.now
+        result.started_after = self._last_completed
+        self._in_progress[group.name] = self._process_group(group)
+        self._peak_concurrency = max(self._peak_concurrency,
+                                     len(self._in_progress))
+        self._advance(group.name)
+
+    def _advance(self, name):
+        """Continue processing a group until its next task, or its end"""
+        try:
+            duration = next(self._in_progress[name])
+        except StopIteration:
+            del self._in_progress[name]
+            self.results[name].ended = self.now
+            self._last_completed = name
+            return
+        heapq.heappush(self._events,
+                       (self.now + duration, next(self._sequence), name))
+
+    def _process_group(self, group):
+        """Prepares and deploys the nodes of a group, as the operator does"""
+        dgm = self.dgm
+        if not group.actionable_nodes:
+            self._evaluate(group, Stage.PREPARED)
+            self._evaluate(group, Stage.DEPLOYED)
+            return
+        self.results[group.name].actionable_nodes = len(
+            group.actionable_nodes)
+
+        prepared = yield from self._run_task(group.actionable_nodes,
+                                             Stage.PREPARED)
+        for node_name in prepared:
+            dgm.mark_node_prepared(node_name)
+        dgm.fail_unsuccessful_nodes(group, prepared)
+        if not self._evaluate(group, Stage.PREPARED):
+            return
+
+        if prepared:
+            deployed = yield from self._run_task(prepared, Stage.DEPLOYED)
+            for node_name in deployed:
+                dgm.mark_node_deployed(node_name)
+            dgm.fail_unsuccessful_nodes(group, deployed)
+        self._evaluate(group, Stage.DEPLOYED)
+
+    def _run_task(self, node_names, stage):
+        """Simulates a Drydock task acting on nodes at the same time
+
+        Yields the duration of the task, the longest duration of its nodes,
+        and returns the names of the nodes that succeeded.
+        """
+        successes = []
+        duration = 0
+        # sorted, so that a seed draws the same numbers for the same nodes
+        for node_name in sorted(node_names):
+            profile = self.sim.profile(node_name)
+            if stage == Stage.PREPARED:
+                dist, failure_rate = (profile.prepare,
+                                      profile.prepare_failure_rate)
+            else:
+                dist, failure_rate = (profile.deploy,
+                                      profile.deploy_failure_rate)
+            duration = max(duration, dist(self.rng))
+            if self.rng.random() >= failure_rate:
+                successes.append(node_name)
+        self._active_nodes += len(node_names)
+        self._peak_nodes = max(self._peak_nodes, self._active_nodes)
+        yield duration + self.sim.task_overhead
+        self._active_nodes -= len(node_names)
+        return successes
+
+    def _evaluate(self, group, stage):
+        """Evaluate the success criteria of a group, recording failures"""
+        failures = self.dgm.get_group_failures_for_stage(group.name, stage)
+        if failures:
+            result = self.results[group.name]
+            result.failed_stage = stage
+            result.failed_criteria = failures
+        return self.dgm.evaluate_group_succ_criteria(group.name, stage)
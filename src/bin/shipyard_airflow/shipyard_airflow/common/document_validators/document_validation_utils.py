@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Utilities for use by document validators."""
+from collections import defaultdict
 import logging
 
 from .errors import DocumentLookupError, DocumentNotFoundError
@@ -19,11 +20,99 @@ from .errors import DocumentLookupError, DocumentNotFoundError
 LOG = logging.getLogger(__name__)
 
 
+class RenderedDocument:
+    """A rendered document, providing the attributes of the documents
+    returned by the Deckhand client (schema, metadata, data)
+
+    :param doc: the dictionary form of the rendered document
+    """
+    def __init__(self, doc):
+        self.schema = doc.get('schema')
+        self.metadata = doc.get('metadata') or {}
+        self.data = doc.get('data')
+
+
+def _doc_value(doc, path):
+    # Returns the value at the dotted path in the document, or None
+    value = doc
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _matches_filters(doc, filters):
+    """Determines if the document matches all of the filters
+
+    Filters are matched on the value at the dotted path of their key, except
+    schema, which also matches its leading segments (e.g. a schema filter of
+    shipyard/DeploymentStrategy matches shipyard/DeploymentStrategy/v1), as
+    is done by Deckhand.
+    """
+    for path, expected in filters.items():
+        value = _doc_value(doc, path)
+        if path == 'schema' and isinstance(value, str):
+            if not (value == expected or
+                    value.startswith('{}/'.format(expected))):
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class DocumentIndex:
+    """The rendered documents of a revision, indexed by schema and name
+
+    :param revision_id: the revision the documents were rendered from
+    :param docs: the list of rendered documents, as dictionaries
+    """
+    def __init__(self, revision_id, docs):
+        self.revision_id = revision_id
+        self.docs = [doc for doc in docs if doc]
+        self._by_schema_name = defaultdict(list)
+        for doc in self.docs:
+            key = (doc.get('schema'), _doc_value(doc, 'metadata.name'))
+            self._by_schema_name[key].append(RenderedDocument(doc))
+        LOG.info("Indexed %s documents from revision %s", len(self.docs),
+                 revision_id)
+
+    def get_docs_by_filter(self, filters):
+        """Returns the documents matching the filters
+
+        Lookups by a full schema (including version) and name use the index,
+        other filters are matched against each document.
+        """
+        schema = filters.get('schema')
+        if (set(filters) == {'schema', 'metadata.name'} and
+                isinstance(schema, str) and schema.count('/') == 2):
+            return list(self._by_schema_name.get(
+                (schema, filters['metadata.name']), []))
+        return [RenderedDocument(doc) for doc in self.docs
+                if _matches_filters(doc, filters)]
+
+
 class DocumentValidationUtils:
-    def __init__(self, deckhand_client):
+    """Utilities for the lookup of rendered documents
+
+    :param deckhand_client: An instance of a Deckhand client used to look up
+        documents
+    :param get_rendered_docs: optional, a method accepting a revision id and
+        returning the list of all rendered documents of the revision as
+        dictionaries, used instead of a lookup by the Deckhand client for
+        each filter. Allows the rendered documents of a revision to be reused
+        between lookups.
+    :param document_index: optional, a DocumentIndex used for lookups of
+        documents in its revision, e.g. shared by the validators run by a
+        DocumentValidationManager
+    """
+    def __init__(self, deckhand_client, get_rendered_docs=None,
+                 document_index=None):
         if deckhand_client is None:
             raise TypeError('Deckhand client is required.')
         self.deckhand_client = deckhand_client
+        self.get_rendered_docs = get_rendered_docs
+        self.document_index = document_index
 
     def get_unique_doc(self, revision_id, name, schema):
         """Retrieve a single, unique document as a dictionary
@@ -57,9 +146,18 @@ class DocumentValidationUtils:
         LOG.info("Attempting to retrieve %s from revision %s", str(filters),
                  revision_id)
         try:
-            docs = self.deckhand_client.revisions.documents(revision_id,
-                                                            rendered=True,
-                                                            **filters)
+            if (self.document_index is not None and
+                    self.document_index.revision_id == revision_id):
+                docs = self.document_index.get_docs_by_filter(filters)
+            elif self.get_rendered_docs is not None:
+                docs = [
+                    RenderedDocument(doc)
+                    for doc in self.get_rendered_docs(revision_id)
+                    if _matches_filters(doc, filters)
+                ]
+            else:
+                docs = self.deckhand_client.revisions.documents(
+                    revision_id, rendered=True, **filters)
         except Exception as ex:
             # If we looked for a document, it's either not there ([] response)
             # or it's there. Anything else is a DocumentLookupError.
@@ -30,12 +30,21 @@ class DocumentValidator(metaclass=abc.ABCMeta):
         to interact with Deckhand during the validation
     :param revision: The numeric Deckhand revision of document under test
     :param doc_name: The name of the document under test
+    :param get_rendered_docs: optional, a method returning the list of
+        rendered documents of a revision, used to look up documents. See
+        DocumentValidationUtils
+    :param document_index: optional, a DocumentIndex of the revision's
+        documents used to look up documents. See DocumentValidationUtils
     """
-    def __init__(self, deckhand_client, revision, doc_name):
+    def __init__(self, deckhand_client, revision, doc_name,
+                 get_rendered_docs=None, document_index=None):
         if deckhand_client is None:
             raise DeckhandClientRequiredError()
         self.deckhand_client = deckhand_client
-        self.docutils = DocumentValidationUtils(self.deckhand_client)
+        self.get_rendered_docs = get_rendered_docs
+        self.docutils = DocumentValidationUtils(
+            self.deckhand_client, get_rendered_docs=get_rendered_docs,
+            document_index=document_index)
         self.doc_name = doc_name
 
         # self.error_status is False if no validations fail. It becomes
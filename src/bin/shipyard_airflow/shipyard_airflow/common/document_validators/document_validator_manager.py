@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Coordination and running of the documents to validate for Shipyard"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import logging
 
+from .document_validation_utils import DocumentIndex
+
 LOG = logging.getLogger(__name__)
 
 
@@ -22,15 +25,27 @@ class _DocValidationDef:
 
     :param validator: the class of the validator
     :param name: the name of the document to be validated
+    :param order: the position of the validation: the position of the
+        validation that triggered it (if any), followed by its position in
+        the list of validations
     """
-    def __init__(self, validator, name):
+    def __init__(self, validator, name, order):
         LOG.info("Setting up validation for %s", name)
         self.validator = validator
         self.name = name
+        self.order = order
         self.finished = False
         self.errored = False
         self.results = []
 
+    def sort_key(self):
+        """The key ordering validations as if run one at a time
+
+        Validations run one at a time run in order of the number of triggers
+        leading to them, then in the order they were triggered.
+        """
+        return (len(self.order), self.order)
+
 
 class DocumentValidationManager:
     """Coordinates the validation of Shipyard documents
@@ -40,47 +55,123 @@ class DocumentValidationManager:
     :param revision: The numeric Deckhand revision of document under test
     :param validations: The list of tuples containing a Validator (extending
         DocumentValidator) and a document name.
+    :param get_rendered_docs: optional, a method returning the list of
+        rendered documents of a revision. If specified, the documents of the
+        revision are retrieved once and indexed by schema and name for the
+        lookups done by all of the validators. See DocumentValidationUtils
+    :param max_workers: optional, the number of validators run concurrently.
+        Triggered validations are started as they are discovered. The results
+        are in the same order as when run one at a time. Defaults to 1,
+        running the validators one at a time.
     """
-    def __init__(self, deckhand_client, revision, validations):
+    def __init__(self, deckhand_client, revision, validations,
+                 get_rendered_docs=None, max_workers=None):
         self.deckhand_client = deckhand_client
+        self.get_rendered_docs = get_rendered_docs
         self.revision = revision
+        self.max_workers = max_workers or 1
         self.validations = self._parse_validations(validations)
         self.errored = False
         self.validations_run = 0
 
-    def _parse_validations(self, validations):
+    def _parse_validations(self, validations, parent=None):
         # Turn tuples into DocValidationDefs
+        prefix = parent.order if parent is not None else ()
         defs = []
-        for val, name in validations:
-            defs.append(_DocValidationDef(val, name))
+        for idx, (val, name) in enumerate(validations):
+            defs.append(_DocValidationDef(val, name, prefix + (idx, )))
         return defs
 
-    def validate(self):
-        """Run the validations
+    def _get_document_index(self):
+        """Retrieves and indexes the rendered documents of the revision
 
-        Runs through the validations until all are finished
+        Returns None if there is no method to retrieve the rendered
+        documents, or if retrieving them fails, in which case each validator
+        looks up its documents, reporting any failure as a validation error.
+        """
+        if self.get_rendered_docs is None:
+            return None
+        try:
+            return DocumentIndex(self.revision,
+                                 self.get_rendered_docs(self.revision))
+        except Exception as ex:
+            LOG.warning("Unable to index the documents of revision %s, "
+                        "validators will look up documents individually: %s",
+                        self.revision, str(ex))
+            return None
+
+    def _run_validator(self, val_def, document_index):
+        """Runs the validator of the validation, returning the validator"""
+        vldtr = val_def.validator(
+            deckhand_client=self.deckhand_client,
+            revision=self.revision,
+            doc_name=val_def.name,
+            get_rendered_docs=self.get_rendered_docs,
+            document_index=document_index)
+        LOG.info("Validating document %s: %s ",
+                 vldtr.schema, vldtr.doc_name)
+        vldtr.validate()
+        return vldtr
+
+    def _finish_validation(self, val_def, vldtr):
+        """Records the outcome of the validation
+
+        Returns the list of new validations triggered by the validator
         """
+        self.validations_run += 1
+        # set the validation status from the status of the validator
+        val_def.errored = vldtr.error_status
+        val_def.results.extend(vldtr.val_msg_list)
+        val_def.finished = True
+
+        # acquire any new validations that should be run
+        new_vals = self._parse_validations(vldtr.triggered_validations,
+                                           parent=val_def)
+        self.validations.extend(new_vals)
+        return new_vals
+
+    def _validate_sequentially(self, document_index):
         unfinished = [v for v in self.validations if not v.finished]
         while unfinished:
             # find the next doc to validate
             for val_def in unfinished:
-                vldtr = val_def.validator(deckhand_client=self.deckhand_client,
-                                          revision=self.revision,
-                                          doc_name=val_def.name)
-                LOG.info("Validating document %s: %s ",
-                         vldtr.schema, vldtr.doc_name)
-                vldtr.validate()
-                self.validations_run += 1
-                # set the validation status from the status of the validator
-                val_def.errored = vldtr.error_status
-                val_def.results.extend(vldtr.val_msg_list)
-                val_def.finished = True
-
-                # acquire any new validations that should be run
-                new_vals = self._parse_validations(vldtr.triggered_validations)
-                self.validations.extend(new_vals)
+                vldtr = self._run_validator(val_def, document_index)
+                self._finish_validation(val_def, vldtr)
             unfinished = [v for v in self.validations if not v.finished]
 
+    def _validate_concurrently(self, document_index):
+        LOG.info("Running document validations using up to %s workers",
+                 self.max_workers)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+
+            def _start(val_defs):
+                for val_def in val_defs:
+                    future = executor.submit(self._run_validator, val_def,
+                                             document_index)
+                    running[future] = val_def
+
+            _start([v for v in self.validations if not v.finished])
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    val_def = running.pop(future)
+                    # re-raises any exception raised by the validator
+                    vldtr = future.result()
+                    _start(self._finish_validation(val_def, vldtr))
+
+    def validate(self):
+        """Run the validations
+
+        Runs through the validations until all are finished
+        """
+        document_index = self._get_document_index()
+        if self.max_workers > 1:
+            self._validate_concurrently(document_index)
+        else:
+            self._validate_sequentially(document_index)
+        self.validations.sort(key=_DocValidationDef.sort_key)
+
         # gather the results
         final_result = []
         for v in self.validations:
@@ -22,8 +22,11 @@ intended to store info that would drive code paths or decisions. This is not
 an arbitrary use key-value database.
 """
 import abc
+from contextlib import contextmanager
 from datetime import datetime
 import logging
+import threading
+import time
 
 import requests
 from requests.exceptions import HTTPError
@@ -52,14 +55,22 @@ class NotesManager:
         a URL. Defaults to 3 seconds
     :param read_timeout: optional, The maximum time waiting to read the info
         from a URL. Defaults to 10 seconds
+    :param get_session: optional, A method that returns the requests.Session
+        used to resolve url-based notes, allowing connections to be reused.
+        Defaults to making each request without a session
 
     Example usage:
         nm = NotesManager(SQLNotesStorage("connection_info"), get_url)
         a_note = nm.store(Note(...params...))
         notes = list(nm.retrieve(Query("some/id")))
+
+        # Notes stored together
+        with nm.batch(max_notes=100, max_seconds=10):
+            nm.store(Note(...params...))
+            nm.store(Note(...params...))
     """
     def __init__(self, storage, get_token, connect_timeout=None,
-                 read_timeout=None):
+                 read_timeout=None, get_session=None):
         if not isinstance(storage, NotesStorage):
             raise NotesInitializationError(
                 "Storage object is not suitable for use with Notes"
@@ -80,6 +91,79 @@ class NotesManager:
         # connect and read timeouts default to 3 and 10 seconds
         self.connect_timeout = connect_timeout or 3
         self.read_timeout = read_timeout or 10
+        if get_session is not None and not callable(get_session):
+            raise NotesInitializationError(
+                "Parameter get_session is not suitable for use with Notes. "
+                "Must be a callable."
+            )
+        self.get_session = get_session
+
+        # Notes buffered while batching, None when not batching
+        self._batch_lock = threading.Lock()
+        self._batch = None
+        self._batch_depth = 0
+        self._batch_max_notes = None
+        self._batch_max_seconds = None
+        self._batch_started = None
+
+    @contextmanager
+    def batch(self, max_notes=100, max_seconds=10):
+        """Buffer the notes stored within the context, storing them together
+
+        :param max_notes: optional, the number of buffered notes causing the
+            buffer to be stored. Defaults to 100
+        :param max_seconds: optional, the age of the oldest buffered note
+            causing the buffer to be stored when another note is stored.
+            Defaults to 10
+
+        The buffered notes are stored when leaving the context, including
+        when an exception is raised, and before notes are retrieved. Nested
+        batches are part of the outermost batch.
+        """
+        with self._batch_lock:
+            self._batch_depth += 1
+            if self._batch is None:
+                self._batch = []
+                self._batch_max_notes = max(max_notes, 1)
+                self._batch_max_seconds = max_seconds
+        try:
+            yield self
+        finally:
+            with self._batch_lock:
+                self._batch_depth -= 1
+                last = self._batch_depth == 0
+            if last:
+                self.flush(end_batch=True)
+
+    def flush(self, end_batch=False):
+        """Store the buffered notes
+
+        :param end_batch: optional, True to stop buffering notes
+        :returns: The notes, as they were after storage
+
+        If the notes cannot be stored together they are stored one at a time,
+        such that a failure to store one note does not lose the others.
+        """
+        with self._batch_lock:
+            notes = self._batch or []
+            if self._batch is not None:
+                self._batch = None if end_batch else []
+            self._batch_started = None
+        if not notes:
+            return []
+        try:
+            return list(self.storage.store_bulk(notes))
+        except Exception as ex:
+            LOG.exception(ex)
+            LOG.warning("Unable to store %d notes together, storing them "
+                        "one at a time", len(notes))
+        stored = []
+        for note in notes:
+            try:
+                stored.append(self.storage.store(note))
+            except Exception as ex:
+                LOG.exception(ex)
+        return stored
 
     def create(self, assoc_id, subject, sub_type, note_val,
                verbosity=None, link_url=None, is_auth_link=None,
@@ -113,6 +197,20 @@ class NotesManager:
             raise NotesStorageError(
                 "Verbosity of notes must range from {} "
                 "to {} (most verbose)".format(MIN_VERBOSITY, MAX_VERBOSITY))
+        with self._batch_lock:
+            batching = self._batch is not None
+            if batching:
+                self._batch.append(note)
+                if self._batch_started is None:
+                    self._batch_started = time.monotonic()
+                flush = (
+                    len(self._batch) >= self._batch_max_notes or
+                    time.monotonic() - self._batch_started >=
+                    self._batch_max_seconds)
+        if batching:
+            if flush:
+                self.flush()
+            return note
         try:
             return self.storage.store(note)
         except NotesStorageError:
@@ -128,6 +226,7 @@ class NotesManager:
         :returns: a list of notes matchin the query, or [] if there are no
             notes matching the query.
         """
+        self.flush()
         try:
             notes = list(self.storage.retrieve(query))
         except NotesRetrievalError:
@@ -137,11 +236,37 @@ class NotesManager:
             raise NotesRetrievalError(
                 "Unhandled error during retrieval of notes"
             )
+        self._set_resolved_url_values(notes)
+        return notes
+
+    def retrieve_bulk(self, queries):
+        """Retrieve a list of the notes matching any of several queries
+
+        :param queries: a list of query objects to retrieve notes
+        :returns: a list of notes matching any of the queries, or [] if there
+            are no notes matching the queries.
+        """
+        if not queries:
+            return []
+        self.flush()
+        try:
+            notes = list(self.storage.retrieve_bulk(queries))
+        except NotesRetrievalError:
+            raise
+        except Exception as ex:
+            LOG.exception(ex)
+            raise NotesRetrievalError(
+                "Unhandled error during retrieval of notes"
+            )
+        self._set_resolved_url_values(notes)
+        return notes
+
+    def _set_resolved_url_values(self, notes):
+        """Set the placeholder value for notes having a URL"""
         for note in notes:
             if note.link_url:
                 note.resolved_url_value = (
                     "Details at notedetails/{}".format(note.note_id))
-        return notes
 
     def retrieve_by_id(self, note_id):
         """Return a single note looked up by the specified note_id
@@ -150,6 +275,7 @@ class NotesManager:
         :raises NoteNotFoundError: if there is no note matching the requested
             note_id
         """
+        self.flush()
         return self.storage.retrieve_by_id(note_id)
 
     def get_note_url_info(self, note):
@@ -180,7 +306,8 @@ class NotesManager:
             if note.is_auth_link:
                 headers['X-Auth-Token'] = auth_token
 
-            response = requests.get(
+            http = self.get_session() if self.get_session else requests
+            response = http.get(
                 note.link_url,
                 headers=headers,
                 timeout=(self.connect_timeout, self.read_timeout))
@@ -284,6 +411,20 @@ class NotesStorage(metaclass=abc.ABCMeta):
         """
         pass
 
+    def store_bulk(self, notes):
+        """Store several Note objects, return the note objects as stored
+
+        :param notes: a list of Note objects
+        :returns: List of Note objects, as were persisted.
+        :raises NotesStorageError: When there is a failure to create the
+            notes.
+
+        Implementations should override this method to store the notes using
+        a single request to the target data store. This default
+        implementation invokes store for each of the notes.
+        """
+        return [self.store(note) for note in notes]
+
     @abc.abstractmethod
     def retrieve(self, query):
         """Query for a list of Note objects
@@ -297,6 +438,27 @@ class NotesStorage(metaclass=abc.ABCMeta):
         """
         pass
 
+    def retrieve_bulk(self, queries):
+        """Query for a list of Note objects matching any of several queries
+
+        :param queries: a list of Notes Query objects representing the notes
+            to be retrieved.
+        :returns: List of Note objects matching any of the queries, without
+            duplicates, ordered by note_timestamp
+        :raises NotesRetrievalError: when there is a failure to retrieve notes,
+            however an empty list is expected to be returned in the case of no
+            results.
+
+        Implementations should override this method to retrieve the notes
+        using a single request to the target data store. This default
+        implementation invokes retrieve for each of the queries.
+        """
+        notes = {}
+        for query in queries:
+            for note in self.retrieve(query):
+                notes[note.note_id] = note
+        return sorted(notes.values(), key=lambda x: x.note_timestamp)
+
     @abc.abstractmethod
     def retrieve_by_id(self, note_id):
         """Lookup a note by note_id
@@ -131,6 +131,17 @@ class NotesHelper:
     def __init__(self, notes_manager):
         self.nm = notes_manager
 
+    def batch(self, max_notes=100, max_seconds=10):
+        """Context manager storing the notes made within it together
+
+        :param max_notes: optional, the number of notes stored together
+        :param max_seconds: optional, the longest time a note is held before
+            being stored, checked when another note is made
+        The notes made are stored when leaving the context, including when an
+        exception is raised.
+        """
+        return self.nm.batch(max_notes=max_notes, max_seconds=max_seconds)
+
     def _failsafe_make_note(self, assoc_id, subject, sub_type, note_val,
                             verbosity=MIN_VERBOSITY, link_url=None,
                             is_auth_link=None, note_timestamp=None):
@@ -171,6 +182,20 @@ class NotesHelper:
             LOG.exception(ex)
         return []
 
+    def _failsafe_get_bulk_notes(self, queries):
+        """LOG and continue on any bulk note retrieval failure"""
+        try:
+            return self.nm.retrieve_bulk(queries)
+        except Exception as ex:
+            LOG.warning(
+                "Note retrieval for %d queries encountered a problem, "
+                "exception info follows, but processing is not halted for "
+                "notes.",
+                len(queries)
+            )
+            LOG.exception(ex)
+        return []
+
     #
     # Retrieve notes by note ID
     #
@@ -364,3 +389,48 @@ class NotesHelper:
             verbosity=verbosity,
             exact_match=True
         )
+
+    #
+    # Bulk notes helper methods
+    #
+
+    def get_notes_for_actions(self, action_ids, verbosity=MIN_VERBOSITY,
+                              step_verbosity=None):
+        """Retrieve the notes for several actions and their steps at once
+
+        :param action_ids: the list of action ids for which to retrieve the
+            action notes and the notes of the action's steps.
+        :param verbosity: optional integer, 0-5, the maximum verbosity level
+            of action notes to retrieve, defaults to 1 (most summary level)
+            if set to less than 1, action notes are not retrieved
+        :param step_verbosity: optional integer, 0-5, the maximum verbosity
+            level of step notes to retrieve, defaults to the value of
+            verbosity. If set to less than 1, step notes are not retrieved
+        :returns: a dictionary of lists of notes, keyed by the assoc_id of the
+            notes, e.g. action/{action_id} or step/{action_id}/{step_id}.
+
+        The notes are retrieved using a single request to the notes storage,
+        rather than a request per action.
+        """
+        if step_verbosity is None:
+            step_verbosity = verbosity
+        queries = []
+        for action_id in action_ids:
+            if verbosity >= MIN_VERBOSITY:
+                queries.append(Query(
+                    NoteType.ACTION.key_pattern.format(action_id),
+                    verbosity,
+                    exact_match=True))
+            if step_verbosity >= MIN_VERBOSITY:
+                queries.append(Query(
+                    NoteType.STEP.lookup_pattern.format(action_id),
+                    step_verbosity,
+                    exact_match=False))
+        note_dict = {}
+        if not queries:
+            return note_dict
+        for n in self._failsafe_get_bulk_notes(queries):
+            if n.assoc_id not in note_dict:
+                note_dict[n.assoc_id] = []
+            note_dict[n.assoc_id].append(n)
+        return note_dict
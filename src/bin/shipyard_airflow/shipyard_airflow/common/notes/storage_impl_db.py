@@ -26,6 +26,7 @@ import logging
 from sqlalchemy import and_
 from sqlalchemy import Column
 from sqlalchemy import func
+from sqlalchemy import or_
 from sqlalchemy import Text
 from sqlalchemy import types
 
@@ -41,6 +42,9 @@ from .errors import NotesInitializationError
 LOG = logging.getLogger(__name__)
 Base = declarative_base()
 
+# The number of notes inserted by each statement of a bulk store
+BULK_INSERT_ROWS = 500
+
 
 class TNote(Base):
     """Notes ORM class"""
@@ -117,6 +121,17 @@ class ShipyardSQLNotesStorage(NotesStorage):
             r_note = self._map(tnote, Note)
         return r_note
 
+    def store_bulk(self, notes):
+        """Store notes in the database using multi-row inserts, within a
+        single transaction
+        """
+        rows = [self._row(note) for note in notes]
+        with self.session_scope() as session:
+            for start in range(0, len(rows), BULK_INSERT_ROWS):
+                session.execute(TNote.__table__.insert().values(
+                    rows[start:start + BULK_INSERT_ROWS]))
+        return list(notes)
+
     def retrieve(self, query):
         a_id_pat = query.assoc_id_pattern
         max_verb = query.max_verbosity
@@ -142,6 +157,48 @@ class ShipyardSQLNotesStorage(NotesStorage):
                 r_notes.append(self._map(tn, Note))
         return r_notes
 
+    def retrieve_bulk(self, queries):
+        """Retrieve the notes matching any of the queries using one select
+
+        The queries are grouped by their maximum verbosity, such that the
+        exact matches for a verbosity are an IN condition and the prefix
+        matches are LIKE conditions.
+        """
+        by_verbosity = {}
+        for query in queries:
+            exact, prefix = by_verbosity.setdefault(
+                query.max_verbosity, (set(), set()))
+            if query.exact_match:
+                exact.add(query.assoc_id_pattern)
+            else:
+                prefix.add(query.assoc_id_pattern)
+
+        conditions = []
+        for max_verb, (exact, prefix) in sorted(by_verbosity.items()):
+            assoc_id_conditions = [
+                TNote.assoc_id.like(a_id_pat + '%')
+                for a_id_pat in sorted(prefix)
+            ]
+            if exact:
+                assoc_id_conditions.append(TNote.assoc_id.in_(sorted(exact)))
+            conditions.append(
+                and_(
+                    or_(*assoc_id_conditions),
+                    TNote.verbosity <= max_verb
+                )
+            )
+
+        r_notes = []
+        if not conditions:
+            return r_notes
+        with self.session_scope() as session:
+            n_qry = session.query(TNote).filter(
+                or_(*conditions)
+            ).order_by(TNote.note_timestamp)
+            for tn in n_qry.all():
+                r_notes.append(self._map(tn, Note))
+        return r_notes
+
     def retrieve_by_id(self, note_id):
         with self.session_scope() as session:
             note = session.query(TNote).filter(
@@ -150,6 +207,19 @@ class ShipyardSQLNotesStorage(NotesStorage):
                 raise NoteNotFoundError()
             return self._map(note, Note)
 
+    def _row(self, note):
+        """Maps a Note object to the column values of a row"""
+        try:
+            return {
+                column.name: getattr(note, column.name)
+                for column in TNote.__table__.columns
+            }
+        except AttributeError as ae:
+            LOG.exception(ae)
+            raise NotesError(
+                "Note could not be translated to SQL form; mapping error"
+            )
+
     def _map(self, src, target_type):
         """Maps a Note object to/from a TNote object.
 
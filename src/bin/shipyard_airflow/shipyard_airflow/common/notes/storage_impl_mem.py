@@ -29,6 +29,9 @@ class MemoryNotesStorage(NotesStorage):
         self.storage[note.note_id] = note
         return note
 
+    def store_bulk(self, notes):
+        return [self.store(note) for note in notes]
+
     def retrieve(self, query):
         pat = query.assoc_id_pattern
         max_verb = query.max_verbosity
@@ -45,6 +48,22 @@ class MemoryNotesStorage(NotesStorage):
         notes.sort(key=lambda x: x.note_timestamp)
         return notes
 
+    def retrieve_bulk(self, queries):
+        notes = [
+            note for note in self.storage.values()
+            if any(self._matches(note, query) for query in queries)
+        ]
+        notes.sort(key=lambda x: x.note_timestamp)
+        return notes
+
+    @staticmethod
+    def _matches(note, query):
+        if note.verbosity > query.max_verbosity:
+            return False
+        if query.exact_match:
+            return note.assoc_id == query.assoc_id_pattern
+        return note.assoc_id.startswith(query.assoc_id_pattern)
+
     def retrieve_by_id(self, note_id):
         note = self.storage.get(note_id)
         if not note:
@@ -0,0 +1,81 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# shipyard_client/cli/yaml_codec.py is a copy of this module, as the client
+# does not depend on shipyard_airflow. This module is the source of truth:
+# change it, then copy it to the client.
+"""Loading and dumping of YAML
+
+Uses the loader and dumper of libyaml, implemented in C, when PyYAML is built
+with libyaml, falling back to the pure Python implementations otherwise. The
+C implementations are many times faster for large documents, such as the
+rendered documents of a site design.
+
+Only the safe loader and dumper are used, handling standard YAML tags only.
+"""
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+    LIBYAML = True
+except ImportError:
+    from yaml import SafeDumper
+    from yaml import SafeLoader
+    LIBYAML = False
+
+# Errors raised by loading invalid YAML
+YAMLError = yaml.YAMLError
+
+
+def load(stream):
+    """Loads a YAML document
+
+    :param stream: a string, bytes, or file of the document
+    :returns: the object of the document
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_all(stream):
+    """Iterates the documents of a multi-document YAML stream
+
+    Each document is loaded as the iterator reaches it, such that a consumer
+    of the documents does not hold all of the documents at once.
+    :param stream: a string, bytes, or file of the documents
+    :returns: an iterator of the objects of the documents
+    """
+    return yaml.load_all(stream, Loader=SafeLoader)
+
+
+def dump(data, stream=None, **kwargs):
+    """Dumps an object as a YAML document
+
+    :param data: the object
+    :param stream: optional, the file to write the document to
+    :param kwargs: the options of yaml.dump, e.g. default_flow_style
+    :returns: the document as a string, if no stream is specified
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def dump_all(documents, stream=None, **kwargs):
+    """Dumps objects as a multi-document YAML stream
+
+    :param documents: an iterable of the objects
+    :param stream: optional, the file to write the documents to
+    :param kwargs: the options of yaml.dump_all, e.g. explicit_start
+    :returns: the documents as a string, if no stream is specified
+    """
+    return yaml.dump_all(documents, stream, Dumper=SafeDumper, **kwargs)
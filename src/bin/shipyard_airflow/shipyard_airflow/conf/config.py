@@ -97,6 +97,24 @@ SECTIONS = [
                 help=('Enable profiling of API requests. Do NOT '
                       'use in production.')
             ),
+            cfg.IntOpt(
+                'keystone_token_refresh_margin',
+                default=300,
+                min=0,
+                help=('The API reuses its Keystone token until it is due to '
+                      'expire within this number of seconds, at which point '
+                      'a new token is acquired. The margin should exceed '
+                      'the longest request made with the token')
+            ),
+            cfg.IntOpt(
+                'document_validation_max_workers',
+                default=4,
+                min=1,
+                help=('The number of Shipyard document validators run '
+                      'concurrently when validating configdocs or creating '
+                      'an action. A value of 1 runs the validators one at '
+                      'a time.')
+            ),
         ]
     ),
     ConfigSection(
@@ -149,6 +167,40 @@ SECTIONS = [
                     'the service lookup in the Keystone service catalog.'
                 )
             ),
+            cfg.IntOpt(
+                'revision_cache_size',
+                default=256,
+                min=0,
+                help=(
+                    'The number of differences between pairs of Deckhand '
+                    'revisions cached and shared by API requests. The list '
+                    'of revisions is not cached. A value of 0 disables the '
+                    'cache.'
+                )
+            ),
+            cfg.IntOpt(
+                'rendered_docs_cache_size',
+                default=8,
+                min=0,
+                help=(
+                    'The number of sets of rendered documents, by revision, '
+                    'cached for use by the rendered configdocs API and '
+                    'document validations. Documents rendered with and '
+                    'without cleartext secrets are cached separately. A '
+                    'value of 0 disables the cache.'
+                )
+            ),
+            cfg.IntOpt(
+                'rendered_docs_cache_max_mb',
+                default=128,
+                min=1,
+                help=(
+                    'The maximum total size (in MB) of the compressed '
+                    'rendered documents held by the rendered documents '
+                    'cache. The least recently used documents are '
+                    'discarded to remain within this size.'
+                )
+            ),
         ]
     ),
     ConfigSection(
@@ -245,6 +297,22 @@ SECTIONS = [
                 default=10,
                 help='Read timeout for a note source URL (in seconds)'
             ),
+            cfg.IntOpt(
+                'notes_batch_size',
+                default=100,
+                min=1,
+                help=('The number of notes written by a workflow step that '
+                      'are buffered before being stored together. Buffered '
+                      'notes are also stored when the step ends')
+            ),
+            cfg.IntOpt(
+                'notes_batch_seconds',
+                default=10,
+                min=0,
+                help=('The longest time that a note written by a workflow '
+                      'step is buffered before being stored, checked when '
+                      'the step writes another note (in seconds)')
+            ),
             cfg.IntOpt(
                 'drydock_client_connect_timeout',
                 default=20,
@@ -257,6 +325,53 @@ SECTIONS = [
                 help=('Read timeout used for responses from Drydock using '
                       'the Drydock client (in seconds)')
             ),
+            cfg.IntOpt(
+                'drydock_task_fetch_workers',
+                default=8,
+                min=1,
+                help=('The number of Drydock subtasks retrieved at the same '
+                      'time by workflow steps, used when Drydock does not '
+                      'return a task together with its subtasks')
+            ),
+            cfg.IntOpt(
+                'http_pool_connections',
+                default=10,
+                min=1,
+                help=('The number of hosts for which the API keeps a pool '
+                      'of connections for reuse by requests to Deckhand, '
+                      'Airflow and note URLs')
+            ),
+            cfg.IntOpt(
+                'http_pool_maxsize',
+                default=10,
+                min=1,
+                help=('The maximum number of connections kept for reuse in '
+                      'the pool for each host')
+            ),
+            cfg.IntOpt(
+                'http_pool_max_retries',
+                default=3,
+                min=0,
+                help=('The number of times a pooled request is retried '
+                      'after a connection failure or a retryable status '
+                      'code. Requests using POST are only retried after a '
+                      'connection failure')
+            ),
+            cfg.FloatOpt(
+                'http_pool_retry_backoff_factor',
+                default=0.5,
+                min=0,
+                help=('The backoff factor (in seconds) between retries of '
+                      'pooled requests. Retry n waits factor * 2^(n-1) '
+                      'seconds, the first retry is immediate')
+            ),
+            cfg.ListOpt(
+                'http_pool_retry_status_codes',
+                item_type=int,
+                default=[502, 503, 504],
+                help=('The response status codes for which a pooled '
+                      'request is retried')
+            ),
         ]
     ),
     ConfigSection(
@@ -33,6 +33,17 @@ from shipyard_airflow.control.validators.validate_test_cleanup import \
 LOG = logging.getLogger(__name__)
 
 
+def _get_rendered_docs(kwargs):
+    """Returns the method used by document validations to retrieve rendered
+    documents, using the cached rendered documents of the configdocs helper's
+    Deckhand client, if a configdocs helper is provided
+    """
+    configdocs_helper = kwargs.get('configdocs_helper')
+    if configdocs_helper is None:
+        return None
+    return configdocs_helper.deckhand.get_rendered_doc_list
+
+
 def validate_committed_revision(action, **kwargs):
     """Invokes a validation that the committed revision of site design exists
     """
@@ -53,7 +64,8 @@ def validate_deployment_action_full(action, **kwargs):
     validator = ValidateDeploymentAction(
         dh_client=service_clients.deckhand_client(),
         action=action,
-        full_validation=True
+        full_validation=True,
+        get_rendered_docs=_get_rendered_docs(kwargs)
     )
     validator.validate()
 
@@ -68,7 +80,8 @@ def validate_deployment_action_basic(action, **kwargs):
     validator = ValidateDeploymentAction(
         dh_client=service_clients.deckhand_client(),
         action=action,
-        full_validation=False
+        full_validation=False,
+        get_rendered_docs=_get_rendered_docs(kwargs)
     )
     validator.validate()
 
@@ -16,14 +16,15 @@ import logging
 import os
 
 import falcon
-import requests
 from requests.exceptions import RequestException
 from dateutil.parser import parse
 from oslo_config import cfg
 import ulid
 
 from shipyard_airflow import policy
+from shipyard_airflow.common.notes.notes_helper import NoteType
 from shipyard_airflow.control.helpers.action_helper import (
+    ACTION_LIFECYCLES,
     determine_lifecycle,
     format_action_steps
 )
@@ -33,6 +34,7 @@ from shipyard_airflow.control.helpers import configdocs_helper
 from shipyard_airflow.control.helpers.configdocs_helper import (
     ConfigdocsHelper)
 from shipyard_airflow.control.helpers.notes import NOTES as notes_helper
+from shipyard_airflow.control.http_session import get_session
 from shipyard_airflow.control.json_schemas import ACTION
 from shipyard_airflow.db.db import AIRFLOW_DB, SHIPYARD_DB
 from shipyard_airflow.errors import ApiError
@@ -112,10 +114,68 @@ class ActionsResource(BaseResource):
         :returns: a json array of action entities
         """
         resp.body = self.to_json(self.get_all_actions(
-            verbosity=req.context.verbosity)
+            verbosity=req.context.verbosity,
+            **self.parse_list_filters(req))
         )
         resp.status = falcon.HTTP_200
 
+    def parse_list_filters(self, req):
+        """Parse the optional filter and paging parameters of the list request
+
+        :param req: the Falcon request object
+        :returns: a dictionary of the limit, after, since, name and lifecycle
+            values, using None for those that are not specified.
+        """
+        try:
+            limit = req.get_param_as_int('limit', required=False, min=1)
+        except falcon.HTTPBadRequest as hbr:
+            LOG.exception(hbr)
+            raise ApiError(
+                title='Invalid limit parameter',
+                description=('If specified, limit parameter should be a '
+                             'positive integer'),
+                status=falcon.HTTP_400)
+
+        after = req.get_param('after')
+        if after is not None and len(after) != 26:
+            raise ApiError(
+                title='Invalid after parameter',
+                description=('If specified, after parameter should be the '
+                             'id of an action'),
+                status=falcon.HTTP_400)
+
+        since = req.get_param('since')
+        if since is not None:
+            try:
+                since = parse(since)
+            except ValueError as valerr:
+                LOG.exception(valerr)
+                raise ApiError(
+                    title='Invalid since parameter',
+                    description=('If specified, since parameter should be an '
+                                 'iso8601 date'),
+                    status=falcon.HTTP_400)
+
+        lifecycle = req.get_param('lifecycle')
+        if lifecycle is not None:
+            lifecycles = {lc.lower(): lc for lc in ACTION_LIFECYCLES}
+            if lifecycle.lower() not in lifecycles:
+                raise ApiError(
+                    title='Invalid lifecycle parameter',
+                    description=('If specified, lifecycle parameter should '
+                                 'be one of: {}'.format(
+                                     ', '.join(ACTION_LIFECYCLES))),
+                    status=falcon.HTTP_400)
+            lifecycle = lifecycles[lifecycle.lower()]
+
+        return {
+            'limit': limit,
+            'after': after,
+            'since': since,
+            'name': req.get_param('name'),
+            'lifecycle': lifecycle
+        }
+
     @policy.ApiEnforcer(policy.CREATE_ACTION)
     def on_post(self, req, resp, **kwargs):
         """
@@ -205,92 +265,142 @@ class ActionsResource(BaseResource):
 
         return action
 
-    def get_all_actions(self, verbosity):
-        """Retrieve all actions known to Shipyard
+    def get_all_actions(self, verbosity, limit=None, after=None, since=None,
+                        name=None, lifecycle=None):
+        """Retrieve the actions known to Shipyard
 
         :param verbosity: Integer 0-5, the level of verbosity applied to the
             response's notes.
+        :param limit: optional, the maximum number of actions to return
+        :param after: optional, the id of an action; only actions created
+            after it are returned
+        :param since: optional, only actions invoked at or after this datetime
+            are returned
+        :param name: optional, only actions with this name are returned
+        :param lifecycle: optional, only actions in this lifecycle state are
+            returned
 
         Interacts with airflow and the shipyard database to return the list of
-        actions invoked through shipyard.
+        actions invoked through shipyard, ordered by action id. Only the
+        requested page of actions and their associated dag runs and steps are
+        retrieved from the databases.
         """
-        # fetch actions from the shipyard db
-        all_actions = self.get_action_map()
-        # fetch the associated dags, steps from the airflow db
-        all_dag_runs = self.get_dag_run_map()
-        all_tasks = self.get_all_tasks_db()
-
-        notes = notes_helper.get_all_action_notes(verbosity=verbosity)
         # correlate the actions and dags into a list of action entites
         actions = []
 
-        for action_id, action in all_actions.items():
-            dag_key = action['dag_id'] + action['dag_execution_date']
-            dag_key_id = action['dag_id']
-            dag_key_date = action['dag_execution_date']
-            # locate the dag run associated
-            dag_state = all_dag_runs.get(dag_key, {}).get('state', None)
-            # get the dag status from the dag run state
-            action['dag_status'] = dag_state
-            action['action_lifecycle'] = determine_lifecycle(dag_state)
-            # get the steps summary
-            action_tasks = [
-                step for step in all_tasks
-                if step['dag_id'].startswith(dag_key_id) and
-                step['execution_date'].strftime(
-                    '%Y-%m-%dT%H:%M:%S') == dag_key_date
-            ]
-            action['steps'] = format_action_steps(
-                action_id=action_id,
-                steps=action_tasks,
-                verbosity=0
+        while True:
+            # fetch a page of actions from the shipyard db
+            page = self.get_all_actions_db(
+                after=after, since=since, name=name, limit=limit)
+            # fetch the associated dag runs from the airflow db
+            all_dag_runs = self.get_dag_run_map(
+                [action['id'] for action in page])
+
+            selected = []
+            for action in page:
+                dag_key = action['dag_id'] + action['dag_execution_date']
+                # locate the dag run associated
+                dag_state = all_dag_runs.get(dag_key, {}).get('state', None)
+                # get the dag status from the dag run state
+                action['dag_status'] = dag_state
+                action['action_lifecycle'] = determine_lifecycle(dag_state)
+                if (lifecycle is None or
+                        action['action_lifecycle'] == lifecycle):
+                    selected.append(action)
+
+            # fetch the steps of the selected actions from the airflow db
+            selected_ids = [action['id'] for action in selected]
+            all_tasks = self.get_task_map(selected_ids)
+            # fetch the notes of the selected actions; step notes are not
+            # included in the summary of steps for a list of actions
+            notes = notes_helper.get_notes_for_actions(
+                action_ids=selected_ids,
+                verbosity=verbosity,
+                step_verbosity=0
             )
-            action['notes'] = []
-            for note in notes.get(action_id, []):
-                action['notes'].append(note.view())
-            actions.append(action)
-
-        return actions
-
-    def get_action_map(self):
-        """
-        maps an array of dictionaries to a dictonary of the same results by id
-        :returns: a dictionary of dictionaries keyed by action id
-        """
-        return {action['id']: action for action in self.get_all_actions_db()}
-
-    def get_all_actions_db(self):
+            for action in selected:
+                action_id = action['id']
+                # get the steps summary
+                action_tasks = all_tasks.get(
+                    (action['dag_id'], action['dag_execution_date']), [])
+                action['steps'] = format_action_steps(
+                    action_id=action_id,
+                    steps=action_tasks,
+                    notes=notes
+                )
+                action['notes'] = []
+                for note in notes.get(
+                        NoteType.ACTION.key_pattern.format(action_id), []):
+                    action['notes'].append(note.view())
+                actions.append(action)
+
+            # The lifecycle of an action is determined from the airflow db,
+            # so it can't be a predicate of the shipyard db query. Keep
+            # reading pages until the limit is met or there are no more.
+            if (lifecycle is None or limit is None or len(page) < limit or
+                    len(actions) >= limit):
+                break
+            after = page[-1]['id']
+
+        return actions[:limit]
+
+    def get_all_actions_db(self, after=None, since=None, name=None,
+                           limit=None):
         """
-        Wrapper for call to the shipyard database to get all actions
-        :returns: a list of dictionaries keyed by action id
+        Wrapper for call to the shipyard database to get a page of actions
+        :returns: a list of action dictionaries, ordered by id
         """
-        return SHIPYARD_DB.get_all_submitted_actions()
+        return SHIPYARD_DB.get_submitted_actions(
+            after=after, since=since, name=name, limit=limit)
 
-    def get_dag_run_map(self):
+    def get_dag_run_map(self, action_ids):
         """
         Maps an array of dag runs to a keyed dictionary
+        :param action_ids: the ids of the actions to retrieve dag runs for
         :returns: a dictionary of dictionaries keyed by dag_id and
                   execution_date
         """
         return {
             run['dag_id'] +
             run['execution_date'].strftime('%Y-%m-%dT%H:%M:%S'): run
-            for run in self.get_all_dag_runs_db()
+            for run in self.get_dag_runs_for_actions_db(action_ids)
         }
 
-    def get_all_dag_runs_db(self):
+    def get_dag_runs_for_actions_db(self, action_ids):
         """
-        Wrapper for call to the airflow db to get all dag runs
+        Wrapper for call to the airflow db to get the dag runs for actions
         :returns: a list of dictionaries representing dag runs in airflow
         """
-        return AIRFLOW_DB.get_all_dag_runs()
+        return AIRFLOW_DB.get_dag_runs_by_run_ids(run_ids=action_ids)
 
-    def get_all_tasks_db(self):
+    def get_task_map(self, action_ids):
+        """
+        Groups the tasks of the actions' dag runs into a keyed dictionary
+        :param action_ids: the ids of the actions to retrieve tasks for
+        :returns: a dictionary of lists of task dictionaries, keyed by a
+                  tuple of the root dag_id and execution_date. The tasks of
+                  child (sub) dags are grouped with those of their root dag,
+                  and the order of the tasks is retained within each list.
+        """
+        task_map = {}
+        # execution dates are shared by many tasks, format each only once
+        formatted_dates = {}
+        for task in self.get_tasks_for_actions_db(action_ids):
+            execution_date = task['execution_date']
+            if execution_date not in formatted_dates:
+                formatted_dates[execution_date] = execution_date.strftime(
+                    '%Y-%m-%dT%H:%M:%S')
+            key = (task['dag_id'].split('.', 1)[0],
+                   formatted_dates[execution_date])
+            task_map.setdefault(key, []).append(task)
+        return task_map
+
+    def get_tasks_for_actions_db(self, action_ids):
         """
-        Wrapper for call to the airflow db to get all tasks
+        Wrapper for call to the airflow db to get the tasks for actions
         :returns: a list of task dictionaries
         """
-        return AIRFLOW_DB.get_all_tasks()
+        return AIRFLOW_DB.get_tasks_by_run_ids(run_ids=action_ids)
 
     def insert_action(self, action):
         """
@@ -338,8 +448,9 @@ class ActionsResource(BaseResource):
             conf_value = self.to_json({'action': action})
             payload = {'run_id': action['id'], 'conf': conf_value}
             try:
-                resp = requests.post(req_url, timeout=(c_timeout, r_timeout),
-                                     headers=headers, json=payload)
+                resp = get_session().post(req_url,
+                                          timeout=(c_timeout, r_timeout),
+                                          headers=headers, json=payload)
                 LOG.info('Response code from Airflow trigger_dag: %s',
                          resp.status_code)
                 # any 4xx/5xx will be HTTPError, which are RequestException
@@ -35,12 +35,14 @@ class ActionsIdResource(BaseResource):
         """
         Return actions that have been invoked through shipyard.
         :returns: a json array of action entities
+
+        The response has an ETag, and is a 304 Not Modified without a body
+        if the action is unchanged since the request's If-None-Match ETag.
         """
-        resp.body = self.to_json(self.get_action(
+        self.set_conditional_body(req, resp, self.to_json(self.get_action(
             action_id=kwargs['action_id'],
             verbosity=req.context.verbosity
-        ))
-        resp.status = falcon.HTTP_200
+        )))
 
     def get_action(self, action_id, verbosity):
         """
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from collections import deque
 import falcon
 import logging
 import os
@@ -21,11 +22,30 @@ from oslo_config import cfg
 from shipyard_airflow import policy
 from shipyard_airflow.control.base import BaseResource
 from shipyard_airflow.control.helpers.action_helper import ActionsHelper
+from shipyard_airflow.control.http_session import get_session
 from shipyard_airflow.errors import ApiError
 
 CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
+# The size of the chunks in which logs are streamed from the workers
+LOG_CHUNK_SIZE = 64 * 1024
+
+# The bytes at the end of a log first read to find its last lines. The
+# window is quadrupled until it holds the lines, or the whole log.
+TAIL_WINDOW = 64 * 1024
+
+
+class StepLog:
+    """A log, or part of a log, of a step streamed from a worker
+
+    :param chunks: an iterable of the byte strings of the log
+    :param content_range: optional, the Content-Range of a part of a log
+    """
+    def __init__(self, chunks, content_range=None):
+        self.chunks = chunks
+        self.content_range = content_range
+
 
 class ActionsStepsLogsResource(BaseResource):
     """
@@ -45,21 +65,46 @@ class ActionsStepsLogsResource(BaseResource):
         # reserved keyword
         try_number = req.get_param_as_int('try',
                                           required=False)
+        tail = req.get_param_as_int('tail', required=False, min=0)
+        byte_range = req.range
+        if byte_range is not None and req.range_unit != 'bytes':
+            raise ApiError(
+                title='Invalid range',
+                description='Only ranges of bytes of logs are supported',
+                status=falcon.HTTP_416)
+        if byte_range is not None and tail is not None:
+            raise ApiError(
+                title='Invalid request',
+                description='A range and a tail of a log cannot be combined',
+                status=falcon.HTTP_400)
 
         # Parse kwargs
         action_id = ActionsHelper.parse_action_id(**kwargs)
         step_id = ActionsHelper.parse_step_id(**kwargs)
 
-        # Retrieve logs for the action step
-        resp.body = self.get_action_step_logs(action_id,
-                                              step_id,
-                                              try_number)
-
-        resp.status = falcon.HTTP_200
+        # Stream the logs of the action step from the worker
+        step_log = self.get_action_step_logs(action_id,
+                                             step_id,
+                                             try_number,
+                                             byte_range=byte_range,
+                                             tail=tail)
+        resp.stream = step_log.chunks
+        if step_log.content_range:
+            resp.set_header('Content-Range', step_log.content_range)
+            resp.status = falcon.HTTP_206
+        else:
+            resp.status = falcon.HTTP_200
 
-    def get_action_step_logs(self, action_id, step_id, try_number=None):
+    def get_action_step_logs(self, action_id, step_id, try_number=None,
+                             byte_range=None, tail=None):
         """
         Retrieve Airflow Logs
+
+        :param byte_range: optional, the (first, last) byte positions of the
+            part of the log to retrieve, as parsed from a Range header
+        :param tail: optional, the number of lines at the end of the log to
+            retrieve
+        :returns: a StepLog
         """
         # Set up actions helper
         self.actions_helper = ActionsHelper(action_id=action_id)
@@ -78,7 +123,7 @@ class ActionsStepsLogsResource(BaseResource):
 
         LOG.debug("Log endpoint url is: %s", log_endpoint)
 
-        return self.retrieve_logs(log_endpoint)
+        return self.retrieve_logs(log_endpoint, byte_range, tail)
 
     def generate_log_endpoint(self, step, dag_id, step_id, try_number):
         """
@@ -113,33 +158,199 @@ class ActionsStepsLogsResource(BaseResource):
         return log_endpoint
 
     @staticmethod
-    def retrieve_logs(log_endpoint):
+    def retrieve_logs(log_endpoint, byte_range=None, tail=None):
         """
         Retrieve Logs
+
+        Streams the log from the worker in chunks, rather than reading the
+        whole log into memory.
+        :param byte_range: optional, the (first, last) byte positions of the
+            part of the log to retrieve. A negative first position is the
+            length of the part at the end of the log, and a last position of
+            -1 is the end of the log
+        :param tail: optional, the number of lines at the end of the log to
+            retrieve
+        :returns: a StepLog
         """
 
         LOG.debug("Retrieving Airflow logs...")
+        if tail is not None:
+            return _retrieve_tail(log_endpoint, tail)
+        headers = {}
+        if byte_range is not None:
+            headers['Range'] = _range_header(byte_range)
+        response = _get_log(log_endpoint, headers)
+        if byte_range is None or response.status_code == 206:
+            return StepLog(_iter_chunks(response),
+                           response.headers.get('Content-Range'))
+        # The worker ignored the range, sending the whole log
+        return _slice_log(response, byte_range)
+
+
+def _get_log(log_endpoint, headers):
+    """Requests a log from a worker, streaming the response"""
+    try:
+        response = get_session().get(
+            log_endpoint,
+            headers=headers,
+            stream=True,
+            timeout=(
+                CONF.requests_config.airflow_log_connect_timeout,
+                CONF.requests_config.airflow_log_read_timeout))
+    except requests.exceptions.RequestException as e:
+        LOG.exception(e)
+        raise ApiError(
+            title='Log retrieval error',
+            description='Exception happened during Airflow API request',
+            status=falcon.HTTP_500)
+    if response.status_code >= 400:
+        LOG.info('Airflow endpoint returned error status code %s, '
+                 'content %s. Response code will be bubbled up',
+                 response.status_code, response.text)
+        response.close()
+        raise ApiError(
+            title='Log retrieval error',
+            description='Airflow endpoint returned error status code',
+            status=getattr(
+                falcon,
+                'HTTP_%d' % response.status_code,
+                falcon.HTTP_500))
+    return response
+
+
+def _iter_chunks(response):
+    """Yields the chunks of a streamed log, closing the response after"""
+    try:
+        for chunk in response.iter_content(LOG_CHUNK_SIZE):
+            yield chunk
+    except requests.exceptions.RequestException as e:
+        # The status has already been sent, the log can only be cut short
+        LOG.error('Streaming of Airflow log interrupted: %s', e)
+    finally:
+        response.close()
+
+
+def _iter_lines(chunks):
+    """Yields the lines of a log, including their line endings"""
+    pending = b''
+    for chunk in chunks:
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + b'\n'
+    if pending:
+        yield pending
+
+
+def _range_header(byte_range):
+    """Formats a (first, last) byte range as the value of a Range header"""
+    first, last = byte_range
+    if first < 0:
+        return 'bytes={}'.format(first)
+    if last < 0:
+        return 'bytes={}-'.format(first)
+    return 'bytes={}-{}'.format(first, last)
+
+
+def _content_range(first, last, length):
+    return 'bytes {}-{}/{}'.format(first, last, length)
+
+
+def _range_length(content_range):
+    """The complete length of a log, from a Content-Range, or None"""
+    try:
+        return int(content_range.rsplit('/', 1)[1])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _slice_log(response, byte_range):
+    """Streams a range of a whole log sent by a worker"""
+    first, last = byte_range
+    length = response.headers.get('Content-Length')
+    length = int(length) if length and length.isdigit() else None
+    if length is None:
+        if first < 0:
+            # Keep no more than the requested bytes at the end of the log
+            tail = deque(maxlen=-first)
+            for chunk in _iter_chunks(response):
+                tail.extend(chunk)
+            return StepLog([bytes(tail)])
+        return StepLog(_slice_chunks(_iter_chunks(response), first, last))
+    if first < 0:
+        first = max(length + first, 0)
+        last = length - 1
+    elif last < 0 or last >= length:
+        last = length - 1
+    if first > last:
+        response.close()
+        raise ApiError(
+            title='Invalid range',
+            description='The range is beyond the end of the log',
+            status=falcon.HTTP_416)
+    return StepLog(_slice_chunks(_iter_chunks(response), first, last),
+                   _content_range(first, last, length))
+
+
+def _slice_chunks(chunks, first, last):
+    """Yields the bytes first to last (-1 being the end) of the chunks"""
+    position = 0
+    for chunk in chunks:
+        start = max(first - position, 0)
+        end = len(chunk)
+        if last >= 0:
+            end = min(last + 1 - position, end)
+        if start < end:
+            yield chunk[start:end]
+        position += len(chunk)
+        if 0 <= last < position:
+            break
+
+
+def _retrieve_tail(log_endpoint, tail):
+    """Retrieves the last lines of a log
+
+    Reads increasing ranges at the end of the log until they hold the lines,
+    streaming the whole log through a bounded buffer of lines if the worker
+    does not support ranges.
+    """
+    if tail == 0:
+        return StepLog([])
+    window = TAIL_WINDOW
+    while True:
         try:
-            response = requests.get(
-                log_endpoint,
-                timeout=(
-                    CONF.requests_config.airflow_log_connect_timeout,
-                    CONF.requests_config.airflow_log_read_timeout))
-        except requests.exceptions.RequestException as e:
-            LOG.exception(e)
-            raise ApiError(
-                title='Log retrieval error',
-                description='Exception happened during Airflow API request',
-                status=falcon.HTTP_500)
-        if response.status_code >= 400:
-            LOG.info('Airflow endpoint returned error status code %s, '
-                     'content %s. Response code will be bubbled up',
-                     response.status_code, response.text)
-            raise ApiError(
-                title='Log retrieval error',
-                description='Airflow endpoint returned error status code',
-                status=getattr(
-                    falcon,
-                    'HTTP_%d' % response.status_code,
-                    falcon.HTTP_500))
-        return response.text
+            response = _get_log(log_endpoint,
+                                {'Range': 'bytes=-{}'.format(window)})
+        except ApiError as err:
+            if err.status == falcon.HTTP_416:
+                # an empty log
+                return StepLog([])
+            raise
+        if response.status_code != 206:
+            lines = deque(maxlen=tail)
+            length = 0
+            for line in _iter_lines(_iter_chunks(response)):
+                lines.append(line)
+                length += len(line)
+            return _tail_log(b''.join(lines), length)
+        try:
+            data = response.content
+        finally:
+            response.close()
+        length = _range_length(response.headers.get('Content-Range'))
+        complete = length is None or len(data) >= length
+        if complete or data.count(b'\n') > tail:
+            lines = data.splitlines(keepends=True)
+            if not complete:
+                # the first line is only the end of a line
+                lines = lines[1:]
+            return _tail_log(b''.join(lines[-tail:]), length)
+        window *= 4
+
+
+def _tail_log(data, length):
+    """A StepLog of the last bytes of a log of a length, if known"""
+    if not data or length is None:
+        return StepLog([data] if data else [])
+    return StepLog([data],
+                   _content_range(length - len(data), length - 1, length))
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
 import json
 import logging
 import uuid
@@ -87,6 +88,43 @@ class BaseResource(object):
         """Thin wrapper around json.dumps, providing the default=str config"""
         return json.dumps(body_dict, default=str)
 
+    def set_conditional_body(self, req, resp, body):
+        """Sets the body of a response, tagged with an entity tag
+
+        The entity tag is a hash of the body. If the request's If-None-Match
+        header matches the entity tag, the client already has the body: the
+        response is a 304 Not Modified, without the body.
+        :param req: the falcon request object
+        :param resp: the falcon response object
+        :param body: the string body of the response
+        """
+        etag = '"{}"'.format(
+            hashlib.sha256(body.encode('utf-8')).hexdigest())
+        resp.etag = etag
+        if etag_matches(etag, req.get_header('If-None-Match')):
+            resp.status = falcon.HTTP_304
+        else:
+            resp.body = body
+            resp.status = falcon.HTTP_200
+
+
+def etag_matches(etag, if_none_match):
+    """Whether an entity tag matches the value of an If-None-Match header
+
+    Uses the weak comparison required for If-None-Match by RFC 7232
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
 
 class ShipyardRequestContext(object):
     """
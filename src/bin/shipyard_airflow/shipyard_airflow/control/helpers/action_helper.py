@@ -17,6 +17,7 @@ import falcon
 import logging
 
 from shipyard_airflow.common.notes.notes import MIN_VERBOSITY
+from shipyard_airflow.common.notes.notes_helper import NoteType
 from shipyard_airflow.control.helpers.notes import NOTES as notes_helper
 from shipyard_airflow.db.db import AIRFLOW_DB, SHIPYARD_DB
 from shipyard_airflow.errors import ApiError
@@ -39,6 +40,9 @@ DAG_STATE_MAPPING = {
     'PAUSED': 'Paused'
 }
 
+# The distinct action_lifecycle values resulting from the dag states
+ACTION_LIFECYCLES = sorted(set(DAG_STATE_MAPPING.values()))
+
 
 def determine_lifecycle(dag_status=None):
     """ Convert a dag_status to an action_lifecycle value """
@@ -50,21 +54,33 @@ def determine_lifecycle(dag_status=None):
     return lifecycle
 
 
-def format_action_steps(action_id, steps, verbosity=MIN_VERBOSITY):
+def format_action_steps(action_id, steps, verbosity=MIN_VERBOSITY,
+                        notes=None):
     """ Converts a list of action step db records to desired format
 
     :param action_id: the action containing steps
     :param steps: the list of dictionaries of step info, in database format
     :param verbosity: the verbosity level of notes to retrieve, defaults to 1.
         if set to a value less than 1, notes will not be retrieved.
+    :param notes: optional, a dictionary of notes keyed by assoc_id, as
+        returned by NotesHelper.get_notes_for_actions. If specified, the step
+        notes are taken from this dictionary instead of being retrieved.
     """
     if not steps:
         return []
     steps_response = []
-    step_notes_dict = notes_helper.get_all_step_notes_for_action(
-        action_id=action_id,
-        verbosity=verbosity
-    )
+    if notes is None:
+        step_notes_dict = notes_helper.get_all_step_notes_for_action(
+            action_id=action_id,
+            verbosity=verbosity
+        )
+    else:
+        step_notes_dict = {
+            step.get('task_id'): notes.get(
+                NoteType.STEP.key_pattern.format(
+                    action_id, step.get('task_id')), [])
+            for step in steps
+        }
     for idx, step in enumerate(steps):
         step_task_id = step.get('task_id')
         steps_response.append(
@@ -524,7 +524,9 @@ class ConfigdocsHelper(object):
                 service_clients.deckhand_client(),
                 revision_id,
                 [(ValidateDeploymentConfigurationFull,
-                  'deployment-configuration')]
+                  'deployment-configuration')],
+                get_rendered_docs=self.deckhand.get_rendered_doc_list,
+                max_workers=CONF.base.document_validation_max_workers
             )
             return sy_val_mgr.validate()
         except Exception as ex:
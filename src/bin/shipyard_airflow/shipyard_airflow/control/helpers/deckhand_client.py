@@ -17,10 +17,13 @@ import enum
 import logging
 
 from oslo_config import cfg
-import requests
 from requests.exceptions import RequestException
-import yaml
 
+from shipyard_airflow.common import yaml_codec
+from shipyard_airflow.control.helpers.rendered_docs_cache import (
+    RENDERED_DOCS_CACHE)
+from shipyard_airflow.control.helpers.revision_cache import REVISION_CACHE
+from shipyard_airflow.control.http_session import get_session
 from shipyard_airflow.control.service_endpoints import (Endpoints,
                                                         get_endpoint,
                                                         get_token)
@@ -88,7 +91,7 @@ class DeckhandClient(object):
             DeckhandClient.get_path(DeckhandPaths.REVISION_LIST)
         )
         self._handle_bad_response(response)
-        revisions = yaml.safe_load(response.text)
+        revisions = yaml_codec.load(response.text)
         return revisions.get('results', [])
 
     def get_revision_count(self):
@@ -99,7 +102,7 @@ class DeckhandClient(object):
             DeckhandClient.get_path(DeckhandPaths.REVISION_LIST)
         )
         self._handle_bad_response(response)
-        revisions = yaml.safe_load(response.text)
+        revisions = yaml_codec.load(response.text)
         return revisions['count']
 
     def get_latest_rev_id(self):
@@ -149,7 +152,7 @@ class DeckhandClient(object):
 
         response = self._post_request(url)
         self._handle_bad_response(response)
-        return yaml.safe_load(response.text)
+        return yaml_codec.load(response.text)
 
     def rollback(self, target_revision_id):
         """
@@ -174,14 +177,21 @@ class DeckhandClient(object):
     def get_diff(self, old_revision_id, new_revision_id):
         """
         Retrieves the bucket-based difference between revisions.
+
+        The difference is shared by all clients in the process using the
+        REVISION_CACHE, as it does not change once both revisions exist.
         """
+        diff = REVISION_CACHE.get_diff(old_revision_id, new_revision_id)
+        if diff is not None:
+            return diff
         url = DeckhandClient.get_path(
             DeckhandPaths.REVISION_DIFF
         ).format(old_revision_id, new_revision_id)
 
         response = self._get_request(url)
         self._handle_bad_response(response)
-        diff = yaml.safe_load(response.text)
+        diff = yaml_codec.load(response.text)
+        REVISION_CACHE.put_diff(old_revision_id, new_revision_id, diff)
         return diff
 
     def get_docs_from_revision(self, revision_id, bucket_id=None,
@@ -218,10 +228,16 @@ class DeckhandClient(object):
 
         errors = []
 
+        if RENDERED_DOCS_CACHE.get(revision_id) is not None:
+            # The revision has been rendered successfully before
+            return errors
+
         LOG.debug("Retrieving rendered docs checking for validation messages")
         response = self._get_request(url)
-        if response.status_code >= 400:
-            err_resp = yaml.safe_load(response.text)
+        if response.status_code < 400:
+            RENDERED_DOCS_CACHE.put(revision_id, response.text)
+        else:
+            err_resp = yaml_codec.load(response.text)
             errors = err_resp.get('details', {}).get('messageList', [])
             if not errors:
                 # default message if none were specified.
@@ -236,7 +252,17 @@ class DeckhandClient(object):
                                         cleartext_secrets=False):
         """
         Returns the full set of rendered documents for a revision
+
+        The documents for the whole revision (no bucket_id) are served from,
+        and added to, the rendered documents cache.
         """
+        cleartext_secrets = cleartext_secrets is True
+        if bucket_id is None:
+            rendered_docs = RENDERED_DOCS_CACHE.get(revision_id,
+                                                    cleartext_secrets)
+            if rendered_docs is not None:
+                return rendered_docs
+
         url = DeckhandClient.get_path(
             DeckhandPaths.RENDERED_REVISION_DOCS
         ).format(revision_id)
@@ -244,12 +270,23 @@ class DeckhandClient(object):
         query = {}
         if bucket_id is not None:
             query = {'status.bucket': bucket_id}
-        if cleartext_secrets is True:
+        if cleartext_secrets:
             query['cleartext-secrets'] = 'true'
         response = self._get_request(url, params=query)
         self._handle_bad_response(response)
+        if bucket_id is None:
+            RENDERED_DOCS_CACHE.put(revision_id, response.text,
+                                    cleartext_secrets)
         return response.text
 
+    def get_rendered_doc_list(self, revision_id):
+        """
+        Returns the rendered documents for a revision as a list of
+        dictionaries, with secrets redacted
+        """
+        return [doc for doc in yaml_codec.load_all(
+            self.get_rendered_docs_from_revision(revision_id)) if doc]
+
     def get_all_revision_validations(self, revision_id):
         """
         Collects a YAML document containing a list of validation results
@@ -269,7 +306,7 @@ class DeckhandClient(object):
         response = self._get_request(url)
         self._handle_bad_response(response)
 
-        return yaml.safe_load(response.text)
+        return yaml_codec.load(response.text)
 
     @staticmethod
     def _handle_bad_response(response, threshold=400):
@@ -318,7 +355,7 @@ class DeckhandClient(object):
                 headers['content-type'] = 'application/x-yaml'
 
             DeckhandClient._log_request('PUT', url, params)
-            response = requests.put(
+            response = get_session().put(
                 url,
                 params=params,
                 headers=headers,
@@ -348,7 +385,7 @@ class DeckhandClient(object):
                 params = None
 
             DeckhandClient._log_request('GET', url, params)
-            response = requests.get(
+            response = get_session().get(
                 url,
                 params=params,
                 headers=headers,
@@ -376,7 +413,7 @@ class DeckhandClient(object):
                 headers['content-type'] = 'application/x-yaml'
 
             DeckhandClient._log_request('POST', url, params)
-            response = requests.post(
+            response = get_session().post(
                 url,
                 params=params,
                 headers=headers,
@@ -402,7 +439,7 @@ class DeckhandClient(object):
             }
 
             DeckhandClient._log_request('DELETE', url, params)
-            response = requests.delete(
+            response = get_session().delete(
                 url,
                 params=params,
                 headers=headers,
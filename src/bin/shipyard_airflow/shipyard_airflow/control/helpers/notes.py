@@ -26,6 +26,7 @@ from shipyard_airflow.common.notes.notes_helper import NotesHelper
 from shipyard_airflow.common.notes.storage_impl_db import (
     ShipyardSQLNotesStorage
 )
+from shipyard_airflow.control.http_session import get_session
 from shipyard_airflow.control.service_endpoints import get_token
 from shipyard_airflow.db.db import SHIPYARD_DB
 
@@ -40,7 +41,8 @@ def _notes_manager():
         ShipyardSQLNotesStorage(sy_engine_getter),
         get_token,
         CONF.requests_config.notes_connect_timeout,
-        CONF.requests_config.notes_read_timeout
+        CONF.requests_config.notes_read_timeout,
+        get_session=get_session
     )
 
 
@@ -0,0 +1,140 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process-wide cache of the rendered documents of Deckhand revisions
+
+A Deckhand revision does not change once created, so the documents rendered
+for a revision can be reused by the rendered configdocs API and the document
+validators instead of having Deckhand render the revision again.
+The rendered documents are kept compressed, with the least recently used
+revisions discarded once the limits on the number of entries or their total
+size are reached. Documents rendered with cleartext secrets and with
+redacted secrets are cached as separate entries.
+"""
+from collections import OrderedDict
+import logging
+import threading
+import zlib
+
+from oslo_config import cfg
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+
+class RenderedDocsCache:
+    """A thread safe LRU cache of rendered documents by revision
+
+    :param max_entries: optional, the maximum number of entries cached.
+        Defaults to the rendered_docs_cache_size configuration value. A value
+        of 0 disables caching.
+    :param max_bytes: optional, the maximum total size of the compressed
+        entries. Defaults to the rendered_docs_cache_max_mb configuration
+        value.
+    """
+    def __init__(self, max_entries=None, max_bytes=None):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_entries(self):
+        if self._max_entries is None:
+            return CONF.deckhand.rendered_docs_cache_size
+        return self._max_entries
+
+    @property
+    def max_bytes(self):
+        if self._max_bytes is None:
+            return CONF.deckhand.rendered_docs_cache_max_mb * 1024 * 1024
+        return self._max_bytes
+
+    @staticmethod
+    def _key(revision_id, cleartext_secrets):
+        return (str(revision_id), bool(cleartext_secrets))
+
+    def get(self, revision_id, cleartext_secrets=False):
+        """Returns the rendered documents for the revision, or None if they
+        are not cached
+
+        :param revision_id: the id of the Deckhand revision
+        :param cleartext_secrets: True for the variant of the documents
+            including cleartext secrets
+        """
+        key = RenderedDocsCache._key(revision_id, cleartext_secrets)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            hits, misses = self.hits, self.misses
+        LOG.debug('Rendered documents for revision %s served from cache. '
+                  'Hits: %s, misses: %s', revision_id, hits, misses)
+        return zlib.decompress(compressed).decode('utf-8')
+
+    def put(self, revision_id, rendered_docs, cleartext_secrets=False):
+        """Caches the rendered documents for the revision
+
+        :param revision_id: the id of the Deckhand revision
+        :param rendered_docs: the rendered documents as returned by Deckhand
+        :param cleartext_secrets: True if the documents include cleartext
+            secrets
+        """
+        max_entries = self.max_entries
+        max_bytes = self.max_bytes
+        if max_entries <= 0:
+            return
+        compressed = zlib.compress(rendered_docs.encode('utf-8'), 1)
+        if len(compressed) > max_bytes:
+            LOG.debug('Rendered documents for revision %s exceed the cache '
+                      'size, not caching', revision_id)
+            return
+        key = RenderedDocsCache._key(revision_id, cleartext_secrets)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = compressed
+            self._bytes += len(compressed)
+            while (len(self._entries) > max_entries or
+                   self._bytes > max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Discards all cached documents"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Returns a dictionary of the counters for the cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+
+RENDERED_DOCS_CACHE = RenderedDocsCache()
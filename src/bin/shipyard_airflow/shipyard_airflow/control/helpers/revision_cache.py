@@ -0,0 +1,113 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process-wide cache of the differences between Deckhand revisions
+
+The buffer, committed and site action revisions are determined from the list
+of revisions, which is always retrieved from Deckhand: the list changes as
+revisions are created and tagged by any API process or workflow, and a list
+cached by one process cannot be known to be current. The difference between
+two revisions, used by configdocs status and buffer checks, does not change
+once both revisions exist, so it is cached by the ids of the revisions and
+shared by API requests, with the least recently used differences discarded
+once the limit on the number of entries is reached.
+"""
+from collections import OrderedDict
+import copy
+import logging
+import threading
+
+from oslo_config import cfg
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+
+class RevisionCache:
+    """A thread safe LRU cache of revision differences by revision ids
+
+    :param max_entries: optional, the maximum number of differences cached.
+        Defaults to the revision_cache_size configuration value. A value of 0
+        disables caching.
+    """
+    def __init__(self, max_entries=None):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_entries(self):
+        if self._max_entries is None:
+            return CONF.deckhand.revision_cache_size
+        return self._max_entries
+
+    @staticmethod
+    def _key(old_revision_id, new_revision_id):
+        return (str(old_revision_id), str(new_revision_id))
+
+    def get_diff(self, old_revision_id, new_revision_id):
+        """Returns a copy of the cached difference between the revisions, or
+        None if it is not cached
+        """
+        key = RevisionCache._key(old_revision_id, new_revision_id)
+        with self._lock:
+            diff = self._entries.get(key)
+            if diff is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            hits, misses = self.hits, self.misses
+        LOG.debug('Difference between revisions %s and %s served from '
+                  'cache. Hits: %s, misses: %s', old_revision_id,
+                  new_revision_id, hits, misses)
+        return copy.deepcopy(diff)
+
+    def put_diff(self, old_revision_id, new_revision_id, diff):
+        """Caches the difference between the revisions
+
+        :param old_revision_id: the id of the old revision, 0 for none
+        :param new_revision_id: the id of the new revision
+        :param diff: the difference as returned by Deckhand
+        """
+        max_entries = self.max_entries
+        if max_entries <= 0:
+            return
+        key = RevisionCache._key(old_revision_id, new_revision_id)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = copy.deepcopy(diff)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Discards all cached differences"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Returns a dictionary of the counters for the cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries)
+            }
+
+
+REVISION_CACHE = RevisionCache()
@@ -0,0 +1,94 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Provides the pooled HTTP session shared by the Shipyard API
+
+Requests made by the API to Deckhand, Airflow and note URLs use a single
+requests.Session, such that connections are kept alive and reused across
+calls and API requests instead of being established for each call.
+The size of the connection pools and the retry policy are set using the
+requests_config section of the configuration.
+"""
+import logging
+import os
+import threading
+
+from oslo_config import cfg
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+_SESSION = None
+_SESSION_PID = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session():
+    """Constructs a session using the requests_config settings"""
+    req_conf = CONF.requests_config
+    # Connection failures are retried for any method, as the request has not
+    # been sent. Retryable status codes are only retried for idempotent
+    # methods (i.e. not POST). Read timeouts are not retried, so that the
+    # configured read timeouts remain the longest wait for a response. When
+    # retries are exhausted, the last response is returned so that callers
+    # handle it as they would without retries.
+    retry = Retry(
+        total=req_conf.http_pool_max_retries,
+        read=0,
+        backoff_factor=req_conf.http_pool_retry_backoff_factor,
+        status_forcelist=req_conf.http_pool_retry_status_codes,
+        raise_on_status=False)
+    adapter = HTTPAdapter(
+        pool_connections=req_conf.http_pool_connections,
+        pool_maxsize=req_conf.http_pool_maxsize,
+        max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    LOG.info('Created pooled HTTP session: %s host pools of %s connections, '
+             '%s retries', req_conf.http_pool_connections,
+             req_conf.http_pool_maxsize, req_conf.http_pool_max_retries)
+    return session
+
+
+def get_session():
+    """Returns the pooled HTTP session for this process
+
+    The session is created on first use. A process forked after the session
+    was created (e.g. by a pre-forking server) gets its own session rather
+    than sharing the connections of its parent.
+    """
+    global _SESSION, _SESSION_PID
+    pid = os.getpid()
+    with _SESSION_LOCK:
+        if _SESSION is None or _SESSION_PID != pid:
+            _SESSION = _build_session()
+            _SESSION_PID = pid
+        return _SESSION
+
+
+def reset_session():
+    """Closes and discards the pooled HTTP session
+
+    A new session is created by the next call to get_session, e.g. after a
+    change to the requests_config settings.
+    """
+    global _SESSION, _SESSION_PID
+    with _SESSION_LOCK:
+        if _SESSION is not None and _SESSION_PID == os.getpid():
+            _SESSION.close()
+        _SESSION = None
+        _SESSION_PID = None
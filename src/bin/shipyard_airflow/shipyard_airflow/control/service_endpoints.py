@@ -18,6 +18,8 @@ by Shipyard
 
 import enum
 import logging
+import os
+import threading
 
 import falcon
 from keystoneauth1 import exceptions as exc
@@ -83,9 +85,7 @@ def get_endpoint(endpoint):
     """
     service_type = _get_service_type(endpoint)
     try:
-        return _get_ks_session().get_endpoint(
-            interface='internal',
-            service_type=service_type)
+        return KEYSTONE_CACHE.get_endpoint(service_type, 'internal')
     except exc.EndpointNotFound:
         LOG.error('Could not find an internal interface for %s',
                   endpoint.name)
@@ -103,7 +103,7 @@ def get_token():
     """
     Returns the simple token string for a token acquired from keystone
     """
-    return _get_ks_session().get_auth_headers().get('X-Auth-Token')
+    return KEYSTONE_CACHE.get_token()
 
 
 def get_session():
@@ -112,6 +112,11 @@ def get_session():
 
 
 def _get_ks_session():
+    # Returns the keystone session shared by this process
+    return KEYSTONE_CACHE.get_session()
+
+
+def _create_ks_session():
     # Establishes a keystone session
     try:
         auth = loading.load_auth_from_conf_options(CONF, "keystone_authtoken")
@@ -127,3 +132,107 @@ def _get_ks_session():
             status=falcon.HTTP_500,
             retry=False
         )
+
+
+class KeystoneCache:
+    """Caches the Keystone session, token and endpoints for a process
+
+    The token acquired from Keystone is reused until it is within the
+    configured refresh margin of its expiry (keystone_token_refresh_margin),
+    and concurrent refreshes are collapsed into a single request to
+    Keystone. Endpoints are cached by service type and interface, and
+    discarded along with the service catalog when the token is replaced.
+
+    :param create_session: optional, a function returning a new keystone
+        session. Defaults to a session authenticated using the
+        keystone_authtoken configuration
+    """
+    def __init__(self, create_session=None):
+        self._create_session = create_session or _create_ks_session
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_pid = None
+        # The token for which the cached endpoints were looked up
+        self._catalog_token = None
+        self._endpoints = {}
+        # A token obtained by a refresh ahead of expiry. It is not refreshed
+        # again ahead of expiry if it is issued with a lifetime shorter than
+        # the refresh margin.
+        self._refreshed_token = None
+        self.token_refreshes = 0
+
+    def get_session(self):
+        """Returns the keystone session, creating it on first use
+
+        A process forked after the session was created gets its own session.
+        """
+        pid = os.getpid()
+        with self._lock:
+            if self._session is None or self._session_pid != pid:
+                self._session = self._create_session()
+                self._session_pid = pid
+                self._catalog_token = None
+                self._endpoints = {}
+                self._refreshed_token = None
+            return self._session
+
+    def _get_access(self):
+        # Returns the current access info (token and catalog), refreshing the
+        # token if it expires within the refresh margin.
+        ks_session = self.get_session()
+        auth = ks_session.auth
+        access = auth.get_access(ks_session)
+        margin = CONF.base.keystone_token_refresh_margin
+        if (access.will_expire_soon(margin) and
+                access.auth_token != self._refreshed_token):
+            with self._lock:
+                # Another thread may have refreshed the token while waiting
+                access = auth.get_access(ks_session)
+                if (access.will_expire_soon(margin) and
+                        access.auth_token != self._refreshed_token):
+                    LOG.info('Keystone token expires within %s seconds, '
+                             'acquiring a new token', margin)
+                    auth.invalidate()
+                    access = auth.get_access(ks_session)
+                    self._refreshed_token = access.auth_token
+                    self.token_refreshes += 1
+        return access
+
+    def get_token(self):
+        """Returns a current token string"""
+        return self._get_access().auth_token
+
+    def get_endpoint(self, service_type, interface):
+        """Returns the url of the endpoint for the service type and interface
+
+        The url found is kept until the token, and the catalog provided with
+        it, is replaced.
+        :raises EndpointNotFound: if the catalog has no matching endpoint
+        """
+        token = self.get_token()
+        key = (service_type, interface)
+        with self._lock:
+            if token != self._catalog_token:
+                self._endpoints = {}
+                self._catalog_token = token
+            url = self._endpoints.get(key)
+        if url is None:
+            url = self.get_session().get_endpoint(
+                interface=interface, service_type=service_type)
+            with self._lock:
+                if url is not None and token == self._catalog_token:
+                    self._endpoints[key] = url
+        return url
+
+    def clear(self):
+        """Discards the cached session, token and endpoints"""
+        with self._lock:
+            self._session = None
+            self._session_pid = None
+            self._catalog_token = None
+            self._endpoints = {}
+            self._refreshed_token = None
+
+
+# KEYSTONE_CACHE is shared by the API to obtain tokens and endpoints
+KEYSTONE_CACHE = KeystoneCache()
@@ -14,6 +14,7 @@
 import logging
 
 import falcon
+from oslo_config import cfg
 
 from .validate_deployment_configuration \
     import ValidateDeploymentConfigurationBasic
@@ -23,13 +24,15 @@ from shipyard_airflow.common.document_validators.document_validator_manager \
     import DocumentValidationManager
 from shipyard_airflow.errors import ApiError
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
 class ValidateDeploymentAction:
     """The validator used by the validate_deployment_action_<x> functions
     """
-    def __init__(self, dh_client, action, full_validation=True):
+    def __init__(self, dh_client, action, full_validation=True,
+                 get_rendered_docs=None):
         self.action = action
         self.doc_revision = self.action.get('committed_rev_id')
         self.cont_on_fail = str(self._action_param(
@@ -40,7 +43,9 @@ class ValidateDeploymentAction:
                 dh_client,
                 self.doc_revision,
                 [(ValidateDeploymentConfigurationFull,
-                  'deployment-configuration')]
+                  'deployment-configuration')],
+                get_rendered_docs=get_rendered_docs,
+                max_workers=CONF.base.document_validation_max_workers
             )
         else:
             # Perform a basic validation only
@@ -48,7 +53,9 @@ class ValidateDeploymentAction:
                 dh_client,
                 self.doc_revision,
                 [(ValidateDeploymentConfigurationBasic,
-                  'deployment-configuration')]
+                  'deployment-configuration')],
+                get_rendered_docs=get_rendered_docs,
+                max_workers=CONF.base.document_validation_max_workers
             )
 
     def validate(self):
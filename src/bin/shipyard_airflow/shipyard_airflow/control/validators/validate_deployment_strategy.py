@@ -26,29 +26,29 @@ from shipyard_airflow.common.deployment_group.errors import (
     InvalidDeploymentGroupError,
     InvalidDeploymentGroupNodeLookupError
 )
-from shipyard_airflow.common.deployment_group.node_lookup import NodeLookup
+from shipyard_airflow.common.deployment_group.node_lookup import (
+    NodeInventoryLookup
+)
 from shipyard_airflow.common.document_validators.document_validator import (
     DocumentValidator
 )
-from shipyard_airflow.control import service_clients
-from shipyard_airflow.control.helpers.design_reference_helper import (
-    DesignRefHelper
-)
 LOG = logging.getLogger(__name__)
 
 
-def _get_node_lookup(revision_id):
-    # get a Drydock node_lookup function using the supplied revision_id
+def _get_node_lookup(docutils, revision_id):
+    # get a node_lookup function resolving selectors against the nodes of
+    # the supplied revision_id, retrieved using the docutils
+
+    def get_docs(schema):
+        return docutils.get_docs_by_filter(revision_id, {'schema': schema})
 
-    return NodeLookup(
-        service_clients.drydock_client(),
-        DesignRefHelper().get_design_reference_href(revision_id)
-    ).lookup
+    return NodeInventoryLookup(get_docs).lookup
 
 
-def _get_deployment_group_manager(groups, revision_id):
+def _get_deployment_group_manager(groups, docutils, revision_id):
     """Retrieves the deployment group manager"""
-    return DeploymentGroupManager(groups, _get_node_lookup(revision_id))
+    return DeploymentGroupManager(groups,
+                                  _get_node_lookup(docutils, revision_id))
 
 
 class ValidateDeploymentStrategy(DocumentValidator):
@@ -62,7 +62,8 @@ class ValidateDeploymentStrategy(DocumentValidator):
     def do_validate(self):
         groups = self.doc_dict['groups']
         try:
-            _get_deployment_group_manager(groups, self.revision)
+            _get_deployment_group_manager(groups, self.docutils,
+                                          self.revision)
         except DeploymentGroupCycleError as dgce:
             self.val_msg_list.append(self.val_msg(
                 name=dgce.__class__.__name__,
@@ -67,6 +67,27 @@ class AirflowDbAccess(DbAccess):
         execution_date = :execution_date
     ''')
 
+    # Shipyard uses the action id as the run_id when triggering a dag, so
+    # the run_ids are the ids of the actions the dag runs are needed for.
+    # The run_ids parameter must be a tuple, which psycopg2 adapts to a
+    # parenthesized list of values.
+    SELECT_DAG_RUNS_BY_RUN_IDS = sqlalchemy.sql.text('''
+    SELECT
+        "id",
+        "dag_id",
+        "execution_date",
+        "state",
+        "run_id",
+        "external_trigger",
+        "conf",
+        "end_date",
+        "start_date"
+    FROM
+        dag_run
+    WHERE
+        run_id IN :run_ids
+    ''')
+
     # The like parameter must have '%' appropriately applied to the args
     # used to merge into this query.
     SELECT_DAG_RUNS_LIKE_ID = sqlalchemy.sql.text('''
@@ -148,6 +169,45 @@ class AirflowDbAccess(DbAccess):
         start_date
     ''')
 
+    # Tasks of the parent and child dags for the dag runs identified by
+    # run_id. Child (sub) dags share the execution date of the parent dag
+    # and have a dag_id prefixed by the parent's dag_id.
+    # The run_ids parameter must be a tuple, as for SELECT_DAG_RUNS_BY_RUN_IDS
+    SELECT_TASKS_BY_RUN_IDS = sqlalchemy.sql.text('''
+    SELECT
+        ti."task_id",
+        ti."dag_id",
+        ti."execution_date",
+        ti."start_date",
+        ti."end_date",
+        ti."duration",
+        ti."state",
+        ti."try_number",
+        ti."hostname",
+        ti."unixname",
+        ti."job_id",
+        ti."pool",
+        ti."queue",
+        ti."priority_weight",
+        ti."operator",
+        ti."queued_dttm",
+        ti."pid",
+        ti."max_tries"
+    FROM
+        task_instance ti
+    JOIN
+        dag_run dr
+    ON
+        ti.execution_date = dr.execution_date
+    AND
+        ti.dag_id LIKE dr.dag_id || '%'
+    WHERE
+        dr.run_id IN :run_ids
+    ORDER BY
+        ti.priority_weight desc,
+        ti.start_date
+    ''')
+
     UPDATE_DAG_RUN_STATUS = sqlalchemy.sql.text('''
     UPDATE
         dag_run
@@ -183,6 +243,17 @@ class AirflowDbAccess(DbAccess):
             dag_id=dag_id,
             execution_date=execution_date)
 
+    def get_dag_runs_by_run_ids(self, run_ids):
+        """
+        Retrieves the dag runs having one of the specified run ids
+        :param run_ids: a list of run ids, i.e. Shipyard action ids
+        """
+        if not run_ids:
+            return []
+        return self.get_as_dict_array(
+            AirflowDbAccess.SELECT_DAG_RUNS_BY_RUN_IDS,
+            run_ids=tuple(run_ids))
+
     def get_dag_runs_like_id(self, dag_id, execution_date):
         """
         Retrieves dag runs, for parent and child dags by the parent
@@ -208,6 +279,18 @@ class AirflowDbAccess(DbAccess):
             dag_id=dag_id + '%',
             execution_date=execution_date)
 
+    def get_tasks_by_run_ids(self, run_ids):
+        """
+        Retrieves the tasks of parent and child dags for the dag runs having
+        one of the specified run ids
+        :param run_ids: a list of run ids, i.e. Shipyard action ids
+        """
+        if not run_ids:
+            return []
+        return self.get_as_dict_array(
+            AirflowDbAccess.SELECT_TASKS_BY_RUN_IDS,
+            run_ids=tuple(run_ids))
+
     def stop_dag_run(self, dag_id, execution_date):
         """
         Triggers an update to set a dag_run to failed state
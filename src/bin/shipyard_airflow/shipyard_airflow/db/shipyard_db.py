@@ -48,6 +48,34 @@ class ShipyardDbAccess(DbAccess):
         actions
     ''')
 
+    # Each of the filters is optional: a null value for a parameter disables
+    # the associated predicate, and a null limit returns all matching rows.
+    # Ordering by the ULID id orders the actions by creation time, allowing
+    # the id of the last action of a page to be used as the "after" cursor
+    # for the next page.
+    SELECT_ACTIONS_FILTERED = sqlalchemy.sql.text('''
+    SELECT
+        "id",
+        "name",
+        "parameters",
+        "dag_id",
+        "dag_execution_date",
+        "user",
+        "datetime",
+        "context_marker"
+    FROM
+        actions
+    WHERE
+        (:after IS NULL OR "id" > :after)
+    AND
+        (:since IS NULL OR "datetime" >= :since)
+    AND
+        (:name IS NULL OR "name" = :name)
+    ORDER BY
+        "id"
+    LIMIT :limit
+    ''')
+
     SELECT_ACTION_BY_ID = sqlalchemy.sql.text('''
     SELECT
         "id",
@@ -205,6 +233,39 @@ class ShipyardDbAccess(DbAccess):
         "id" = :id
     ''')
 
+    # The indexes created by the alembic migrations to support the lookups
+    # performed by Shipyard, and the table each is defined on.
+    LOOKUP_INDEXES = {
+        'ix_preflight_validation_failures_action_id':
+            'preflight_validation_failures',
+        'ix_action_command_audit_action_id': 'action_command_audit',
+        'ix_api_locks_lock_type_released_datetime': 'api_locks',
+        'ix_notes_assoc_id': 'notes',
+    }
+
+    # The state and usage of the named indexes. The index_names parameter
+    # must be a tuple, which psycopg2 adapts to a parenthesized list of
+    # values.
+    SELECT_INDEX_HEALTH = sqlalchemy.sql.text('''
+    SELECT
+        ic.relname AS "index_name",
+        tc.relname AS "table_name",
+        i.indisvalid AS "is_valid",
+        i.indisready AS "is_ready",
+        pg_relation_size(ic.oid) AS "size_bytes",
+        s.idx_scan AS "scans"
+    FROM
+        pg_index i
+    JOIN
+        pg_class ic ON ic.oid = i.indexrelid
+    JOIN
+        pg_class tc ON tc.oid = i.indrelid
+    LEFT JOIN
+        pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+    WHERE
+        ic.relname IN :index_names
+    ''')
+
     def __init__(self):
         DbAccess.__init__(self)
 
@@ -235,12 +296,61 @@ class ShipyardDbAccess(DbAccess):
             # don't let things continue...
             raise exception
 
+    def get_index_health(self):
+        """
+        Reports the health of the indexes used by Shipyard lookups
+        :returns: a list of dictionaries, one for each of LOOKUP_INDEXES,
+            having the index_name, table_name, status (one of ok, missing,
+            invalid), size_bytes and scans of the index.
+        """
+        found = {
+            idx['index_name']: idx for idx in self.get_as_dict_array(
+                ShipyardDbAccess.SELECT_INDEX_HEALTH,
+                index_names=tuple(ShipyardDbAccess.LOOKUP_INDEXES))
+        }
+        report = []
+        for index_name, table_name in sorted(
+                ShipyardDbAccess.LOOKUP_INDEXES.items()):
+            idx = found.get(index_name)
+            if idx is None:
+                status = 'missing'
+            elif not (idx['is_valid'] and idx['is_ready']):
+                status = 'invalid'
+            else:
+                status = 'ok'
+            report.append({
+                'index_name': index_name,
+                'table_name': table_name,
+                'status': status,
+                'size_bytes': idx['size_bytes'] if idx else None,
+                'scans': idx['scans'] if idx else None
+            })
+        return report
+
     def get_all_submitted_actions(self):
         """
         Retrieves all actions.
         """
         return self.get_as_dict_array(ShipyardDbAccess.SELECT_ALL_ACTIONS)
 
+    def get_submitted_actions(self, after=None, since=None, name=None,
+                              limit=None):
+        """
+        Retrieves a page of actions, ordered by id, matching the filters
+        :param after: optional, only actions with an id greater than this
+            action id are returned
+        :param since: optional, only actions invoked at or after this
+            timestamp are returned
+        :param name: optional, only actions with this name are returned
+        :param limit: optional, the maximum number of actions to return
+        """
+        return self.get_as_dict_array(
+            ShipyardDbAccess.SELECT_ACTIONS_FILTERED,
+            after=after,
+            since=since,
+            name=name,
+            limit=limit)
+
     def get_action_by_id(self, action_id):
         """
         Get a single action
@@ -0,0 +1,110 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Waits for a condition checked by polling, with adaptive intervals
+
+The first checks are made in quick succession, catching operations that
+finish quickly, then the interval between checks doubles up to the
+configured interval for operations that take longer. Each interval varies
+randomly by a small fraction, so that waits started together do not check
+at the same times, and no interval extends past the deadline of the wait.
+A downstream service able to signal changes (server push or long polling)
+can be used through the wait_for_change hook instead of sleeping.
+"""
+from collections import namedtuple
+import logging
+import random
+import time
+
+LOG = logging.getLogger(__name__)
+
+# The shortest interval between checks, in seconds
+MIN_INTERVAL = 1
+
+# The outcome of a wait: whether the condition was met, the last value
+# returned by the check, the number of checks made, and the seconds waited
+WaitResult = namedtuple('WaitResult', ['done', 'value', 'polls', 'elapsed'])
+
+
+class AdaptiveWaiter:
+    """Waits up to a time out for a check to be satisfied
+
+    :param time_out: the seconds allowed for the wait
+    :param interval: the longest interval between checks, in seconds
+    :param initial_interval: optional, the interval after the first check.
+        Defaults to an eighth of interval, at least MIN_INTERVAL
+    :param backoff: optional, the factor by which the interval grows after
+        each check. Defaults to 2
+    :param jitter: optional, the fraction by which each interval randomly
+        varies. Defaults to 0.1
+    :param wait_for_change: optional, a function accepting a number of
+        seconds, that returns when the downstream service signals a change,
+        or once the seconds have elapsed. Defaults to sleeping
+    :param clock: optional, the function returning the current time in
+        seconds. Defaults to time.monotonic
+    """
+    def __init__(self, time_out, interval, initial_interval=None, backoff=2,
+                 jitter=0.1, wait_for_change=None, clock=None):
+        self.time_out = max(float(time_out), 0)
+        self.interval = max(float(interval), MIN_INTERVAL)
+        if initial_interval is None:
+            initial_interval = self.interval / 8
+        self.initial_interval = min(max(float(initial_interval),
+                                        MIN_INTERVAL),
+                                    self.interval)
+        self.backoff = max(float(backoff), 1)
+        self.jitter = min(max(float(jitter), 0), 1)
+        self.wait_for_change = wait_for_change or time.sleep
+        self.clock = clock or time.monotonic
+
+    def intervals(self):
+        """Generates the intervals between checks, before jitter"""
+        interval = self.initial_interval
+        while True:
+            yield interval
+            interval = min(interval * self.backoff, self.interval)
+
+    def wait(self, check, until=bool, description=None):
+        """Check until the result of the check satisfies until, or the time
+        out is reached
+
+        :param check: the function returning the current value of what is
+            waited for. The check is made at least once
+        :param until: optional, the function returning True if the value
+            returned by check ends the wait. Defaults to the truth of the
+            value
+        :param description: optional, what is waited for, for logging
+        Returns a WaitResult
+        """
+        start = self.clock()
+        deadline = start + self.time_out
+        polls = 0
+        for interval in self.intervals():
+            value = check()
+            polls += 1
+            if until(value):
+                return self._result(True, value, polls, start, description)
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                return self._result(False, value, polls, start, description)
+            pause = interval * random.uniform(1 - self.jitter,
+                                              1 + self.jitter)
+            self.wait_for_change(min(pause, remaining))
+
+    def _result(self, done, value, polls, start, description):
+        result = WaitResult(done, value, polls, self.clock() - start)
+        LOG.info("Wait for %s %s after %d checks over %.1f seconds",
+                 description or 'condition',
+                 'completed' if done else 'timed out',
+                 result.polls, result.elapsed)
+        return result
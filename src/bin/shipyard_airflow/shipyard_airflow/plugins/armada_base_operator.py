@@ -84,10 +84,15 @@ class ArmadaBaseOperator(UcpBaseOperator):
         # Logs uuid of action performed by the Operator
         LOG.info("Armada Operator for action %s", self.action_id)
 
-        # Set up armada client
-        self.armada_client = self._init_armada_client(
-            self.endpoints.endpoint_by_name(service_endpoint.ARMADA),
-            self.svc_token
+        # Set up armada client, shared by the operators of this worker
+        # process while the endpoint and token are unchanged
+        armada_svc_endpoint = self.endpoints.endpoint_by_name(
+            service_endpoint.ARMADA)
+        self.armada_client = self.registry.get(
+            'armada_client',
+            lambda: self._init_armada_client(armada_svc_endpoint,
+                                             self.svc_token),
+            version=(armada_svc_endpoint, self.svc_token)
         )
 
         # Retrieve Tiller Information
@@ -16,6 +16,10 @@ import time
 
 from kubernetes import client
 from kubernetes import config
+from kubernetes import watch
+
+# The longest time a single watch request is held open, in seconds
+MAX_WATCH_SECONDS = 300
 
 
 def check_node_status(time_out, interval, expected_nodes):
@@ -136,3 +140,136 @@ def _get_all_k8s_node_status():
         # Log some diagnostics and return None.
         logging.warning("There was an error retrieving the cluster status",
                         exc_info=True)
+
+
+def wait_for_nodes_ready(time_out, interval, expected_nodes):
+    """Wait for the expected nodes to reach Ready state in the Kubernetes
+    cluster, using the watch API
+
+    :param time_out: the seconds allowed for the nodes to be Ready
+    :param interval: the seconds to wait before trying again after an error
+        communicating with Kubernetes
+    :param expected_nodes: The list of nodes that are expected to be
+        present in the check for status
+
+    The nodes are listed once, then changes to nodes are watched from the
+    resourceVersion of the list, returning as soon as the last expected node
+    is Ready. Changes to other nodes are ignored. If the watch ends it is
+    resumed from the last resourceVersion seen, and if that resourceVersion
+    is no longer available the nodes are listed again.
+    Returns the list of expected nodes that are not ready.
+    """
+    if not expected_nodes:
+        return []
+
+    not_ready = set(expected_nodes)
+    if interval < 1:
+        interval = 1
+    if time_out < 1:
+        time_out = 1
+    deadline = time.monotonic() + time_out
+
+    # Kubernetes can only select a single node name on the server side
+    selector_args = {}
+    if len(not_ready) == 1:
+        selector_args['field_selector'] = 'metadata.name={}'.format(
+            next(iter(not_ready)))
+
+    resource_version = None
+    while not_ready:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        logging.info("Remaining expected nodes to join cluster: [%s]",
+                     ", ".join(sorted(not_ready)))
+        try:
+            v1 = _get_core_v1_api()
+            if resource_version is None:
+                node_list = v1.list_node(**selector_args)
+                _update_ready_nodes(node_list.items, not_ready)
+                resource_version = node_list.metadata.resource_version
+                continue
+            resource_version = _watch_nodes(
+                v1, resource_version, not_ready,
+                min(max(int(remaining), 1), MAX_WATCH_SECONDS),
+                selector_args)
+        except Exception:
+            logging.warning("There was an error watching the cluster status. "
+                            "Retrying in %d seconds", interval, exc_info=True)
+            resource_version = None
+            time.sleep(max(min(interval, deadline - time.monotonic()), 0))
+
+    if not_ready:
+        logging.info("Timed Out! Nodes [%s] did not reach ready state",
+                     ", ".join(sorted(not_ready)))
+    else:
+        logging.info("All expected nodes are in ready state")
+    return [node for node in expected_nodes if node in not_ready]
+
+
+def _watch_nodes(v1, resource_version, not_ready, timeout_seconds,
+                 selector_args):
+    """Watch nodes from the resource_version, removing nodes from not_ready
+    as they become Ready
+
+    Returns the last resourceVersion seen, or None if the nodes need to be
+    listed again.
+    """
+    events = watch.Watch().stream(v1.list_node,
+                                  resource_version=resource_version,
+                                  timeout_seconds=timeout_seconds,
+                                  **selector_args)
+    try:
+        for event in events:
+            if event['type'] == 'ERROR':
+                # Most likely 410 Gone: the resourceVersion is too old
+                logging.info("Watch of nodes ended with an error: %s",
+                             event['raw_object'].get('message'))
+                return None
+            node = event['object']
+            resource_version = node.metadata.resource_version
+            if event['type'] != 'DELETED':
+                _update_ready_nodes([node], not_ready)
+            if not not_ready:
+                break
+    finally:
+        events.close()
+    return resource_version
+
+
+def _update_ready_nodes(nodes, not_ready):
+    """Remove the nodes that are Ready from the not_ready set"""
+    for node in nodes:
+        try:
+            node_name = node.metadata.name
+            if node_name not in not_ready:
+                continue
+            status, message = _node_ready_condition(node)
+        except (AttributeError, IndexError, TypeError):
+            logging.warning("Malformed node status response object. "
+                            "Processing continues with the next item",
+                            exc_info=True)
+            continue
+        if status == 'True':
+            not_ready.discard(node_name)
+            logging.info("Node %s is in ready state", node_name)
+        else:
+            logging.info("Node %s is not ready. Status is: %s",
+                         node_name, message)
+
+
+def _node_ready_condition(node):
+    """Returns the status and message of the Ready condition of a node,
+    or of its last condition if there is no Ready condition
+    """
+    conditions = node.status.conditions
+    for condition in conditions:
+        if condition.type == 'Ready':
+            return condition.status, condition.message
+    return conditions[-1].status, conditions[-1].message
+
+
+def _get_core_v1_api():
+    """Returns a Kubernetes API client, using 'in_cluster_config'"""
+    config.load_incluster_config()
+    return client.CoreV1Api()
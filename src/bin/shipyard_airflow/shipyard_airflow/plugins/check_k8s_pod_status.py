@@ -12,11 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import logging
+import socket
+import threading
 import time
 
 from airflow.exceptions import AirflowException
-from kubernetes import client, config
+from kubernetes import client, config, watch
+
+# The longest time a single watch request is held open, in seconds
+MAX_WATCH_SECONDS = 300
+
+# The longest time to wait for the watches to stop once the pods are ready,
+# or the time allowed has passed, in seconds
+STOP_WATCH_SECONDS = 5
+
+# The status of a required pod prefix in the report of wait_for_pods_ready
+PODS_READY = 'Ready'
+PODS_NOT_READY = 'NotReady'
+PODS_NOT_FOUND = 'NotFound'
 
 
 def check_pods_status(required_pods):
@@ -70,3 +85,314 @@ def check_pods_status(required_pods):
     # Return True when all required pods are in 'Succeeded' or
     # 'Running' state
     return True
+
+
+def wait_for_pods_ready(required_pods, time_out, interval=30,
+                        namespaces=None, label_selector=None,
+                        field_selector=None):
+    """Wait for the pods of interest to be ready in the Kubernetes cluster,
+    using the watch API
+
+    :param required_pods: the list of prefixes of the names of the pods of
+        interest, e.g. ['ceph-', 'calico-']
+    :param time_out: the seconds allowed for the pods to be ready
+    :param interval: the seconds to wait before trying again after an error
+        communicating with Kubernetes
+    :param namespaces: optional, the list of namespaces of the pods. The pods
+        of all namespaces are checked by default
+    :param label_selector: optional, the Kubernetes label selector limiting
+        the pods checked, e.g. 'application=ceph'
+    :param field_selector: optional, the Kubernetes field selector limiting
+        the pods checked
+
+    The pods of each namespace are listed once, then changes to the pods are
+    watched from the resourceVersion of the list, returning as soon as every
+    prefix is ready. A prefix is ready when at least one pod has a name
+    starting with the prefix, and all such pods are Succeeded, or Running
+    with a Ready condition.
+    Returns a report by prefix of the status of the pods, e.g.::
+
+        {
+            'ceph-': {
+                'status': 'NotReady',
+                'ready': ['ceph/ceph-mon-1'],
+                'not_ready': {'ceph/ceph-osd-1': 'Pending'}
+            },
+            'calico-': {'status': 'NotFound', 'ready': [], 'not_ready': {}}
+        }
+    """
+    if not required_pods:
+        return {}
+
+    if interval < 1:
+        interval = 1
+    if time_out < 1:
+        time_out = 1
+    deadline = time.monotonic() + time_out
+
+    selector_args = {}
+    if label_selector:
+        selector_args['label_selector'] = label_selector
+    if field_selector:
+        selector_args['field_selector'] = field_selector
+
+    # None stands for the pods of all namespaces
+    namespaces = list(namespaces) if namespaces else [None]
+    index = _PodPrefixIndex(required_pods, namespaces)
+    watchers = [
+        threading.Thread(target=_watch_namespace_pods,
+                         args=(index, namespace, selector_args, deadline,
+                               interval),
+                         daemon=True)
+        for namespace in namespaces
+    ]
+    for watcher in watchers:
+        watcher.start()
+    index.done.wait(timeout=max(deadline - time.monotonic(), 0))
+    index.stop_watches()
+    stop_deadline = time.monotonic() + STOP_WATCH_SECONDS
+    for watcher in watchers:
+        watcher.join(timeout=max(stop_deadline - time.monotonic(), 0))
+
+    report = index.report()
+    not_ready = [prefix for prefix, status in report.items()
+                 if status['status'] != PODS_READY]
+    if not_ready:
+        logging.info("Timed Out! Pods [%s] did not reach ready state",
+                     ", ".join(not_ready))
+    else:
+        logging.info("All required pods are in ready state")
+    return report
+
+
+def _watch_namespace_pods(index, namespace, selector_args, deadline,
+                          interval):
+    """List, then watch, the pods of a namespace (or all namespaces if None)
+    until all the prefixes are ready or the deadline is reached
+    """
+    resource_version = None
+    while not index.done.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            v1 = _get_core_v1_api()
+            if namespace is None:
+                list_func = v1.list_pod_for_all_namespaces
+                list_args = dict(selector_args)
+            else:
+                list_func = v1.list_namespaced_pod
+                list_args = dict(selector_args, namespace=namespace)
+            if resource_version is None:
+                pod_list = list_func(**list_args)
+                index.replace(namespace, pod_list.items)
+                resource_version = pod_list.metadata.resource_version
+                continue
+            resource_version = _watch_pods(
+                index, list_func, list_args, resource_version,
+                min(max(int(remaining), 1), MAX_WATCH_SECONDS))
+        except Exception:
+            if index.done.is_set():
+                # the watch was stopped
+                return
+            logging.warning("There was an error watching the pods of "
+                            "namespace %s. Retrying in %d seconds",
+                            namespace or '(all)', interval, exc_info=True)
+            resource_version = None
+            index.done.wait(max(min(interval, deadline - time.monotonic()),
+                                0))
+
+
+def _watch_pods(index, list_func, list_args, resource_version,
+                timeout_seconds):
+    """Watch pods from the resource_version, updating the index
+
+    Returns the last resourceVersion seen, or None if the pods need to be
+    listed again. The watch is tracked by the index, such that it is stopped
+    as soon as the index is done.
+    """
+    pod_watch = watch.Watch()
+
+    # The watch response is only available to the function streamed, which
+    # must keep the docstring used to find the type of the events
+    @functools.wraps(list_func)
+    def watch_func(*args, **kwargs):
+        response = list_func(*args, **kwargs)
+        index.add_watch(pod_watch, response)
+        return response
+
+    events = pod_watch.stream(watch_func,
+                              resource_version=resource_version,
+                              timeout_seconds=timeout_seconds,
+                              **list_args)
+    try:
+        for event in events:
+            if event['type'] == 'ERROR':
+                # Most likely 410 Gone: the resourceVersion is too old
+                logging.info("Watch of pods ended with an error: %s",
+                             event['raw_object'].get('message'))
+                return None
+            pod = event['object']
+            resource_version = pod.metadata.resource_version
+            index.update(pod, deleted=event['type'] == 'DELETED')
+            if index.done.is_set():
+                break
+    finally:
+        events.close()
+        index.remove_watch(pod_watch)
+    return resource_version
+
+
+class _PodPrefixIndex:
+    """The state of the pods matching the required prefixes
+
+    Pods are matched to prefixes by looking up the leading characters of
+    their names for each distinct length of prefix, instead of comparing
+    every pod with every prefix. The done event is set once the pods of
+    every namespace have been listed and every prefix is ready.
+    The watches of the pods are tracked, such that they can be stopped
+    without waiting for their next event.
+    """
+    def __init__(self, prefixes, namespaces):
+        # prefix -> {(namespace, name): (phase, ready)}, in required order
+        self._pods = {prefix: {} for prefix in prefixes}
+        self._prefixes = set(self._pods)
+        self._lengths = sorted({len(prefix) for prefix in self._prefixes})
+        self._unlisted = set(namespaces)
+        self._lock = threading.Lock()
+        # watch -> the response being streamed
+        self._watches = {}
+        self.done = threading.Event()
+
+    def prefixes_for(self, name):
+        """Returns the required prefixes of the pod name"""
+        return [name[:length] for length in self._lengths
+                if name[:length] in self._prefixes]
+
+    def replace(self, namespace, pods):
+        """Replace the pods of the namespace (all namespaces if None) with
+        the listed pods
+        """
+        with self._lock:
+            for pods_by_key in self._pods.values():
+                for key in list(pods_by_key):
+                    if namespace is None or key[0] == namespace:
+                        del pods_by_key[key]
+            for pod in pods:
+                self._update(pod, deleted=False)
+            self._unlisted.discard(namespace)
+            self._check_done()
+
+    def update(self, pod, deleted=False):
+        """Update the index with a pod that changed"""
+        with self._lock:
+            self._update(pod, deleted)
+            self._check_done()
+
+    def add_watch(self, pod_watch, response):
+        """Track a watch and its response, stopping it if already done"""
+        with self._lock:
+            self._watches[pod_watch] = response
+            stop = self.done.is_set()
+        if stop:
+            self.stop_watches()
+
+    def remove_watch(self, pod_watch):
+        """Stop tracking a watch that has ended"""
+        with self._lock:
+            self._watches.pop(pod_watch, None)
+
+    def stop_watches(self):
+        """Set the done event, and stop the watches in progress"""
+        self.done.set()
+        with self._lock:
+            watches = list(self._watches.items())
+            self._watches.clear()
+        for pod_watch, response in watches:
+            pod_watch.stop()
+            _close_response(response)
+
+    def _update(self, pod, deleted):
+        try:
+            name = pod.metadata.name
+            prefixes = self.prefixes_for(name)
+            if not prefixes:
+                return
+            key = (pod.metadata.namespace, name)
+            state = None if deleted else _pod_state(pod)
+        except (AttributeError, TypeError):
+            logging.warning("Malformed pod status response object. "
+                            "Processing continues with the next item",
+                            exc_info=True)
+            return
+        for prefix in prefixes:
+            if state is None:
+                self._pods[prefix].pop(key, None)
+            else:
+                self._pods[prefix][key] = state
+
+    def _check_done(self):
+        if not self._unlisted and all(
+                self._status(pods) == PODS_READY
+                for pods in self._pods.values()):
+            self.done.set()
+
+    @staticmethod
+    def _status(pods):
+        if not pods:
+            return PODS_NOT_FOUND
+        if all(ready for _, ready in pods.values()):
+            return PODS_READY
+        return PODS_NOT_READY
+
+    def report(self):
+        """Returns the status of the pods by prefix"""
+        with self._lock:
+            report = {}
+            for prefix, pods in self._pods.items():
+                report[prefix] = {
+                    'status': self._status(pods),
+                    'ready': sorted('{}/{}'.format(*key)
+                                    for key, (_, ready) in pods.items()
+                                    if ready),
+                    'not_ready': {'{}/{}'.format(*key): phase
+                                  for key, (phase, ready) in pods.items()
+                                  if not ready}
+                }
+            return report
+
+
+def _pod_state(pod):
+    """Returns the phase of a pod, and whether it is ready
+
+    A pod is ready if it is Succeeded, or Running with a Ready condition
+    that is True. A Running pod without conditions is considered ready.
+    """
+    phase = pod.status.phase
+    if phase == 'Succeeded':
+        return phase, True
+    if phase != 'Running':
+        return phase, False
+    for condition in pod.status.conditions or []:
+        if condition.type == 'Ready':
+            return phase, condition.status == 'True'
+    return phase, True
+
+
+def _close_response(response):
+    """Close a watch response, shutting down its connection such that the
+    thread reading the response does not wait for the next event
+    """
+    sock = getattr(getattr(response, '_connection', None), 'sock', None)
+    try:
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+        response.close()
+    except Exception:
+        logging.debug("Unable to close a watch of pods", exc_info=True)
+
+
+def _get_core_v1_api():
+    """Returns a Kubernetes API client, using 'in_cluster_config'"""
+    config.load_incluster_config()
+    return client.CoreV1Api()
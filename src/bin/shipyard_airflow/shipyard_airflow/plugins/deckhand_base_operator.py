@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import configparser
 import logging
 
 from airflow.utils.decorators import apply_defaults
@@ -80,9 +79,8 @@ class DeckhandBaseOperator(UcpBaseOperator):
     @shipyard_service_token
     def run_base(self, context):
 
-        # Read and parse shiyard.conf
-        config = configparser.ConfigParser()
-        config.read(self.shipyard_conf)
+        # The parsed shipyard.conf shared by the worker process
+        config = self.config
 
         # Initialize variables
         self.deckhand_client_read_timeout = int(config.get(
@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import configparser
 import logging
 
 from keystoneauth1.identity import v3 as keystone_v3
@@ -19,6 +18,11 @@ from keystoneauth1 import session as keystone_session
 
 from deckhand.client import client as deckhand_client
 
+try:
+    from worker_registry import get_registry
+except ImportError:
+    from shipyard_airflow.plugins.worker_registry import get_registry
+
 LOG = logging.getLogger(__name__)
 
 
@@ -33,11 +37,15 @@ class DeckhandClientFactory(object):
         Creates a client factory to retrieve clients
         :param shipyard_conf: Location of shipyard.conf
         """
-        self.config = configparser.ConfigParser()
-        self.config.read(shipyard_conf)
+        self.registry = get_registry(shipyard_conf)
+        self.config = self.registry.config
 
     def get_client(self):
-        """Retrieve a deckhand client"""
+        """Retrieve a deckhand client, shared by the worker process"""
+        return self.registry.get('deckhand_client', self._new_client)
+
+    def _new_client(self):
+        """Create a deckhand client"""
 
         """
         Notes:
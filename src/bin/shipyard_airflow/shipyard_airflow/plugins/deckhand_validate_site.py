@@ -14,11 +14,12 @@
 import logging
 import os
 import requests
-import yaml
 
 from airflow.plugins_manager import AirflowPlugin
 from airflow.exceptions import AirflowException
 
+from shipyard_airflow.common import yaml_codec
+
 try:
     from deckhand_base_operator import DeckhandBaseOperator
 except ImportError:
@@ -51,7 +52,7 @@ class DeckhandValidateSiteDesignOperator(DeckhandBaseOperator):
         LOG.info("Retrieving validation list...")
 
         try:
-            retrieved_list = yaml.safe_load(
+            retrieved_list = yaml_codec.load(
                 requests.get(validation_endpoint,
                              headers=x_auth_token,
                              timeout=self.validation_read_timeout).text)
@@ -51,6 +51,7 @@ class DeploymentConfigurationOperator(BaseOperator):
         "physical_provisioner.destroy_interval": 30,
         "physical_provisioner.destroy_timeout": 900,
         "physical_provisioner.join_wait": 120,
+        "physical_provisioner.max_concurrent_groups": 1,
         "physical_provisioner.prepare_node_interval": 30,
         "physical_provisioner.prepare_node_timeout": 1800,
         "physical_provisioner.prepare_site_interval": 10,
@@ -11,11 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import configparser
+from concurrent.futures import ThreadPoolExecutor
 import copy
+import functools
 import pprint
 import logging
-import time
 from urllib.parse import urlparse
 
 from airflow.plugins_manager import AirflowPlugin
@@ -33,8 +33,9 @@ try:
         DrydockTaskTimeoutException
     )
     import service_endpoint
-    from service_token import shipyard_service_token
+    from service_session import ucp_keystone_session
     from ucp_base_operator import UcpBaseOperator
+    from worker_registry import get_registry
 
 except ImportError:
     from shipyard_airflow.plugins.drydock_errors import (
@@ -44,11 +45,15 @@ except ImportError:
         DrydockTaskTimeoutException
     )
     from shipyard_airflow.plugins import service_endpoint
-    from shipyard_airflow.plugins.service_token import shipyard_service_token
+    from shipyard_airflow.plugins.service_session import ucp_keystone_session
     from shipyard_airflow.plugins.ucp_base_operator import UcpBaseOperator
+    from shipyard_airflow.plugins.worker_registry import get_registry
 
 LOG = logging.getLogger(__name__)
 
+# The statuses of a Drydock task that will not change
+FINISHED_TASK_STATUSES = ['complete', 'terminated']
+
 
 class DrydockBaseOperator(UcpBaseOperator):
     """Drydock Base Operator
@@ -97,6 +102,9 @@ class DrydockBaseOperator(UcpBaseOperator):
         self.svc_session = svc_session
         self.svc_token = svc_token
         self.target_nodes = None
+        self.task_fetch_workers = 8
+        self._task_cache = {}
+        self._task_layers_supported = True
 
     def run_base(self, context):
         """Base setup/processing for Drydock operators
@@ -107,12 +115,15 @@ class DrydockBaseOperator(UcpBaseOperator):
         # if continue processing is false, don't bother setting up things.
         if self._continue_processing_flag():
             # Retrieve config values from shipyard configuration.
-            config = configparser.ConfigParser()
-            config.read(self.shipyard_conf)
+            config = self.config
             self.drydock_client_connect_timeout = int(config.get(
                 'requests_config', 'drydock_client_connect_timeout'))
             self.drydock_client_read_timeout = int(config.get(
                 'requests_config', 'drydock_client_read_timeout'))
+            self.task_fetch_workers = config.getint(
+                'requests_config', 'drydock_task_fetch_workers', fallback=8)
+            # Drydock task results are cached for this run only
+            self._task_cache = {}
 
             # Setup the drydock client
             self._setup_drydock_client()
@@ -142,17 +153,30 @@ class DrydockBaseOperator(UcpBaseOperator):
 
         LOG.info("Drydock endpoint is %s", self.drydock_svc_endpoint)
 
+        # The Drydock client is shared by the operators of this worker
+        # process, and recreated if its endpoint or timeouts change
+        self.drydock_client = get_registry(self.shipyard_conf).get(
+            'drydock_client', self._create_drydock_client,
+            version=(self.drydock_svc_endpoint,
+                     self.drydock_client_connect_timeout,
+                     self.drydock_client_read_timeout))
+        LOG.info("Drydock Session and Client etablished.")
+
+    def _create_drydock_client(self):
+        """Create a Drydock client for the Drydock endpoint"""
         # Parse DryDock Service Endpoint
         drydock_url = urlparse(self.drydock_svc_endpoint)
 
         # Build a DrydockSession with credentials and target host
         # information.
         # The DrydockSession will care for TCP connection pooling
-        # and header management
+        # and header management. The token is retrieved from the Keystone
+        # session shared by the worker process for each request, rather
+        # than from this operator.
         dd_session = session.DrydockSession(
             drydock_url.hostname,
             port=drydock_url.port,
-            auth_gen=self._auth_gen,
+            auth_gen=functools.partial(_auth_headers, self.shipyard_conf),
             timeout=(self.drydock_client_connect_timeout,
                      self.drydock_client_read_timeout))
 
@@ -164,74 +188,78 @@ class DrydockBaseOperator(UcpBaseOperator):
 
         # Use the DrydockSession to build a DrydockClient that can
         # be used to make one or more API calls
-        self.drydock_client = client.DrydockClient(dd_session)
+        drydock_client = client.DrydockClient(dd_session)
         # Raise Exception if we are not able to build the client
-        if not self.drydock_client:
+        if not drydock_client:
             raise DrydockClientUseFailureException(
                 "Failed to set up Drydock Client!"
             )
-        LOG.info("Drydock Session and Client etablished.")
-
-    @shipyard_service_token
-    def _auth_gen(self):
-        # Generator method for the Drydock Session to use to get the
-        # auth headers necessary
-        return [('X-Auth-Token', self.svc_token)]
+        return drydock_client
 
-    def create_task(self, task_action):
+    def create_task(self, task_action, node_filter=None):
+        """Create a Drydock task
 
+        :param task_action: the action of the task
+        :param node_filter: optional, the node filter for the task. Defaults
+            to self.node_filter
+        Returns the id of the created task, also set as self.drydock_task_id
+        """
         # Initialize Variables
         create_task_response = {}
 
         # Node Filter
-        LOG.info("Nodes Filter List: %s", self.node_filter)
+        if node_filter is None:
+            node_filter = self.node_filter
+        LOG.info("Nodes Filter List: %s", node_filter)
 
         try:
             # Create Task
             create_task_response = self.drydock_client.create_task(
                 design_ref=self.design_ref,
                 task_action=task_action,
-                node_filter=self.node_filter)
+                node_filter=node_filter)
 
         except errors.ClientError as client_error:
             raise DrydockClientUseFailureException(client_error)
 
         # Retrieve Task ID
-        self.drydock_task_id = create_task_response['task_id']
-        LOG.info('Drydock %s task ID is %s',
-                 task_action, self.drydock_task_id)
+        task_id = create_task_response['task_id']
+        self.drydock_task_id = task_id
+        LOG.info('Drydock %s task ID is %s', task_action, task_id)
 
         # Raise Exception if we are not able to get the task_id from
         # Drydock
-        if self.drydock_task_id:
-            return self.drydock_task_id
+        if task_id:
+            return task_id
         else:
             raise DrydockTaskNotCreatedException("Unable to create task!")
 
-    def query_task(self, interval, time_out):
-
-        # Calculate number of times to execute the 'for' loop
-        # Convert 'time_out' and 'interval' from string into integer
-        # The result from the division will be a floating number which
-        # We will round off to nearest whole number
-        end_range = round(int(time_out) / int(interval))
+    def query_task(self, interval, time_out, task_id=None):
+        """Wait for a Drydock task to complete
 
-        LOG.info('Task ID is %s', self.drydock_task_id)
-        task_result = None
+        :param interval: the longest interval between queries of the task,
+            in seconds. Early queries are made more frequently
+        :param time_out: the seconds to wait for the task to complete
+        :param task_id: optional, the id of the task. Defaults to
+            self.drydock_task_id
+        """
+        if task_id is None:
+            task_id = self.drydock_task_id
 
-        # Query task status
-        for i in range(0, end_range + 1):
-            task_status = None
+        LOG.info('Task ID is %s', task_id)
 
+        def check_task():
+            """Returns the status and result status of the task"""
             try:
                 # Retrieve current task state
-                task_state = self.get_task_dict(task_id=self.drydock_task_id)
+                task_state = self.get_task_dict(task_id=task_id)
 
                 task_status = task_state['status']
                 task_result = task_state['result']['status']
 
                 LOG.info("Current status of task id %s is %s",
-                         self.drydock_task_id, task_status)
+                         task_id, task_status)
+                return task_status, task_result
             except DrydockClientUseFailureException:
                 raise
             except:
@@ -239,26 +267,29 @@ class DrydockBaseOperator(UcpBaseOperator):
                 # issues that prevents us from retrieving the task state. We
                 # will want to retry in such situations.
                 LOG.warning("Unable to retrieve task state. Retrying...")
+                return None, None
 
-            # Raise Time Out Exception
-            if task_status == 'running' and i == end_range:
-                # TODO(bryan-strassner) If Shipyard has timed out waiting for
-                #     this task to complete, and Drydock has provided a means
-                #     to cancel a task, that cancellation should be done here.
-                raise DrydockTaskTimeoutException("Task Execution Timed Out!")
-
-            # Exit 'for' loop if the task is in 'complete' or 'terminated'
-            # state
-            if task_status in ['complete', 'terminated']:
-                LOG.info('Task result is %s', task_result)
-                break
-            else:
-                time.sleep(int(interval))
+        wait = self.wait_for(
+            check_task, time_out, interval,
+            description='Drydock task {}'.format(task_id),
+            until=lambda state: state[0] in FINISHED_TASK_STATUSES,
+            subject=task_id)
+        task_status, task_result = wait.value
+
+        # Raise Time Out Exception
+        if task_status == 'running' and not wait.done:
+            # TODO(bryan-strassner) If Shipyard has timed out waiting for
+            #     this task to complete, and Drydock has provided a means
+            #     to cancel a task, that cancellation should be done here.
+            raise DrydockTaskTimeoutException("Task Execution Timed Out!")
+
+        if wait.done:
+            LOG.info('Task result is %s', task_result)
 
         # Get final task result
         if task_result == 'success':
             LOG.info('Task id %s has been successfully completed',
-                     self.drydock_task_id)
+                     task_id)
         else:
             raise DrydockTaskFailedException(
                 "Failed to Execute/Complete Task!")
@@ -277,22 +308,121 @@ class DrydockBaseOperator(UcpBaseOperator):
         except errors.ClientError as client_error:
             raise DrydockClientUseFailureException(client_error)
 
-    def fetch_failure_details(self):
-        LOG.info('Retrieving all tasks records from Drydock...')
+    def get_task_tree(self, task_id):
+        """Retrieve a task and all of its subtasks
 
+        :param task_id: The id of the task to retrieve
+        Returns a dictionary of the raw task dictionaries by task id, for the
+        task and all the tasks below it. The tasks are retrieved from Drydock
+        in one request if Drydock supports it, or else each layer of subtasks
+        is retrieved using up to self.task_fetch_workers requests at a time.
+        Subtasks that cannot be retrieved are left out. Finished tasks are
+        cached for the remainder of the operator's run.
+        Raises DrydockClientUseFailureException if the task cannot be
+        retrieved.
+        """
+        tree = self._get_cached_task_tree(task_id)
+        if tree is not None:
+            return tree
+
+        tree = None
+        if self._task_layers_supported:
+            tree = self._get_task_layers(task_id)
+        if tree is None:
+            tree = self._get_task_tree_by_layer(task_id)
+
+        for t_id, task in tree.items():
+            if task.get('status') in FINISHED_TASK_STATUSES:
+                self._task_cache[t_id] = task
+        return tree
+
+    def _get_cached_task_tree(self, task_id):
+        """Return the task tree from the cache, or None if any task of the
+        tree is not cached
+        """
+        tree = {}
+        layer = [task_id]
+        while layer:
+            for t_id in layer:
+                if t_id not in self._task_cache:
+                    return None
+                tree[t_id] = self._task_cache[t_id]
+            layer = [sub_id for t_id in layer
+                     for sub_id in tree[t_id].get('subtask_id_list') or []
+                     if sub_id not in tree]
+        return tree
+
+    def _get_task_layers(self, task_id):
+        """Retrieve a task with all its layers of subtasks in one request
+
+        Returns None if the tree could not be retrieved this way
+        """
+        try:
+            response = self.drydock_client.get_task(task_id=task_id,
+                                                    layers=-1)
+        except errors.ClientError:
+            LOG.warning("Unable to retrieve task %s with its subtasks. The "
+                        "subtasks will be retrieved individually", task_id,
+                        exc_info=True)
+            return None
+        except Exception:
+            LOG.warning("Drydock client does not support the retrieval of a "
+                        "task with its subtasks. Subtasks will be retrieved "
+                        "individually", exc_info=True)
+            self._task_layers_supported = False
+            return None
+
+        # The response has the tasks by task id, and the init_task_id
+        if not isinstance(response, dict) or task_id not in response:
+            LOG.warning("Drydock did not return task %s with its subtasks. "
+                        "Subtasks will be retrieved individually", task_id)
+            self._task_layers_supported = False
+            return None
+        return {t_id: task for t_id, task in response.items()
+                if isinstance(task, dict)}
+
+    def _get_task_tree_by_layer(self, task_id):
+        """Retrieve a task, then each layer of its subtasks concurrently"""
+        tree = {task_id: self._task_cache.get(task_id) or
+                self.get_task_dict(task_id)}
+        layer = list(tree[task_id].get('subtask_id_list') or [])
+        with ThreadPoolExecutor(max_workers=self.task_fetch_workers) as pool:
+            while layer:
+                tasks = pool.map(self._get_subtask_dict, layer)
+                for t_id, task in zip(layer, tasks):
+                    if task is not None:
+                        tree[t_id] = task
+                layer = [sub_id for t_id in layer if t_id in tree
+                         for sub_id in tree[t_id].get('subtask_id_list') or []
+                         if sub_id not in tree]
+        return tree
+
+    def _get_subtask_dict(self, task_id):
+        """Retrieve a subtask, or None if it cannot be retrieved"""
+        if task_id in self._task_cache:
+            return self._task_cache[task_id]
         try:
-            # Get all tasks records
-            all_tasks = self.drydock_client.get_tasks()
+            return self.get_task_dict(task_id)
+        except Exception:
+            LOG.warn("Failed to retrieve subtask %s. Exception follows:",
+                     task_id, exc_info=True)
+            return None
 
-            # Create a dictionary of tasks records with 'task_id' as key
-            self.all_task_ids = {t['task_id']: t for t in all_tasks}
+    def fetch_failure_details(self):
+        if self.drydock_task_id is None:
+            LOG.info("No Drydock task has been created")
+            return
 
-        except errors.ClientError as client_error:
-            raise DrydockClientUseFailureException(client_error)
+        LOG.info('Retrieving task %s and its subtasks from Drydock...',
+                 self.drydock_task_id)
+
+        # Create a dictionary of tasks records with 'task_id' as key
+        self.all_task_ids = self.get_task_tree(self.drydock_task_id)
 
         # Retrieve the failed parent task and assign it to list
         failed_parent_task = (
-            [x for x in all_tasks if x['task_id'] == self.drydock_task_id])
+            [x for x in self.all_task_ids.values()
+             if x.get('task_id') == self.drydock_task_id])
 
         # Print detailed information of failed parent task in json output
         # Since there is only 1 failed parent task, we will print index 0
@@ -396,9 +526,27 @@ class DrydockBaseOperator(UcpBaseOperator):
         Only a reported success at the parent task indicates success of the
         task. Drydock is assumed to roll up overall success to the top level.
         """
+        try:
+            tree = self.get_task_tree(task_id)
+        except Exception:
+            # since we are reporting task results, if we can't get the
+            # results, do not block the processing.
+            LOG.warn("Failed to retrieve a result for task %s. Exception "
+                     "follows:", task_id, exc_info=True)
+            return set()
+        return self._get_successes_from_tree(tree, task_id, extend_success)
+
+    def _get_successes_from_tree(self, tree, task_id, extend_success):
+        """Discover the successful nodes of a task from its task tree
+
+        :param tree: the task dictionaries by task id, from get_task_tree
+        :param task_id: The id of the task
+        :param extend_successes: determines if this result extends successes
+            or simply reports on the task.
+        """
         success_nodes = []
         try:
-            task_dict = self.get_task_dict(task_id)
+            task_dict = tree[task_id]
             task_status = task_dict.get('status', "Not Specified")
             task_result = task_dict.get('result')
             if task_result is None:
@@ -440,8 +588,8 @@ class DrydockBaseOperator(UcpBaseOperator):
             # success list.
             for ch_task_id in task_dict.get('subtask_id_list', []):
                 success_nodes.extend(
-                    self.get_successes_for_task(ch_task_id,
-                                                extend_success=False)
+                    self._get_successes_from_tree(tree, ch_task_id,
+                                                  extend_success=False)
                 )
         except Exception:
             # since we are reporting task results, if we can't get the
@@ -531,6 +679,14 @@ class DrydockBaseOperator(UcpBaseOperator):
                 LOG.exception(ex)
 
 
+def _auth_headers(shipyard_conf):
+    """Returns the auth headers for a Drydock request, using the Keystone
+    session shared by the worker process, which renews its token when needed
+    """
+    return [('X-Auth-Token',
+             ucp_keystone_session(shipyard_conf).get_token())]
+
+
 def _get_context_info_from_url(url_string):
     """Examine a url for helpful info for use in a note
 
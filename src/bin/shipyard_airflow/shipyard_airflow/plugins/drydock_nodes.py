@@ -19,11 +19,14 @@ progress through preparation and deployment of nodes in a group-based fashion.
 In the case of no specified deployment strategy, an "all-at-once" approach is
 taken, by which all nodes are deployed together.
 
+Groups that do not depend on each other may be prepared and deployed at the
+same time, up to the max_concurrent_groups of the deployment-configuration.
+
 Historical Note: This operator replaces the function of drydock_prepare_nodes
 and drydock_deploy_nodes operators that existed previously.
 """
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import logging
-import time
 
 from airflow.exceptions import AirflowException
 from airflow.plugins_manager import AirflowPlugin
@@ -31,7 +34,8 @@ from airflow.plugins_manager import AirflowPlugin
 from shipyard_airflow.common.deployment_group.deployment_group import Stage
 from shipyard_airflow.common.deployment_group.deployment_group_manager import \
     DeploymentGroupManager
-from shipyard_airflow.common.deployment_group.node_lookup import NodeLookup
+from shipyard_airflow.common.deployment_group.node_lookup import \
+    NodeInventoryLookup
 
 try:
     import check_k8s_node_status
@@ -68,12 +72,13 @@ class DrydockNodesOperator(DrydockBaseOperator):
         self.strategy = self.get_deployment_strategy()
         dgm = _get_deployment_group_manager(
             self.strategy['groups'],
-            _get_node_lookup(self.drydock_client, self.design_ref)
+            _get_node_lookup(self.doc_utils, self.revision_id)
         )
 
         _process_deployment_groups(dgm,
                                    self._execute_prepare,
-                                   self._execute_deployment)
+                                   self._execute_deployment,
+                                   self.max_concurrent_groups)
 
         # All groups "complete" (as they're going to be). Report summary
         dgm.report_group_summary()
@@ -148,8 +153,10 @@ class DrydockNodesOperator(DrydockBaseOperator):
         self.prep_timeout = self.dc[
             'physical_provisioner.prepare_node_timeout'
         ]
-        # The time to wait before querying k8s nodes after Drydock deploy nodes
-        self.join_wait = self.dc['physical_provisioner.join_wait']
+        # The number of groups that may be prepared and deployed at once
+        self.max_concurrent_groups = self.dc[
+            'physical_provisioner.max_concurrent_groups'
+        ]
 
     def _execute_prepare(self, group):
         """Executes the prepare nodes step for the group.
@@ -159,10 +166,11 @@ class DrydockNodesOperator(DrydockBaseOperator):
         """
         LOG.info("Group %s is preparing nodes", group.name)
 
-        self.node_filter = gen_node_name_filter(group.actionable_nodes)
+        node_filter = gen_node_name_filter(group.actionable_nodes)
         return self._execute_task('prepare_nodes',
                                   self.prep_interval,
-                                  self.prep_timeout)
+                                  self.prep_timeout,
+                                  node_filter)
 
     def _execute_deployment(self, group, successful_prepared_nodes):
         """Execute the deployment of nodes for the group.
@@ -174,10 +182,11 @@ class DrydockNodesOperator(DrydockBaseOperator):
         """
         LOG.info("Group %s is deploying nodes", group.name)
         s_nodes = list(successful_prepared_nodes)
-        self.node_filter = gen_node_name_filter(s_nodes)
+        node_filter = gen_node_name_filter(s_nodes)
         task_result = self._execute_task('deploy_nodes',
                                          self.dep_interval,
-                                         self.dep_timeout)
+                                         self.dep_timeout,
+                                         node_filter)
 
         if not task_result.successes:
             # if there are no successes from Drydock, there is no need to
@@ -187,21 +196,15 @@ class DrydockNodesOperator(DrydockBaseOperator):
                      "proceeding to validation")
             return task_result
 
-        # It takes time for the cluster join process to be triggered across
-        # all the nodes in the cluster. Hence there is a need to back off
-        # and wait before checking the state of the cluster join process.
-        LOG.info("Nodes <%s> reported as deployed in MAAS",
-                 ", ".join(task_result.successes))
-        LOG.info("Waiting for %d seconds before checking node state...",
-                 self.join_wait)
-        time.sleep(self.join_wait)
-
         # Check that cluster join process is completed before declaring
-        # deploy_node as 'completed'.
+        # deploy_node as 'completed'. The nodes are watched until they are
+        # Ready, so there is no need to wait before starting to check.
         # This should only include nodes that drydock has indicated as
         # successful and has passed the join script to.
         # Anything not ready in the timeout needs to be considered a failure
-        not_ready_list = check_k8s_node_status.check_node_status(
+        LOG.info("Nodes <%s> reported as deployed in MAAS",
+                 ", ".join(task_result.successes))
+        not_ready_list = check_k8s_node_status.wait_for_nodes_ready(
             self.node_st_timeout,
             self.node_st_interval,
             expected_nodes=task_result.successes
@@ -222,12 +225,13 @@ class DrydockNodesOperator(DrydockBaseOperator):
                          ", ".join(task_result.successes))
         return task_result
 
-    def _execute_task(self, task_name, interval, timeout):
+    def _execute_task(self, task_name, interval, timeout, node_filter=None):
         """Execute the Drydock task requested
 
         :param task_name: 'prepare_nodes', 'deploy_nodes'
         :param interval: The time between checking status on the task
         :param timeout: The total time allowed for the task
+        :param node_filter: The Drydock node filter for the task
 
         Wraps the query_task method in the base class, capturing
         AirflowExceptions and summarizing results into a response
@@ -241,12 +245,15 @@ class DrydockNodesOperator(DrydockBaseOperator):
         the successes list in the response object. In the case of a failure to
         get the task results, this workflow must assume that the result is a
         total loss, and pass back no successes
+
+        The task id and node filter are not taken from the operator, as
+        tasks for several groups may be executed at the same time.
         """
-        self.create_task(task_name)
-        result = QueryTaskResult(self.drydock_task_id, task_name)
+        task_id = self.create_task(task_name, node_filter=node_filter)
+        result = QueryTaskResult(task_id, task_name)
 
         try:
-            self.query_task(interval, timeout)
+            self.query_task(interval, timeout, task_id=task_id)
         except DrydockTaskFailedException:
             # Task failure may be successful enough based on success criteria.
             # This should not halt the overall flow of this workflow step.
@@ -265,7 +272,7 @@ class DrydockNodesOperator(DrydockBaseOperator):
         # Other AirflowExceptions will fail the whole task - let them do this.
 
         # find successes
-        result.successes = self.get_successes_for_task(self.drydock_task_id)
+        result.successes = self.get_successes_for_task(task_id)
         return result
 
     def get_deployment_strategy(self):
@@ -336,26 +343,33 @@ def gen_simple_deployment_strategy(name=None, nodes=None):
     }
 
 
-def _get_node_lookup(drydock_client, design_ref):
-    """Return a NodeLookup suitable for the DeploymentGroupManager
+def _get_node_lookup(doc_utils, revision_id):
+    """Return a node lookup suitable for the DeploymentGroupManager
 
-    :param drydock_client: the drydock_client object
-    :param design_ref: the design_ref for the NodeLookup
+    :param doc_utils: the DocumentValidationUtils used to retrieve the nodes
+        of the site design
+    :param revision_id: the Deckhand revision of the site design
+    The nodes of the site design are retrieved once, and the selectors of
+    all groups are resolved against them.
     """
-    return NodeLookup(drydock_client, design_ref).lookup
+    def get_docs(schema):
+        return doc_utils.get_docs_by_filter(revision_id, {'schema': schema})
+
+    return NodeInventoryLookup(get_docs).lookup
 
 
 def _get_deployment_group_manager(groups_dict_list, node_lookup):
     """Return a DeploymentGroupManager suitable for managing this deployment
 
     :param groups_dict_list: the list of group dictionaries to use
-    :param node_lookup: a NodeLookup object that will be used by this
+    :param node_lookup: a node lookup function that will be used by this
         DeploymentGroupManager
     """
     return DeploymentGroupManager(groups_dict_list, node_lookup)
 
 
-def _process_deployment_groups(dgm, prepare_func, deploy_func):
+def _process_deployment_groups(dgm, prepare_func, deploy_func,
+                               max_concurrent_groups=1):
     """Executes the deployment group deployments
 
     :param dgm: the DeploymentGroupManager object that manages the
@@ -364,7 +378,14 @@ def _process_deployment_groups(dgm, prepare_func, deploy_func):
         a QueryTaskResult with the purpose of preparing nodes
     :param deploy_func: a function that accepts a DeploymentGroup and returns
         a QueryTaskResult with the purpose of deploying nodes
+    :param max_concurrent_groups: the maximum number of groups processed at
+        the same time. Defaults to 1, processing one group at a time.
     """
+    if max_concurrent_groups > 1:
+        _process_deployment_groups_concurrently(
+            dgm, prepare_func, deploy_func, max_concurrent_groups)
+        return
+
     complete = False
     while not complete:
         # Find the next group to be prepared.  Prepare and deploy it.
@@ -375,65 +396,117 @@ def _process_deployment_groups(dgm, prepare_func, deploy_func):
             complete = True
             continue
 
-        LOG.info("*** Deployment Group: %s is being processed ***", group.name)
-        if not group.actionable_nodes:
-            LOG.info("There were no actionable nodes for group %s. It is "
-                     "possible that all nodes: [%s] have previously been "
-                     "deployed. Group will be immediately checked "
-                     "against its success criteria", group.name,
-                     ", ".join(group.full_nodes))
-
-            # In the case of a group having no actionable nodes, since groups
-            # prepare -> deploy in direct sequence, we can check against
-            # deployment, since all nodes would need to be deployed or have
-            # been attempted. Need to follow the state-transition, so
-            # PREPARED -> DEPLOYED
-            dgm.evaluate_group_succ_criteria(group.name, Stage.PREPARED)
-            dgm.evaluate_group_succ_criteria(group.name, Stage.DEPLOYED)
-            # success or failure, move on to next group
-            continue
+        _process_group(dgm, group, prepare_func, deploy_func)
 
-        LOG.info("%s has actionable nodes: [%s]", group.name,
-                 ", ".join(group.actionable_nodes))
-        if len(group.actionable_nodes) < len(group.full_nodes):
-            LOG.info("Some nodes are not actionable because they were "
-                     "included in a prior group, but will be considered in "
-                     "the success critera calculation for this group")
-
-        # Group has actionable nodes.
-        # Prepare Nodes for group, store QueryTaskResults
-        prep_qtr = prepare_func(group)
-        # Mark successes as prepared
-        for node_name in prep_qtr.successes:
-            dgm.mark_node_prepared(node_name)
-
-        dgm.fail_unsuccessful_nodes(group, prep_qtr.successes)
-        should_deploy = dgm.evaluate_group_succ_criteria(group.name,
-                                                         Stage.PREPARED)
-        if not should_deploy:
-            # group has failed, move on to next group. Current group has
-            # been marked as failed.
-            continue
 
-        if prep_qtr.successes:
-            # Continue with deployment, only for successfully prepared nodes
-            dep_qtr = deploy_func(group, prep_qtr.successes)
-            # Mark successes as deployed
-            for node_name in dep_qtr.successes:
-                dgm.mark_node_deployed(node_name)
-            dgm.fail_unsuccessful_nodes(group, dep_qtr.successes)
-        else:
-            # TODO(bryan-strassner) Update this message if Drydock provides
-            #     a way to cancel a task, and that method is employed by
-            #     Shipyard upon timeout.
-            LOG.info("There were no nodes successfully prepared. "
-                     "Deployment will not be attempted for group %s. "
-                     "Success criteria will be immediately checked. "
-                     "If a timeout in the prepare step has occured, it is "
-                     "possible that Drydock is still attempting the prepare "
-                     "task.",
-                     group.name)
+def _process_deployment_groups_concurrently(dgm, prepare_func, deploy_func,
+                                            max_concurrent_groups):
+    """Executes the deployment group deployments, processing each group as
+    soon as the groups it depends upon are deployed
+
+    :param dgm: the DeploymentGroupManager object that manages the
+        dependency chain of groups
+    :param prepare_func: a function that accepts a DeploymentGroup and returns
+        a QueryTaskResult with the purpose of preparing nodes
+    :param deploy_func: a function that accepts a DeploymentGroup and returns
+        a QueryTaskResult with the purpose of deploying nodes
+    :param max_concurrent_groups: the maximum number of groups processed at
+        the same time
+
+    An exception raised while processing a group is raised once the other
+    groups being processed are complete.
+    """
+    LOG.info("Processing up to %d deployment groups at a time",
+             max_concurrent_groups)
+    in_progress = {}
+    with ThreadPoolExecutor(max_workers=max_concurrent_groups) as executor:
+        while True:
+            for group in dgm.get_ready_groups(exclude=in_progress.values()):
+                if len(in_progress) >= max_concurrent_groups:
+                    break
+                future = executor.submit(_process_group, dgm, group,
+                                         prepare_func, deploy_func)
+                in_progress[future] = group.name
+            if not in_progress:
+                LOG.info("There are no more groups eligible to process")
+                break
+            done, _ = wait(in_progress, return_when=FIRST_COMPLETED)
+            for future in done:
+                LOG.info("Deployment Group: %s processing has ended",
+                         in_progress.pop(future))
+                # raises an exception from processing the group
+                future.result()
+
+
+def _process_group(dgm, group, prepare_func, deploy_func):
+    """Prepares and deploys the nodes of a group
+
+    :param dgm: the DeploymentGroupManager object that manages the
+        dependency chain of groups
+    :param group: the DeploymentGroup to process
+    :param prepare_func: a function that accepts a DeploymentGroup and returns
+        a QueryTaskResult with the purpose of preparing nodes
+    :param deploy_func: a function that accepts a DeploymentGroup and returns
+        a QueryTaskResult with the purpose of deploying nodes
+    """
+    LOG.info("*** Deployment Group: %s is being processed ***", group.name)
+    if not group.actionable_nodes:
+        LOG.info("There were no actionable nodes for group %s. It is "
+                 "possible that all nodes: [%s] have previously been "
+                 "deployed. Group will be immediately checked "
+                 "against its success criteria", group.name,
+                 ", ".join(group.full_nodes))
+
+        # In the case of a group having no actionable nodes, since groups
+        # prepare -> deploy in direct sequence, we can check against
+        # deployment, since all nodes would need to be deployed or have
+        # been attempted. Need to follow the state-transition, so
+        # PREPARED -> DEPLOYED
+        dgm.evaluate_group_succ_criteria(group.name, Stage.PREPARED)
         dgm.evaluate_group_succ_criteria(group.name, Stage.DEPLOYED)
+        # success or failure, the group is complete
+        return
+
+    LOG.info("%s has actionable nodes: [%s]", group.name,
+             ", ".join(group.actionable_nodes))
+    if len(group.actionable_nodes) < len(group.full_nodes):
+        LOG.info("Some nodes are not actionable because they were "
+                 "included in a prior group, but will be considered in "
+                 "the success critera calculation for this group")
+
+    # Group has actionable nodes.
+    # Prepare Nodes for group, store QueryTaskResults
+    prep_qtr = prepare_func(group)
+    # Mark successes as prepared
+    for node_name in prep_qtr.successes:
+        dgm.mark_node_prepared(node_name)
+
+    dgm.fail_unsuccessful_nodes(group, prep_qtr.successes)
+    should_deploy = dgm.evaluate_group_succ_criteria(group.name,
+                                                     Stage.PREPARED)
+    if not should_deploy:
+        # group has failed. Current group has been marked as failed.
+        return
+
+    if prep_qtr.successes:
+        # Continue with deployment, only for successfully prepared nodes
+        dep_qtr = deploy_func(group, prep_qtr.successes)
+        # Mark successes as deployed
+        for node_name in dep_qtr.successes:
+            dgm.mark_node_deployed(node_name)
+        dgm.fail_unsuccessful_nodes(group, dep_qtr.successes)
+    else:
+        # TODO(bryan-strassner) Update this message if Drydock provides
+        #     a way to cancel a task, and that method is employed by
+        #     Shipyard upon timeout.
+        LOG.info("There were no nodes successfully prepared. "
+                 "Deployment will not be attempted for group %s. "
+                 "Success criteria will be immediately checked. "
+                 "If a timeout in the prepare step has occured, it is "
+                 "possible that Drydock is still attempting the prepare "
+                 "task.",
+                 group.name)
+    dgm.evaluate_group_succ_criteria(group.name, Stage.DEPLOYED)
 
 
 class QueryTaskResult:
@@ -27,6 +27,12 @@ except ImportError:
 
 LOG = logging.getLogger(__name__)
 
+# The longest interval between checks of a Promenade operation, in seconds
+POLL_INTERVAL = 5
+
+# The seconds allowed for a Promenade operation without a configured time out
+DEFAULT_TIMEOUT = 600
+
 
 class PromenadeBaseOperator(UcpBaseOperator):
 
@@ -71,6 +77,23 @@ class PromenadeBaseOperator(UcpBaseOperator):
 
         LOG.info("Promenade endpoint is %s", self.promenade_svc_endpoint)
 
+    def wait_for_operation(self, description, time_out=DEFAULT_TIMEOUT):
+        """Wait for a Promenade operation to complete
+
+        :param description: the operation waited for, used in the note
+            recording the wait
+        :param time_out: optional, the seconds allowed for the operation
+        Returns True if the operation completed before the time out
+        """
+        return self.wait_for(self.check_operation, time_out, POLL_INTERVAL,
+                             description).done
+
+    def check_operation(self):
+        """Returns True if the Promenade operation is complete"""
+        # Placeholder function. Updates will be made when the Promenade
+        # API is ready for consumption.
+        return True
+
 
 class PromenadeBaseOperatorPlugin(AirflowPlugin):
 
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
-import time
 
 from airflow.plugins_manager import AirflowPlugin
 from airflow.exceptions import AirflowException
@@ -40,12 +39,11 @@ class PromenadeCheckEtcdOperator(PromenadeBaseOperator):
         # API is ready for consumption.
 
         # TODO(bryan-strassner) use:
-        #     self.dc['kubernetes_provisioner.etcd_ready_timeout']
         #     self.dc['kubernetes_provisioner.remove_etcd_timeout']
         LOG.info("Performing health check on etcd...")
-        time.sleep(5)
-
-        check_etcd = True
+        check_etcd = self.wait_for_operation(
+            'etcd health check',
+            self.dc['kubernetes_provisioner.etcd_ready_timeout'])
 
         if check_etcd:
             LOG.info("The etcd cluster is healthy and ready")
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
-import time
 
 from airflow.plugins_manager import AirflowPlugin
 from airflow.exceptions import AirflowException
@@ -39,13 +38,10 @@ class PromenadeClearLabelsOperator(PromenadeBaseOperator):
         # Placeholder function. Updates will be made when the Promenade
         # API is ready for consumption.
 
-        # TODO(bryan-strassner) use:
-        #     self.dc['kubernetes_provisioner.clear_labels_timeout']
-
         LOG.info("Removing labels on node...")
-        time.sleep(5)
-
-        labels_removed = True
+        labels_removed = self.wait_for_operation(
+            'removal of labels on {}'.format(self.redeploy_server),
+            self.dc['kubernetes_provisioner.clear_labels_timeout'])
 
         if labels_removed:
             LOG.info("Successfully removed labels on %s",
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
-import time
 
 from airflow.plugins_manager import AirflowPlugin
 from airflow.exceptions import AirflowException
@@ -39,9 +38,8 @@ class PromenadeDecommissionNodeOperator(PromenadeBaseOperator):
         # Placeholder function. Updates will be made when the Promenade
         # API is ready for consumption.
         LOG.info("Decommissioning node from Kubernetes cluster...")
-        time.sleep(5)
-
-        decommission_node = True
+        decommission_node = self.wait_for_operation(
+            'decommission of {}'.format(self.redeploy_server))
 
         if decommission_node:
             LOG.info("Succesfully decommissioned node %s",
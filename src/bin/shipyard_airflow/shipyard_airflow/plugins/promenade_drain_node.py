@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
-import time
 
 from airflow.plugins_manager import AirflowPlugin
 from airflow.exceptions import AirflowException
@@ -42,13 +41,12 @@ class PromenadeDrainNodeOperator(PromenadeBaseOperator):
         # API is ready for consumption.
 
         # TODO(bryan-strassner) use:
-        #     self.dc['kubernetes_provisioner.drain_timeout']
         #     self.dc['kubernetes_provisioner.drain_grace_period']
 
         LOG.info("Draining node...")
-        time.sleep(5)
-
-        node_drained = True
+        node_drained = self.wait_for_operation(
+            'drain of {}'.format(self.redeploy_server),
+            self.dc['kubernetes_provisioner.drain_timeout'])
 
         if node_drained:
             LOG.info("Node %s has been successfully drained",
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
-import time
 
 from airflow.plugins_manager import AirflowPlugin
 from airflow.exceptions import AirflowException
@@ -39,9 +38,8 @@ class PromenadeShutdownKubeletOperator(PromenadeBaseOperator):
         # Placeholder function. Updates will be made when the Promenade
         # API is ready for consumption.
         LOG.info("Shutting down kubelet on node...")
-        time.sleep(5)
-
-        shutdown_kubelet = True
+        shutdown_kubelet = self.wait_for_operation(
+            'kubelet shutdown on {}'.format(self.redeploy_server))
 
         if shutdown_kubelet:
             LOG.info("Successfully shut down kubelet on %s",
@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import configparser
 import logging
 import time
 
@@ -19,8 +18,10 @@ from airflow.exceptions import AirflowException
 
 try:
     from service_session import ucp_keystone_session
+    from worker_registry import get_registry
 except ImportError:
     from shipyard_airflow.plugins.service_session import ucp_keystone_session
+    from shipyard_airflow.plugins.worker_registry import get_registry
 
 # Lookup values for configuration to find the real service type for components
 SHIPYARD = 'shipyard'
@@ -33,6 +34,15 @@ LOG = logging.getLogger(__name__)
 
 
 def _ucp_service_endpoint(shipyard_conf, svc_type):
+    """Returns the internal endpoint of the service type, looked up once by
+    the worker process
+    """
+    return get_registry(shipyard_conf).get(
+        ('endpoint', svc_type),
+        lambda: _lookup_service_endpoint(shipyard_conf, svc_type))
+
+
+def _lookup_service_endpoint(shipyard_conf, svc_type):
 
     # Initialize variables
     retry = 0
@@ -74,9 +84,8 @@ class ServiceEndpoints():
     def __init__(self, shipyard_conf):
         self.shipyard_conf = shipyard_conf
 
-        # Read and parse shiyard.conf
-        self.config = configparser.ConfigParser()
-        self.config.read(self.shipyard_conf)
+        # The parsed shipyard.conf shared by the worker process
+        self.config = get_registry(self.shipyard_conf).config
 
     def endpoint_by_name(self, svc_name):
         """Return the service endpoint for the named service.
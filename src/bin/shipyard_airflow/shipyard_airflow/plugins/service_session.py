@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import configparser
 import logging
 import time
 
@@ -21,13 +20,29 @@ from airflow.exceptions import AirflowException
 from keystoneauth1.identity import v3 as keystone_v3
 from keystoneauth1 import session as keystone_session
 
+try:
+    from worker_registry import get_registry
+except ImportError:
+    from shipyard_airflow.plugins.worker_registry import get_registry
+
 
 def ucp_keystone_session(shipyard_conf):
+    """Returns the Keystone session shared by the operators of the worker
+    process using the configuration file
+
+    :param shipyard_conf: Location of shipyard.conf
+    The session reuses its token until the token is about to expire.
+    """
+    registry = get_registry(shipyard_conf)
+    return registry.get('keystone_session',
+                        lambda: _new_keystone_session(registry.config))
+
 
-    # Read and parse shiyard.conf
-    config = configparser.ConfigParser()
-    config.read(shipyard_conf)
+def _new_keystone_session(config):
+    """Creates a Keystone session for the keystone_authtoken configuration
 
+    :param config: the parsed shipyard.conf
+    """
     # Initialize variables
     retry = 0
     sess = None
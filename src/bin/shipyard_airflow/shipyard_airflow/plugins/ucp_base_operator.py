@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import configparser
 import logging
 import math
 import os
@@ -24,19 +23,23 @@ from airflow.utils.decorators import apply_defaults
 import sqlalchemy
 
 try:
+    from adaptive_waiter import AdaptiveWaiter
     from deckhand_client_factory import DeckhandClientFactory
     import service_endpoint
     from get_k8s_logs import get_pod_logs
     from get_k8s_logs import K8sLoggingException
     from service_token import shipyard_service_token
+    from worker_registry import get_registry
     from xcom_puller import XcomPuller
 except ImportError:
+    from shipyard_airflow.plugins.adaptive_waiter import AdaptiveWaiter
     from shipyard_airflow.plugins.deckhand_client_factory import \
         DeckhandClientFactory
     from shipyard_airflow.plugins import service_endpoint
     from shipyard_airflow.plugins.get_k8s_logs import get_pod_logs
     from shipyard_airflow.plugins.get_k8s_logs import K8sLoggingException
     from shipyard_airflow.plugins.service_token import shipyard_service_token
+    from shipyard_airflow.plugins.worker_registry import get_registry
     from shipyard_airflow.plugins.xcom_puller import XcomPuller
 
 from shipyard_airflow.common.document_validators.document_validation_utils \
@@ -105,33 +108,40 @@ class UcpBaseOperator(BaseOperator):
         self._shipyard_db_engine = None
 
     def execute(self, context):
-        # Setup values that depend on the shipyard configuration
-        self.doc_utils = _get_document_util(self.shipyard_conf)
+        # Setup values that depend on the shipyard configuration, shared by
+        # the operators run by this worker process
+        self.registry = get_registry(self.shipyard_conf)
+        self.doc_utils = self.registry.get(
+            'document_utils', lambda: _get_document_util(self.shipyard_conf))
         self.endpoints = service_endpoint.ServiceEndpoints(self.shipyard_conf)
-
-        # Read and parse shiyard.conf
-        self.config = configparser.ConfigParser()
-        self.config.read(self.shipyard_conf)
+        self.config = self.registry.config
 
         # Execute Airship base function
         self.ucp_base(context)
 
-        # Execute base function for child operator
-        self.run_base(context)
-
-        if self.continue_processing:
-            # Execute child function
-            try:
-                self.do_execute()
-            except Exception:
-                LOG.exception(
-                    'Exception happened during %s execution, '
-                    'will try to log additional details',
-                    self.__class__.__name__)
-                self.get_k8s_logs()
-                if hasattr(self, 'fetch_failure_details'):
-                    self.fetch_failure_details()
-                raise
+        # Notes made by the step are stored together, and when the step ends
+        # even if it fails
+        with self.notes_helper.batch(
+                max_notes=self.config.getint(
+                    REQUESTS_CONFIG, 'notes_batch_size', fallback=100),
+                max_seconds=self.config.getint(
+                    REQUESTS_CONFIG, 'notes_batch_seconds', fallback=10)):
+            # Execute base function for child operator
+            self.run_base(context)
+
+            if self.continue_processing:
+                # Execute child function
+                try:
+                    self.do_execute()
+                except Exception:
+                    LOG.exception(
+                        'Exception happened during %s execution, '
+                        'will try to log additional details',
+                        self.__class__.__name__)
+                    self.get_k8s_logs()
+                    if hasattr(self, 'fetch_failure_details'):
+                        self.fetch_failure_details()
+                    raise
 
     def ucp_base(self, context):
 
@@ -284,33 +294,71 @@ class UcpBaseOperator(BaseOperator):
         that Airflow registers database connections for use by the dbApiHook
         """
         if self._shipyard_db_engine is None:
-            connection_string = self.config.get(BASE, 'postgresql_db')
-            pool_size = self.config.getint(BASE, 'pool_size')
-            max_overflow = self.config.getint(BASE, 'pool_overflow')
-            pool_pre_ping = self.config.getboolean(BASE, 'pool_pre_ping')
-            pool_recycle = self.config.getint(BASE, 'connection_recycle')
-            pool_timeout = self.config.getint(BASE, 'pool_timeout')
-            self._shipyard_db_engine = sqlalchemy.create_engine(
-                connection_string, pool_size=pool_size,
-                max_overflow=max_overflow,
-                pool_pre_ping=pool_pre_ping,
-                pool_recycle=pool_recycle,
-                pool_timeout=pool_timeout
-            )
-            LOG.info("Initialized Shipyard database connection with pool "
-                     "size: %d, max overflow: %d, pool pre ping: %s, pool "
-                     "recycle: %d, and pool timeout: %d",
-                     pool_size, max_overflow,
-                     pool_pre_ping, pool_recycle,
-                     pool_timeout)
+            self._shipyard_db_engine = get_registry(self.shipyard_conf).get(
+                'shipyard_db_engine', self._create_shipyard_db_engine)
 
         return self._shipyard_db_engine
 
+    def _create_shipyard_db_engine(self):
+        """Create an engine for the Shipyard database, shared by the
+        operators run by this worker process
+        """
+        connection_string = self.config.get(BASE, 'postgresql_db')
+        pool_size = self.config.getint(BASE, 'pool_size')
+        max_overflow = self.config.getint(BASE, 'pool_overflow')
+        pool_pre_ping = self.config.getboolean(BASE, 'pool_pre_ping')
+        pool_recycle = self.config.getint(BASE, 'connection_recycle')
+        pool_timeout = self.config.getint(BASE, 'pool_timeout')
+        engine = sqlalchemy.create_engine(
+            connection_string, pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+            pool_timeout=pool_timeout
+        )
+        LOG.info("Initialized Shipyard database connection with pool "
+                 "size: %d, max overflow: %d, pool pre ping: %s, pool "
+                 "recycle: %d, and pool timeout: %d",
+                 pool_size, max_overflow,
+                 pool_pre_ping, pool_recycle,
+                 pool_timeout)
+        return engine
+
     @shipyard_service_token
     def _token_getter(self):
         # Generator method to get a shipyard service token
         return self.svc_token
 
+    def wait_for(self, check, time_out, interval, description, until=bool,
+                 subject=None):
+        """Wait for a check to be satisfied, recording the wait as a note
+        of the step
+
+        :param check: the function returning the current value of what is
+            waited for
+        :param time_out: the seconds allowed for the wait
+        :param interval: the longest interval between checks, in seconds
+        :param description: what is waited for, used in the note
+        :param until: optional, the function returning True if the value
+            returned by check ends the wait. Defaults to the truth of the
+            value
+        :param subject: optional, the subject of the note. Defaults to the
+            step
+        Returns the WaitResult of the wait
+        """
+        result = AdaptiveWaiter(time_out, interval).wait(
+            check, until=until, description=description)
+        self.notes_helper.make_step_note(
+            action_id=self.action_id,
+            step_id=self.task_id,
+            note_val="Waited {:.1f} seconds for {} with {} checks: {}".format(
+                result.elapsed, description, result.polls,
+                'completed' if result.done else 'timed out'),
+            subject=subject,
+            sub_type="Wait",
+            verbosity=3)
+        return result
+
     def _setup_notes_helper(self):
         """Setup a notes helper for use by all descendent operators"""
         connect_timeout = self.config.get(REQUESTS_CONFIG,
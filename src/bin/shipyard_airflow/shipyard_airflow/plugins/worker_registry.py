@@ -0,0 +1,130 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Configuration and service clients shared within an Airflow worker process
+
+Operators look up the parsed shipyard.conf, the Keystone session, service
+endpoints, service clients and database engines in the registry for their
+configuration file, creating each on first use instead of for every task.
+A registry is discarded, disposing of the database engines it holds, when
+its configuration file is modified.
+"""
+import configparser
+import logging
+import os
+import threading
+
+LOG = logging.getLogger(__name__)
+
+_REGISTRIES = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_registry(shipyard_conf):
+    """Returns the registry for the configuration file
+
+    :param shipyard_conf: Location of shipyard.conf
+    A new registry replaces the existing one if the file has been modified
+    since the existing registry was created, or if the existing registry was
+    created by the parent of a forked process.
+    """
+    stamp = _file_stamp(shipyard_conf)
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(shipyard_conf)
+        if registry is not None and registry.pid != os.getpid():
+            # Inherited from the parent of a forked process: the connections
+            # of the parent's clients must be neither used nor closed
+            registry = None
+        if registry is not None and registry.stamp == stamp:
+            return registry
+        if registry is not None:
+            LOG.info("Configuration %s has changed, discarding the shared "
+                     "clients", shipyard_conf)
+            registry.dispose()
+        registry = WorkerRegistry(shipyard_conf, stamp)
+        _REGISTRIES[shipyard_conf] = registry
+        return registry
+
+
+def clear():
+    """Discards all registries"""
+    with _REGISTRIES_LOCK:
+        registries = list(_REGISTRIES.values())
+        _REGISTRIES.clear()
+    for registry in registries:
+        if registry.pid == os.getpid():
+            registry.dispose()
+
+
+def _file_stamp(path):
+    """Returns the modification time and size of a file, or None"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WorkerRegistry:
+    """The objects shared by the operators using a configuration file
+
+    :param shipyard_conf: Location of shipyard.conf
+    :param stamp: the modification time and size of the file when read
+    """
+    def __init__(self, shipyard_conf, stamp=None):
+        self.shipyard_conf = shipyard_conf
+        self.stamp = stamp
+        self.pid = os.getpid()
+        self.config = configparser.ConfigParser()
+        self.config.read(shipyard_conf)
+        self._items = {}
+        self._lock = threading.RLock()
+
+    def get(self, key, factory, version=None):
+        """Returns the shared object for the key, created by factory if it
+        does not exist yet
+
+        :param key: the name of the object
+        :param factory: a function without arguments returning a new object
+        :param version: optional, the value that the object depends on, e.g.
+            the endpoint of a client. The object is created again if the
+            version differs from the version of the existing object
+        Objects are not shared if the factory raises an exception.
+        """
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            item = factory()
+            self._items[key] = (version, item)
+        if entry is not None:
+            _dispose(entry[1])
+        return item
+
+    def dispose(self):
+        """Discards the shared objects, disposing of those that can be"""
+        with self._lock:
+            items = [item for _, item in self._items.values()]
+            self._items.clear()
+        for item in items:
+            _dispose(item)
+
+
+def _dispose(item):
+    """Dispose of an object holding resources, e.g. a database engine"""
+    dispose = getattr(item, 'dispose', None)
+    if callable(dispose):
+        try:
+            dispose()
+        except Exception:
+            LOG.warning("Unable to dispose of %s", item, exc_info=True)
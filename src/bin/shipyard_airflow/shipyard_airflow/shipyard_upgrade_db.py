@@ -11,10 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import logging
 
 from shipyard_airflow.conf import config
 from shipyard_airflow.db import db
 
+LOG = logging.getLogger(__name__)
+
 
 def shipyard_upgrade_db(default_config_files=None):
     """
@@ -24,6 +27,29 @@ def shipyard_upgrade_db(default_config_files=None):
     config.parse_args(args=[], default_config_files=default_config_files)
 
     db.SHIPYARD_DB.update_db()
+    report_index_health()
+
+
+def report_index_health():
+    """
+    Logs the health of the indexes used by Shipyard lookups following an
+    upgrade. Problems with the indexes are logged as warnings, but do not
+    fail the upgrade.
+    """
+    try:
+        report = db.SHIPYARD_DB.get_index_health()
+    except Exception as ex:
+        LOG.warning('Unable to report index health: %s', ex)
+        return
+    for idx in report:
+        if idx['status'] == 'ok':
+            LOG.info('Index %s on %s is ok: %s bytes, %s scans',
+                     idx['index_name'], idx['table_name'],
+                     idx['size_bytes'], idx['scans'])
+        else:
+            LOG.warning('Index %s on %s is %s, lookups on %s may scan the '
+                        'table', idx['index_name'], idx['table_name'],
+                        idx['status'], idx['table_name'])
 
 
 upgrade_db = shipyard_upgrade_db
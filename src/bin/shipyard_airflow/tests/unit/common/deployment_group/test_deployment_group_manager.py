@@ -167,6 +167,47 @@ class TestDeploymentGroupManager:
             assert g in str(ce)
         assert 'group-b' not in str(ce)
 
+    def test_get_ready_groups(self):
+        dgm = DeploymentGroupManager(yaml.safe_load(GROUPS_YAML), node_lookup)
+
+        def ready(exclude=None):
+            return {g.name for g in dgm.get_ready_groups(exclude=exclude)}
+
+        assert ready() == {'ntp-node', 'monitoring-nodes'}
+        assert ready(exclude=['ntp-node']) == {'monitoring-nodes'}
+        # a group being processed is not ready again
+        dgm.mark_group_prepared('ntp-node')
+        assert ready() == {'monitoring-nodes'}
+        dgm.mark_group_deployed('ntp-node')
+        assert ready() == {'control-nodes', 'monitoring-nodes'}
+        dgm.mark_group_prepared('control-nodes')
+        dgm.mark_group_deployed('control-nodes')
+        assert ready() == {'compute-nodes-1', 'compute-nodes-2',
+                           'monitoring-nodes'}
+        dgm.mark_group_failed('compute-nodes-1')
+        assert ready() == {'compute-nodes-2', 'monitoring-nodes'}
+
+    def test_get_ready_groups_shared_nodes(self):
+        groups = yaml.safe_load("""
+- name: group-a
+  critical: true
+  depends_on: []
+  selectors:
+    - node_names: [node1, node2]
+- name: group-b
+  critical: true
+  depends_on: []
+  selectors:
+    - node_names: [node2, node3]
+""")
+        dgm = DeploymentGroupManager(groups, node_lookup)
+        ready = dgm.get_ready_groups()
+        assert len(ready) == 1
+        dgm.mark_group_prepared(ready[0].name)
+        dgm.mark_group_deployed(ready[0].name)
+        assert [g.name for g in dgm.get_ready_groups()] == [
+            g.name for g in dgm.group_list() if g.name != ready[0].name]
+
     def test_no_next_group(self):
         dgm = DeploymentGroupManager(yaml.safe_load(GROUPS_YAML), node_lookup)
         assert dgm.get_next_group(Stage.DEPLOYED) is None
@@ -255,6 +296,34 @@ class TestDeploymentGroupManager:
                 assert grp.stage == Stage.FAILED
         assert group is None
 
+    def test_get_next_group_stages(self):
+        dgm = DeploymentGroupManager(yaml.safe_load(GROUPS_YAML), node_lookup)
+        order = [group.name for group in dgm.group_list()]
+        assert dgm.get_next_group(Stage.DEPLOYED) is None
+        dgm.mark_group_prepared(order[1])
+        assert dgm.get_next_group(Stage.PREPARED).name == order[0]
+        assert dgm.get_next_group(Stage.DEPLOYED).name == order[1]
+        assert dgm.get_next_group(Stage.FAILED).name == order[0]
+        dgm.mark_group_prepared(order[0])
+        assert dgm.get_next_group(Stage.PREPARED).name == order[2]
+        assert dgm.get_next_group(Stage.DEPLOYED).name == order[0]
+        dgm.mark_group_deployed(order[0])
+        dgm.mark_group_deployed(order[1])
+        assert dgm.get_next_group(Stage.DEPLOYED) is None
+        assert dgm.get_next_group(Stage.FAILED).name == order[2]
+
+    def test_get_nodes_by_stage(self):
+        dgm = DeploymentGroupManager(yaml.safe_load(GROUPS_YAML), node_lookup)
+        all_nodes = dgm.get_nodes()
+        for node in reversed(all_nodes[:4]):
+            dgm.mark_node_prepared(node)
+        dgm.mark_node_deployed(all_nodes[1])
+        # nodes are listed in the same order as all nodes
+        assert dgm.get_nodes(Stage.PREPARED) == [
+            all_nodes[0], all_nodes[2], all_nodes[3]]
+        assert dgm.get_nodes(Stage.DEPLOYED) == [all_nodes[1]]
+        assert dgm.get_nodes(Stage.NOT_STARTED) == all_nodes[4:]
+
     def test_deduplication(self):
         """all-compute-nodes is a duplicate of things it's dependent on, it
         should have no actionable nodes"""
@@ -0,0 +1,161 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the group transitions of the DeploymentGroupManager
+
+A deployment of a synthetic strategy is replayed, group by group, using the
+indexed DeploymentGroupManager and a manager that scans all groups and nodes
+for each transition as the manager did before it was indexed. Some nodes
+fail, causing some groups and the groups depending on them to fail.
+
+The unit test only checks that both managers deploy the same groups and
+nodes. The full scale benchmark, a strategy of 5,000 nodes in 500 groups,
+also reports and compares the timings, and is only run when the
+SHIPYARD_FULL_BENCHMARK environment variable is set.
+"""
+import os
+import time
+
+import pytest
+
+from shipyard_airflow.common.deployment_group.deployment_group import Stage
+from shipyard_airflow.common.deployment_group.deployment_group_manager import \
+    DeploymentGroupManager
+
+NODES_PER_GROUP = 10
+
+
+class _ScanningDeploymentGroupManager(DeploymentGroupManager):
+    """A manager scanning all groups and nodes for each transition"""
+    def get_next_group(self, stage):
+        prev_stage = Stage.previous_stage(stage)
+        with self._lock:
+            for group in self._group_order:
+                if self._all_groups[group].stage in prev_stage:
+                    return self._all_groups[group]
+        return None
+
+    def mark_group_failed(self, group_name):
+        group = self._find_group(group_name)
+        with self._lock:
+            group.stage = Stage.FAILED
+            for name in self._group_graph.successors(group_name):
+                self.mark_group_failed(name)
+
+    def get_group_failures_for_stage(self, group_name, stage):
+        success_nodes = set()
+        with self._lock:
+            success_nodes.update(self.get_nodes(Stage.DEPLOYED))
+            if stage == Stage.PREPARED:
+                success_nodes.update(self.get_nodes(Stage.PREPARED))
+        group = self._find_group(group_name)
+        return group.get_failed_success_criteria(success_nodes)
+
+    def get_nodes(self, stage=None):
+        with self._lock:
+            if stage is None:
+                return list(self._all_nodes)
+            return [name for name, n_stage in self._all_nodes.items()
+                    if n_stage == stage]
+
+
+def _strategy(group_count):
+    """Returns the groups of a synthetic strategy
+
+    Each group shares a node with the group before it, and depends on a group
+    before it, forming a tree of dependencies.
+    """
+    groups = []
+    for i in range(group_count):
+        first = i * NODES_PER_GROUP
+        nodes = ['node{}'.format(n) for n in range(
+            max(first - 1, 0), first + NODES_PER_GROUP)]
+        groups.append({
+            'name': 'group{}'.format(i),
+            'critical': i == 0,
+            'depends_on': ['group{}'.format((i - 1) // 2)] if i else [],
+            'selectors': [{'node_names': nodes}],
+            'success_criteria': {'percent_successful_nodes': 90},
+        })
+    return groups
+
+
+def _node_lookup(selectors):
+    nodes = set()
+    for selector in selectors:
+        nodes.update(selector.node_names)
+    return nodes
+
+
+def _succeeds(node_name):
+    """Whether a node is prepared and deployed successfully"""
+    number = int(node_name[4:])
+    # every node of every fiftieth group fails, failing the groups that
+    # depend upon them
+    return (number // NODES_PER_GROUP) % 50 != 7 and number % 97 != 0
+
+
+def _replay(dgm):
+    """Deploys the groups one at a time, returning the elapsed time and the
+    resulting stages
+    """
+    start = time.perf_counter()
+    while True:
+        group = dgm.get_next_group(Stage.PREPARED)
+        if group is None:
+            break
+        successes = [n for n in group.actionable_nodes if _succeeds(n)]
+        for node_name in successes:
+            dgm.mark_node_prepared(node_name)
+        dgm.fail_unsuccessful_nodes(group, successes)
+        if not dgm.evaluate_group_succ_criteria(group.name, Stage.PREPARED):
+            continue
+        for node_name in successes:
+            dgm.mark_node_deployed(node_name)
+        dgm.evaluate_group_succ_criteria(group.name, Stage.DEPLOYED)
+    nodes = {stage: dgm.get_nodes(stage) for stage in Stage}
+    elapsed = time.perf_counter() - start
+    groups = {group.name: group.stage for group in dgm.group_list()}
+    return elapsed, groups, nodes
+
+
+def _compare(group_count, rounds=1):
+    """Returns the fastest of rounds replays using each manager"""
+    groups = _strategy(group_count)
+    scanning = min(
+        (_replay(_ScanningDeploymentGroupManager(groups, _node_lookup))
+         for _ in range(rounds)), key=lambda result: result[0])
+    indexed = min(
+        (_replay(DeploymentGroupManager(groups, _node_lookup))
+         for _ in range(rounds)), key=lambda result: result[0])
+    # the same groups and nodes are deployed, in the same order
+    assert indexed[1:] == scanning[1:]
+    stages = set(indexed[1].values())
+    assert stages == {Stage.DEPLOYED, Stage.FAILED}
+    return scanning, indexed
+
+
+def test_replay():
+    """Replays a deployment of 2,000 nodes in 200 groups"""
+    _compare(200)
+
+
+@pytest.mark.skipif(not os.environ.get('SHIPYARD_FULL_BENCHMARK'),
+                    reason='SHIPYARD_FULL_BENCHMARK is not set')
+def test_replay_full_scale():
+    """Replays a deployment of 5,000 nodes in 500 groups"""
+    scanning, indexed = _compare(500, rounds=3)
+    print('{} nodes in {} groups: scanning {:.3f}s, indexed {:.3f}s'.format(
+        sum(len(nodes) for nodes in indexed[2].values()), len(indexed[1]),
+        scanning[0], indexed[0]))
+    assert indexed[0] < scanning[0]
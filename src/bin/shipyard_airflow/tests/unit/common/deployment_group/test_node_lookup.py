@@ -25,10 +25,49 @@ from shipyard_airflow.common.deployment_group.errors import (
     InvalidDeploymentGroupNodeLookupError
 )
 from shipyard_airflow.common.deployment_group.node_lookup import (
+    BAREMETAL_NODE_SCHEMA, HOST_PROFILE_SCHEMA, NodeInventoryLookup,
     NodeLookup, _generate_node_filter, _validate_selectors
 )
 from drydock_provisioner import error as errors
 
+PROFILES = {
+    'cp': {'metadata': {'tags': ['control'],
+                        'owner_data': {'control-plane': 'enabled'}}},
+    'cp-r1': {'host_profile': 'cp', 'metadata': {'rack': 'rack1'}},
+    'compute': {'metadata': {'tags': ['workers'],
+                             'owner_data': {'compute': 'enabled',
+                                            'sriov': 'disabled'}}},
+}
+
+NODES = {
+    'node1': {'host_profile': 'cp-r1', 'metadata': {}},
+    'node2': {'host_profile': 'cp',
+              'metadata': {'rack': 'rack2', 'tags': ['monitoring']}},
+    'node3': {'host_profile': 'compute',
+              'metadata': {'rack': 'rack2',
+                           'owner_data': {'sriov': 'enabled'}}},
+    'node4': {'host_profile': 'compute', 'metadata': {'rack': 'rack3'}},
+}
+
+
+def _docs(docs):
+    return [mock.Mock(metadata={'name': name}, data=data)
+            for name, data in docs.items()]
+
+
+def _get_docs(schema):
+    return _docs({BAREMETAL_NODE_SCHEMA: NODES,
+                  HOST_PROFILE_SCHEMA: PROFILES}[schema])
+
+
+def _sel(node_names=None, node_labels=None, node_tags=None, rack_names=None):
+    return GroupNodeSelector({
+        'node_names': node_names or [],
+        'node_labels': node_labels or [],
+        'node_tags': node_tags or [],
+        'rack_names': rack_names or [],
+    })
+
 
 class TestNodeLookup:
     def test_validate_selectors(self):
@@ -260,3 +299,64 @@ class TestNodeLookup:
         with pytest.raises(InvalidDeploymentGroupNodeLookupError) as idgnle:
             NodeLookup(mock.MagicMock(), {})
         assert 'An incomplete design ref' in str(idgnle.value)
+
+
+class TestNodeInventoryLookup:
+    @pytest.mark.parametrize("selectors, expected", [
+        ([_sel()], {'node1', 'node2', 'node3', 'node4'}),
+        ([], set()),
+        ([_sel(node_names=['node1', 'node9'])], {'node1'}),
+        ([_sel(rack_names=['rack1'])], {'node1'}),
+        # tags and labels are inherited from host profiles
+        ([_sel(node_tags=['control'])], {'node1', 'node2'}),
+        ([_sel(node_tags=['control', 'monitoring'])], {'node1', 'node2'}),
+        ([_sel(node_labels=['control-plane:enabled'])], {'node1', 'node2'}),
+        # a node's own values take precedence over its profile's
+        ([_sel(node_labels=['sriov:enabled'])], {'node3'}),
+        ([_sel(node_labels=['sriov:disabled'])], {'node4'}),
+        # fields of a selector are an intersection
+        ([_sel(node_tags=['workers'], rack_names=['rack2'])], {'node3'}),
+        ([_sel(node_names=['node4'], rack_names=['rack2'])], set()),
+        # selectors are a union
+        ([_sel(rack_names=['rack1']), _sel(rack_names=['rack3'])],
+         {'node1', 'node4'}),
+    ])
+    def test_lookup(self, selectors, expected):
+        nl = NodeInventoryLookup(_get_docs)
+        assert nl.lookup(selectors) == expected
+
+    def test_lookup_inventory_retrieved_once(self):
+        get_docs = mock.MagicMock(side_effect=_get_docs)
+        nl = NodeInventoryLookup(get_docs)
+        for _ in range(10):
+            assert nl.lookup([_sel(node_tags=['workers'])]) == {'node3',
+                                                                'node4'}
+            assert nl.lookup([_sel(rack_names=['rack2'])]) == {'node2',
+                                                               'node3'}
+        assert get_docs.call_count == 2
+        # the result of each distinct selector is remembered
+        assert len(nl._selected) == 2
+
+    def test_lookup_profile_cycle(self):
+        profiles = {'a': {'host_profile': 'b', 'metadata': {'tags': ['a']}},
+                    'b': {'host_profile': 'a', 'metadata': {'tags': ['b']}}}
+        nodes = {'node1': {'host_profile': 'a', 'metadata': {}}}
+        nl = NodeInventoryLookup(lambda schema: _docs(
+            nodes if schema == BAREMETAL_NODE_SCHEMA else profiles))
+        assert nl.lookup([_sel(node_tags=['b'])]) == {'node1'}
+
+    def test_lookup_retry(self):
+        get_docs = mock.MagicMock(side_effect=Exception('nope'))
+        nl = NodeInventoryLookup(get_docs, retry_delay=0.1)
+        with pytest.raises(Exception):
+            nl.lookup([_sel()])
+        assert get_docs.call_count == 3
+
+    def test_lookup_invalid_selectors(self):
+        nl = NodeInventoryLookup(_get_docs)
+        with pytest.raises(InvalidDeploymentGroupNodeLookupError):
+            nl.lookup(["bad!"])
+
+    def test_missing_get_docs(self):
+        with pytest.raises(TypeError):
+            NodeInventoryLookup(None)
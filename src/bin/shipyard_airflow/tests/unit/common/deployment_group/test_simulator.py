@@ -0,0 +1,184 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the deployment strategy simulator"""
+import yaml
+
+from shipyard_airflow.common.deployment_group.deployment_group import Stage
+from shipyard_airflow.common.deployment_group.node_lookup import InventoryNode
+from shipyard_airflow.common.deployment_group.simulator import (
+    DeploymentSimulator,
+    fixed,
+    inventory_from_documents,
+    NodeProfile,
+    summarize,
+    uniform
+)
+
+STRATEGY_YAML = """
+---
+schema: shipyard/DeploymentStrategy/v1
+metadata:
+  name: deployment-strategy
+data:
+  groups:
+    - name: control
+      critical: true
+      depends_on: []
+      selectors:
+        - rack_names:
+            - rack01
+      success_criteria:
+        percent_successful_nodes: 100
+    - name: compute-1
+      critical: false
+      depends_on:
+        - control
+      selectors:
+        - rack_names:
+            - rack02
+      success_criteria:
+        minimum_successful_nodes: 1
+    - name: storage
+      critical: false
+      depends_on: []
+      selectors:
+        - node_tags:
+            - storage
+...
+"""
+
+INVENTORY = [
+    InventoryNode('node1', rack='rack01'),
+    InventoryNode('node2', rack='rack01'),
+    InventoryNode('node3', rack='rack02'),
+    InventoryNode('node4', rack='rack02'),
+    InventoryNode('node5', rack='rack03', tags=['storage']),
+    InventoryNode('node6', rack='rack03', tags=['storage']),
+]
+
+PROFILE = NodeProfile(prepare=fixed(10), deploy=fixed(20))
+
+
+def _simulator(**kwargs):
+    return DeploymentSimulator(yaml.safe_load(STRATEGY_YAML), INVENTORY,
+                               kwargs.pop('default_profile', PROFILE),
+                               **kwargs)
+
+
+def test_sequential():
+    result = _simulator(task_overhead=1).run()
+    assert result.makespan == 96
+    assert result.peak_concurrency == 1
+    assert result.peak_nodes == 2
+    assert not result.critical_groups_failed
+    assert result.nodes[Stage.DEPLOYED] == 6
+    assert {name: group.stage for name, group in result.groups.items()} == {
+        'control': Stage.DEPLOYED,
+        'compute-1': Stage.DEPLOYED,
+        'storage': Stage.DEPLOYED,
+    }
+    # groups are processed one after the other
+    assert len(result.critical_path) == 3
+    for group in result.groups.values():
+        assert group.duration == 32
+        assert group.actionable_nodes == 2
+
+
+def test_concurrent():
+    result = _simulator(max_concurrent_groups=2).run()
+    assert result.makespan == 60
+    assert result.peak_concurrency == 2
+    assert result.peak_nodes == 4
+    assert result.critical_path == ['control', 'compute-1']
+    assert result.groups['storage'].started == 0
+    assert result.groups['compute-1'].started == 30
+    assert result.groups['compute-1'].started_after == 'control'
+
+
+def test_failures():
+    failing = NodeProfile(prepare=fixed(10), deploy=fixed(20),
+                          deploy_failure_rate=1)
+    result = _simulator(node_profiles={'node1': failing},
+                        max_concurrent_groups=3).run()
+    control = result.groups['control']
+    assert control.stage == Stage.FAILED
+    assert control.failed_stage == Stage.DEPLOYED
+    assert control.failed_criteria == [{
+        'criteria': 'percent_successful_nodes', 'needed': 100, 'actual': 50.0
+    }]
+    # the group depending on the failed group is never processed
+    assert result.groups['compute-1'].stage == Stage.FAILED
+    assert result.groups['compute-1'].started is None
+    assert result.groups['storage'].stage == Stage.DEPLOYED
+    assert result.critical_groups_failed
+    assert result.nodes[Stage.FAILED] == 1
+    assert result.nodes[Stage.NOT_STARTED] == 2
+
+
+def test_prepare_failures():
+    failing = NodeProfile(prepare=fixed(10), deploy=fixed(20),
+                          prepare_failure_rate=1)
+    result = _simulator(default_profile=failing).run()
+    assert result.groups['control'].failed_stage == Stage.PREPARED
+    assert result.groups['compute-1'].started is None
+    # the nodes of the storage group fail, but the group has no success
+    # criteria
+    assert result.groups['storage'].stage == Stage.DEPLOYED
+    assert result.makespan == 20
+    assert result.nodes[Stage.FAILED] == 4
+
+
+def test_repeatable():
+    profile = NodeProfile(prepare=uniform(5, 15), deploy=uniform(10, 30),
+                          deploy_failure_rate=0.2)
+    sim = _simulator(default_profile=profile, max_concurrent_groups=2)
+    first = sim.run(seed=7)
+    second = sim.run(seed=7)
+    assert first.makespan == second.makespan
+    assert ({n: g.stage for n, g in first.groups.items()} ==
+            {n: g.stage for n, g in second.groups.items()})
+
+
+def test_summarize():
+    profile = NodeProfile(prepare=uniform(5, 15), deploy=uniform(10, 30),
+                          deploy_failure_rate=0.2)
+    results = _simulator(default_profile=profile).run_many(20, seed=1)
+    summary = summarize(results)
+    assert summary['runs'] == 20
+    makespan = summary['makespan']
+    assert (makespan['min'] <= makespan['p50'] <= makespan['p90'] <=
+            makespan['max'])
+    assert 0 <= summary['success_rate'] <= 1
+    assert set(summary['group_failure_rates']) == {
+        'control', 'compute-1', 'storage'}
+    assert summarize([]) == {'runs': 0}
+
+
+def test_inventory_from_documents():
+    docs = [
+        {'schema': 'drydock/HostProfile/v1',
+         'metadata': {'name': 'storage'},
+         'data': {'metadata': {'tags': ['storage']}}},
+        {'schema': 'drydock/BaremetalNode/v1',
+         'metadata': {'name': 'node7'},
+         'data': {'host_profile': 'storage',
+                  'metadata': {'rack': 'rack04'}}},
+        {'schema': 'shipyard/DeploymentStrategy/v1',
+         'metadata': {'name': 'deployment-strategy'},
+         'data': {}},
+    ]
+    inventory = inventory_from_documents(docs)
+    assert [node.name for node in inventory] == ['node7']
+    assert inventory[0].rack == 'rack04'
+    assert inventory[0].tags == {'storage'}
@@ -0,0 +1,133 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the DocumentValidationUtils"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from shipyard_airflow.common.document_validators.document_validation_utils \
+    import DocumentIndex, DocumentValidationUtils
+from shipyard_airflow.common.document_validators.errors import (
+    DocumentLookupError,
+    DocumentNotFoundError
+)
+
+RENDERED_DOCS = [
+    {
+        'schema': 'shipyard/DeploymentConfiguration/v1',
+        'metadata': {'name': 'deployment-configuration',
+                     'layeringDefinition': {'layer': 'site'}},
+        'data': {'armada': {'manifest': 'full-site'}}
+    },
+    {
+        'schema': 'shipyard/DeploymentStrategy/v1',
+        'metadata': {'name': 'deployment-strategy'},
+        'data': {'groups': []}
+    },
+    {
+        'schema': 'shipyard/DeploymentStrategyExtra/v1',
+        'metadata': {'name': 'deployment-strategy'},
+        'data': {}
+    },
+    {
+        'schema': 'metadata/Document/v1',
+        'metadata': {'name': 'deployment-strategy'},
+        'data': None
+    },
+]
+
+
+def _doc_utils(docs=RENDERED_DOCS):
+    return DocumentValidationUtils(MagicMock(),
+                                   get_rendered_docs=lambda rev_id: docs)
+
+
+def test_get_unique_doc_rendered_docs():
+    doc_utils = _doc_utils()
+    assert doc_utils.get_unique_doc(
+        1, 'deployment-configuration',
+        'shipyard/DeploymentConfiguration/v1') == {
+            'armada': {'manifest': 'full-site'}}
+    assert doc_utils.get_unique_doc(
+        1, 'deployment-strategy',
+        'shipyard/DeploymentStrategy/v1') == {'groups': []}
+    doc_utils.deckhand_client.revisions.documents.assert_not_called()
+
+
+@pytest.mark.parametrize('filters, names', [
+    ({'schema': 'shipyard/DeploymentStrategy/v1'}, ['deployment-strategy']),
+    ({'schema': 'shipyard/DeploymentStrategy'}, ['deployment-strategy']),
+    ({'schema': 'shipyard'},
+     ['deployment-configuration', 'deployment-strategy',
+      'deployment-strategy']),
+    ({'metadata.name': 'deployment-strategy'},
+     ['deployment-strategy'] * 3),
+    ({'metadata.layeringDefinition.layer': 'site'},
+     ['deployment-configuration']),
+    ({'schema': 'shipyard/DeploymentConfiguration/v1',
+      'metadata.name': 'deployment-strategy'}, []),
+])
+def test_get_docs_by_filter_rendered_docs(filters, names):
+    docs = _doc_utils().get_docs_by_filter(1, filters)
+    assert [doc.metadata['name'] for doc in docs] == names
+
+
+def test_get_unique_doc_rendered_docs_not_found():
+    with pytest.raises(DocumentNotFoundError):
+        _doc_utils().get_unique_doc(1, 'deployment-strategy',
+                                    'metadata/Document/v1')
+
+
+def test_get_docs_by_filter_rendered_docs_error():
+    def get_rendered_docs(revision_id):
+        raise ValueError('Unable to render')
+
+    doc_utils = DocumentValidationUtils(MagicMock(),
+                                        get_rendered_docs=get_rendered_docs)
+    with pytest.raises(DocumentLookupError):
+        doc_utils.get_docs_by_filter(1, {'schema': 'a/B/v1'})
+
+
+def test_document_index():
+    index = DocumentIndex(1, RENDERED_DOCS + [None])
+    docs = index.get_docs_by_filter({
+        'schema': 'shipyard/DeploymentStrategy/v1',
+        'metadata.name': 'deployment-strategy'})
+    assert [doc.data for doc in docs] == [{'groups': []}]
+    assert index.get_docs_by_filter({
+        'schema': 'shipyard/DeploymentStrategy/v2',
+        'metadata.name': 'deployment-strategy'}) == []
+    # partial schemas and other filters are matched against each document
+    docs = index.get_docs_by_filter({
+        'schema': 'shipyard', 'metadata.name': 'deployment-strategy'})
+    assert [doc.schema for doc in docs] == [
+        'shipyard/DeploymentStrategy/v1',
+        'shipyard/DeploymentStrategyExtra/v1']
+
+
+def test_get_unique_doc_document_index():
+    get_rendered_docs = MagicMock()
+    doc_utils = DocumentValidationUtils(
+        MagicMock(), get_rendered_docs=get_rendered_docs,
+        document_index=DocumentIndex(1, RENDERED_DOCS))
+    assert doc_utils.get_unique_doc(
+        1, 'deployment-strategy',
+        'shipyard/DeploymentStrategy/v1') == {'groups': []}
+    get_rendered_docs.assert_not_called()
+    # other revisions are not looked up in the index
+    get_rendered_docs.return_value = []
+    with pytest.raises(DocumentNotFoundError):
+        doc_utils.get_unique_doc(2, 'deployment-strategy',
+                                 'shipyard/DeploymentStrategy/v1')
+    get_rendered_docs.assert_called_once_with(2)
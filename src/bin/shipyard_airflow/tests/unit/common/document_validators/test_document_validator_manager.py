@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Tests for the DocumentValidationManager"""
+import random
+import threading
+import time
 from unittest import mock
 from unittest.mock import MagicMock
 
@@ -184,6 +187,53 @@ class ValidatorBadMissingSeverity(DocumentValidator):
         pass
 
 
+class ValidatorNamed(DocumentValidator):
+    """Reports its document name, triggering validations for names having
+    fewer than 3 characters after the placeholder prefix
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    schema = "schema/Schema/v1"
+    missing_severity = "Error"
+
+    def do_validate(self):
+        # finish in a different order than started
+        time.sleep(random.random() / 100)
+        self.val_msg_list.append(self.val_msg(
+            name=self.doc_name, error=False, level="Info", message="ok"))
+        suffix = self.doc_name[len('document-placeholder'):]
+        if len(suffix) < 3:
+            for c in 'xyz':
+                self.add_triggered_validation(
+                    ValidatorNamed, 'document-placeholder' + suffix + c)
+
+
+class ValidatorBarrier(DocumentValidator):
+    """Waits for 3 validators to be running at once"""
+    barrier = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    schema = "schema/Schema/v1"
+    missing_severity = "Error"
+
+    def do_validate(self):
+        ValidatorBarrier.barrier.wait(timeout=5)
+
+
+class ValidatorRaises(DocumentValidator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    schema = "schema/Schema/v1"
+    missing_severity = "Error"
+
+    def do_validate(self):
+        raise ValueError('Unexpected')
+
+
 class TestValidatorManager:
     @mock.patch("shipyard_airflow.control.service_clients.deckhand_client",
                 return_value=_dh_doc_client())
@@ -281,3 +331,92 @@ class TestValidatorManager:
         assert msg['diagnostic'] == "Message generated by Shipyard."
         assert msg['documents'] == [{"name": "no",
                                      "schema": "schema/Schema/v1"}]
+
+    def test_rendered_docs_getter(self):
+        dh_client = MagicMock()
+        rendered_docs = [{
+            'schema': 'schema/Schema/v1',
+            'metadata': {'name': 'document-placeholder01'},
+            'data': {'nothing': 'here'}
+        }]
+        get_rendered_docs = MagicMock(return_value=rendered_docs)
+        validations = [(ValidatorB, 'document-placeholder01'),
+                       (ValidatorB, 'missing-error')]
+        dvm = DocumentValidationManager(dh_client, 1, validations,
+                                        get_rendered_docs=get_rendered_docs)
+        results = dvm.validate()
+        assert dvm.errored
+        assert len(results) == 1
+        assert results[0]['name'] == 'DocumentNotFoundError'
+        # the documents are retrieved once, for all validators
+        get_rendered_docs.assert_called_once_with(1)
+        dh_client.revisions.documents.assert_not_called()
+
+    def test_rendered_docs_getter_chained(self):
+        rendered_docs = [{
+            'schema': 'schema/Schema/v1',
+            'metadata': {'name': 'document-placeholder{}'.format(suffix)},
+            'data': {'nothing': 'here'}
+        } for suffix in ['03'] + ['-' + c for c in 'ABCDEFGHIJKLM']]
+        get_rendered_docs = MagicMock(return_value=rendered_docs)
+        validations = [(ValidatorC, 'document-placeholder03')]
+        dvm = DocumentValidationManager(MagicMock(), 1, validations,
+                                        get_rendered_docs=get_rendered_docs)
+        dvm.validate()
+        assert not dvm.errored
+        assert dvm.validations_run == 26
+        get_rendered_docs.assert_called_once_with(1)
+
+    def test_rendered_docs_getter_failure(self):
+        get_rendered_docs = MagicMock(side_effect=ValueError('no render'))
+        validations = [(ValidatorB, 'document-placeholder01')]
+        dvm = DocumentValidationManager(MagicMock(), 1, validations,
+                                        get_rendered_docs=get_rendered_docs)
+        results = dvm.validate()
+        assert len(results) == 1
+        assert results[0]['name'] == 'DocumentLookupError'
+        assert results[0]['error']
+
+    @mock.patch("shipyard_airflow.control.service_clients.deckhand_client",
+                return_value=_dh_doc_client())
+    def test_concurrent_results_order(self, fake_client):
+        validations = [(ValidatorNamed, 'document-placeholder1'),
+                       (ValidatorNamed, 'document-placeholder2')]
+        sequential = DocumentValidationManager(fake_client(), 1, validations)
+        seq_results = sequential.validate()
+        concurrent = DocumentValidationManager(fake_client(), 1, validations,
+                                               max_workers=4)
+        con_results = concurrent.validate()
+        assert concurrent.validations_run == sequential.validations_run == 26
+        assert len(seq_results) == 26
+        assert ([r['name'] for r in con_results] ==
+                [r['name'] for r in seq_results])
+        # triggered validations follow those that triggered them
+        assert [r['name'] for r in seq_results[:8]] == [
+            'document-placeholder1', 'document-placeholder2',
+            'document-placeholder1x', 'document-placeholder1y',
+            'document-placeholder1z', 'document-placeholder2x',
+            'document-placeholder2y', 'document-placeholder2z']
+
+    @mock.patch("shipyard_airflow.control.service_clients.deckhand_client",
+                return_value=_dh_doc_client())
+    def test_concurrent_validators_run_at_once(self, fake_client):
+        ValidatorBarrier.barrier = threading.Barrier(3)
+        validations = [(ValidatorBarrier, 'document-placeholder01'),
+                       (ValidatorBarrier, 'document-placeholder02'),
+                       (ValidatorBarrier, 'document-placeholder03')]
+        dvm = DocumentValidationManager(fake_client(), 1, validations,
+                                        max_workers=3)
+        dvm.validate()
+        assert not dvm.errored
+        assert dvm.validations_run == 3
+
+    @mock.patch("shipyard_airflow.control.service_clients.deckhand_client",
+                return_value=_dh_doc_client())
+    def test_concurrent_validator_exception(self, fake_client):
+        validations = [(ValidatorB, 'document-placeholder01'),
+                       (ValidatorRaises, 'document-placeholder02')]
+        dvm = DocumentValidationManager(fake_client(), 1, validations,
+                                        max_workers=2)
+        with pytest.raises(ValueError):
+            dvm.validate()
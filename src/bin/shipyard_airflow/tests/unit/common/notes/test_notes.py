@@ -15,7 +15,9 @@
 from unittest import mock
 
 import pytest
+import requests
 import responses
+from sqlalchemy.dialects import postgresql
 
 from shipyard_airflow.common.notes.errors import (
     NotesInitializationError,
@@ -31,6 +33,10 @@ from shipyard_airflow.common.notes.notes import (
     NotesStorage,
     Query
 )
+from shipyard_airflow.common.notes.storage_impl_db import (
+    BULK_INSERT_ROWS,
+    ShipyardSQLNotesStorage
+)
 from shipyard_airflow.common.notes.storage_impl_mem import MemoryNotesStorage
 
 
@@ -60,6 +66,60 @@ class NotesStorageExpectedErrorImpl(NotesStorage):
         raise NotesRetrievalError("Expected")
 
 
+class NotesStorageNoBulkImpl(NotesStorage):
+    """Storage relying on the default implementation of retrieve_bulk"""
+    def __init__(self):
+        self.mem = MemoryNotesStorage()
+
+    def store(self, note):
+        return self.mem.store(note)
+
+    def retrieve(self, query):
+        return self.mem.retrieve(query)
+
+    def retrieve_by_id(self, note_id):
+        return self.mem.retrieve_by_id(note_id)
+
+
+class NotesStorageBulkErrorImpl(NotesStorageNoBulkImpl):
+    """Storage failing to store notes together, and to store note 'bad'"""
+    def store(self, note):
+        if note.note_val == "bad":
+            raise NotesStorageError("Expected")
+        return super().store(note)
+
+    def store_bulk(self, notes):
+        raise Exception("Not today")
+
+
+def _note(note_val="a note", assoc_id="test1/11111"):
+    return Note(
+        assoc_id=assoc_id,
+        subject="batch",
+        sub_type="test",
+        note_val=note_val
+    )
+
+
+def _store_bulk_notes(nm):
+    """Stores notes used by the bulk retrieval tests"""
+    for assoc_id, verbosity, ts in [
+        ("test1/11111", 1, "2018-10-10 00:00:03"),
+        ("test1/11111/aaa", 1, "2018-10-10 00:00:01"),
+        ("test1/11111/bbb", 3, "2018-10-10 00:00:02"),
+        ("test1/22222/aaa", 1, "2018-10-10 00:00:04"),
+        ("test2/11111", 1, "2018-10-10 00:00:05"),
+    ]:
+        nm.store(Note(
+            assoc_id=assoc_id,
+            subject="store_retrieve_bulk",
+            sub_type="test",
+            note_val="note for {}".format(assoc_id),
+            verbosity=verbosity,
+            note_timestamp=ts
+        ))
+
+
 class TestNotesManager:
     def test_init(self):
         with pytest.raises(NotesInitializationError) as nie:
@@ -78,6 +138,11 @@ class TestNotesManager:
             nm = NotesManager(MemoryNotesStorage(), {})
         assert "Parameter get_token" in str(nie.value)
 
+        with pytest.raises(NotesInitializationError) as nie:
+            nm = NotesManager(MemoryNotesStorage(), get_token,
+                              get_session={})
+        assert "Parameter get_session" in str(nie.value)
+
         nm = NotesManager(MemoryNotesStorage(), get_token)
         assert nm.connect_timeout == 3
         assert nm.read_timeout == 10
@@ -105,6 +170,10 @@ class TestNotesManager:
             nm.retrieve(Query("test"))
         assert "Expected" == str(nse.value)
 
+        with pytest.raises(NotesRetrievalError) as nse:
+            nm.retrieve_bulk([Query("test")])
+        assert "Expected" == str(nse.value)
+
     def test_store_retrieve_unexpected_exception_handling(self):
         nm = NotesManager(NotesStorageErrorImpl(), get_token)
         with pytest.raises(NotesStorageError) as nse:
@@ -122,6 +191,10 @@ class TestNotesManager:
             nm.retrieve(Query("test"))
         assert "Unhandled" in str(nse.value)
 
+        with pytest.raises(NotesRetrievalError) as nse:
+            nm.retrieve_bulk([Query("test")])
+        assert "Unhandled" in str(nse.value)
+
     def test_store_retrieve_basic(self):
         nm = NotesManager(MemoryNotesStorage(), get_token)
         nm.store(Note(
@@ -200,6 +273,154 @@ class TestNotesManager:
         n_list = nm.retrieve(Query("test1/11111/aaa", exact_match=True))
         assert len(n_list) == 1
 
+    @pytest.mark.parametrize('storage', [
+        MemoryNotesStorage, NotesStorageNoBulkImpl])
+    def test_store_retrieve_bulk(self, storage):
+        nm = NotesManager(storage(), get_token)
+        _store_bulk_notes(nm)
+        n_list = nm.retrieve_bulk([
+            Query("test1/11111", exact_match=True),
+            Query("test1/11111/", max_verbosity=2),
+            Query("test1/"),
+            Query("test2/11111/"),
+        ])
+        # Notes matching several queries are returned once, ordered by
+        # timestamp.
+        assert [n.assoc_id for n in n_list] == [
+            "test1/11111/aaa",
+            "test1/11111/bbb",
+            "test1/11111",
+            "test1/22222/aaa",
+        ]
+        n_list = nm.retrieve_bulk([
+            Query("test1/11111", exact_match=True),
+            Query("test1/11111/", max_verbosity=2),
+        ])
+        assert [n.assoc_id for n in n_list] == [
+            "test1/11111/aaa",
+            "test1/11111",
+        ]
+        assert nm.retrieve_bulk([Query("test3")]) == []
+        assert nm.retrieve_bulk([]) == []
+
+    def test_batch(self):
+        storage = MemoryNotesStorage()
+        nm = NotesManager(storage, get_token)
+        with mock.patch.object(storage, 'store_bulk',
+                               wraps=storage.store_bulk) as store_bulk:
+            with nm.batch():
+                nm.store(_note("one"))
+                nm.store(_note("two"))
+                assert storage.storage == {}
+            assert store_bulk.call_count == 1
+            assert len(storage.storage) == 2
+            # not batching any more
+            nm.store(_note("three"))
+            assert len(storage.storage) == 3
+            assert store_bulk.call_count == 1
+
+    def test_batch_nested(self):
+        storage = MemoryNotesStorage()
+        nm = NotesManager(storage, get_token)
+        with nm.batch():
+            with nm.batch():
+                nm.store(_note())
+            assert storage.storage == {}
+        assert len(storage.storage) == 1
+
+    def test_batch_max_notes(self):
+        storage = MemoryNotesStorage()
+        nm = NotesManager(storage, get_token)
+        with nm.batch(max_notes=2):
+            nm.store(_note("one"))
+            assert len(storage.storage) == 0
+            nm.store(_note("two"))
+            assert len(storage.storage) == 2
+            nm.store(_note("three"))
+            assert len(storage.storage) == 2
+        assert len(storage.storage) == 3
+
+    def test_batch_max_seconds(self):
+        storage = MemoryNotesStorage()
+        nm = NotesManager(storage, get_token)
+        with mock.patch('shipyard_airflow.common.notes.notes.time.'
+                        'monotonic', side_effect=[0, 0, 5, 10, 11]):
+            with nm.batch(max_seconds=10):
+                nm.store(_note("one"))
+                nm.store(_note("two"))
+                assert len(storage.storage) == 0
+                nm.store(_note("three"))
+                assert len(storage.storage) == 3
+
+    def test_batch_stored_on_error(self):
+        storage = MemoryNotesStorage()
+        nm = NotesManager(storage, get_token)
+        with pytest.raises(ValueError):
+            with nm.batch():
+                nm.store(_note())
+                raise ValueError()
+        assert len(storage.storage) == 1
+
+    def test_batch_bad_verbosity(self):
+        nm = NotesManager(MemoryNotesStorage(), get_token)
+        with nm.batch():
+            with pytest.raises(NotesStorageError):
+                nm.store(Note(
+                    assoc_id="test1/11111/aaa",
+                    subject="store_bad_verbosity",
+                    sub_type="test",
+                    note_val="this is my note 1",
+                    verbosity=6
+                ))
+
+    def test_batch_bulk_store_failure(self):
+        storage = NotesStorageBulkErrorImpl()
+        nm = NotesManager(storage, get_token)
+        with nm.batch():
+            for note_val in ["one", "bad", "two"]:
+                nm.store(_note(note_val))
+        # stored one at a time, losing only the note that cannot be stored
+        assert sorted(n.note_val for n in nm.retrieve(Query("test1"))) == [
+            "one", "two"]
+
+    def test_batch_retrieve_stores(self):
+        nm = NotesManager(MemoryNotesStorage(), get_token)
+        with nm.batch():
+            note = nm.store(_note())
+            assert len(nm.retrieve(Query("test1"))) == 1
+            nm.store(_note(assoc_id="test1/22222"))
+            assert len(nm.retrieve_bulk([Query("test1/22222")])) == 1
+            nm.store(_note(assoc_id="test1/33333"))
+            assert nm.retrieve_by_id(note.note_id).note_val == "a note"
+            assert len(nm.retrieve(Query("test1"))) == 3
+
+    def test_retrieve_does_not_batch(self):
+        storage = MemoryNotesStorage()
+        nm = NotesManager(storage, get_token)
+        assert nm.retrieve(Query("test1")) == []
+        assert nm.retrieve_bulk([Query("test1")]) == []
+        with pytest.raises(NoteNotFoundError):
+            nm.retrieve_by_id("aaaaaaaaaaaaaaaaaaaaaaaaaa")
+        nm.flush()
+        # stored immediately, not buffered
+        nm.create("test1/11111", "subject", "test", "a note")
+        assert len(storage.storage) == 1
+
+    def test_sql_store_bulk(self):
+        storage = ShipyardSQLNotesStorage(mock.MagicMock())
+        session = mock.MagicMock()
+        notes = [_note(str(i)) for i in range(BULK_INSERT_ROWS + 1)]
+        with mock.patch.object(storage, '_get_session',
+                               return_value=session):
+            assert storage.store_bulk(notes) == notes
+        # one insert statement per BULK_INSERT_ROWS notes, in one transaction
+        assert session.execute.call_count == 2
+        assert session.commit.call_count == 1
+        statement = session.execute.call_args_list[1][0][0]
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert params['note_val_m0'] == str(
+            BULK_INSERT_ROWS)
+
     def test_store_retrieve_url_refs(self):
         """Tests that notes retrieved as a list have notedetails refs"""
         nm = NotesManager(MemoryNotesStorage(), get_token)
@@ -391,6 +612,30 @@ class TestNotesManager:
         auth_hdr = responses.calls[0].request.headers['X-Auth-Token']
         assert 'token' == auth_hdr
 
+    @responses.activate
+    def test_store_retrieve_url_with_session(self):
+        responses.add(
+            method="GET",
+            url="http://test.test2",
+            body="Hello from testland2",
+            status=200,
+            content_type="text/plain"
+        )
+        session = requests.Session()
+        nm = NotesManager(MemoryNotesStorage(), get_token,
+                          get_session=lambda: session)
+        n = nm.store(Note(
+            assoc_id="test1/11111/bbb",
+            subject="store_retrieve3",
+            sub_type="test",
+            note_val="this is my note 2",
+            link_url="http://test.test2/"
+        ))
+        with mock.patch.object(session, 'get',
+                               wraps=session.get) as session_get:
+            assert nm.get_note_url_info(n.note_id) == "Hello from testland2"
+        assert session_get.call_count == 1
+
     def test_note_view(self):
         nm = NotesManager(MemoryNotesStorage(), get_token)
         nm.store(Note(
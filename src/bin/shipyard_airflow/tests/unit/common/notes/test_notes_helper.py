@@ -0,0 +1,85 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Notes Helper"""
+from unittest import mock
+
+from shipyard_airflow.common.notes.notes import NotesManager
+from shipyard_airflow.common.notes.notes_helper import NotesHelper
+from shipyard_airflow.common.notes.storage_impl_mem import MemoryNotesStorage
+
+ACTION_1 = "01CVJKA6Q8QHQXDBBVD0S1Y4B6"
+ACTION_2 = "01CVJKA6Q8QHQXDBBVD0S1Y4B7"
+ACTION_3 = "01CVJKA6Q8QHQXDBBVD0S1Y4B8"
+
+
+def get_token():
+    return "token"
+
+
+def _notes_helper():
+    nh = NotesHelper(NotesManager(MemoryNotesStorage(), get_token))
+    nh.make_action_note(ACTION_1, "action 1 note")
+    nh.make_action_note(ACTION_1, "action 1 detail note", verbosity=3)
+    nh.make_step_note(ACTION_1, "step_a", "step a note")
+    nh.make_step_note(ACTION_1, "step_b", "step b detail note", verbosity=3)
+    nh.make_action_note(ACTION_2, "action 2 note")
+    nh.make_step_note(ACTION_2, "step_a", "step a note")
+    nh.make_action_note(ACTION_3, "action 3 note")
+    return nh
+
+
+class TestNotesHelper:
+    def test_get_notes_for_actions(self):
+        nh = _notes_helper()
+        notes = nh.get_notes_for_actions([ACTION_1, ACTION_2])
+        assert sorted(notes.keys()) == [
+            "action/{}".format(ACTION_1),
+            "action/{}".format(ACTION_2),
+            "step/{}/step_a".format(ACTION_1),
+            "step/{}/step_a".format(ACTION_2),
+        ]
+        assert ([n.note_val for n in notes["action/{}".format(ACTION_1)]] ==
+                ["action 1 note"])
+
+    def test_get_notes_for_actions_verbosity(self):
+        nh = _notes_helper()
+        notes = nh.get_notes_for_actions([ACTION_1], verbosity=5)
+        assert len(notes["action/{}".format(ACTION_1)]) == 2
+        assert "step/{}/step_b".format(ACTION_1) in notes
+
+        notes = nh.get_notes_for_actions([ACTION_1], verbosity=5,
+                                         step_verbosity=0)
+        assert list(notes.keys()) == ["action/{}".format(ACTION_1)]
+
+        notes = nh.get_notes_for_actions([ACTION_1], verbosity=0,
+                                         step_verbosity=1)
+        assert list(notes.keys()) == ["step/{}/step_a".format(ACTION_1)]
+
+    def test_get_notes_for_actions_single_retrieval(self):
+        nh = _notes_helper()
+        with mock.patch.object(nh.nm, 'retrieve_bulk',
+                               wraps=nh.nm.retrieve_bulk) as rb:
+            nh.get_notes_for_actions([ACTION_1, ACTION_2, ACTION_3])
+            assert rb.call_count == 1
+
+        with mock.patch.object(nh.nm, 'retrieve_bulk') as rb:
+            assert nh.get_notes_for_actions([ACTION_1], verbosity=0) == {}
+            assert nh.get_notes_for_actions([]) == {}
+            rb.assert_not_called()
+
+    def test_get_notes_for_actions_failsafe(self):
+        nh = _notes_helper()
+        with mock.patch.object(nh.nm, 'retrieve_bulk',
+                               side_effect=Exception("Outta Nowhere")):
+            assert nh.get_notes_for_actions([ACTION_1]) == {}
@@ -0,0 +1,103 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the YAML codec"""
+import importlib
+import os
+
+import pytest
+import yaml
+
+from shipyard_airflow.common import yaml_codec
+
+# The copy of the codec used by the client, in the source tree
+CLIENT_CODEC = os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', '..', 'shipyard_client',
+    'shipyard_client', 'cli', 'yaml_codec.py')
+
+DOCS = """
+---
+schema: shipyard/DeploymentConfiguration/v1
+metadata:
+  name: deployment-configuration
+data:
+  armada:
+    manifest: full-site
+---
+schema: shipyard/DeploymentStrategy/v1
+metadata:
+  name: deployment-strategy
+data:
+  groups: []
+...
+"""
+
+
+def test_load():
+    assert yaml_codec.load('a: [1, 2]') == {'a': [1, 2]}
+    assert yaml_codec.load(b'a: b') == {'a': 'b'}
+    assert yaml_codec.load('') is None
+    with pytest.raises(yaml_codec.YAMLError):
+        yaml_codec.load('a: [1, 2')
+    # only standard tags are loaded
+    with pytest.raises(yaml_codec.YAMLError):
+        yaml_codec.load('!!python/object/apply:os.getcwd []')
+
+
+def test_load_all():
+    docs = yaml_codec.load_all(DOCS)
+    # the documents are loaded as they are iterated
+    assert next(docs)['metadata']['name'] == 'deployment-configuration'
+    assert next(docs)['data'] == {'groups': []}
+    with pytest.raises(StopIteration):
+        next(docs)
+    assert list(yaml_codec.load_all(DOCS)) == list(yaml.safe_load_all(DOCS))
+
+
+def test_dump():
+    docs = list(yaml_codec.load_all(DOCS))
+    assert yaml_codec.load(yaml_codec.dump(docs[0])) == docs[0]
+    assert list(yaml_codec.load_all(yaml_codec.dump_all(docs))) == docs
+    assert (yaml_codec.dump({'a': [1]}, default_flow_style=False) ==
+            yaml.safe_dump({'a': [1]}, default_flow_style=False))
+    with pytest.raises(yaml.representer.RepresenterError):
+        yaml_codec.dump(object())
+
+
+def test_without_libyaml(monkeypatch):
+    """Tests the pure Python loader and dumper are used without libyaml"""
+    monkeypatch.delattr(yaml, 'CSafeLoader', raising=False)
+    monkeypatch.delattr(yaml, 'CSafeDumper', raising=False)
+    try:
+        importlib.reload(yaml_codec)
+        assert not yaml_codec.LIBYAML
+        assert yaml_codec.SafeLoader is yaml.SafeLoader
+        assert yaml_codec.SafeDumper is yaml.SafeDumper
+        assert len(list(yaml_codec.load_all(DOCS))) == 2
+        assert yaml_codec.load(yaml_codec.dump({'a': 1})) == {'a': 1}
+    finally:
+        monkeypatch.undo()
+        importlib.reload(yaml_codec)
+    assert yaml_codec.LIBYAML == yaml.__with_libyaml__
+
+
+@pytest.mark.skipif(not os.path.exists(CLIENT_CODEC),
+                    reason='The client source is not available')
+def test_client_copy():
+    """Tests the client's copy of the codec matches this codec"""
+    def _code(path):
+        with open(path) as module:
+            content = module.read()
+        # the header comments of the modules differ
+        return content[content.index('"""'):]
+    assert _code(CLIENT_CODEC) == _code(yaml_codec.__file__)
@@ -0,0 +1,106 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of loading and dumping YAML using the YAML codec
+
+A multi-document stream is built from the valid documents of the sample YAML
+in tests/unit/yaml_samples, repeated, and is loaded and dumped using the pure
+Python loader and dumper of PyYAML and using the YAML codec, which uses the
+libyaml loader and dumper when available.
+
+The unit test only checks that both load and dump the same documents. The
+full scale benchmark, a stream of 20,000 documents, also reports and compares
+the timings, and is only run when the SHIPYARD_FULL_BENCHMARK environment
+variable is set.
+"""
+import os
+import time
+
+import pytest
+import yaml
+
+from shipyard_airflow.common import yaml_codec
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           'yaml_samples')
+
+
+def _sample_docs():
+    """Returns the documents of the samples that are valid YAML"""
+    docs = []
+    for name in sorted(os.listdir(SAMPLES_DIR)):
+        with open(os.path.join(SAMPLES_DIR, name)) as sample:
+            try:
+                docs.extend(doc for doc in yaml.safe_load_all(sample)
+                            if isinstance(doc, dict))
+            except yaml.YAMLError:
+                continue
+    return docs
+
+
+def _stream(doc_count):
+    """Returns a multi-document stream of doc_count sample documents"""
+    samples = _sample_docs()
+    docs = [samples[i % len(samples)] for i in range(doc_count)]
+    return yaml.safe_dump_all(docs, explicit_start=True)
+
+
+def _timed(func, arg, rounds):
+    """Returns the best time of rounds calls of func, and its result"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _compare(doc_count, rounds=1):
+    """Returns the load and dump times of the pure Python implementation and
+    of the codec
+    """
+    stream = _stream(doc_count)
+    py_load, py_docs = _timed(
+        lambda s: list(yaml.load_all(s, Loader=yaml.SafeLoader)), stream,
+        rounds)
+    codec_load, codec_docs = _timed(
+        lambda s: list(yaml_codec.load_all(s)), stream, rounds)
+    py_dump, _ = _timed(
+        lambda d: yaml.dump_all(d, Dumper=yaml.SafeDumper), py_docs, rounds)
+    codec_dump, codec_stream = _timed(yaml_codec.dump_all, codec_docs,
+                                      rounds)
+    # the codec loads and dumps the same documents
+    assert codec_docs == py_docs
+    assert len(codec_docs) == doc_count
+    assert list(yaml_codec.load_all(codec_stream)) == py_docs
+    return len(stream), (py_load, codec_load), (py_dump, codec_dump)
+
+
+def test_load_dump():
+    """Loads and dumps a stream of 200 documents"""
+    _compare(200)
+
+
+@pytest.mark.skipif(not os.environ.get('SHIPYARD_FULL_BENCHMARK'),
+                    reason='SHIPYARD_FULL_BENCHMARK is not set')
+def test_load_dump_full_scale():
+    """Loads and dumps a stream of 20,000 documents"""
+    size, load, dump = _compare(20000, rounds=3)
+    print('20000 documents ({} KiB), libyaml {}: load python {:.3f}s, codec '
+          '{:.3f}s; dump python {:.3f}s, codec {:.3f}s'.format(
+              size // 1024, yaml_codec.LIBYAML, load[0], load[1], dump[0],
+              dump[1]))
+    if yaml_codec.LIBYAML:
+        assert load[1] < load[0]
+        assert dump[1] < dump[0]
@@ -83,7 +83,7 @@ def create_resp():
     return resp
 
 
-def actions_db():
+def actions_db(after=None, since=None, name=None, limit=None):
     """
     replaces the actual db call
     """
@@ -113,7 +113,7 @@ def actions_db():
     ]
 
 
-def dag_runs_db():
+def dag_runs_db(action_ids=None):
     """
     replaces the actual db call
     """
@@ -139,7 +139,7 @@ def dag_runs_db():
     ]
 
 
-def tasks_db():
+def tasks_db(action_ids=None):
     """
     replaces the actual db call
     """
@@ -299,8 +299,8 @@ def test_get_all_actions(*args):
     """
     action_resource = ActionsResource()
     action_resource.get_all_actions_db = actions_db
-    action_resource.get_all_dag_runs_db = dag_runs_db
-    action_resource.get_all_tasks_db = tasks_db
+    action_resource.get_dag_runs_for_actions_db = dag_runs_db
+    action_resource.get_tasks_for_actions_db = tasks_db
     result = action_resource.get_all_actions(verbosity=1)
     assert len(result) == len(actions_db())
     for action in result:
@@ -320,8 +320,8 @@ def test_get_all_actions_notes(*args):
     """
     action_resource = ActionsResource()
     action_resource.get_all_actions_db = actions_db
-    action_resource.get_all_dag_runs_db = dag_runs_db
-    action_resource.get_all_tasks_db = tasks_db
+    action_resource.get_dag_runs_for_actions_db = dag_runs_db
+    action_resource.get_tasks_for_actions_db = tasks_db
     # inject some notes
     nh.make_action_note('aaaaaa', "hello from aaaaaa1")
     nh.make_action_note('aaaaaa', "hello from aaaaaa2")
@@ -337,12 +337,154 @@ def test_get_all_actions_notes(*args):
             assert action['notes'][0]['note_val'] == 'hello from bbbbbb'
 
 
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+def test_get_all_actions_paged(*args):
+    """
+    Tests that the paging and filters are passed to the database and that
+    only the page of actions is correlated with airflow
+    """
+    action_resource = ActionsResource()
+    action_resource.get_all_actions_db = mock.MagicMock(
+        return_value=actions_db()[1:])
+    action_resource.get_dag_runs_for_actions_db = mock.MagicMock(
+        return_value=dag_runs_db())
+    action_resource.get_tasks_for_actions_db = mock.MagicMock(
+        return_value=tasks_db())
+    result = action_resource.get_all_actions(
+        verbosity=1, limit=1, after='aaaaaa', since=DATE_ONE, name='dag2')
+    action_resource.get_all_actions_db.assert_called_once_with(
+        after='aaaaaa', since=DATE_ONE, name='dag2', limit=1)
+    action_resource.get_dag_runs_for_actions_db.assert_called_once_with(
+        ['bbbbbb'])
+    action_resource.get_tasks_for_actions_db.assert_called_once_with(
+        ['bbbbbb'])
+    assert [action['id'] for action in result] == ['bbbbbb']
+    assert len(result[0]['steps']) == 3
+
+
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+def test_get_all_actions_lifecycle(*args):
+    """
+    Tests that the lifecycle filter reads pages until the limit is met
+    """
+    pages = [actions_db()[0:1], actions_db()[1:2], []]
+    action_resource = ActionsResource()
+    action_resource.get_all_actions_db = mock.MagicMock(side_effect=pages)
+    action_resource.get_dag_runs_for_actions_db = dag_runs_db
+    action_resource.get_tasks_for_actions_db = mock.MagicMock(
+        return_value=tasks_db())
+    result = action_resource.get_all_actions(
+        verbosity=1, limit=1, lifecycle='Complete')
+    assert [action['id'] for action in result] == ['bbbbbb']
+    assert result[0]['action_lifecycle'] == 'Complete'
+    assert action_resource.get_all_actions_db.call_count == 2
+    action_resource.get_all_actions_db.assert_called_with(
+        after='aaaaaa', since=None, name=None, limit=1)
+    # steps are only retrieved for the actions that match the lifecycle
+    action_resource.get_tasks_for_actions_db.assert_has_calls(
+        [mock.call([]), mock.call(['bbbbbb'])])
+
+
+def test_get_all_actions_notes_bulk():
+    """
+    Tests that the notes of the listed actions are retrieved once per page
+    """
+    notes_helper = NotesHelper(NotesManager(MemoryNotesStorage(), get_token))
+    notes_helper.make_action_note('aaaaaa', 'action a note')
+    notes_helper.make_action_note('bbbbbb', 'action b note')
+    notes_helper.make_step_note('bbbbbb', '1a', 'step note')
+    action_resource = ActionsResource()
+    action_resource.get_all_actions_db = actions_db
+    action_resource.get_dag_runs_for_actions_db = dag_runs_db
+    action_resource.get_tasks_for_actions_db = tasks_db
+    with mock.patch.object(actions_api, 'notes_helper', new=notes_helper):
+        with mock.patch.object(notes_helper, 'get_notes_for_actions',
+                               wraps=notes_helper.get_notes_for_actions) as gn:
+            result = action_resource.get_all_actions(verbosity=1)
+            gn.assert_called_once_with(action_ids=['aaaaaa', 'bbbbbb'],
+                                       verbosity=1, step_verbosity=0)
+    assert [note['note_val'] for note in result[0]['notes']] == [
+        'action a note']
+    assert [note['note_val'] for note in result[1]['notes']] == [
+        'action b note']
+    # step notes are not part of the list of actions
+    assert all(not step['notes'] for step in result[1]['steps'])
+
+
+def test_get_task_map():
+    """
+    Tests that tasks are grouped by root dag_id and execution date,
+    including the tasks of subdags, retaining their order
+    """
+    tasks = [
+        {'task_id': 'a', 'dag_id': 'did2', 'execution_date': DATE_ONE},
+        {'task_id': 'b', 'dag_id': 'did2.sub', 'execution_date': DATE_ONE},
+        {'task_id': 'c', 'dag_id': 'did2', 'execution_date': DATE_TWO},
+        {'task_id': 'd', 'dag_id': 'did22', 'execution_date': DATE_ONE},
+        {'task_id': 'e', 'dag_id': 'did2', 'execution_date': DATE_ONE},
+    ]
+    action_resource = ActionsResource()
+    action_resource.get_tasks_for_actions_db = mock.MagicMock(
+        return_value=tasks)
+    task_map = action_resource.get_task_map(['aaaaaa', 'bbbbbb'])
+    action_resource.get_tasks_for_actions_db.assert_called_once_with(
+        ['aaaaaa', 'bbbbbb'])
+    assert {
+        key: [task['task_id'] for task in key_tasks]
+        for key, key_tasks in task_map.items()
+    } == {
+        ('did2', DATE_ONE_STR): ['a', 'b', 'e'],
+        ('did2', DATE_TWO_STR): ['c'],
+        ('did22', DATE_ONE_STR): ['d'],
+    }
+
+
+def _list_req(query_string):
+    """Creates a falcon GET request with the specified query string"""
+    env = testing.create_environ(path='/', query_string=query_string)
+    return falcon.Request(env)
+
+
+def test_parse_list_filters():
+    action_resource = ActionsResource()
+    filters = action_resource.parse_list_filters(_list_req(''))
+    assert filters == {'limit': None, 'after': None, 'since': None,
+                       'name': None, 'lifecycle': None}
+
+    filters = action_resource.parse_list_filters(_list_req(
+        'limit=5&after=01BTP9T2WCE1PAJR2DWYXG805V&since=2017-09-13T11:13:03'
+        '&name=deploy_site&lifecycle=failed'))
+    assert filters == {
+        'limit': 5,
+        'after': '01BTP9T2WCE1PAJR2DWYXG805V',
+        'since': datetime(2017, 9, 13, 11, 13, 3),
+        'name': 'deploy_site',
+        'lifecycle': 'Failed'
+    }
+
+
+@pytest.mark.parametrize('query_string', [
+    'limit=0',
+    'limit=ten',
+    'after=short',
+    'since=notadate',
+    'lifecycle=Sleeping',
+])
+def test_parse_list_filters_invalid(query_string):
+    action_resource = ActionsResource()
+    with pytest.raises(ApiError) as api_err:
+        action_resource.parse_list_filters(_list_req(query_string))
+    assert api_err.value.status == falcon.HTTP_400
+
+
 def _gen_action_resource_stubbed():
     # TODO(bryan-strassner): mabye subclass this instead?
     action_resource = ActionsResource()
     action_resource.get_all_actions_db = actions_db
-    action_resource.get_all_dag_runs_db = dag_runs_db
-    action_resource.get_all_tasks_db = tasks_db
+    action_resource.get_dag_runs_for_actions_db = dag_runs_db
+    action_resource.get_tasks_for_actions_db = tasks_db
     action_resource.invoke_airflow_dag = airflow_stub
     action_resource.insert_action = insert_action_stub
     action_resource.audit_control_command_db = audit_control_command_db
@@ -608,25 +750,27 @@ def test_auth_alignment(auth, *args):
 
 
 @patch('shipyard_airflow.db.shipyard_db.ShipyardDbAccess.'
-       'get_all_submitted_actions')
-def test_get_all_actions_db(mock_get_all_submitted_actions):
+       'get_submitted_actions')
+def test_get_all_actions_db(mock_get_submitted_actions):
     act_resource = ActionsResource()
-    act_resource.get_all_actions_db()
-    assert mock_get_all_submitted_actions.called
+    act_resource.get_all_actions_db(name='deploy_site', limit=10)
+    mock_get_submitted_actions.assert_called_once_with(
+        after=None, since=None, name='deploy_site', limit=10)
 
 
-@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.get_all_dag_runs')
-def test_get_all_dag_runs_db(mock_get_all_dag_runs):
+@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.'
+       'get_dag_runs_by_run_ids')
+def test_get_dag_runs_for_actions_db(mock_get_dag_runs_by_run_ids):
     act_resource = ActionsResource()
-    act_resource.get_all_dag_runs_db()
-    assert mock_get_all_dag_runs.called
+    act_resource.get_dag_runs_for_actions_db(['aaaaaa'])
+    mock_get_dag_runs_by_run_ids.assert_called_once_with(run_ids=['aaaaaa'])
 
 
-@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.get_all_tasks')
-def test_get_all_tasks_db(mock_get_all_tasks):
+@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.get_tasks_by_run_ids')
+def test_get_tasks_for_actions_db(mock_get_tasks_by_run_ids):
     act_resource = ActionsResource()
-    act_resource.get_all_tasks_db()
-    assert mock_get_all_tasks.called
+    act_resource.get_tasks_for_actions_db(['aaaaaa'])
+    mock_get_tasks_by_run_ids.assert_called_once_with(run_ids=['aaaaaa'])
 
 
 @patch('shipyard_airflow.db.shipyard_db.ShipyardDbAccess.insert_action')
@@ -0,0 +1,138 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the correlation of actions, dag runs and steps when listing
+actions.
+
+The database access is replaced by synthetic tables of actions, dag runs and
+tasks (including subdag tasks), so that only the work done by the API to
+correlate them is measured.
+
+The unit test only checks the listing and the queries it makes. The full
+scale benchmark, 10,000 actions having 200 tasks each, also times the
+listing to check that it scales linearly. It needs several hundred MB of
+memory and is only run when the SHIPYARD_FULL_BENCHMARK environment variable
+is set.
+"""
+from datetime import datetime, timedelta
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from shipyard_airflow.common.notes.notes import NotesManager
+from shipyard_airflow.common.notes.notes_helper import NotesHelper
+from shipyard_airflow.common.notes.storage_impl_mem import (
+    MemoryNotesStorage
+)
+from shipyard_airflow.control.action.actions_api import ActionsResource
+
+TASKS_PER_ACTION = 200
+SUBDAG_TASKS_PER_ACTION = 50
+BASE_DATE = datetime(2018, 1, 1)
+
+nh = NotesHelper(NotesManager(MemoryNotesStorage(), lambda: "token"))
+
+
+def _synthetic_tables(action_count):
+    """Builds the actions, dag runs and tasks for a number of actions
+
+    Each action has a dag run with TASKS_PER_ACTION tasks, some of which
+    belong to a subdag of the action's dag.
+    """
+    actions = []
+    dag_runs = []
+    tasks = []
+    task_ids = ['task_{}'.format(i) for i in range(TASKS_PER_ACTION)]
+    for i in range(action_count):
+        action_id = '{:026d}'.format(i)
+        dag_id = 'deploy_site' if i % 2 else 'update_site'
+        execution_date = BASE_DATE + timedelta(seconds=i)
+        actions.append({
+            'id': action_id,
+            'name': dag_id,
+            'dag_id': dag_id,
+            'dag_execution_date': execution_date.strftime(
+                '%Y-%m-%dT%H:%M:%S'),
+        })
+        dag_runs.append({
+            'dag_id': dag_id,
+            'execution_date': execution_date,
+            'state': 'success',
+            'run_id': action_id,
+        })
+        for j, task_id in enumerate(task_ids):
+            tasks.append({
+                'task_id': task_id,
+                'dag_id': (dag_id + '.subdag'
+                           if j < SUBDAG_TASKS_PER_ACTION else dag_id),
+                'execution_date': execution_date,
+                'state': 'success',
+            })
+    return actions, dag_runs, tasks
+
+
+def _list_actions(action_count, rounds=1):
+    """Returns the best of rounds timings of listing action_count actions,
+    and the resource used
+    """
+    actions, dag_runs, tasks = _synthetic_tables(action_count)
+    action_resource = ActionsResource()
+    action_resource.get_all_actions_db = mock.MagicMock(
+        side_effect=lambda **kwargs: [dict(a) for a in actions])
+    action_resource.get_dag_runs_for_actions_db = mock.MagicMock(
+        return_value=dag_runs)
+    action_resource.get_tasks_for_actions_db = mock.MagicMock(
+        return_value=tasks)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = action_resource.get_all_actions(verbosity=0)
+        timings.append(time.perf_counter() - start)
+        assert len(result) == action_count
+        assert all(len(a['steps']) == TASKS_PER_ACTION for a in result)
+    return min(timings), action_resource
+
+
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+@mock.patch('shipyard_airflow.control.helpers.action_helper.notes_helper',
+            new=nh)
+def test_list_actions(*args):
+    """Lists 200 actions, querying dag runs and tasks once for the page"""
+    _, action_resource = _list_actions(200)
+    assert action_resource.get_all_actions_db.call_count == 1
+    assert action_resource.get_dag_runs_for_actions_db.call_count == 1
+    assert action_resource.get_tasks_for_actions_db.call_count == 1
+    assert len(
+        action_resource.get_tasks_for_actions_db.call_args[0][0]) == 200
+
+
+@pytest.mark.skipif(not os.environ.get('SHIPYARD_FULL_BENCHMARK'),
+                    reason='SHIPYARD_FULL_BENCHMARK is not set')
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+@mock.patch('shipyard_airflow.control.helpers.action_helper.notes_helper',
+            new=nh)
+def test_list_actions_full_scale(*args):
+    """Lists 10,000 actions having 200 tasks each, checking linear scaling
+    against a tenth of the actions
+
+    A quadratic correlation of actions and tasks would take 100 times as
+    long, so a generous bound still distinguishes the two.
+    """
+    small, _ = _list_actions(1000, rounds=3)
+    large, _ = _list_actions(10000, rounds=3)
+    print('1000 actions {:.3f}s, 10000 actions {:.3f}s'.format(small, large))
+    assert large < small * 20
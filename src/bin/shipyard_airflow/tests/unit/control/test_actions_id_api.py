@@ -169,6 +169,35 @@ def test_on_get(mock_authorize, mock_get_action):
     assert resp.body == '"action_returned"'
     assert resp.status == '200 OK'
 
+
+@mock.patch.object(
+    ActionsIdResource, 'get_action', return_value='action_returned')
+@mock.patch.object(ShipyardPolicy, 'authorize', return_value=True)
+def test_on_get_not_modified(mock_authorize, mock_get_action):
+    action_resource = ActionsIdResource()
+    context.policy_engine = ShipyardPolicy()
+    resp = create_resp()
+    action_resource.on_get(create_req(context, None), resp, action_id=None)
+    etag = resp.etag
+    assert etag
+
+    # the action is unchanged since the ETag
+    req = create_req(context, None)
+    req.env['HTTP_IF_NONE_MATCH'] = etag
+    resp = create_resp()
+    action_resource.on_get(req, resp, action_id=None)
+    assert resp.status == '304 Not Modified'
+    assert resp.body is None
+    assert resp.etag == etag
+
+    # the action has changed
+    mock_get_action.return_value = 'action_changed'
+    resp = create_resp()
+    action_resource.on_get(req, resp, action_id=None)
+    assert resp.status == '200 OK'
+    assert resp.body == '"action_changed"'
+    assert resp.etag != etag
+
 @mock.patch('shipyard_airflow.control.helpers.action_helper.notes_helper',
             new=nh)
 @mock.patch('shipyard_airflow.control.action.actions_id_api.notes_helper',
@@ -19,8 +19,11 @@ import falcon
 import pytest
 import requests
 
-from shipyard_airflow.control.action.actions_steps_id_logs_api import \
-    ActionsStepsLogsResource
+from shipyard_airflow.control.action import actions_steps_id_logs_api
+from shipyard_airflow.control.action.actions_steps_id_logs_api import (
+    ActionsStepsLogsResource,
+    StepLog
+)
 from shipyard_airflow.errors import ApiError
 from tests.unit.control import common
 
@@ -129,9 +132,79 @@ INFO - Done. Returned value was: None
 """
 
 
+class _Response:
+    """A streamed response of a worker"""
+    def __init__(self, status_code, data, headers=None):
+        self.status_code = status_code
+        self.content = data
+        self.text = data.decode()
+        self.headers = headers or {}
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class _Worker:
+    """Serves a log as an Airflow worker, supporting ranges or not"""
+    def __init__(self, log, ranges=True, content_length=True):
+        self.log = log.encode()
+        self.ranges = ranges
+        self.content_length = content_length
+        self.requests = []
+        self.responses = []
+
+    def get(self, url, headers=None, stream=False, timeout=None):
+        self.requests.append(headers or {})
+        response = self._response((headers or {}).get('Range'))
+        self.responses.append(response)
+        return response
+
+    def _response(self, range_header):
+        length = len(self.log)
+        if not range_header or not self.ranges:
+            headers = {}
+            if self.content_length:
+                headers['Content-Length'] = str(length)
+            return _Response(200, self.log, headers)
+        first, last = range_header[len('bytes='):].split('-')
+        if not first:
+            first = max(length - int(last), 0)
+            last = length - 1
+        else:
+            first = int(first)
+            last = min(int(last), length - 1) if last else length - 1
+        if first > last:
+            return _Response(416, b'')
+        return _Response(206, self.log[first:last + 1], {
+            'Content-Range': 'bytes {}-{}/{}'.format(first, last, length)})
+
+
+def _step_log_responder(*args, **kwargs):
+    return StepLog([b'log ', b'text'])
+
+
+def _range_step_log_responder(*args, **kwargs):
+    return StepLog([b'text'], 'bytes 4-7/8')
+
+
+def _read(step_log):
+    return b''.join(step_log.chunks).decode()
+
+
+LOG_ENDPOINT = ('http://airflow-worker-0.ucp.svc.cluster.local:8793/'
+                'log/deploy_site/action_xcom/2018-04-05T16:29:11/2.log')
+
+LOG_LINES = ''.join('line {}\n'.format(i) for i in range(1000))
+
+
 class TestActionsStepsLogsEndpoint():
     @patch.object(ActionsStepsLogsResource, 'get_action_step_logs',
-                  common.str_responder)
+                  _step_log_responder)
     def test_on_get(self, api_client):
         """Validate the on_get method returns 200 on success"""
         # Define Endpoint
@@ -142,6 +215,26 @@ class TestActionsStepsLogsEndpoint():
         result = api_client.simulate_get(endpoint,
                                          headers=common.AUTH_HEADERS)
         assert result.status_code == 200
+        assert result.text == 'log text'
+
+    def test_on_get_range(self, api_client):
+        """Validate a range of a log is a 206 response"""
+        endpoint = "/api/v1.0/actions/{}/steps/{}/logs".format(
+            '01C9VVQSCFS7V9QB5GBS3WFVSE',
+            'action_xcom')
+        headers = dict(common.AUTH_HEADERS, Range='bytes=4-')
+        with patch.object(ActionsStepsLogsResource, 'get_action_step_logs',
+                          side_effect=_range_step_log_responder) as get_logs:
+            result = api_client.simulate_get(endpoint, headers=headers)
+        assert result.status_code == 206
+        assert result.headers['Content-Range'] == 'bytes 4-7/8'
+        assert result.text == 'text'
+        assert get_logs.call_args[1] == {'byte_range': (4, -1),
+                                         'tail': None}
+
+        result = api_client.simulate_get(
+            endpoint, headers=headers, query_string='tail=10')
+        assert result.status_code == 400
 
     @patch('shipyard_airflow.control.helpers.action_helper.ActionsHelper',
            autospec=True)
@@ -170,52 +263,126 @@ class TestActionsStepsLogsEndpoint():
         mock_actions_helper.get_formatted_dag_execution_date.\
             assert_called_once_with(step)
 
-    def _mock_response(
-            self,
-            status=200,
-            text="TEXT"):
-
-        mock_resp = mock.Mock()
-
-        # set status code and content
-        mock_resp.status_code = status
-        mock_resp.text = text
+    def test_retrieve_logs(self):
+        """Tests log retrieval"""
+        action_logs_resource = ActionsStepsLogsResource()
+        worker = _Worker(XCOM_RUN_LOGS)
+        with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                               return_value=worker):
+            result = action_logs_resource.retrieve_logs(LOG_ENDPOINT)
+            assert result.content_range is None
+            assert _read(result) == XCOM_RUN_LOGS
+        # the log is streamed, and the connection released after
+        assert worker.responses[0].closed
 
-        return mock_resp
+    def test_retrieve_logs_range(self):
+        """Tests retrieval of a range of a log"""
+        action_logs_resource = ActionsStepsLogsResource()
+        for worker in (_Worker(LOG_LINES), _Worker(LOG_LINES, ranges=False)):
+            with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                                   return_value=worker):
+                result = action_logs_resource.retrieve_logs(
+                    LOG_ENDPOINT, byte_range=(7, 13))
+                assert _read(result) == 'line 1\n'
+                assert result.content_range == 'bytes 7-13/{}'.format(
+                    len(LOG_LINES))
+                result = action_logs_resource.retrieve_logs(
+                    LOG_ENDPOINT, byte_range=(-9, -1))
+                assert _read(result) == 'line 999\n'
+                result = action_logs_resource.retrieve_logs(
+                    LOG_ENDPOINT, byte_range=(len(LOG_LINES) - 9, -1))
+                assert _read(result) == 'line 999\n'
+            assert worker.requests[0]['Range'] == 'bytes=7-13'
+            assert worker.requests[1]['Range'] == 'bytes=-9'
 
-    @mock.patch('requests.get')
-    def test_retrieve_logs(self, mock_get):
-        """Tests log retrieval"""
+    def test_retrieve_logs_range_no_length(self):
+        """Tests retrieval of a range of a log of an unknown length"""
         action_logs_resource = ActionsStepsLogsResource()
+        worker = _Worker(LOG_LINES, ranges=False, content_length=False)
+        with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                               return_value=worker):
+            result = action_logs_resource.retrieve_logs(
+                LOG_ENDPOINT, byte_range=(7, 13))
+            assert _read(result) == 'line 1\n'
+            assert result.content_range is None
+            result = action_logs_resource.retrieve_logs(
+                LOG_ENDPOINT, byte_range=(-9, -1))
+            assert _read(result) == 'line 999\n'
 
-        # Define variables
-        log_endpoint = (
-            'http://airflow-worker-0.ucp.svc.cluster.local:8793/'
-            'log/deploy_site/action_xcom/2018-04-05T16:29:11/2.log')
+    def test_retrieve_logs_range_beyond_end(self):
+        action_logs_resource = ActionsStepsLogsResource()
+        for worker in (_Worker('log'), _Worker('log', ranges=False)):
+            with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                                   return_value=worker):
+                with pytest.raises(ApiError) as e:
+                    action_logs_resource.retrieve_logs(
+                        LOG_ENDPOINT, byte_range=(3, -1))
+            assert falcon.HTTP_416 == e.value.status
 
-        mock_resp = self._mock_response(text=XCOM_RUN_LOGS)
-        mock_get.return_value = mock_resp
+    def test_retrieve_logs_tail(self):
+        """Tests retrieval of the last lines of a log"""
+        action_logs_resource = ActionsStepsLogsResource()
+        expected = 'line 998\nline 999\n'
+        for worker in (_Worker(LOG_LINES), _Worker(LOG_LINES, ranges=False)):
+            with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                                   return_value=worker):
+                result = action_logs_resource.retrieve_logs(
+                    LOG_ENDPOINT, tail=2)
+            assert _read(result) == expected
+            assert result.content_range == 'bytes {}-{}/{}'.format(
+                len(LOG_LINES) - len(expected), len(LOG_LINES) - 1,
+                len(LOG_LINES))
 
-        result = action_logs_resource.retrieve_logs(log_endpoint)
+    def test_retrieve_logs_tail_window(self):
+        """Tests the window at the end of the log grows to hold the lines"""
+        action_logs_resource = ActionsStepsLogsResource()
+        worker = _Worker(LOG_LINES)
+        with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                               return_value=worker), \
+                mock.patch.object(actions_steps_id_logs_api, 'TAIL_WINDOW',
+                                  20):
+            result = action_logs_resource.retrieve_logs(
+                LOG_ENDPOINT, tail=10)
+            assert _read(result) == ''.join(
+                'line {}\n'.format(i) for i in range(990, 1000))
+            assert [r['Range'] for r in worker.requests] == [
+                'bytes=-20', 'bytes=-80', 'bytes=-320']
+            result = action_logs_resource.retrieve_logs(
+                LOG_ENDPOINT, tail=2000)
+            assert _read(result) == LOG_LINES
+            assert action_logs_resource.retrieve_logs(
+                LOG_ENDPOINT, tail=0).chunks == []
 
-        assert result == XCOM_RUN_LOGS
+    def test_retrieve_logs_tail_empty(self):
+        action_logs_resource = ActionsStepsLogsResource()
+        for worker in (_Worker(''), _Worker('', ranges=False)):
+            with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                                   return_value=worker):
+                result = action_logs_resource.retrieve_logs(
+                    LOG_ENDPOINT, tail=5)
+            assert _read(result) == ''
+            assert result.content_range is None
 
-    @mock.patch('requests.get')
-    def test_retrieve_logs_404(self, mock_get):
-        mock_get.return_value.status_code = 404
+    def test_retrieve_logs_404(self):
+        worker = mock.Mock()
+        worker.get.return_value.status_code = 404
         action_logs_resource = ActionsStepsLogsResource()
-        with pytest.raises(ApiError) as e:
-            action_logs_resource.retrieve_logs(None)
+        with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                               return_value=worker):
+            with pytest.raises(ApiError) as e:
+                action_logs_resource.retrieve_logs(None)
         assert ('Airflow endpoint returned error status code' in
                 e.value.description)
         assert falcon.HTTP_404 == e.value.status
 
-    @mock.patch('requests.get')
-    def test_retrieve_logs_error(self, mock_get):
-        mock_get.side_effect = requests.exceptions.ConnectionError
+    def test_retrieve_logs_error(self):
+        worker = mock.Mock()
+        worker.get.side_effect = requests.exceptions.ConnectionError
         action_logs_resource = ActionsStepsLogsResource()
-        with pytest.raises(ApiError) as e:
-            action_logs_resource.retrieve_logs(None)
+        with mock.patch.object(actions_steps_id_logs_api, 'get_session',
+                               return_value=worker):
+            with pytest.raises(ApiError) as e:
+                action_logs_resource.retrieve_logs(None)
         assert ("Exception happened during Airflow API request" in
                 e.value.description)
         assert falcon.HTTP_500 == e.value.status
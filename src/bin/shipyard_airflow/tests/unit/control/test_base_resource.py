@@ -15,7 +15,11 @@
 import json
 import pytest
 
-from shipyard_airflow.control.base import BaseResource, ShipyardRequestContext
+from shipyard_airflow.control.base import (
+    BaseResource,
+    etag_matches,
+    ShipyardRequestContext
+)
 from shipyard_airflow.control.json_schemas import ACTION
 from shipyard_airflow.errors import InvalidFormatError
 from tests.unit.control.common import create_req, create_resp
@@ -89,3 +93,15 @@ def test_to_json():
     }
     results = baseResource.to_json(body_dict)
     assert results == json.dumps(body_dict)
+
+
+def test_etag_matches():
+    '''test matching entity tags to If-None-Match headers'''
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', '"xyz", "abc"')
+    assert etag_matches('"abc"', '*')
+    assert not etag_matches('"abc"', '"xyz"')
+    assert not etag_matches('"abc"', 'abc')
+    assert not etag_matches('"abc"', None)
+    assert not etag_matches('"abc"', '')
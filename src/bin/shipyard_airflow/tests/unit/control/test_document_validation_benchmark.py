@@ -0,0 +1,151 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the document lookups done by Shipyard's document validators
+
+The validators run for a deployment action are run against a synthetic site
+design, once looking up each document from Deckhand, and once using the
+documents of the revision retrieved once and indexed by the validation
+manager. Retrieving the documents is simulated by deserializing the whole
+site design, as each lookup renders the whole revision in Deckhand.
+
+The unit test only checks the number of retrievals of the revision. The full
+scale benchmark, a site design of 20,000 documents, also reports and compares
+the timings, and is only run when the SHIPYARD_FULL_BENCHMARK environment
+variable is set.
+"""
+import json
+import os
+import time
+from unittest import mock
+
+import pytest
+import yaml
+
+from shipyard_airflow.common.document_validators.document_validation_utils \
+    import _matches_filters
+from shipyard_airflow.common.document_validators.document_validator_manager \
+    import DocumentValidationManager
+from shipyard_airflow.control.validators.validate_deployment_configuration \
+    import ValidateDeploymentConfigurationFull
+import tests.unit.common.deployment_group.test_deployment_group_manager as tdgm
+
+VALIDATIONS = [(ValidateDeploymentConfigurationFull,
+                'deployment-configuration')]
+
+
+def _site_design(node_count):
+    """Returns the serialized site design having node_count node documents,
+    and the Shipyard documents needed by the validators
+    """
+    docs = [
+        {
+            'schema': 'shipyard/DeploymentConfiguration/v1',
+            'metadata': {'name': 'deployment-configuration'},
+            'data': {
+                'physical_provisioner': {
+                    'deployment_strategy': 'deployment-strategy'
+                },
+                'armada': {'manifest': 'full-site'}
+            }
+        },
+        {
+            'schema': 'shipyard/DeploymentStrategy/v1',
+            'metadata': {'name': 'deployment-strategy'},
+            'data': {'groups': yaml.safe_load(tdgm.GROUPS_YAML)}
+        },
+    ]
+    for i in range(node_count):
+        docs.append({
+            'schema': 'drydock/BaremetalNode/v1',
+            'metadata': {'name': 'node{}'.format(i)},
+            'data': {
+                'oob': {'type': 'ipmi', 'network': 'oob',
+                        'account': 'admin'},
+                'host_profile': 'compute',
+                'addressing': [
+                    {'network': 'oob', 'address': '10.0.0.1'},
+                    {'network': 'pxe', 'address': 'dhcp'},
+                ],
+                'metadata': {'rack': 'rack{}'.format(i % 40),
+                             'tags': ['workers'],
+                             'owner_data': {'compute': 'true'}},
+            }
+        })
+    return json.dumps(docs)
+
+
+class _Counter:
+    def __init__(self, site_design):
+        self.site_design = site_design
+        self.calls = 0
+
+    def get_rendered_docs(self, revision_id):
+        """Retrieves the documents of the whole revision"""
+        self.calls += 1
+        return json.loads(self.site_design)
+
+    def documents(self, revision_id, rendered, **filters):
+        """Looks up documents as Deckhand would, rendering the revision"""
+        return [mock.Mock(data=doc['data'], metadata=doc['metadata'])
+                for doc in self.get_rendered_docs(revision_id)
+                if _matches_filters(doc, filters)]
+
+
+def _run_validations(site_design, indexed):
+    """Returns the timing and number of revision retrievals of a run of the
+    validations
+    """
+    counter = _Counter(site_design)
+    dh_client = mock.MagicMock()
+    dh_client.revisions.documents = counter.documents
+    start = time.perf_counter()
+    dvm = DocumentValidationManager(
+        dh_client, 1, VALIDATIONS,
+        get_rendered_docs=counter.get_rendered_docs if indexed else None)
+    dvm.validate()
+    elapsed = time.perf_counter() - start
+    assert not dvm.errored
+    assert dvm.validations_run == 2
+    return elapsed, counter.calls
+
+
+def _compare(node_count, rounds=1):
+    """Returns the fastest of rounds runs looking up each document and using
+    the indexed documents
+    """
+    site_design = _site_design(node_count)
+    per_lookup = min(_run_validations(site_design, False)
+                     for _ in range(rounds))
+    indexed = min(_run_validations(site_design, True) for _ in range(rounds))
+    # the configuration, the strategy, and the node inventory (nodes and
+    # host profiles)
+    assert per_lookup[1] == 4
+    assert indexed[1] == 1
+    return per_lookup, indexed
+
+
+def test_indexed_lookups():
+    """The indexed validation retrieves the revision's documents once"""
+    _compare(2000)
+
+
+@pytest.mark.skipif(not os.environ.get('SHIPYARD_FULL_BENCHMARK'),
+                    reason='SHIPYARD_FULL_BENCHMARK is not set')
+def test_indexed_lookups_full_scale():
+    """Validates a site design of 20,000 documents"""
+    per_lookup, indexed = _compare(20000, rounds=3)
+    print('20002 documents: per lookup {:.3f}s, {} retrievals; indexed '
+          '{:.3f}s, {} retrievals'.format(per_lookup[0], per_lookup[1],
+                                          indexed[0], indexed[1]))
+    assert indexed[0] < per_lookup[0]
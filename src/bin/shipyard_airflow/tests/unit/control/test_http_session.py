@@ -0,0 +1,94 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the pooled HTTP session shared by the API"""
+from unittest import mock
+
+from oslo_config import cfg
+import pytest
+import responses
+
+from shipyard_airflow.control import http_session
+from shipyard_airflow.control.helpers.deckhand_client import DeckhandClient
+
+CONF = cfg.CONF
+
+
+@pytest.fixture()
+def pool_conf():
+    """Sets the pool settings, providing a new session for each test"""
+    overrides = {
+        'http_pool_connections': 4,
+        'http_pool_maxsize': 8,
+        'http_pool_max_retries': 2,
+        'http_pool_retry_backoff_factor': 0.25,
+        'http_pool_retry_status_codes': [503],
+    }
+    for name, value in overrides.items():
+        CONF.set_override(name, value, group='requests_config')
+    http_session.reset_session()
+    yield
+    http_session.reset_session()
+    for name in overrides:
+        CONF.clear_override(name, group='requests_config')
+
+
+def test_session_settings(pool_conf):
+    session = http_session.get_session()
+    for prefix in ('http://', 'https://'):
+        adapter = session.get_adapter(prefix + 'deckhand-int')
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 8
+        assert adapter.max_retries.total == 2
+        assert adapter.max_retries.read == 0
+        assert adapter.max_retries.backoff_factor == 0.25
+        assert adapter.max_retries.status_forcelist == [503]
+        assert not adapter.max_retries.raise_on_status
+
+
+def test_session_reused(pool_conf):
+    assert http_session.get_session() is http_session.get_session()
+
+
+def test_session_per_process(pool_conf):
+    session = http_session.get_session()
+    with mock.patch.object(http_session.os, 'getpid', return_value=-1):
+        assert http_session.get_session() is not session
+
+
+def test_reset_session(pool_conf):
+    session = http_session.get_session()
+    with mock.patch.object(session, 'close') as close:
+        http_session.reset_session()
+    close.assert_called_once_with()
+    assert http_session.get_session() is not session
+
+
+@responses.activate
+@mock.patch('shipyard_airflow.control.helpers.deckhand_client.get_token',
+            return_value='token')
+def test_deckhand_requests_use_session(get_token, pool_conf):
+    url = 'http://deckhand-int/api/v1.0/revisions'
+    for method in ('GET', 'PUT', 'POST', 'DELETE'):
+        responses.add(method, url, body='{}', status=200)
+    session = http_session.get_session()
+    dh_client = DeckhandClient('context-marker')
+    with mock.patch.object(session, 'request',
+                           wraps=session.request) as request:
+        dh_client._get_request(url)
+        dh_client._put_request(url, document_data='docs')
+        dh_client._post_request(url)
+        dh_client._delete_request(url)
+    assert [call[0][0] for call in request.call_args_list] == [
+        'GET', 'PUT', 'POST', 'DELETE']
+    assert len(responses.calls) == 4
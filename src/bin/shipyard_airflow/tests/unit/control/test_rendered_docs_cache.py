@@ -0,0 +1,164 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the rendered documents cache and its use by the Deckhand
+client
+"""
+from unittest import mock
+
+import pytest
+
+from .fake_response import FakeResponse
+from shipyard_airflow.control.helpers import deckhand_client
+from shipyard_airflow.control.helpers.deckhand_client import (
+    DeckhandClient, DeckhandResponseError)
+from shipyard_airflow.control.helpers.rendered_docs_cache import (
+    RenderedDocsCache)
+
+RENDERED_DOCS = """---
+schema: shipyard/DeploymentConfiguration/v1
+metadata:
+  name: deployment-configuration
+data:
+  armada:
+    manifest: full-site
+---
+schema: deckhand/Passphrase/v1
+metadata:
+  name: admin-password
+data: {}
+...
+"""
+
+
+def test_rendered_docs_cache_hit_miss():
+    cache = RenderedDocsCache(max_entries=2, max_bytes=1024 * 1024)
+    assert cache.get(1) is None
+    cache.put(1, RENDERED_DOCS)
+    assert cache.get(1) == RENDERED_DOCS
+    assert cache.get('1') == RENDERED_DOCS
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+    assert 0 < stats['bytes'] < len(RENDERED_DOCS)
+
+
+def test_rendered_docs_cache_cleartext_variant():
+    cache = RenderedDocsCache(max_entries=2, max_bytes=1024 * 1024)
+    cache.put(1, 'redacted')
+    assert cache.get(1, cleartext_secrets=True) is None
+    cache.put(1, 'cleartext', cleartext_secrets=True)
+    assert cache.get(1) == 'redacted'
+    assert cache.get(1, cleartext_secrets=True) == 'cleartext'
+
+
+def test_rendered_docs_cache_lru_entries():
+    cache = RenderedDocsCache(max_entries=2, max_bytes=1024 * 1024)
+    cache.put(1, 'rev1')
+    cache.put(2, 'rev2')
+    # use revision 1, making revision 2 the least recently used
+    assert cache.get(1) == 'rev1'
+    cache.put(3, 'rev3')
+    assert cache.get(2) is None
+    assert cache.get(1) == 'rev1'
+    assert cache.get(3) == 'rev3'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_rendered_docs_cache_lru_bytes():
+    cache = RenderedDocsCache(max_entries=10, max_bytes=1)
+    cache.put(1, 'rev1')
+    assert cache.get(1) is None
+    cache = RenderedDocsCache(max_entries=10, max_bytes=1024 * 1024)
+    cache.put(1, RENDERED_DOCS)
+    cache._max_bytes = cache.stats()['bytes'] * 2
+    cache.put(2, RENDERED_DOCS)
+    cache.put(3, RENDERED_DOCS)
+    assert cache.get(1) is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_rendered_docs_cache_disabled():
+    cache = RenderedDocsCache(max_entries=0, max_bytes=1024 * 1024)
+    cache.put(1, RENDERED_DOCS)
+    assert cache.get(1) is None
+
+
+@pytest.fixture()
+def rendered_docs_cache():
+    """Replaces the process-wide rendered documents cache"""
+    cache = RenderedDocsCache(max_entries=4, max_bytes=1024 * 1024)
+    with mock.patch.object(deckhand_client, 'RENDERED_DOCS_CACHE',
+                           new=cache):
+        yield cache
+
+
+@mock.patch.object(DeckhandClient, 'get_path', new=lambda path: path.value)
+def test_get_rendered_docs_cached(rendered_docs_cache):
+    dh_client = DeckhandClient('context-marker')
+    with mock.patch.object(
+            DeckhandClient, '_get_request',
+            return_value=FakeResponse(200, RENDERED_DOCS)) as get_request:
+        for cleartext_secrets in (False, True, False, True):
+            assert dh_client.get_rendered_docs_from_revision(
+                revision_id=5,
+                cleartext_secrets=cleartext_secrets) == RENDERED_DOCS
+        assert get_request.call_count == 2
+        get_request.assert_called_with(
+            '/revisions/5/rendered-documents',
+            params={'cleartext-secrets': 'true'})
+        # documents of a single bucket are not cached
+        dh_client.get_rendered_docs_from_revision(revision_id=5,
+                                                  bucket_id='mop')
+        assert get_request.call_count == 3
+    assert rendered_docs_cache.stats()['entries'] == 2
+
+
+@mock.patch.object(DeckhandClient, 'get_path', new=lambda path: path.value)
+def test_get_rendered_docs_error_not_cached(rendered_docs_cache):
+    dh_client = DeckhandClient('context-marker')
+    with mock.patch.object(DeckhandClient, '_get_request',
+                           return_value=FakeResponse(500, 'broken')):
+        with pytest.raises(DeckhandResponseError):
+            dh_client.get_rendered_docs_from_revision(revision_id=5)
+    assert rendered_docs_cache.stats()['entries'] == 0
+
+
+@mock.patch.object(DeckhandClient, 'get_path', new=lambda path: path.value)
+def test_get_render_errors_cached(rendered_docs_cache):
+    dh_client = DeckhandClient('context-marker')
+    with mock.patch.object(
+            DeckhandClient, '_get_request',
+            return_value=FakeResponse(200, RENDERED_DOCS)) as get_request:
+        assert dh_client.get_render_errors(5) == []
+        assert dh_client.get_render_errors(5) == []
+        docs = dh_client.get_rendered_doc_list(5)
+        assert get_request.call_count == 1
+    assert [doc['metadata']['name'] for doc in docs] == [
+        'deployment-configuration', 'admin-password']
+
+
+@mock.patch.object(DeckhandClient, 'get_path', new=lambda path: path.value)
+def test_get_render_errors_not_cached(rendered_docs_cache):
+    dh_client = DeckhandClient('context-marker')
+    error = """
+details:
+  messageList:
+    - error: true
+      message: Unable to render
+"""
+    with mock.patch.object(DeckhandClient, '_get_request',
+                           return_value=FakeResponse(400, error)):
+        assert len(dh_client.get_render_errors(5)) == 1
+    assert rendered_docs_cache.stats()['entries'] == 0
@@ -0,0 +1,172 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the revision cache and its use by the Deckhand client"""
+from contextlib import contextmanager
+import json
+from unittest import mock
+
+import pytest
+
+from .fake_response import FakeResponse
+from shipyard_airflow.control.base import ShipyardRequestContext
+from shipyard_airflow.control.helpers import deckhand_client
+from shipyard_airflow.control.helpers.configdocs_helper import (
+    BUFFER, COMMITTED, ConfigdocsHelper)
+from shipyard_airflow.control.helpers.deckhand_client import (
+    DeckhandClient, DeckhandResponseError)
+from shipyard_airflow.control.helpers.revision_cache import RevisionCache
+
+DIFF = {'mop': 'created', 'slop': 'unmodified'}
+
+
+def test_revision_cache_hit_miss():
+    cache = RevisionCache(max_entries=10)
+    assert cache.get_diff(1, 2) is None
+    cache.put_diff(1, 2, DIFF)
+    assert cache.get_diff(1, 2) == DIFF
+    assert cache.get_diff('1', '2') == DIFF
+    assert cache.get_diff(2, 1) is None
+    assert cache.stats() == {
+        'hits': 2,
+        'misses': 2,
+        'evictions': 0,
+        'entries': 1
+    }
+
+
+def test_revision_cache_returns_copy():
+    cache = RevisionCache(max_entries=10)
+    diff = dict(DIFF)
+    cache.put_diff(1, 2, diff)
+    diff['chum'] = 'created'
+    cache.get_diff(1, 2)['mop'] = 'deleted'
+    assert cache.get_diff(1, 2) == DIFF
+
+
+def test_revision_cache_lru():
+    cache = RevisionCache(max_entries=2)
+    cache.put_diff(0, 1, DIFF)
+    cache.put_diff(1, 2, DIFF)
+    assert cache.get_diff(0, 1) == DIFF
+    cache.put_diff(2, 3, DIFF)
+    # the least recently used difference is discarded
+    assert cache.get_diff(1, 2) is None
+    assert cache.get_diff(0, 1) == DIFF
+    assert cache.stats()['evictions'] == 1
+
+
+def test_revision_cache_disabled():
+    cache = RevisionCache(max_entries=0)
+    cache.put_diff(1, 2, DIFF)
+    assert cache.get_diff(1, 2) is None
+
+
+@pytest.fixture()
+def revision_cache():
+    """Replaces the process-wide revision cache used by the client"""
+    cache = RevisionCache(max_entries=10)
+    with mock.patch.object(deckhand_client, 'REVISION_CACHE', new=cache):
+        yield cache
+
+
+@mock.patch.object(DeckhandClient, 'get_path', new=lambda path: path.value)
+def test_get_diff_cached(revision_cache):
+    with mock.patch.object(
+            DeckhandClient, '_get_request',
+            return_value=FakeResponse(200, json.dumps(DIFF))) as get_request:
+        assert DeckhandClient('context-marker').get_diff(1, 2) == DIFF
+        assert DeckhandClient('other').get_diff(1, 2) == DIFF
+        assert get_request.call_count == 1
+    assert revision_cache.stats()['hits'] == 1
+
+
+@mock.patch.object(DeckhandClient, 'get_path', new=lambda path: path.value)
+def test_get_diff_error_not_cached(revision_cache):
+    with mock.patch.object(DeckhandClient, '_get_request',
+                           return_value=FakeResponse(500, 'broken')):
+        with pytest.raises(DeckhandResponseError):
+            DeckhandClient('context-marker').get_diff(1, 2)
+    assert revision_cache.get_diff(1, 2) is None
+
+
+class FakeDeckhand:
+    """The revisions of a Deckhand shared by the API processes"""
+    def __init__(self):
+        self.revisions = [{'id': 1, 'tags': ['committed'], 'buckets': []}]
+
+    def get(self, url):
+        if url == '/revisions':
+            return FakeResponse(200, json.dumps({
+                'count': len(self.revisions), 'results': self.revisions}))
+        old_id, new_id = url.split('/')[2::2]
+        return FakeResponse(200, json.dumps(
+            {'mop': 'created' if old_id != new_id else 'unmodified'}))
+
+    def put(self, url):
+        self.revisions.append({'id': len(self.revisions) + 1, 'tags': [],
+                               'buckets': [url.split('/')[2]]})
+        return FakeResponse(200, '')
+
+    def post(self, url):
+        revision_id, tag = url.split('/')[2::2]
+        self.revisions[int(revision_id) - 1]['tags'].append(tag)
+        return FakeResponse(200, '{}')
+
+
+class ApiProcess:
+    """A Deckhand client in an API process with its own revision cache"""
+    def __init__(self, deckhand):
+        self.deckhand = deckhand
+        self.cache = RevisionCache(max_entries=10)
+
+    @contextmanager
+    def request(self):
+        """Yields a configdocs helper, as created for a request"""
+        deckhand = self.deckhand
+        with mock.patch.object(deckhand_client, 'REVISION_CACHE',
+                               new=self.cache), mock.patch.multiple(
+                DeckhandClient,
+                get_path=lambda path: path.value,
+                _get_request=lambda _, url, params=None: deckhand.get(url),
+                _put_request=lambda _, url, **kwargs: deckhand.put(url),
+                _post_request=lambda _, url, **kwargs: deckhand.post(url)):
+            yield ConfigdocsHelper(ShipyardRequestContext())
+
+
+def test_write_then_read_elsewhere():
+    """A revision created by one API process is seen by another at once"""
+    deckhand = FakeDeckhand()
+    first, second = ApiProcess(deckhand), ApiProcess(deckhand)
+    with second.request() as helper:
+        assert helper.get_revision_id(COMMITTED) == 1
+        assert helper.get_revision_id(BUFFER) is None
+
+    # configdocs are created, committed, and created again by the first
+    # process
+    with first.request() as helper:
+        helper.deckhand.put_bucket('mop', 'docs')
+        helper.deckhand.tag_revision(2, 'committed')
+        helper.deckhand.put_bucket('mop', 'docs')
+
+    # the next request of the second process sees the new revisions
+    with second.request() as helper:
+        assert helper.get_revision_id(COMMITTED) == 2
+        assert helper.get_revision_id(BUFFER) == 3
+        assert helper.is_collection_in_buffer('mop')
+    with second.request() as helper:
+        assert helper.is_collection_in_buffer('mop')
+    # the difference between revisions 2 and 3 is retrieved once
+    assert second.cache.stats()['misses'] == 1
+    assert second.cache.stats()['hits'] > 0
+    assert first.cache.stats()['entries'] == 0
@@ -0,0 +1,159 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the caching of Keystone tokens and endpoints"""
+import threading
+import time
+from unittest import mock
+
+from keystoneauth1 import exceptions as exc
+import pytest
+
+from shipyard_airflow.control import service_endpoints
+from shipyard_airflow.control.service_endpoints import (Endpoints,
+                                                        KeystoneCache)
+from shipyard_airflow.errors import AppError
+
+
+class FakeAccess:
+    def __init__(self, auth_token, lifetime):
+        self.auth_token = auth_token
+        self.lifetime = lifetime
+
+    def will_expire_soon(self, stale_duration):
+        return self.lifetime <= stale_duration
+
+
+class FakeAuth:
+    """Issues tokens with the specified lifetimes, in order"""
+    def __init__(self, *lifetimes, delay=0):
+        self.lifetimes = list(lifetimes)
+        self.delay = delay
+        self.access = None
+        self.issued = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def get_access(self, session):
+        with self._lock:
+            if self.access is None:
+                time.sleep(self.delay)
+                self.issued += 1
+                self.access = FakeAccess('token{}'.format(self.issued),
+                                         self.lifetimes.pop(0))
+            return self.access
+
+    def invalidate(self):
+        self.invalidations += 1
+        self.access = None
+
+
+class FakeSession:
+    def __init__(self, auth):
+        self.auth = auth
+        self.endpoint_lookups = 0
+
+    def get_endpoint(self, interface, service_type):
+        self.endpoint_lookups += 1
+        if service_type == 'unknown':
+            raise exc.EndpointNotFound()
+        return 'http://{}-{}/{}'.format(
+            service_type, interface, self.auth.access.auth_token)
+
+
+def _cache(*lifetimes, delay=0):
+    ks_session = FakeSession(FakeAuth(*lifetimes, delay=delay))
+    return KeystoneCache(create_session=lambda: ks_session), ks_session
+
+
+def test_token_reused():
+    cache, ks_session = _cache(3600)
+    assert cache.get_token() == 'token1'
+    assert cache.get_token() == 'token1'
+    assert ks_session.auth.issued == 1
+    assert cache.token_refreshes == 0
+
+
+def test_token_refreshed_before_expiry():
+    cache, ks_session = _cache(200, 3600)
+    assert cache.get_token() == 'token2'
+    assert cache.get_token() == 'token2'
+    assert ks_session.auth.invalidations == 1
+    assert cache.token_refreshes == 1
+
+
+def test_short_lived_token_not_refreshed_repeatedly():
+    cache, ks_session = _cache(200, 200, 200)
+    assert cache.get_token() == 'token2'
+    assert cache.get_token() == 'token2'
+    assert ks_session.auth.issued == 2
+
+
+def test_concurrent_refreshes_collapsed():
+    cache, ks_session = _cache(200, 3600, 3600, delay=0.01)
+    # acquire the expiring token before the threads start
+    ks_session.auth.get_access(ks_session)
+    tokens = []
+
+    def _get_token():
+        tokens.append(cache.get_token())
+
+    threads = [threading.Thread(target=_get_token) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tokens == ['token2'] * 10
+    assert ks_session.auth.invalidations == 1
+
+
+def test_endpoints_cached_by_service_type_and_interface():
+    cache, ks_session = _cache(3600)
+    assert cache.get_endpoint('deckhand', 'internal') == (
+        'http://deckhand-internal/token1')
+    assert cache.get_endpoint('deckhand', 'internal') == (
+        'http://deckhand-internal/token1')
+    assert cache.get_endpoint('deckhand', 'public') == (
+        'http://deckhand-public/token1')
+    assert cache.get_endpoint('shipyard', 'internal') == (
+        'http://shipyard-internal/token1')
+    assert ks_session.endpoint_lookups == 3
+
+
+def test_endpoints_discarded_with_token():
+    cache, ks_session = _cache(3600, 3600)
+    assert cache.get_endpoint('deckhand', 'internal').endswith('token1')
+    ks_session.auth.invalidate()
+    assert cache.get_endpoint('deckhand', 'internal').endswith('token2')
+    assert ks_session.endpoint_lookups == 2
+
+
+def test_session_per_process():
+    sessions = [FakeSession(FakeAuth(3600)), FakeSession(FakeAuth(3600))]
+    cache = KeystoneCache(create_session=lambda: sessions.pop(0))
+    ks_session = cache.get_session()
+    assert cache.get_session() is ks_session
+    with mock.patch.object(service_endpoints.os, 'getpid', return_value=-1):
+        assert cache.get_session() is not ks_session
+
+
+def test_get_endpoint_not_found():
+    cache, ks_session = _cache(3600)
+    with mock.patch.object(service_endpoints, 'KEYSTONE_CACHE', new=cache):
+        with mock.patch.object(service_endpoints, '_get_service_type',
+                               return_value='unknown'):
+            with pytest.raises(AppError) as app_err:
+                service_endpoints.get_endpoint(Endpoints.DECKHAND)
+    assert 'Can not access service endpoint' in str(app_err.value)
+    # failed lookups are not cached
+    assert ks_session.endpoint_lookups == 1
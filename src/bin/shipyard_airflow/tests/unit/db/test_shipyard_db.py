@@ -0,0 +1,53 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+from shipyard_airflow.conf import config
+from shipyard_airflow.db.shipyard_db import ShipyardDbAccess
+
+
+def _index(name, is_valid=True, is_ready=True):
+    return {
+        'index_name': name,
+        'table_name': ShipyardDbAccess.LOOKUP_INDEXES[name],
+        'is_valid': is_valid,
+        'is_ready': is_ready,
+        'size_bytes': 8192,
+        'scans': 3
+    }
+
+
+def test_get_index_health():
+    config.parse_args(args=[], default_config_files=[])
+    db = ShipyardDbAccess()
+    found = [
+        _index('ix_action_command_audit_action_id'),
+        _index('ix_notes_assoc_id', is_valid=False),
+        _index('ix_preflight_validation_failures_action_id', is_ready=False),
+    ]
+    with mock.patch.object(db, 'get_as_dict_array',
+                           return_value=found) as gada:
+        report = db.get_index_health()
+    assert (gada.call_args[1]['index_names'] ==
+            tuple(ShipyardDbAccess.LOOKUP_INDEXES))
+    assert [(idx['index_name'], idx['status']) for idx in report] == [
+        ('ix_action_command_audit_action_id', 'ok'),
+        ('ix_api_locks_lock_type_released_datetime', 'missing'),
+        ('ix_notes_assoc_id', 'invalid'),
+        ('ix_preflight_validation_failures_action_id', 'invalid'),
+    ]
+    assert report[0]['size_bytes'] == 8192
+    assert report[0]['scans'] == 3
+    assert report[1]['table_name'] == 'api_locks'
+    assert report[1]['size_bytes'] is None
@@ -0,0 +1,96 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the adaptive waiter"""
+import itertools
+
+from shipyard_airflow.plugins.adaptive_waiter import AdaptiveWaiter
+
+
+class FakeClock:
+    """A clock advanced by sleeping"""
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _waiter(clock, time_out, interval, **kwargs):
+    return AdaptiveWaiter(time_out, interval, wait_for_change=clock.sleep,
+                          clock=clock, **kwargs)
+
+
+def test_intervals():
+    waiter = AdaptiveWaiter(600, 30)
+    assert list(itertools.islice(waiter.intervals(), 6)) == [
+        3.75, 7.5, 15, 30, 30, 30]
+    waiter = AdaptiveWaiter(600, 30, initial_interval=0)
+    assert list(itertools.islice(waiter.intervals(), 7)) == [
+        1, 2, 4, 8, 16, 30, 30]
+    waiter = AdaptiveWaiter(600, -5)
+    assert list(itertools.islice(waiter.intervals(), 2)) == [1, 1]
+
+
+def test_wait_completes():
+    clock = FakeClock()
+    values = iter([None, None, None, 'done'])
+    result = _waiter(clock, 600, 8, jitter=0).wait(lambda: next(values))
+    assert result.done
+    assert result.value == 'done'
+    assert result.polls == 4
+    assert clock.sleeps == [1, 2, 4]
+    assert result.elapsed == 7
+
+
+def test_wait_until():
+    clock = FakeClock()
+    values = iter(['running', 'running', 'complete'])
+    result = _waiter(clock, 600, 8).wait(
+        lambda: next(values), until=lambda value: value == 'complete')
+    assert result.done
+    assert result.polls == 3
+
+
+def test_wait_first_check():
+    clock = FakeClock()
+    result = _waiter(clock, 0, 8).wait(lambda: True)
+    assert result.done
+    assert result.polls == 1
+    assert not clock.sleeps
+
+
+def test_wait_times_out():
+    clock = FakeClock()
+    result = _waiter(clock, 100, 30, jitter=0).wait(lambda: False)
+    assert not result.done
+    assert result.value is False
+    # the last interval is shortened to the deadline, where a last check is
+    # made
+    assert clock.sleeps == [3.75, 7.5, 15, 30, 30, 13.75]
+    assert result.polls == 7
+    assert result.elapsed == 100
+
+
+def test_wait_jitter():
+    clock = FakeClock()
+    _waiter(clock, 10000, 30, jitter=0.5).wait(lambda: False)
+    intervals = itertools.chain([3.75, 7.5, 15], itertools.repeat(30))
+    for sleep, interval in zip(clock.sleeps[:-1], intervals):
+        assert interval * 0.5 <= sleep <= interval * 1.5
+    assert len(set(clock.sleeps)) > 1
@@ -15,7 +15,8 @@
 from unittest import mock
 
 from shipyard_airflow.plugins.check_k8s_node_status import (
-    check_node_status
+    check_node_status,
+    wait_for_nodes_ready
 )
 
 
@@ -245,3 +246,125 @@ class TestCheckK8sNodeStatus:
 
         not_found_nodes = check_node_status(1, 5, set(['a1', 'b1', 'z1']))
         assert not_found_nodes == ['z1']
+
+
+def _condition(type_, status, message):
+    condition = mock.MagicMock(status=status, message=message)
+    condition.type = type_
+    return condition
+
+
+class FakeCoreV1Api:
+    """Returns a list of nodes, then streams the watch events of each
+    watch request, in order
+    """
+    def __init__(self, items, watches):
+        self.items = items
+        self.watches = list(watches)
+        self.list_calls = []
+        self.watch_calls = []
+
+    def list_node(self, **kwargs):
+        self.list_calls.append(kwargs)
+        ret = mock.MagicMock()
+        ret.items = self.items
+        ret.metadata.resource_version = '100'
+        return ret
+
+
+class FakeWatch:
+    def __init__(self, api):
+        self.api = api
+
+    def stream(self, func, **kwargs):
+        self.api.watch_calls.append(kwargs)
+        events = self.api.watches.pop(0) if self.api.watches else []
+        return (event for event in events)
+
+
+def _event(type_, node, resource_version):
+    node.metadata.resource_version = resource_version
+    return {'type': type_, 'object': node, 'raw_object': {}}
+
+
+def _patch_k8s(api):
+    return mock.patch.multiple(
+        "shipyard_airflow.plugins.check_k8s_node_status",
+        _get_core_v1_api=mock.MagicMock(return_value=api),
+        watch=mock.MagicMock(Watch=lambda: FakeWatch(api)))
+
+
+class TestWaitForNodesReady:
+    def test_all_ready_when_listed(self):
+        api = FakeCoreV1Api(INV_SEQ_A['final'], [])
+        with _patch_k8s(api):
+            assert wait_for_nodes_ready(10, 1, ['a1', 'b1', 'c1']) == []
+        assert len(api.list_calls) == 1
+        assert not api.watch_calls
+
+    def test_ready_from_watch_events(self):
+        api = FakeCoreV1Api(
+            [MockNodeStatus('a1', 'True', 'Ready'),
+             MockNodeStatus('b1', 'False', 'Not Ready')],
+            [[_event('MODIFIED', MockNodeStatus('z9', 'True', 'Ready'), '101'),
+              _event('MODIFIED', MockNodeStatus('b1', 'False', 'Not Ready'),
+                     '102')],
+             [_event('ADDED', MockNodeStatus('c1', 'True', 'Ready'), '103'),
+              _event('MODIFIED', MockNodeStatus('b1', 'True', 'Ready'),
+                     '104')]])
+        with _patch_k8s(api):
+            assert wait_for_nodes_ready(10, 1, ['a1', 'b1', 'c1']) == []
+        assert len(api.list_calls) == 1
+        # watches resume from the last resourceVersion seen
+        assert [c['resource_version'] for c in api.watch_calls] == ['100',
+                                                                    '102']
+        assert 'field_selector' not in api.watch_calls[0]
+
+    def test_relist_after_watch_error(self):
+        api = FakeCoreV1Api(
+            [MockNodeStatus('a1', 'False', 'Not Ready')],
+            [[{'type': 'ERROR', 'object': None,
+               'raw_object': {'code': 410, 'message': 'too old'}}]])
+        with _patch_k8s(api):
+            original_list_node = api.list_node
+
+            def list_node(**kwargs):
+                ret = original_list_node(**kwargs)
+                # ready by the time the nodes are listed again
+                api.items = [MockNodeStatus('a1', 'True', 'Ready')]
+                return ret
+            api.list_node = list_node
+            assert wait_for_nodes_ready(10, 1, ['a1']) == []
+        assert len(api.list_calls) == 2
+        # a single node is selected by Kubernetes
+        assert api.list_calls[0] == {'field_selector': 'metadata.name=a1'}
+        assert api.watch_calls[0]['field_selector'] == 'metadata.name=a1'
+
+    def test_ready_condition(self):
+        node = MockNodeStatus('a1', 'True', 'Ready')
+        node.status.conditions = [
+            _condition('Ready', 'True', 'kubelet is posting ready status'),
+            _condition('MemoryPressure', 'False', 'has sufficient memory')]
+        api = FakeCoreV1Api([node], [])
+        with _patch_k8s(api):
+            assert wait_for_nodes_ready(10, 1, ['a1']) == []
+
+    def test_timeout(self):
+        api = FakeCoreV1Api(INV_SEQ_D['final'], [])
+        with _patch_k8s(api):
+            not_ready = wait_for_nodes_ready(1, 1, ['a1', 'b1', 'c1'])
+        assert not_ready == ['a1', 'b1']
+
+    def test_error_retried(self):
+        api = FakeCoreV1Api(INV_SEQ_A['final'], [])
+        get_api = mock.MagicMock(side_effect=[Exception('no cluster'), api])
+        with mock.patch("shipyard_airflow.plugins.check_k8s_node_status."
+                        "_get_core_v1_api", new=get_api), \
+                mock.patch("shipyard_airflow.plugins.check_k8s_node_status."
+                           "time.sleep") as sleep:
+            assert wait_for_nodes_ready(10, 1, {'a1', 'b1'}) == []
+        assert sleep.call_count == 1
+
+    def test_no_interest(self):
+        assert wait_for_nodes_ready(3, 1, None) == []
+        assert wait_for_nodes_ready(3, 1, []) == []
@@ -0,0 +1,267 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for check_k8s_pod_status functions"""
+import threading
+from unittest import mock
+
+from shipyard_airflow.plugins.check_k8s_pod_status import (
+    _PodPrefixIndex,
+    PODS_NOT_FOUND,
+    PODS_NOT_READY,
+    PODS_READY,
+    wait_for_pods_ready
+)
+
+
+def _pod(name, phase, namespace='ucp', ready=None, resource_version='1'):
+    pod = mock.MagicMock()
+    pod.metadata.name = name
+    pod.metadata.namespace = namespace
+    pod.metadata.resource_version = resource_version
+    pod.status.phase = phase
+    pod.status.conditions = None
+    if ready is not None:
+        condition = mock.MagicMock(status=str(ready))
+        condition.type = 'Ready'
+        pod.status.conditions = [condition]
+    return pod
+
+
+def _event(type_, pod):
+    return {'type': type_, 'object': pod, 'raw_object': {}}
+
+
+class FakeCoreV1Api:
+    """Lists pods by namespace (None for all namespaces), and streams the
+    watch events of each watch request of a namespace, in order
+    """
+    def __init__(self, pods, watches=None):
+        self.pods = pods
+        self.watches = watches or {}
+        self.list_calls = []
+        self.watch_calls = []
+        self.lock = threading.Lock()
+
+    def _list(self, namespace, kwargs):
+        if kwargs.get('watch'):
+            return FakeWatchResponse()
+        with self.lock:
+            self.list_calls.append((namespace, kwargs))
+        ret = mock.MagicMock()
+        ret.items = [pod for pod in self.pods
+                     if namespace is None or
+                     pod.metadata.namespace == namespace]
+        ret.metadata.resource_version = '100'
+        return ret
+
+    def list_pod_for_all_namespaces(self, **kwargs):
+        return self._list(None, kwargs)
+
+    def list_namespaced_pod(self, namespace, **kwargs):
+        return self._list(namespace, kwargs)
+
+
+class FakeWatchResponse:
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeWatch:
+    """Streams the watch events of the namespace. An event that is a
+    function is called instead of streamed, e.g. to wait
+    """
+    def __init__(self, api):
+        self.api = api
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def stream(self, func, **kwargs):
+        namespace = kwargs.get('namespace')
+        with self.api.lock:
+            self.api.watch_calls.append(kwargs)
+            watches = self.api.watches.get(namespace, [])
+            events = watches.pop(0) if watches else []
+        func(watch=True, **kwargs)
+        for event in events:
+            if callable(event):
+                event()
+            else:
+                yield event
+
+
+def _patch_k8s(api):
+    return mock.patch.multiple(
+        "shipyard_airflow.plugins.check_k8s_pod_status",
+        _get_core_v1_api=mock.MagicMock(return_value=api),
+        watch=mock.MagicMock(Watch=lambda: FakeWatch(api)))
+
+
+def test_prefix_index():
+    index = _PodPrefixIndex(['ceph-', 'ceph-mon', 'calico-'], [None])
+    assert index.prefixes_for('ceph-mon-1') == ['ceph-', 'ceph-mon']
+    assert index.prefixes_for('calico-node-x') == ['calico-']
+    assert index.prefixes_for('coredns-1') == []
+    assert index.prefixes_for('ceph') == []
+
+
+def test_all_ready_when_listed():
+    api = FakeCoreV1Api([
+        _pod('ceph-mon-1', 'Running', ready=True),
+        _pod('ceph-bootstrap-1', 'Succeeded'),
+        _pod('calico-node-1', 'Running'),
+        _pod('coredns-1', 'Pending'),
+    ])
+    with _patch_k8s(api):
+        report = wait_for_pods_ready(['ceph-', 'calico-'], 10)
+    assert list(report) == ['ceph-', 'calico-']
+    assert report['ceph-'] == {
+        'status': PODS_READY,
+        'ready': ['ucp/ceph-bootstrap-1', 'ucp/ceph-mon-1'],
+        'not_ready': {}
+    }
+    assert report['calico-']['status'] == PODS_READY
+    assert len(api.list_calls) == 1
+    assert not api.watch_calls
+
+
+def test_ready_from_watch_events():
+    api = FakeCoreV1Api(
+        [_pod('ceph-mon-1', 'Running', namespace='ceph', ready=False),
+         _pod('ceph-osd-1', 'Pending', namespace='ceph')],
+        {'ceph': [
+            [_event('MODIFIED', _pod('ceph-mon-1', 'Running', namespace='ceph',
+                                     ready=True, resource_version='101')),
+             _event('ADDED', _pod('other-1', 'Pending', namespace='ceph',
+                                  resource_version='102'))],
+            [_event('DELETED', _pod('ceph-osd-1', 'Pending', namespace='ceph',
+                                    resource_version='103'))],
+        ]})
+    with _patch_k8s(api):
+        report = wait_for_pods_ready(['ceph-'], 10, namespaces=['ceph'],
+                                     label_selector='application=ceph')
+    assert report['ceph-']['status'] == PODS_READY
+    assert report['ceph-']['ready'] == ['ceph/ceph-mon-1']
+    assert api.list_calls == [('ceph',
+                               {'label_selector': 'application=ceph'})]
+    # watches resume from the last resourceVersion seen
+    assert [c['resource_version'] for c in api.watch_calls] == ['100', '102']
+    assert api.watch_calls[0]['label_selector'] == 'application=ceph'
+
+
+def test_relist_after_watch_error():
+    api = FakeCoreV1Api(
+        [_pod('ceph-mon-1', 'Pending')],
+        {None: [[{'type': 'ERROR', 'object': None,
+                  'raw_object': {'code': 410, 'message': 'too old'}}]]})
+    original_list = api.list_pod_for_all_namespaces
+
+    def list_pod_for_all_namespaces(**kwargs):
+        ret = original_list(**kwargs)
+        # running by the time the pods are listed again
+        api.pods = [_pod('ceph-mon-1', 'Running', ready=True)]
+        return ret
+    api.list_pod_for_all_namespaces = list_pod_for_all_namespaces
+    with _patch_k8s(api):
+        report = wait_for_pods_ready(['ceph-'], 10)
+    assert report['ceph-']['status'] == PODS_READY
+    assert len(api.list_calls) == 2
+
+
+def test_waits_for_all_namespaces():
+    api = FakeCoreV1Api(
+        [_pod('ceph-mon-1', 'Running', namespace='ceph'),
+         _pod('calico-node-1', 'Running', namespace='kube-system')])
+    with _patch_k8s(api):
+        report = wait_for_pods_ready(['ceph-', 'calico-'], 10,
+                                     namespaces=['ceph', 'kube-system'])
+    assert report['ceph-']['ready'] == ['ceph/ceph-mon-1']
+    assert report['calico-']['ready'] == ['kube-system/calico-node-1']
+    assert sorted(namespace for namespace, _ in api.list_calls) == [
+        'ceph', 'kube-system']
+
+
+def test_watches_stopped_when_ready():
+    watch_started = threading.Event()
+    watches = []
+
+    def block():
+        # blocks until the watch response is closed, as a watch of pods
+        # that do not change would
+        watch_started.set()
+        watches[-1].closed.wait(10)
+        raise Exception('connection closed')
+
+    api = FakeCoreV1Api(
+        [_pod('ceph-mon-1', 'Pending', namespace='ceph'),
+         _pod('calico-node-1', 'Running', namespace='kube-system')],
+        {'ceph': [[lambda: watch_started.wait(10),
+                   _event('MODIFIED', _pod('ceph-mon-1', 'Running',
+                                           namespace='ceph',
+                                           resource_version='101'))]],
+         'kube-system': [[block]]})
+
+    def list_namespaced_pod(namespace, **kwargs):
+        ret = FakeCoreV1Api.list_namespaced_pod(api, namespace, **kwargs)
+        if namespace == 'kube-system' and kwargs.get('watch'):
+            watches.append(ret)
+        return ret
+    api.list_namespaced_pod = list_namespaced_pod
+    with _patch_k8s(api), mock.patch(
+            "shipyard_airflow.plugins.check_k8s_pod_status.logging") as log:
+        report = wait_for_pods_ready(['ceph-', 'calico-'], 30,
+                                     namespaces=['ceph', 'kube-system'])
+    assert report['ceph-']['status'] == PODS_READY
+    assert report['calico-']['status'] == PODS_READY
+    # the watch of the ready namespace is closed, not left to time out
+    assert len(watches) == 1
+    assert watches[0].closed.is_set()
+    assert not log.warning.called
+
+
+def test_timeout_report():
+    api = FakeCoreV1Api([
+        _pod('ceph-mon-1', 'Running', ready=True),
+        _pod('ceph-osd-1', 'Running', ready=False),
+        _pod('ceph-rgw-1', 'Failed'),
+    ])
+    with _patch_k8s(api):
+        report = wait_for_pods_ready(['ceph-', 'calico-'], 1)
+    assert report == {
+        'ceph-': {
+            'status': PODS_NOT_READY,
+            'ready': ['ucp/ceph-mon-1'],
+            'not_ready': {'ucp/ceph-osd-1': 'Running',
+                          'ucp/ceph-rgw-1': 'Failed'}
+        },
+        'calico-': {'status': PODS_NOT_FOUND, 'ready': [], 'not_ready': {}}
+    }
+
+
+def test_error_retried():
+    api = FakeCoreV1Api([_pod('ceph-mon-1', 'Running')])
+    get_api = mock.MagicMock(side_effect=[Exception('no cluster'), api])
+    with mock.patch("shipyard_airflow.plugins.check_k8s_pod_status."
+                    "_get_core_v1_api", new=get_api):
+        report = wait_for_pods_ready(['ceph-'], 10, interval=1)
+    assert report['ceph-']['status'] == PODS_READY
+    assert get_api.call_count == 2
+
+
+def test_no_required_pods():
+    assert wait_for_pods_ready([], 3) == {}
@@ -14,6 +14,8 @@
 """Tests for drydock_nodes operator functions"""
 import copy
 import os
+import threading
+import time
 from unittest import mock
 
 import pytest
@@ -300,6 +302,8 @@ class TestDrydockNodesOperator:
             DeploymentConfigurationOperator.config_keys_defaults
         )
         op.design_ref = {}
+        op.doc_utils = mock.MagicMock()
+        op.revision_id = 1
         op.notes_helper = get_notes_helper()
         op.action_id = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
         op.task_id = "prepare_and_deploy_nodes"
@@ -326,6 +330,8 @@ class TestDrydockNodesOperator:
                 DeploymentConfigurationOperator.config_keys_defaults
             )
             op.design_ref = {}
+            op.doc_utils = mock.MagicMock()
+            op.revision_id = 1
             op.notes_helper = get_notes_helper()
             op.action_id = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
             op.task_id = "prepare_and_deploy_nodes"
@@ -351,7 +357,7 @@ class TestDrydockNodesOperator:
         assert op._execute_task.call_count == 1
 
     @mock.patch("shipyard_airflow.plugins.check_k8s_node_status."
-                "check_node_status", return_value=[])
+                "wait_for_nodes_ready", return_value=[])
     def test_execute_deployment(self, cns):
         op = DrydockNodesOperator(main_dag_name="main",
                                   shipyard_conf=CONF_FILE,
@@ -361,7 +367,6 @@ class TestDrydockNodesOperator:
         )
         op._setup_configured_values()
         op._execute_task = mock.MagicMock(return_value=TASK_RESULT)
-        op.join_wait = 0
         group = DeploymentGroup(GROUP_DICT, mock.MagicMock())
         group.actionable_nodes = ['node1', 'node2', 'node3']
         succ_prep_nodes = ['node1', 'node2', 'node3']
@@ -370,7 +375,7 @@ class TestDrydockNodesOperator:
         assert cns.call_count == 1
 
     @mock.patch("shipyard_airflow.plugins.check_k8s_node_status."
-                "check_node_status", return_value=['node2', 'node4'])
+                "wait_for_nodes_ready", return_value=['node2', 'node4'])
     def test_execute_deployment_k8s_fail(self, cns, caplog):
         op = DrydockNodesOperator(main_dag_name="main",
                                   shipyard_conf=CONF_FILE,
@@ -380,7 +385,6 @@ class TestDrydockNodesOperator:
         )
         op._setup_configured_values()
         op._execute_task = mock.MagicMock(return_value=TASK_RESULT)
-        op.join_wait = 0
         group = DeploymentGroup(GROUP_DICT, mock.MagicMock())
         group.actionable_nodes = ['node1', 'node2', 'node3']
         succ_prep_nodes = ['node1', 'node2', 'node3']
@@ -409,6 +413,67 @@ class TestDrydockNodesOperator:
             assert "node{}".format(i) in s
         assert "node2" not in s
 
+    def test_get_successes_for_task_layers(self):
+        """The task tree is retrieved in one request and cached"""
+        op = DrydockNodesOperator(main_dag_name="main",
+                                  shipyard_conf=CONF_FILE,
+                                  task_id="t1")
+        op.drydock_client = mock.MagicMock()
+        layers = {k: v for k, v in TASK_DICT.items() if k in '0123'}
+        layers['init_task_id'] = '0'
+        op.drydock_client.get_task.return_value = layers
+        op.get_task_dict = mock.MagicMock(side_effect=_fake_get_task_dict)
+        for _ in range(2):
+            s = op.get_successes_for_task('0')
+            assert s == {'node1', 'node2', 'node3'}
+        op.drydock_client.get_task.assert_called_once_with(task_id='0',
+                                                           layers=-1)
+        assert op.get_task_dict.call_count == 0
+
+    def test_get_successes_for_task_by_layer(self):
+        """Subtasks are retrieved individually if Drydock does not return
+        the task with its subtasks
+        """
+        op = DrydockNodesOperator(main_dag_name="main",
+                                  shipyard_conf=CONF_FILE,
+                                  task_id="t1")
+        op.drydock_client = mock.MagicMock()
+        op.drydock_client.get_task.side_effect = TypeError('layers')
+        op.get_task_dict = mock.MagicMock(side_effect=_fake_get_task_dict)
+        s = op.get_successes_for_task('0')
+        assert s == {'node1', 'node2', 'node3'}
+        assert op.get_task_dict.call_count == 4
+        assert not op._task_layers_supported
+        # task 2 is cached, task 99 is not finished so is not cached
+        op.get_successes_for_task('99')
+        op.get_successes_for_task('99')
+        assert op.get_task_dict.call_count == 6
+        assert op.drydock_client.get_task.call_count == 1
+
+    def test_fetch_failure_details_reuses_tasks(self, caplog):
+        op = DrydockNodesOperator(main_dag_name="main",
+                                  shipyard_conf=CONF_FILE,
+                                  task_id="t1")
+        op.drydock_client = mock.MagicMock()
+        op.drydock_client.get_task.return_value = {
+            'init_task_id': 'p',
+            'p': {'task_id': 'p', 'action': 'deploy_nodes',
+                  'status': 'complete', 'subtask_id_list': ['c'],
+                  'result': {'status': 'failure', 'failures': ['node1']}},
+            'c': {'task_id': 'c', 'action': 'deploy_node',
+                  'status': 'complete', 'subtask_id_list': [],
+                  'result': {'status': 'failure',
+                             'details': {'errorCount': 1,
+                                         'messageList': []}}},
+        }
+        op.drydock_task_id = 'p'
+        op.get_successes_for_task('p')
+        op.fetch_failure_details()
+        assert op.drydock_client.get_task.call_count == 1
+        assert op.drydock_client.get_tasks.call_count == 0
+        assert 'deploy_nodes task has either failed' in caplog.text
+        assert 'deploy_node subtask is in failure state' in caplog.text
+
     def test_process_deployment_groups(self):
         """Test the core processing loop of the drydock_nodes module"""
         dgm = DeploymentGroupManager(
@@ -455,6 +520,95 @@ class TestDrydockNodesOperator:
         dgm.report_group_summary()
         dgm.report_node_summary()
 
+    @pytest.mark.parametrize("prep_mode, dep_mode", [
+        ('all-success', 'all-success'),
+        ('all-success', 'all-fail'),
+        ('all-fail', 'all-success'),
+    ])
+    def test_process_deployment_groups_concurrent(self, prep_mode, dep_mode):
+        """Concurrent processing has the same outcome as sequential"""
+        results = []
+        for max_concurrent_groups in (1, 4):
+            dgm = DeploymentGroupManager(
+                yaml.safe_load(tdgm.GROUPS_YAML),
+                node_lookup
+            )
+            _process_deployment_groups(
+                dgm,
+                _gen_pe_func(prep_mode, stand_alone=True),
+                _gen_pe_func(dep_mode, stand_alone=True),
+                max_concurrent_groups)
+            results.append((
+                {group.name: group.stage for group in dgm.group_list()},
+                {stage: set(dgm.get_nodes(stage)) for stage in Stage}))
+        assert results[0] == results[1]
+
+    def test_process_deployment_groups_concurrent_ordering(self):
+        """Independent groups are processed at the same time, and groups are
+        only processed once the groups they depend on are deployed
+        """
+        dgm = DeploymentGroupManager(
+            yaml.safe_load(tdgm.GROUPS_YAML),
+            node_lookup
+        )
+        lock = threading.Lock()
+        running = set()
+        overlaps = []
+
+        def prepare(group):
+            for name in group.depends_on:
+                assert dgm._find_group(name).stage == Stage.DEPLOYED
+            with lock:
+                running.add(group.name)
+                overlaps.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.discard(group.name)
+            return _gen_pe_func('all-success', stand_alone=True)(group)
+
+        _process_deployment_groups(
+            dgm, prepare, _gen_pe_func('all-success', stand_alone=True), 2)
+        assert not dgm.critical_groups_failed()
+        assert max(overlaps) == 2
+        for group in dgm.group_list():
+            assert group.stage == Stage.DEPLOYED
+
+    def test_process_deployment_groups_concurrent_exception(self):
+        dgm = DeploymentGroupManager(
+            yaml.safe_load(tdgm.GROUPS_YAML),
+            node_lookup
+        )
+
+        def prepare(group):
+            if group.name == 'monitoring-nodes':
+                raise AirflowException('Broken')
+            return _gen_pe_func('all-success', stand_alone=True)(group)
+
+        with pytest.raises(AirflowException):
+            _process_deployment_groups(
+                dgm, prepare, _gen_pe_func('all-success', stand_alone=True),
+                4)
+
+    def test_execute_task_uses_own_task(self):
+        """The task created for a group is the one queried, even if the
+        operator's task id changes
+        """
+        op = DrydockNodesOperator(main_dag_name="main",
+                                  shipyard_conf=CONF_FILE,
+                                  task_id="t1")
+        op.create_task = mock.MagicMock(return_value='task-1')
+        op.drydock_task_id = 'task-2'
+        op.query_task = mock.MagicMock()
+        op.get_successes_for_task = mock.MagicMock(return_value={'node1'})
+        node_filter = gen_node_name_filter(['node1'])
+        result = op._execute_task('prepare_nodes', 1, 1, node_filter)
+        op.create_task.assert_called_once_with('prepare_nodes',
+                                               node_filter=node_filter)
+        op.query_task.assert_called_once_with(1, 1, task_id='task-1')
+        op.get_successes_for_task.assert_called_once_with('task-1')
+        assert result.task_id == 'task-1'
+        assert result.successes == {'node1'}
+
     @mock.patch("shipyard_airflow.plugins.drydock_nodes._get_node_lookup",
                 return_value=node_lookup)
     @mock.patch.object(
@@ -477,6 +631,8 @@ class TestDrydockNodesOperator:
             DeploymentConfigurationOperator.config_keys_defaults
         )
         op.design_ref = {"a": "b"}
+        op.doc_utils = mock.MagicMock()
+        op.revision_id = 1
         op.notes_helper = get_notes_helper()
         op.action_id = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
         op.task_id = "prepare_and_deploy_nodes"
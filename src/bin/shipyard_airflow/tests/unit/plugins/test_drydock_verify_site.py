@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Tests for drydock base operator functions"""
+import itertools
 import os
 from unittest import mock
 
@@ -22,6 +23,7 @@ from shipyard_airflow.plugins.drydock_verify_site import (
 )
 from shipyard_airflow.plugins.drydock_errors import (
     DrydockTaskFailedException,
+    DrydockTaskTimeoutException
 )
 
 CONF_FILE = os.path.join(os.path.dirname(__file__), 'test.conf')
@@ -42,7 +44,9 @@ def test_logs_fetched_if_exception_in_create_task(get_pod_logs):
     with pytest.raises(ValueError, match=err):
         dvs.execute(mock.MagicMock())
     assert get_pod_logs.called
-    assert client.get_tasks.called
+    # there is no task to retrieve details of
+    assert not client.get_task.called
+    assert not client.get_tasks.called
 
 
 @mock.patch('time.sleep', mock.MagicMock())
@@ -59,4 +63,55 @@ def test_logs_fetched_if_exception_in_query_task(get_pod_logs):
     with pytest.raises(DrydockTaskFailedException):
         dvs.execute(mock.MagicMock())
     assert get_pod_logs.called
-    assert client.get_tasks.called
+    # the task is retrieved with its subtasks, not the list of all tasks
+    client.get_task.assert_any_call(task_id=dvs.drydock_task_id, layers=-1)
+    assert not client.get_tasks.called
+
+
+def _task_state(status, result):
+    return {'status': status, 'result': {'status': result}}
+
+
+def _query_task_op(task_states):
+    dvs = DrydockVerifySiteOperator(task_id="t1", shipyard_conf=CONF_FILE)
+    dvs.action_id = 'action-1'
+    dvs.notes_helper = mock.MagicMock()
+    dvs.get_task_dict = mock.MagicMock(side_effect=task_states)
+    return dvs
+
+
+def test_query_task_adaptive_intervals():
+    dvs = _query_task_op([
+        _task_state('running', 'incomplete'),
+        Exception('Drydock unavailable'),
+        _task_state('running', 'incomplete'),
+        _task_state('complete', 'success'),
+    ])
+    with mock.patch('time.sleep') as sleep:
+        dvs.query_task(30, 600, task_id='task-1')
+    assert dvs.get_task_dict.call_count == 4
+    # early queries are more frequent than the configured interval
+    intervals = [call[0][0] for call in sleep.call_args_list]
+    assert len(intervals) == 3
+    assert intervals[0] < intervals[1] < intervals[2] < 30
+    note = dvs.notes_helper.make_step_note.call_args[1]
+    assert note['subject'] == 'task-1'
+    assert note['sub_type'] == 'Wait'
+    assert 'with 4 checks: completed' in note['note_val']
+
+
+def test_query_task_timeout():
+    dvs = _query_task_op(lambda task_id: _task_state('running', None))
+    with mock.patch('shipyard_airflow.plugins.adaptive_waiter.time') as tm:
+        tm.monotonic.side_effect = itertools.count(0, 100)
+        with pytest.raises(DrydockTaskTimeoutException):
+            dvs.query_task(30, 600, task_id='task-1')
+    note = dvs.notes_helper.make_step_note.call_args[1]
+    assert 'timed out' in note['note_val']
+
+
+def test_query_task_failed():
+    dvs = _query_task_op([_task_state('terminated', 'failure')])
+    with pytest.raises(DrydockTaskFailedException):
+        dvs.query_task(30, 600, task_id='task-1')
+    assert dvs.get_task_dict.call_count == 1
@@ -0,0 +1,128 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the registry of objects shared by a worker process"""
+import os
+import shutil
+from unittest import mock
+
+import pytest
+
+from shipyard_airflow.plugins import service_endpoint
+from shipyard_airflow.plugins import worker_registry
+from shipyard_airflow.plugins.service_session import ucp_keystone_session
+from shipyard_airflow.plugins.ucp_base_operator import UcpBaseOperator
+
+CONF_FILE = os.path.join(os.path.dirname(__file__), 'test.conf')
+
+
+@pytest.fixture()
+def conf_file(tmpdir):
+    """A copy of the test configuration, with no registry"""
+    path = str(tmpdir.join('shipyard.conf'))
+    shutil.copyfile(CONF_FILE, path)
+    with open(path, 'a') as conf:
+        conf.write('\n[drydock]\nservice_type = physicalprovisioner\n')
+    yield path
+    worker_registry.clear()
+
+
+def test_get_registry(conf_file):
+    registry = worker_registry.get_registry(conf_file)
+    assert worker_registry.get_registry(conf_file) is registry
+    assert registry.config.get('requests_config',
+                               'drydock_client_read_timeout') == '300'
+
+
+def test_get_shared(conf_file):
+    registry = worker_registry.get_registry(conf_file)
+    factory = mock.MagicMock(side_effect=[object(), object()])
+    item = registry.get('item', factory)
+    assert registry.get('item', factory) is item
+    assert factory.call_count == 1
+
+
+def test_get_version(conf_file):
+    registry = worker_registry.get_registry(conf_file)
+    first = mock.MagicMock()
+    assert registry.get('client', lambda: first, version='a') is first
+    assert registry.get('client', mock.MagicMock, version='a') is first
+    second = registry.get('client', mock.MagicMock, version='b')
+    assert second is not first
+    assert first.dispose.called
+
+
+def test_get_factory_error(conf_file):
+    registry = worker_registry.get_registry(conf_file)
+    with pytest.raises(ValueError):
+        registry.get('item', mock.MagicMock(side_effect=ValueError))
+    assert registry.get('item', lambda: 'created') == 'created'
+
+
+def test_config_changed(conf_file):
+    registry = worker_registry.get_registry(conf_file)
+    engine = registry.get('engine', mock.MagicMock)
+    with open(conf_file, 'a') as conf:
+        conf.write('\n[extra]\nvalue = 1\n')
+    changed = worker_registry.get_registry(conf_file)
+    assert changed is not registry
+    assert changed.config.get('extra', 'value') == '1'
+    assert engine.dispose.called
+    assert changed.get('engine', mock.MagicMock) is not engine
+
+
+def test_forked_process(conf_file):
+    registry = worker_registry.get_registry(conf_file)
+    engine = registry.get('engine', mock.MagicMock)
+    with mock.patch.object(worker_registry.os, 'getpid',
+                           return_value=registry.pid + 1):
+        child = worker_registry.get_registry(conf_file)
+        assert child is not registry
+        assert child.get('engine', mock.MagicMock) is not engine
+    # the parent's engine is left alone
+    assert not engine.dispose.called
+
+
+def test_keystone_session_shared(conf_file):
+    with mock.patch('shipyard_airflow.plugins.service_session.'
+                    'keystone_session') as keystone_session:
+        sess = ucp_keystone_session(conf_file)
+        assert ucp_keystone_session(conf_file) is sess
+    assert keystone_session.Session.call_count == 1
+
+
+def test_endpoints_shared(conf_file):
+    sess = mock.MagicMock()
+    sess.get_endpoint.return_value = 'http://drydock-api:9000/api/v1.0'
+    with mock.patch.object(service_endpoint, 'ucp_keystone_session',
+                           return_value=sess):
+        for _ in range(3):
+            endpoints = service_endpoint.ServiceEndpoints(conf_file)
+            assert endpoints.endpoint_by_name(
+                service_endpoint.DRYDOCK) == sess.get_endpoint.return_value
+    sess.get_endpoint.assert_called_once_with(
+        interface='internal', service_type='physicalprovisioner')
+
+
+def test_db_engine_shared(conf_file):
+    config = worker_registry.get_registry(conf_file).config
+    config.set('base', 'postgresql_db', 'postgresql://shipyard@db/shipyard')
+    engines = []
+    with mock.patch('shipyard_airflow.plugins.ucp_base_operator.'
+                    'sqlalchemy') as sqlalchemy:
+        for task_id in ('t1', 't2'):
+            op = UcpBaseOperator(task_id=task_id, shipyard_conf=conf_file)
+            op.config = config
+            engines.append(op._get_shipyard_db_engine())
+    assert engines[0] is engines[1]
+    assert sqlalchemy.create_engine.call_count == 1
@@ -0,0 +1,52 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+from shipyard_airflow import shipyard_upgrade_db
+from shipyard_airflow.db import db
+
+REPORT = [
+    {'index_name': 'ix_notes_assoc_id', 'table_name': 'notes',
+     'status': 'ok', 'size_bytes': 8192, 'scans': 3},
+    {'index_name': 'ix_api_locks_lock_type_released_datetime',
+     'table_name': 'api_locks', 'status': 'missing', 'size_bytes': None,
+     'scans': None},
+]
+
+
+@mock.patch.object(shipyard_upgrade_db, 'LOG')
+@mock.patch.object(db.SHIPYARD_DB, 'get_index_health', return_value=REPORT)
+def test_report_index_health(get_index_health, log):
+    shipyard_upgrade_db.report_index_health()
+    assert log.info.call_count == 1
+    assert log.warning.call_count == 1
+    assert 'missing' in log.warning.call_args[0]
+
+
+@mock.patch.object(shipyard_upgrade_db, 'LOG')
+@mock.patch.object(db.SHIPYARD_DB, 'get_index_health',
+                   side_effect=Exception('no database'))
+def test_report_index_health_failure(get_index_health, log):
+    # Failure to report index health does not fail the upgrade
+    shipyard_upgrade_db.report_index_health()
+    assert log.warning.call_count == 1
+
+
+@mock.patch.object(shipyard_upgrade_db, 'report_index_health')
+@mock.patch.object(db.SHIPYARD_DB, 'update_db')
+@mock.patch('shipyard_airflow.conf.config.parse_args')
+def test_shipyard_upgrade_db(parse_args, update_db, report_index_health):
+    assert shipyard_upgrade_db.shipyard_upgrade_db() is None
+    update_db.assert_called_once_with()
+    report_index_health.assert_called_once_with()
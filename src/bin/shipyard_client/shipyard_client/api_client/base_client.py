@@ -19,12 +19,21 @@ from keystoneauth1.exceptions.catalog import EndpointNotFound
 from keystoneauth1.identity import v3
 from keystoneauth1 import session
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from shipyard_client.api_client.client_error import ClientError
 from shipyard_client.api_client.client_error import UnauthenticatedClientError
 from shipyard_client.api_client.client_error import UnauthorizedClientError
 from shipyard_client.api_client.client_error import ShipyardBufferError
 from shipyard_client.api_client.client_error import InvalidCollectionError
+from shipyard_client.api_client.keystone_cache import KeystoneCache
+
+# The requests that may be retried, not changing anything when repeated
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# The responses of a proxy or a service that is (re)starting, retried
+RETRY_STATUSES = frozenset([502, 503, 504])
 
 
 class BaseClient(metaclass=abc.ABCMeta):
@@ -51,6 +60,14 @@ class BaseClient(metaclass=abc.ABCMeta):
         self.logger = logging.Logger('api_client')
         self.context = context
         self.endpoint = None
+        # One session serves the token and endpoint lookups
+        self._ks_session = None
+        self.keystone_cache = None
+        # One pooled HTTP session serves the requests of the client
+        self._http_session = None
+        if getattr(context, 'keystone_cache_dir', None):
+            self.keystone_cache = KeystoneCache(context.keystone_cache_dir,
+                                                context.keystone_auth)
 
     def log_message(self, level, msg):
         """ Logs a message with context, and extra populated. """
@@ -93,11 +110,13 @@ class BaseClient(metaclass=abc.ABCMeta):
             self.debug('Query Params: ' + str(query_params))
             # This could use keystoneauth1 session, but that library handles
             # responses strangely (wraps all 400/500 in a keystone exception)
-            response = requests.post(
-                url, data=data, params=query_params, headers=headers)
+            response = self.get_http_session().post(
+                url, data=data, params=query_params, headers=headers,
+                timeout=self._timeout())
             # handle some cases where the response code is sufficient to know
             # what needs to be done
             if response.status_code == 401:
+                self._discard_token()
                 raise UnauthenticatedClientError()
             if response.status_code == 403:
                 raise UnauthorizedClientError()
@@ -110,22 +129,32 @@ class BaseClient(metaclass=abc.ABCMeta):
             self.error(str(e))
             raise ClientError(str(e))
 
-    def get_resp(self, url, query_params=None):
-        """ Thin wrapper of requests get """
+    def get_resp(self, url, query_params=None, headers=None, stream=False):
+        """ Thin wrapper of requests get
+
+        :param headers: optional, additional headers of the request, e.g.
+            If-None-Match
+        :param stream: optional, if True the body of the response is read as
+            it is consumed, rather than when the response is received
+        """
         if not query_params:
             query_params = {}
+        headers = dict(headers or {})
         try:
-            headers = {
+            headers.update({
                 'X-Context-Marker': self.context.context_marker,
                 'X-Auth-Token': self.get_token()
-            }
+            })
             query_params['verbosity'] = self.context.verbosity
             self.debug('url: ' + url)
             self.debug('Query Params: ' + str(query_params))
-            response = requests.get(url, params=query_params, headers=headers)
+            response = self.get_http_session().get(
+                url, params=query_params, headers=headers, stream=stream,
+                timeout=self._timeout())
             # handle some cases where the response code is sufficient to know
             # what needs to be done
             if response.status_code == 401:
+                self._discard_token()
                 raise UnauthenticatedClientError()
             if response.status_code == 403:
                 raise UnauthorizedClientError()
@@ -134,36 +163,117 @@ class BaseClient(metaclass=abc.ABCMeta):
             self.error(str(e))
             raise ClientError(str(e))
 
+    def get_http_session(self):
+        """Returns the HTTP session used for requests to the service
+
+        The session keeps connections alive in a pool, for reuse by later
+        requests, and retries idempotent requests failing to connect or
+        receiving a 502, 503 or 504 response, backing off between attempts.
+        """
+        if self._http_session is None:
+            retries = getattr(self.context, 'retries', 0)
+            retry_kwargs = {
+                'total': retries,
+                'backoff_factor': getattr(self.context, 'retry_backoff', 0),
+                'status_forcelist': RETRY_STATUSES,
+                # return the last response when out of retries
+                'raise_on_status': False,
+            }
+            # urllib3 1.26 renamed method_whitelist to allowed_methods
+            if hasattr(Retry, 'DEFAULT_ALLOWED_METHODS'):
+                retry_kwargs['allowed_methods'] = IDEMPOTENT_METHODS
+            else:
+                retry_kwargs['method_whitelist'] = IDEMPOTENT_METHODS
+            pool_size = getattr(self.context, 'pool_size', 10)
+            adapter = HTTPAdapter(pool_connections=pool_size,
+                                  pool_maxsize=pool_size,
+                                  max_retries=Retry(**retry_kwargs))
+            http_session = requests.Session()
+            http_session.mount('http://', adapter)
+            http_session.mount('https://', adapter)
+            http_session.headers.update({
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive'
+            })
+            self._http_session = http_session
+        return self._http_session
+
+    def close(self):
+        """Closes the connections of the HTTP session"""
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+
+    def _timeout(self):
+        """The (connect, read) timeout of requests, in seconds"""
+        return (getattr(self.context, 'connect_timeout', None),
+                getattr(self.context, 'read_timeout', None))
+
     def get_token(self):
         """
         Returns the simple token string for a token acquired from keystone
+
+        The token is taken from the keystone cache, if used and the cached
+        token has not expired.
         """
-        return self._get_ks_session().get_auth_headers().get('X-Auth-Token')
+        if self.keystone_cache is not None:
+            token = self.keystone_cache.get_token()
+            if token is not None:
+                return token
+        ks_session = self._get_ks_session()
+        token = ks_session.get_auth_headers().get('X-Auth-Token')
+        self._cache_session(ks_session)
+        return token
 
     def _get_ks_session(self):
+        if self._ks_session is not None:
+            return self._ks_session
         self.logger.debug('Accessing keystone for keystone session')
         try:
             auth = v3.Password(**self.context.keystone_auth)
-            return session.Session(auth=auth)
+            self._ks_session = session.Session(auth=auth)
+            return self._ks_session
         except AuthorizationFailure as e:
             self.logger.error('Could not authorize against keystone: %s',
                               str(e))
             raise ClientError(str(e))
 
+    def _cache_session(self, ks_session, endpoint=None):
+        """Cache the token of a session, and an endpoint found using it"""
+        if self.keystone_cache is None:
+            return
+        access = ks_session.auth.get_access(ks_session)
+        endpoints = None
+        if endpoint is not None:
+            endpoints = {(self.service_type, self.interface): endpoint}
+        self.keystone_cache.update(access.auth_token, access.expires,
+                                   endpoints)
+
+    def _discard_token(self):
+        """Discard a token rejected by the service, e.g. revoked"""
+        self._ks_session = None
+        if self.keystone_cache is not None:
+            self.keystone_cache.invalidate()
+
     def get_endpoint(self):
         """Lookup the endpoint for the client. Cache it.
 
         Uses a keystone session to find an endpoint for the specified
         service_type at the specified interface (public, internal, admin)
         """
+        if self.endpoint is None and self.keystone_cache is not None:
+            self.endpoint = self.keystone_cache.get_endpoint(
+                self.service_type, self.interface)
         if self.endpoint is None:
             self.logger.debug('Accessing keystone for %s endpoint',
                               self.service_type)
+            ks_session = self._get_ks_session()
             try:
-                self.endpoint = self._get_ks_session().get_endpoint(
+                self.endpoint = ks_session.get_endpoint(
                     interface=self.interface, service_type=self.service_type)
             except EndpointNotFound as e:
                 self.logger.error('Could not find %s interface for %s',
                                   self.interface, self.service_type)
                 raise ClientError(str(e))
+            self._cache_session(ks_session, self.endpoint)
         return self.endpoint
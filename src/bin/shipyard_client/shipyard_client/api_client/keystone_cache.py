@@ -0,0 +1,174 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""On-disk cache of Keystone tokens and service endpoints
+
+Allows separate invocations of the client to use the token, and the endpoints
+looked up from the service catalog, of a previous invocation until the token
+expires, instead of authenticating with Keystone each time.
+
+Each set of credentials has its own cache file, named by a hash of the
+Keystone URL, user, project and domains. The cache directory is only
+accessible to its owner, and cache files are only readable and writable by
+their owner; a file that others could read or write is ignored.
+"""
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+import time
+
+LOG = logging.getLogger(__name__)
+
+# A cached token is not used if it expires within this many seconds
+EXPIRY_MARGIN = 60
+
+# The Keystone authentication values identifying the cached credentials
+_KEY_FIELDS = ('auth_url', 'username', 'user_domain_name', 'project_name',
+               'project_domain_name')
+
+
+def default_cache_dir():
+    """The default directory of the cache, in the user's cache directory"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'shipyard')
+
+
+class KeystoneCache:
+    """The cached token and endpoints of a set of Keystone credentials
+
+    :param cache_dir: the directory holding the cache files
+    :param keystone_auth: the Keystone authentication values, as used for
+        v3.Password: auth_url, username, user_domain_name, project_name,
+        project_domain_name (and password, which is not used)
+    :param clock: optional, the function returning the current time in
+        seconds since the epoch. Defaults to time.time
+
+    Failures to read or write the cache are logged and otherwise ignored,
+    such that the client authenticates with Keystone instead.
+    """
+    def __init__(self, cache_dir, keystone_auth, clock=None):
+        self.cache_dir = cache_dir
+        key = json.dumps([keystone_auth.get(field) for field in _KEY_FIELDS])
+        self.path = os.path.join(
+            cache_dir,
+            'keystone-{}.json'.format(
+                hashlib.sha256(key.encode('utf-8')).hexdigest()))
+        self.clock = clock or time.time
+
+    def get_token(self):
+        """Returns the cached token, or None if there is none unexpired"""
+        entry = self._load()
+        return entry['token'] if entry else None
+
+    def get_endpoint(self, service_type, interface):
+        """Returns the cached endpoint of a service, or None
+
+        Endpoints are cached with the token of the authentication returning
+        the service catalog, and expire with it.
+        """
+        entry = self._load()
+        if not entry:
+            return None
+        return entry['endpoints'].get(_endpoint_key(service_type, interface))
+
+    def update(self, token, expires_at, endpoints=None):
+        """Caches a token, and endpoints found using that token
+
+        :param token: the token
+        :param expires_at: the expiry of the token, as a timezone aware
+            datetime or seconds since the epoch
+        :param endpoints: optional, a dictionary of endpoints by
+            (service_type, interface), added to the endpoints cached with the
+            same token
+        """
+        if token is None or expires_at is None:
+            return
+        if hasattr(expires_at, 'timestamp'):
+            expires_at = expires_at.timestamp()
+        entry = self._load()
+        if not entry or entry['token'] != token:
+            entry = {'token': token, 'expires_at': expires_at,
+                     'endpoints': {}}
+        for (service_type, interface), url in (endpoints or {}).items():
+            entry['endpoints'][_endpoint_key(service_type, interface)] = url
+        self._save(entry)
+
+    def invalidate(self):
+        """Discards the cached token and endpoints, e.g. a revoked token"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as ex:
+            LOG.warning('Unable to remove the Keystone cache %s: %s',
+                        self.path, ex)
+
+    def _load(self):
+        """Returns the unexpired cache entry, or None"""
+        try:
+            with open(self.path) as cache_file:
+                info = os.fstat(cache_file.fileno())
+                if not _is_private(info):
+                    LOG.warning('Ignoring the Keystone cache %s, which is '
+                                'accessible to other users', self.path)
+                    return None
+                entry = json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as ex:
+            LOG.warning('Unable to read the Keystone cache %s: %s',
+                        self.path, ex)
+            return None
+        try:
+            if entry['expires_at'] - EXPIRY_MARGIN <= self.clock():
+                return None
+            entry.setdefault('endpoints', {})
+            return entry if entry['token'] else None
+        except (KeyError, TypeError):
+            return None
+
+    def _save(self, entry):
+        """Writes the cache entry, replacing the cache file"""
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            if not _is_private(os.stat(self.cache_dir)):
+                LOG.warning('Not writing the Keystone cache to %s, which is '
+                            'accessible to other users', self.cache_dir)
+                return
+            # mkstemp creates the file readable and writable by its owner
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir,
+                                            prefix='.keystone-')
+            try:
+                with os.fdopen(fd, 'w') as cache_file:
+                    json.dump(entry, cache_file)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                os.remove(tmp_path)
+                raise
+        except OSError as ex:
+            LOG.warning('Unable to write the Keystone cache %s: %s',
+                        self.path, ex)
+
+
+def _endpoint_key(service_type, interface):
+    return '{}/{}'.format(service_type, interface)
+
+
+def _is_private(info):
+    """Whether a file is owned by the user, and inaccessible to others"""
+    return (info.st_uid == os.getuid() and
+            not info.st_mode & (stat.S_IRWXG | stat.S_IRWXO))
@@ -127,16 +127,33 @@ class ShipyardClient(BaseClient):
         url = ApiPaths.COMMIT_CONFIG.value.format(self.get_endpoint())
         return self.post_resp(url, query_params)
 
-    def get_actions(self):
+    def get_actions(self, limit=None, after=None, since=None, name=None,
+                    lifecycle=None):
         """
         A list of actions that have been executed through shipyard's action API
-        :returns: lists all actions
+        :param int limit: optional, the maximum number of actions to return
+        :param str after: optional, the id of the action after which to
+            start listing actions
+        :param str since: optional, iso8601 date; only actions invoked since
+            this date are returned
+        :param str name: optional, only actions with this name are returned
+        :param str lifecycle: optional, only actions in this lifecycle state
+            are returned
+        :returns: lists all actions matching the filters
         :rtype: Response object
         """
+        filters = {
+            'limit': limit,
+            'after': after,
+            'since': since,
+            'name': name,
+            'lifecycle': lifecycle
+        }
+        query_params = {k: v for k, v in filters.items() if v is not None}
         url = ApiPaths.POST_GET_ACTIONS.value.format(
             self.get_endpoint()
         )
-        return self.get_resp(url)
+        return self.get_resp(url, query_params)
 
     def post_actions(self, name=None, parameters=None,
                      allow_intermediate_commits=False):
@@ -159,10 +176,12 @@ class ShipyardClient(BaseClient):
                               data=json.dumps(action_data),
                               content_type='application/json')
 
-    def get_action_detail(self, action_id=None):
+    def get_action_detail(self, action_id=None, etag=None):
         """
         Used to get details about an action
         :param str action_id: Unique ID for a particular action
+        :param str etag: optional, the ETag of a previous response. If the
+            action is unchanged, the response is a 304 Not Modified
         :returns: information describing the action
         :rtype: Response object
         """
@@ -170,7 +189,9 @@ class ShipyardClient(BaseClient):
             self.get_endpoint(),
             action_id
         )
-        return self.get_resp(url)
+        if etag is None:
+            return self.get_resp(url)
+        return self.get_resp(url, headers={'If-None-Match': etag})
 
     def get_validation_detail(self, action_id=None, validation_id=None):
         """
@@ -199,7 +220,8 @@ class ShipyardClient(BaseClient):
         )
         return self.get_resp(url)
 
-    def get_step_log(self, action_id=None, step_id=None, try_number=None):
+    def get_step_log(self, action_id=None, step_id=None, try_number=None,
+                     offset=None, tail=None, stream=False):
         """
         Retrieve logs for a particular step
         :param str action_id: Unique action id
@@ -209,6 +231,15 @@ class ShipyardClient(BaseClient):
                                names of the logs as 1.log, 2.log, 3.log, etc.
                                Logs from the last attempt will be returned if
                                'try' is not specified.
+        :param int offset: optional, the byte of the log from which to
+                           retrieve the logs. The response is a 206 Partial
+                           Content, or a 416 if the log has not reached the
+                           offset.
+        :param int tail: optional, the number of lines at the end of the log
+                         to retrieve
+        :param bool stream: optional, if True, the logs are read from the
+                            response as it is consumed, e.g. using
+                            iter_content
         :returns: Logs for the step
         :rtype: Response object
         """
@@ -216,13 +247,21 @@ class ShipyardClient(BaseClient):
             query_params = {'try': try_number}
         else:
             query_params = {}
+        if tail is not None:
+            query_params['tail'] = tail
 
         url = ApiPaths.GET_STEP_LOG.value.format(
             self.get_endpoint(),
             action_id,
             step_id
         )
-        return self.get_resp(url, query_params)
+        if not offset and not stream:
+            return self.get_resp(url, query_params)
+        headers = None
+        if offset:
+            headers = {'Range': 'bytes={}-'.format(offset)}
+        return self.get_resp(url, query_params, headers=headers,
+                             stream=stream)
 
     def post_control_action(self, action_id=None, control_verb=None):
         """
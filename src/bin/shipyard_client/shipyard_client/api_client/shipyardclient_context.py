@@ -25,10 +25,25 @@ class ShipyardClientContext:
     :param bool debug: defaults False, enable debugging
     :param int verbosity: 0-5, default=1, the level of verbosity to set
         for the API
+    :param str keystone_cache_dir: optional, the directory in which Keystone
+        tokens and endpoints are cached between invocations. Defaults to
+        None, not caching them
+    :param float connect_timeout: seconds to wait for a connection to the
+        API, default=10. None waits indefinitely
+    :param float read_timeout: seconds to wait for the API to send data,
+        default=None, waiting indefinitely
+    :param int retries: default=3, the number of times a GET request failing
+        to connect, or receiving a 502, 503 or 504 response, is retried
+    :param float retry_backoff: default=0.5, the backoff factor of retries.
+        Retries wait {retry_backoff} * 2 ** ({retry number} - 1) seconds
+    :param int pool_size: default=10, the number of connections to the API
+        kept alive for reuse
     """
 
     def __init__(self, keystone_auth, context_marker,
-                 debug=False, verbosity=1):
+                 debug=False, verbosity=1, keystone_cache_dir=None,
+                 connect_timeout=10, read_timeout=None, retries=3,
+                 retry_backoff=0.5, pool_size=10):
         self.debug = debug
         if self.debug:
             LOG.setLevel(logging.DEBUG)
@@ -36,3 +51,9 @@ class ShipyardClientContext:
         self.keystone_auth = keystone_auth
         self.context_marker = context_marker
         self.verbosity = verbosity
+        self.keystone_cache_dir = keystone_cache_dir
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.pool_size = pool_size
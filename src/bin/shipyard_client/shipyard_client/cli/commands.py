@@ -24,6 +24,8 @@ from .describe import commands as describe
 from .get import commands as get
 from .help import commands as help
 from .logs import commands as logs
+from .watch import commands as watch
+from shipyard_client.api_client.keystone_cache import default_cache_dir
 from shipyard_client.cli.input_checks import check_control_action, check_id
 
 
@@ -60,6 +62,21 @@ from shipyard_client.cli.input_checks import check_control_action, check_id
 # os_auth_url is required for all command except help, please see shipyard def
 @click.option(
     '--os-auth-url', envvar='OS_AUTH_URL', required=False)
+@click.option(
+    '--keystone-cache/--no-keystone-cache',
+    'keystone_cache',
+    envvar='SHIPYARD_KEYSTONE_CACHE',
+    default=False,
+    help='Cache the Keystone token and the Shipyard endpoint on disk, and '
+    'use them in later invocations until the token expires. Defaults to no '
+    'cache.')
+@click.option(
+    '--keystone-cache-dir',
+    'keystone_cache_dir',
+    envvar='SHIPYARD_KEYSTONE_CACHE_DIR',
+    required=False,
+    help='The directory of the Keystone cache, only accessible to its '
+    'owner. Defaults to $XDG_CACHE_HOME/shipyard or ~/.cache/shipyard.')
 # Allows context (ctx) to be passed
 @click.option(
     '--verbosity',
@@ -70,13 +87,15 @@ from shipyard_client.cli.input_checks import check_control_action, check_id
 @click.pass_context
 def shipyard(ctx, context_marker, debug, os_project_domain_name,
              os_user_domain_name, os_project_name, os_username, os_password,
-             os_auth_url, output_format, verbosity):
+             os_auth_url, keystone_cache, keystone_cache_dir, output_format,
+             verbosity):
     """
     COMMAND: shipyard \n
     DESCRIPTION: The base shipyard command supports options that determine
     cross-CLI behaviors. These options are positioned immediately following
     the shipyard command. \n
     FORMAT: shipyard [--context-marker=<uuid>] [--os_{various}=<value>]
+    [--keystone-cache/--no-keystone-cache] [--keystone-cache-dir=<dir>]
     [--debug/--no-debug] [--output-format=<json,yaml,raw] [--verbosity=<0-5>]
     <subcommands> \n
     """
@@ -108,6 +127,8 @@ def shipyard(ctx, context_marker, debug, os_project_domain_name,
         'context_marker': str(context_marker) if context_marker else None,
         'debug': debug,
         'verbosity': verbosity,
+        'keystone_cache_dir': (keystone_cache_dir or default_cache_dir()
+                               if keystone_cache else None),
     }
 
     ctx.obj['FORMAT'] = output_format
@@ -120,6 +141,7 @@ shipyard.add_command(describe.describe)
 shipyard.add_command(get.get)
 shipyard.add_command(help.help)
 shipyard.add_command(logs.logs)
+shipyard.add_command(watch.watch)
 
 
 # To Invoke Control Commands
@@ -16,11 +16,11 @@
 
 import click
 import os
-import yaml
 
 from shipyard_client.cli.create.actions import CreateAction, CreateConfigdocs
 from shipyard_client.cli.input_checks import check_action_command, \
     check_reformat_parameter
+from shipyard_client.cli import yaml_codec
 
 
 @click.group()
@@ -182,15 +182,15 @@ def create_configdocs(ctx, collection, filenames, directory, append, replace,
             with open(_file, 'r') as stream:
                 if is_yaml(_file):
                     try:
-                        docs += list(yaml.safe_load_all(stream))
-                    except yaml.YAMLError as exc:
+                        docs += list(yaml_codec.load_all(stream))
+                    except yaml_codec.YAMLError as exc:
                         ctx.fail('YAML file {} is invalid because {}'.format(
                             _file, exc))
                 else:
                     ctx.fail('The file {} is not a YAML file.  Please enter '
                              'only YAML files.'.format(_file))
 
-        data = yaml.safe_dump_all(docs)
+        data = yaml_codec.dump_all(docs)
 
     click.echo(
         CreateConfigdocs(
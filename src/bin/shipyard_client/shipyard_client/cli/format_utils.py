@@ -12,11 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import json
-import yaml
 
 from prettytable import PrettyTable
 from prettytable.prettytable import PLAIN_COLUMNS
 
+from shipyard_client.cli import yaml_codec
+
 _INDENT = ' ' * 8
 
 
@@ -204,8 +205,8 @@ def formatted_response_handler(response):
 
     else:  # all others should be yaml
         try:
-            return (yaml.dump_all(
-                yaml.safe_load_all(response.content),
+            return (yaml_codec.dump_all(
+                yaml_codec.load_all(response.content),
                 width=79,
                 indent=4,
                 default_flow_style=False))
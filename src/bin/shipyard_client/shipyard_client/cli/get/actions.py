@@ -18,15 +18,23 @@ from shipyard_client.cli import format_utils
 class GetActions(CliAction):
     """Action to Get Actions"""
 
-    def __init__(self, ctx):
+    def __init__(self, ctx, limit=None, after=None, since=None, name=None,
+                 lifecycle=None):
         """Sets parameters."""
         super().__init__(ctx)
         self.logger.debug("GetActions action initialized.")
+        self.limit = limit
+        self.after = after
+        self.since = since
+        self.name = name
+        self.lifecycle = lifecycle
 
     def invoke(self):
         """Calls API Client and formats response from API Client"""
         self.logger.debug("Calling API Client get_actions.")
-        return self.get_api_client().get_actions()
+        return self.get_api_client().get_actions(
+            limit=self.limit, after=self.after, since=self.since,
+            name=self.name, lifecycle=self.lifecycle)
 
     # Handle 404 with default error handler for cli.
     cli_handled_err_resp_codes = []
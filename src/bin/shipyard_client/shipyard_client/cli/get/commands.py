@@ -39,18 +39,40 @@ def get(ctx):
 DESC_ACTIONS = """
 COMMAND: actions \n
 DESCRIPTION: Lists the actions that have been invoked. \n
-FORMAT: shipyard get actions \n
-EXAMPLE: shipyard get actions
+FORMAT: shipyard get actions [--limit=<limit>] [--after=<action id>]
+[--since=<date>] [--name=<action name>] [--lifecycle=<lifecycle>] \n
+EXAMPLE: \n
+    shipyard get actions \n
+    shipyard get actions --name=update_site --lifecycle=Failed --limit=10
 """
 
 SHORT_DESC_ACTIONS = "Lists the actions that have been invoked."
 
 
 @get.command(name='actions', help=DESC_ACTIONS, short_help=SHORT_DESC_ACTIONS)
+@click.option(
+    '--limit',
+    type=click.IntRange(min=1),
+    help='The maximum number of actions to list.')
+@click.option(
+    '--after',
+    help='The id of the action after which to start listing actions. Use the '
+    'id of the last action listed to retrieve the next page of actions.')
+@click.option(
+    '--since',
+    help='A boundary in the past within which to list actions.')
+@click.option(
+    '--name',
+    help='List only the actions with this name, e.g. deploy_site.')
+@click.option(
+    '--lifecycle',
+    help='List only the actions in this lifecycle state, e.g. Processing.')
 @click.pass_context
-def get_actions(ctx):
+def get_actions(ctx, limit, after, since, name, lifecycle):
 
-    click.echo(GetActions(ctx).invoke_and_return_resp())
+    click.echo(
+        GetActions(ctx, limit, after, since, name,
+                   lifecycle).invoke_and_return_resp())
 
 
 DESC_CONFIGDOCS = """
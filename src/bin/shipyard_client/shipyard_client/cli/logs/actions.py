@@ -12,15 +12,40 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import codecs
+import time
+
 from shipyard_client.cli.action import CliAction
 from shipyard_client.cli import format_utils
 
+# The size of the chunks in which logs are read and written
+LOG_CHUNK_SIZE = 64 * 1024
+
+# The states of a step that is no longer running, so its log is complete
+FINISHED_STATES = frozenset(['success', 'failed', 'upstream_failed',
+                             'skipped', 'removed', 'shutdown'])
+
 
 class LogsStep(CliAction):
-    """Action to Retrieve Logs for a particular Step"""
+    """Action to Retrieve Logs for a particular Step
+
+    For the cli output format, logs are written using the output function as
+    they are received, rather than once the whole log is received. When
+    following the log, the log of the step is checked for more until the
+    step has finished.
+    """
 
-    def __init__(self, ctx, action_id, step_id, try_number=None):
-        """Sets parameters."""
+    def __init__(self, ctx, action_id, step_id, try_number=None, tail=None,
+                 follow=False, interval=5, output=None):
+        """Sets parameters.
+
+        :param tail: optional, the number of lines at the end of the log to
+            retrieve
+        :param follow: if True, keep retrieving the log while the step runs
+        :param interval: the seconds between checks for more of a followed
+            log
+        :param output: the function writing the text of the log
+        """
         super().__init__(ctx)
         self.logger.debug(
             "LogsStep action initialized with action_id=%s and step_id=%s",
@@ -28,27 +53,119 @@ class LogsStep(CliAction):
         self.action_id = action_id
         self.step_id = step_id
         self.try_number = try_number
+        self.tail = tail
+        self.follow = follow
+        self.interval = interval
+        self.output = output or print
+        self.streamed = False
 
     def invoke(self):
         """Calls API Client and formats response from API Client"""
         self.logger.debug("Calling API Client get_step_log.")
-        return self.get_api_client().get_step_log(
+        api_client = self.get_api_client()
+        if self.follow:
+            return self._follow(api_client)
+        if self.output_format != 'cli':
+            return api_client.get_step_log(
+                action_id=self.action_id,
+                step_id=self.step_id,
+                try_number=self.try_number,
+                tail=self.tail)
+        response = api_client.get_step_log(
             action_id=self.action_id,
             step_id=self.step_id,
-            try_number=self.try_number)
+            try_number=self.try_number,
+            tail=self.tail,
+            stream=True)
+        if response.status_code in self.cli_handled_succ_resp_codes:
+            self._write(response, self._decoder())
+        return response
+
+    def _follow(self, api_client):
+        """Writes the log as it grows, until the step has finished
 
-    # Handle 404 with default error handler for cli.
-    cli_handled_err_resp_codes = [404]
+        The log of the latest try of the step is followed, unless a try is
+        specified. Returns the last response, or an error response.
+        """
+        decoder = self._decoder()
+        try_number = self.try_number
+        offset = 0
+        tail = self.tail
+        last_response = None
+        while True:
+            step = api_client.get_step_detail(action_id=self.action_id,
+                                              step_id=self.step_id)
+            if step.status_code != 200:
+                return step
+            step = step.json()
+            finished = step.get('state') in FINISHED_STATES
+            if not self.try_number and step.get('try_number') != try_number:
+                # a retry of the step writes a new log
+                try_number = step.get('try_number')
+                offset = 0
+            response = api_client.get_step_log(
+                action_id=self.action_id,
+                step_id=self.step_id,
+                try_number=try_number,
+                offset=offset,
+                tail=tail,
+                stream=True)
+            if response.status_code in self.cli_handled_succ_resp_codes:
+                received = self._write(response, decoder)
+                length = _range_length(response.headers.get('Content-Range'))
+                if tail is not None and length is not None:
+                    # the tail ends at the end of the log
+                    offset = length
+                else:
+                    offset += received
+                tail = None
+                last_response = response
+            elif response.status_code not in (404, 416):
+                return response
+            # a 404 is a log not yet written, a 416 a log with no more lines
+            if finished:
+                return last_response or response
+            time.sleep(self.interval)
+
+    def _decoder(self):
+        """Decodes the log, which may be split mid character between chunks
+        """
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def _write(self, response, decoder):
+        """Writes the log as it is received, returning the bytes received"""
+        received = 0
+        for chunk in response.iter_content(LOG_CHUNK_SIZE):
+            received += len(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                self.output(text)
+        self.streamed = True
+        return received
 
-    # Handle 200 responses using the cli_format_response_handler
-    cli_handled_succ_resp_codes = [200]
+    # Handle 404 and 416 with default error handler for cli.
+    cli_handled_err_resp_codes = [404, 416]
+
+    # Handle 200 and 206 responses using the cli_format_response_handler
+    cli_handled_succ_resp_codes = [200, 206]
 
     def cli_format_response_handler(self, response):
         """CLI output handler
 
-        Effectively passes through the logs received.
+        Effectively passes through the logs received, unless they have been
+        written as they were received.
         :param response: a requests response object
         :returns: a string representing a CLI appropriate response
-            Handles 200 responses
+            Handles 200 and 206 responses
         """
+        if self.streamed:
+            return ''
         return format_utils.raw_format_response_handler(response)
+
+
+def _range_length(content_range):
+    """The complete length of a log, from a Content-Range, or None"""
+    try:
+        return int(content_range.rsplit('/', 1)[1])
+    except (AttributeError, IndexError, ValueError):
+        return None
@@ -65,11 +65,15 @@ def logs_default_command(ctx, namespace_item):
 
 LOGS_STEP = """
 COMMAND: logs step
-DESCRIPTION: Retrieves logs for a particular step.
+DESCRIPTION: Retrieves logs for a particular step, optionally only the last
+lines, or following the log until the step has finished.
 FORMAT: shipyard logs step <step_id> --action=<action_id> --try=<try>
+[--tail=<lines>] [--follow]
 EXAMPLE:
 shipyard logs step drydock_validate_site_design
  --action=01C7ECDZF7MC8JEVE8NA8PS764 --try=2
+shipyard logs step armada_build --action=01C7ECDZF7MC8JEVE8NA8PS764
+ --tail=100 --follow
 """
 
 SHORT_LOGS_STEP = ("Retrieve logs for a particular step.")
@@ -87,10 +91,39 @@ SHORT_LOGS_STEP = ("Retrieve logs for a particular step.")
     '-t',
     'try_number',
     help='The try number that provides the context for this step')
+@click.option(
+    '--tail',
+    '-n',
+    type=click.IntRange(min=0),
+    help='The number of lines at the end of the log to retrieve')
+@click.option(
+    '--follow',
+    '-f',
+    is_flag=True,
+    default=False,
+    help='Keep retrieving the log as it grows, until the step has finished')
+@click.option(
+    '--interval',
+    type=click.IntRange(min=1),
+    default=5,
+    help='The seconds between checks for more of a followed log. '
+         'Defaults to 5')
 @click.pass_context
-def logs_step(ctx, action, step_id, try_number=None):
+def logs_step(ctx, action, step_id, try_number=None, tail=None, follow=False,
+              interval=5):
 
-    click.echo(LogsStep(ctx,
+    resp_txt = LogsStep(ctx,
                         action,
                         step_id,
-                        try_number).invoke_and_return_resp())
+                        try_number,
+                        tail=tail,
+                        follow=follow,
+                        interval=interval,
+                        output=_write_log).invoke_and_return_resp()
+    if resp_txt:
+        click.echo(resp_txt)
+
+
+def _write_log(text):
+    """Writes the text of a log as it is received"""
+    click.echo(text, nl=False)
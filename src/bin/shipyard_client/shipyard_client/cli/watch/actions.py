@@ -0,0 +1,130 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+
+from shipyard_client.cli.action import CliAction
+from shipyard_client.cli import cli_format_common
+
+# Exit codes of the watch, by the final lifecycle of the action
+EXIT_CODES = {
+    'Complete': 0,
+    'Failed': 1,
+}
+
+# The exit code of a watch ending without a final lifecycle, by an error or
+# a timeout
+EXIT_NOT_FINISHED = 2
+
+
+class WatchAction(CliAction):
+    """Action to watch an action until it completes or fails
+
+    Polls the action using a single client, and therefore connection and
+    Keystone session, sending the ETag of the previous response such that
+    unchanged polls are answered with a 304 Not Modified, without the action.
+    Changes to the lifecycle of the action, the states of its steps and new
+    notes are written using the output function as they are seen.
+    """
+
+    def __init__(self, ctx, action_id, interval, timeout=None, output=None):
+        """Sets parameters.
+
+        :param interval: the seconds between polls of the action
+        :param timeout: optional, the seconds after which the watch ends,
+            even if the action has not completed or failed
+        :param output: the function writing a line of output
+        """
+        super().__init__(ctx)
+        self.logger.debug(
+            "WatchAction action initialized with action_id=%s", action_id)
+        self.action_id = action_id
+        self.interval = interval
+        self.timeout = timeout
+        self.output = output or print
+        self.exit_code = EXIT_NOT_FINISHED
+        self._lifecycle = None
+        self._step_states = {}
+        self._note_ids = set()
+
+    def invoke(self):
+        """Polls the action until its lifecycle is final
+
+        Returns the last response of a changed action, or an error response
+        """
+        self.logger.debug("Calling API Client get_action_detail.")
+        api_client = self.get_api_client()
+        deadline = None
+        if self.timeout is not None:
+            deadline = time.monotonic() + self.timeout
+        etag = None
+        last_response = None
+        while True:
+            response = api_client.get_action_detail(
+                action_id=self.action_id, etag=etag)
+            if response.status_code == 200:
+                etag = response.headers.get('ETag')
+                last_response = response
+                self._report_changes(response.json())
+            elif response.status_code != 304:
+                return response
+            if self._lifecycle in EXIT_CODES:
+                self.exit_code = EXIT_CODES[self._lifecycle]
+                return last_response
+            if deadline is not None and time.monotonic() >= deadline:
+                self.output('Timed out watching action/{}'.format(
+                    self.action_id))
+                return last_response
+            time.sleep(self.interval)
+
+    def _report_changes(self, action):
+        """Outputs the changes to the action since it was last seen"""
+        lifecycle = action.get('action_lifecycle')
+        if lifecycle != self._lifecycle:
+            self.output('action/{}: {}'.format(self.action_id, lifecycle))
+            self._lifecycle = lifecycle
+        for step in action.get('steps') or []:
+            step_id = step.get('id')
+            state = step.get('state')
+            if state != self._step_states.get(step_id):
+                self.output('step/{}/{}: {}'.format(
+                    self.action_id, step_id, state))
+                self._step_states[step_id] = state
+            self._report_notes(step.get('notes'))
+        self._report_notes(action.get('notes'))
+
+    def _report_notes(self, notes):
+        """Outputs the notes not previously output"""
+        new_notes = [note for note in notes or []
+                     if note.get('note_id') not in self._note_ids]
+        for note_str in cli_format_common.format_notes(new_notes):
+            self.output(note_str)
+        self._note_ids.update(note.get('note_id') for note in new_notes)
+
+    # Handle 404 with default error handler for cli.
+    cli_handled_err_resp_codes = [404]
+
+    # Handle 200 responses using the cli_format_response_handler
+    cli_handled_succ_resp_codes = [200]
+
+    def cli_format_response_handler(self, response):
+        """CLI output handler
+
+        The changes have already been output while watching, leaving the
+        final lifecycle of the action.
+        :param response: a requests response object
+        :returns: a string representing a formatted response
+            Handles 200 responses
+        """
+        return 'Finished watching action/{}: {}'.format(
+            self.action_id, self._lifecycle)
@@ -0,0 +1,98 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Watch command
+
+import click
+
+from click_default_group import DefaultGroup
+
+from shipyard_client.cli.input_checks import check_id
+from shipyard_client.cli.watch.actions import WatchAction
+
+
+@click.group(cls=DefaultGroup, default='watch_default_command')
+@click.pass_context
+def watch(ctx):
+    """
+    Watch an action until it completes or fails.
+    For more information on watch commands
+    please enter the watch command followed by '--help'
+    Example: shipyard watch action --help
+
+    FOR NAMESPACE ENTRIES:
+        COMMAND: (no sub command)
+        DESCRIPTION: Watches the supplied namespaced item.
+        FORMAT: shipyard watch <namespace item>
+        EXAMPLE: shipyard watch action/01BTG32JW87G0YKA1K29TKNAFX
+    """
+
+
+@watch.command('watch_default_command', short_help="")
+@click.argument('namespace_item')
+@click.pass_context
+def watch_default_command(ctx, namespace_item):
+    try:
+        namespace = namespace_item.split("/")
+        if namespace[0] == 'action':
+            action_id = namespace[1]
+        else:
+            raise Exception('Invalid namespaced watch action')
+    except Exception:
+        ctx.fail("Invalid namespace item. Please utilize the following "
+                 "format for the namespace item.\n"
+                 "action: action/action id")
+    ctx.invoke(watch_action, action_id=action_id)
+
+
+WATCH_ACTION = """
+COMMAND: watch action \n
+DESCRIPTION: Watches an action until it completes or fails, printing the
+changes to the lifecycle of the action, the states of its steps, and new
+notes. Exits with 0 if the action completes, 1 if the action fails, or 2 if
+the watch ends otherwise, e.g. by timing out. \n
+FORMAT: shipyard watch action <action id> [--interval=<seconds>]
+[--timeout=<seconds>] \n
+EXAMPLE: shipyard watch action 01BTG32JW87G0YKA1K29TKNAFX --interval=5
+"""
+
+SHORT_WATCH_ACTION = "Watches an action until it completes or fails."
+
+
+@watch.command('action', help=WATCH_ACTION, short_help=SHORT_WATCH_ACTION)
+@click.argument('action_id')
+@click.option(
+    '--interval',
+    '-i',
+    type=float,
+    default=10,
+    help='The seconds between checks of the action. Defaults to 10')
+@click.option(
+    '--timeout',
+    '-t',
+    type=float,
+    help='The seconds after which to stop watching. Defaults to no timeout')
+@click.pass_context
+def watch_action(ctx, action_id, interval=10, timeout=None):
+
+    check_id(ctx, action_id)
+    if interval < 1:
+        ctx.fail('The interval must be at least 1 second.')
+    if timeout is not None and timeout < 0:
+        ctx.fail('The timeout must not be negative.')
+
+    watch_action = WatchAction(ctx, action_id, interval, timeout,
+                               output=click.echo)
+    click.echo(watch_action.invoke_and_return_resp())
+    ctx.exit(watch_action.exit_code)
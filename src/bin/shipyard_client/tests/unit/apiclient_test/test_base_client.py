@@ -0,0 +1,94 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+import pytest
+import requests
+
+from shipyard_client.api_client.base_client import BaseClient
+from shipyard_client.api_client.client_error import ClientError
+from shipyard_client.api_client.shipyard_api_client import ShipyardClient
+from shipyard_client.api_client.shipyardclient_context import \
+    ShipyardClientContext
+
+KEYSTONE_AUTH = {
+    'project_domain_name': 'projDomainTest',
+    'user_domain_name': 'userDomainTest',
+    'project_name': 'projectTest',
+    'username': 'usernameTest',
+    'password': 'passwordTest',
+    'auth_url': 'urlTest'
+}
+
+
+def _client(**kwargs):
+    return ShipyardClient(ShipyardClientContext(
+        keystone_auth=KEYSTONE_AUTH,
+        context_marker='88888888-4444-4444-4444-121212121212',
+        **kwargs))
+
+
+def _retry(client, scheme='http://'):
+    return client.get_http_session().get_adapter(scheme).max_retries
+
+
+def test_http_session_shared():
+    client = _client()
+    http_session = client.get_http_session()
+    assert isinstance(http_session, requests.Session)
+    assert client.get_http_session() is http_session
+    assert 'gzip' in http_session.headers['Accept-Encoding']
+    assert http_session.headers['Connection'] == 'keep-alive'
+    client.close()
+    assert client.get_http_session() is not http_session
+
+
+def test_http_session_options():
+    client = _client(retries=5, retry_backoff=2, pool_size=4)
+    retry = _retry(client)
+    assert retry.total == 5
+    assert retry.backoff_factor == 2
+    assert set(retry.status_forcelist) == {502, 503, 504}
+    assert _retry(client, 'https://') is retry
+    adapter = client.get_http_session().get_adapter('http://')
+    assert adapter._pool_maxsize == 4
+    # only idempotent requests are retried after being sent
+    assert retry.is_retry('GET', 503)
+    assert not retry.is_retry('POST', 503)
+
+
+def test_requests_use_http_session():
+    client = _client(connect_timeout=5, read_timeout=30)
+    with mock.patch.object(BaseClient, 'get_token', return_value='token'), \
+            mock.patch.object(client, 'get_http_session') as http_session:
+        http_session.return_value.get.return_value.status_code = 200
+        http_session.return_value.post.return_value.status_code = 201
+        client.get_resp('http://shipyard/api/v1.0/actions')
+        client.post_resp('http://shipyard/api/v1.0/actions', data='x')
+    get_kwargs = http_session.return_value.get.call_args[1]
+    assert get_kwargs['timeout'] == (5, 30)
+    assert get_kwargs['headers']['X-Auth-Token'] == 'token'
+    post_kwargs = http_session.return_value.post.call_args[1]
+    assert post_kwargs['timeout'] == (5, 30)
+    assert post_kwargs['data'] == 'x'
+
+
+def test_request_failure():
+    client = _client(retries=0)
+    with mock.patch.object(BaseClient, 'get_token', return_value='token'), \
+            mock.patch.object(client, 'get_http_session') as http_session:
+        http_session.return_value.get.side_effect = (
+            requests.exceptions.ConnectTimeout('timed out'))
+        with pytest.raises(ClientError):
+            client.get_resp('http://shipyard/api/v1.0/actions')
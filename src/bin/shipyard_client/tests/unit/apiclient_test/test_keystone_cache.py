@@ -0,0 +1,186 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datetime import datetime
+from datetime import timezone
+import os
+import stat
+from unittest import mock
+
+import pytest
+
+from shipyard_client.api_client.client_error import UnauthenticatedClientError
+from shipyard_client.api_client.keystone_cache import KeystoneCache
+from shipyard_client.api_client.shipyard_api_client import ShipyardClient
+from shipyard_client.api_client.shipyardclient_context import \
+    ShipyardClientContext
+
+KEYSTONE_AUTH = {
+    'project_domain_name': 'projDomainTest',
+    'user_domain_name': 'userDomainTest',
+    'project_name': 'projectTest',
+    'username': 'usernameTest',
+    'password': 'passwordTest',
+    'auth_url': 'urlTest'
+}
+
+NOW = 1500000000
+
+
+def _cache(cache_dir, **auth):
+    keystone_auth = dict(KEYSTONE_AUTH, **auth)
+    return KeystoneCache(str(cache_dir), keystone_auth, clock=lambda: NOW)
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_cache_token(tmpdir):
+    cache_dir = tmpdir.join('cache')
+    cache = _cache(cache_dir)
+    assert cache.get_token() is None
+    cache.update('token1', NOW + 3600)
+    assert cache.get_token() == 'token1'
+    assert _cache(cache_dir).get_token() == 'token1'
+    assert _mode(str(cache_dir)) == 0o700
+    assert _mode(cache.path) == 0o600
+
+
+def test_cache_datetime_expiry(tmpdir):
+    cache = _cache(tmpdir)
+    cache.update('token1',
+                 datetime.fromtimestamp(NOW + 3600, tz=timezone.utc))
+    assert cache.get_token() == 'token1'
+
+
+def test_cache_expired(tmpdir):
+    cache = _cache(tmpdir)
+    cache.update('token1', NOW + 30)
+    # expiring within the margin
+    assert cache.get_token() is None
+    assert cache.get_endpoint('shipyard', 'public') is None
+
+
+def test_cache_endpoints(tmpdir):
+    cache = _cache(tmpdir)
+    cache.update('token1', NOW + 3600,
+                 {('shipyard', 'public'): 'http://shipyard/api/v1.0'})
+    cache.update('token1', NOW + 3600,
+                 {('deckhand', 'public'): 'http://deckhand/api/v1.0'})
+    assert cache.get_endpoint('shipyard', 'public') == (
+        'http://shipyard/api/v1.0')
+    assert cache.get_endpoint('deckhand', 'public') == (
+        'http://deckhand/api/v1.0')
+    assert cache.get_endpoint('shipyard', 'internal') is None
+    # endpoints expire with the token they were found with
+    cache.update('token2', NOW + 3600)
+    assert cache.get_token() == 'token2'
+    assert cache.get_endpoint('shipyard', 'public') is None
+
+
+def test_cache_keys(tmpdir):
+    cache = _cache(tmpdir)
+    cache.update('token1', NOW + 3600)
+    assert _cache(tmpdir, project_name='other').get_token() is None
+    assert _cache(tmpdir, auth_url='other').get_token() is None
+    assert _cache(tmpdir, user_domain_name='other').get_token() is None
+    assert _cache(tmpdir, password='changed').get_token() == 'token1'
+
+
+def test_cache_not_private(tmpdir):
+    cache = _cache(tmpdir)
+    cache.update('token1', NOW + 3600)
+    os.chmod(cache.path, 0o644)
+    assert cache.get_token() is None
+
+
+def test_cache_dir_not_private(tmpdir):
+    os.chmod(str(tmpdir), 0o755)
+    cache = _cache(tmpdir)
+    cache.update('token1', NOW + 3600)
+    assert not os.path.exists(cache.path)
+    assert cache.get_token() is None
+
+
+def test_cache_corrupt(tmpdir):
+    cache = _cache(tmpdir)
+    cache.update('token1', NOW + 3600)
+    with open(cache.path, 'w') as cache_file:
+        cache_file.write('{not json')
+    assert cache.get_token() is None
+    cache.update('token2', NOW + 3600)
+    assert cache.get_token() == 'token2'
+
+
+def test_cache_invalidate(tmpdir):
+    cache = _cache(tmpdir)
+    cache.update('token1', NOW + 3600)
+    cache.invalidate()
+    assert cache.get_token() is None
+    cache.invalidate()
+
+
+@pytest.fixture()
+def keystone():
+    """A Keystone session issuing one token that expires in an hour"""
+    with mock.patch('shipyard_client.api_client.base_client.v3'), \
+            mock.patch('shipyard_client.api_client.base_client.'
+                       'session') as ks_session:
+        sess = ks_session.Session.return_value
+        sess.get_auth_headers.return_value = {'X-Auth-Token': 'token1'}
+        sess.get_endpoint.return_value = 'http://shipyard/api/v1.0'
+        access = sess.auth.get_access.return_value
+        access.auth_token = 'token1'
+        access.expires = datetime.fromtimestamp(
+            datetime.now().timestamp() + 3600, tz=timezone.utc)
+        yield ks_session
+
+
+def _client(cache_dir):
+    return ShipyardClient(ShipyardClientContext(
+        keystone_auth=KEYSTONE_AUTH,
+        context_marker='88888888-4444-4444-4444-121212121212',
+        keystone_cache_dir=cache_dir))
+
+
+def test_client_shares_session(keystone):
+    client = _client(None)
+    assert client.get_endpoint() == 'http://shipyard/api/v1.0'
+    assert client.get_token() == 'token1'
+    assert keystone.Session.call_count == 1
+
+
+def test_client_uses_cache(keystone, tmpdir):
+    client = _client(str(tmpdir))
+    assert client.get_endpoint() == 'http://shipyard/api/v1.0'
+    assert client.get_token() == 'token1'
+    assert keystone.Session.call_count == 1
+
+    # a later invocation does not access Keystone
+    client = _client(str(tmpdir))
+    assert client.get_token() == 'token1'
+    assert client.get_endpoint() == 'http://shipyard/api/v1.0'
+    assert keystone.Session.call_count == 1
+
+
+def test_client_rejected_token(keystone, tmpdir):
+    client = _client(str(tmpdir))
+    client.get_token()
+    with mock.patch.object(client, 'get_http_session') as http_session:
+        http_session.return_value.get.return_value.status_code = 401
+        with pytest.raises(UnauthenticatedClientError):
+            client.get_resp('http://shipyard/api/v1.0/actions')
+    assert client.keystone_cache.get_token() is None
+    client.get_token()
+    assert keystone.Session.call_count == 2
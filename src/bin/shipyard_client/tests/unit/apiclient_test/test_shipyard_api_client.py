@@ -133,6 +133,22 @@ def test_get_actions(*args):
     shipyard_client = get_api_client()
     result = shipyard_client.get_actions()
     assert result['url'] == '{}/actions'.format(shipyard_client.get_endpoint())
+    assert result['params'] == {}
+
+
+@mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
+@mock.patch.object(BaseClient, 'get_resp', replace_get_resp)
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+def test_get_actions_filters(*args):
+    shipyard_client = get_api_client()
+    result = shipyard_client.get_actions(
+        limit=10, after='01BTP9T2WCE1PAJR2DWYXG805V', lifecycle='Failed')
+    assert result['url'] == '{}/actions'.format(shipyard_client.get_endpoint())
+    assert result['params'] == {
+        'limit': 10,
+        'after': '01BTP9T2WCE1PAJR2DWYXG805V',
+        'lifecycle': 'Failed'
+    }
 
 
 @mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
@@ -34,7 +34,31 @@ def test_get_actions(*args):
     runner = CliRunner()
     with patch.object(GetActions, '__init__') as mock_method:
         runner.invoke(shipyard, [auth_vars, 'get', 'actions'])
-    mock_method.assert_called_once_with(ANY)
+    mock_method.assert_called_once_with(ANY, None, None, None, None, None)
+
+
+def test_get_actions_filters(*args):
+    """test get_actions with paging and filter options"""
+
+    runner = CliRunner()
+    with patch.object(GetActions, '__init__') as mock_method:
+        runner.invoke(shipyard, [auth_vars, 'get', 'actions', '--limit=10',
+                                 '--after=01BTP9T2WCE1PAJR2DWYXG805V',
+                                 '--since=2017-11-09T15:02:18Z',
+                                 '--name=deploy_site',
+                                 '--lifecycle=Failed'])
+    mock_method.assert_called_once_with(
+        ANY, 10, '01BTP9T2WCE1PAJR2DWYXG805V', '2017-11-09T15:02:18Z',
+        'deploy_site', 'Failed')
+
+
+def test_get_actions_invalid_limit(*args):
+    """Verifies a limit less than 1 results in an error."""
+
+    runner = CliRunner()
+    results = runner.invoke(shipyard,
+                            [auth_vars, 'get', 'actions', '--limit=0'])
+    assert 'Error' in results.output
 
 
 def test_get_actions_negative(*args):
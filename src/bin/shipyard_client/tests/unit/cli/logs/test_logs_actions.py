@@ -0,0 +1,137 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from unittest import mock
+
+import responses
+
+from shipyard_client.api_client.base_client import BaseClient
+from shipyard_client.cli.logs.actions import LogsStep
+from tests.unit.cli import stubs
+
+ACTION_ID = '01C9VVQSCFS7V9QB5GBS3WFVSE'
+STEP_URL = 'http://shiptest/actions/{}/steps/action_xcom'.format(ACTION_ID)
+LOG_URL = STEP_URL + '/logs'
+
+
+class _LogServer:
+    """Serves a growing log, and the state of its step"""
+    def __init__(self, versions):
+        # (state, try_number, log) of the step at each poll
+        self.versions = list(versions)
+        self.state = None
+        self.log_requests = []
+
+    def step(self, request):
+        state, try_number, self.log = self.versions.pop(0)
+        return (200, {}, json.dumps({'task_id': 'action_xcom',
+                                     'state': state,
+                                     'try_number': try_number}))
+
+    def logs(self, request):
+        self.log_requests.append(request)
+        log = self.log.encode('utf-8')
+        range_header = request.headers.get('Range')
+        if not range_header:
+            return (200, {}, log)
+        first = int(range_header[len('bytes='):-1])
+        if first >= len(log):
+            return (416, {}, stubs.gen_err_resp(code=416))
+        return (206, {'Content-Range': 'bytes {}-{}/{}'.format(
+            first, len(log) - 1, len(log))}, log[first:])
+
+
+def _logs_step(fmt='cli', **kwargs):
+    written = []
+    logs_step = LogsStep(stubs.StubCliContext(fmt=fmt), ACTION_ID,
+                         'action_xcom', output=written.append, **kwargs)
+    with mock.patch('shipyard_client.cli.logs.actions.time.sleep'):
+        response = logs_step.invoke_and_return_resp()
+    return ''.join(written), response
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_logs_step(*args):
+    responses.add(responses.GET, LOG_URL, body='line 1\nline 2\n',
+                  status=200)
+    written, response = _logs_step(tail=2)
+    assert written == 'line 1\nline 2\n'
+    assert response == ''
+    assert responses.calls[0].request.url.endswith('?tail=2')
+
+    # other formats are not written as they are received
+    written, response = _logs_step(fmt='raw')
+    assert written == ''
+    assert 'line 2' in response
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_logs_step_not_found(*args):
+    api_resp = stubs.gen_err_resp(message='Not Found',
+                                  sub_error_count=0,
+                                  sub_info_count=0,
+                                  reason='It does not exist',
+                                  code=404)
+    responses.add(responses.GET, LOG_URL, body=api_resp, status=404)
+    written, response = _logs_step()
+    assert written == ''
+    assert 'Error: Not Found' in response
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_logs_step_follow(*args):
+    server = _LogServer([
+        ('queued', 1, ''),
+        ('running', 1, 'line 1\n'),
+        ('running', 1, 'line 1\n'),
+        ('running', 1, 'line 1\nline 2 ✓\n'),
+        ('up_for_retry', 1, 'line 1\nline 2 ✓\nfailed\n'),
+        ('running', 2, 'retry\n'),
+        ('success', 2, 'retry\ndone\n'),
+    ])
+    responses.add_callback(responses.GET, STEP_URL, callback=server.step)
+    responses.add_callback(responses.GET, LOG_URL, callback=server.logs)
+    written, response = _logs_step(follow=True)
+    assert written == 'line 1\nline 2 ✓\nfailed\nretry\ndone\n'
+    assert response == ''
+    # the log is retrieved from where the last retrieval ended
+    assert [r.headers.get('Range') for r in server.log_requests] == [
+        None, None, 'bytes=7-', 'bytes=7-', 'bytes=18-', None, 'bytes=6-']
+    assert server.log_requests[-1].url.endswith('?try=2')
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_logs_step_follow_tail(*args):
+    def tail_logs(request):
+        if 'tail=1' in request.url:
+            return (206, {'Content-Range': 'bytes 7-13/14'}, 'line 2\n')
+        return server.logs(request)
+
+    server = _LogServer([
+        ('running', 1, 'line 1\nline 2\n'),
+        ('success', 1, 'line 1\nline 2\nline 3\n'),
+    ])
+    responses.add_callback(responses.GET, STEP_URL, callback=server.step)
+    responses.add_callback(responses.GET, LOG_URL, callback=tail_logs)
+    written, response = _logs_step(follow=True, tail=1)
+    assert written == 'line 2\nline 3\n'
+    assert server.log_requests[-1].headers['Range'] == 'bytes=14-'
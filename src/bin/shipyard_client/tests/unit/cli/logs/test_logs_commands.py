@@ -0,0 +1,61 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest.mock import patch, ANY
+
+from click.testing import CliRunner
+
+from shipyard_client.cli.logs.actions import LogsStep
+from shipyard_client.cli.commands import shipyard
+
+auth_vars = ('--os-project-domain-name=OS_PROJECT_DOMAIN_NAME_test '
+             '--os-user-domain-name=OS_USER_DOMAIN_NAME_test '
+             '--os-project-name=OS_PROJECT_NAME_test '
+             '--os-username=OS_USERNAME_test '
+             '--os-password=OS_PASSWORD_test '
+             '--os-auth-url=OS_AUTH_URL_test')
+
+ACTION_ID = '01C9VVQSCFS7V9QB5GBS3WFVSE'
+
+
+def test_logs_step():
+    """test logs step"""
+    runner = CliRunner()
+    with patch.object(LogsStep, '__init__') as mock_init:
+        runner.invoke(shipyard, [auth_vars, 'logs', 'step', 'action_xcom',
+                                 '--action={}'.format(ACTION_ID), '--try=2'])
+    mock_init.assert_called_once_with(ANY, ACTION_ID, 'action_xcom', '2',
+                                      tail=None, follow=False, interval=5,
+                                      output=ANY)
+
+
+def test_logs_step_follow():
+    """test logs step, following the last lines of the log"""
+    runner = CliRunner()
+    with patch.object(LogsStep, '__init__') as mock_init:
+        runner.invoke(shipyard, [auth_vars, 'logs', 'step', 'action_xcom',
+                                 '--action={}'.format(ACTION_ID),
+                                 '--tail=20', '--follow', '--interval=2'])
+    mock_init.assert_called_once_with(ANY, ACTION_ID, 'action_xcom', None,
+                                      tail=20, follow=True, interval=2,
+                                      output=ANY)
+
+
+def test_logs_step_negative():
+    """test logs step with an invalid tail"""
+    runner = CliRunner()
+    results = runner.invoke(shipyard, [auth_vars, 'logs', 'step',
+                                       'action_xcom',
+                                       '--action={}'.format(ACTION_ID),
+                                       '--tail=-1'])
+    assert 'Error' in results.output
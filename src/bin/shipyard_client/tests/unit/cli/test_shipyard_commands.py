@@ -51,5 +51,24 @@ def test_shipyard():
         auth_vars,
         '88888888-4444-4444-4444-121212121212',
         True,
-        1
+        1,
+        None
     )
+
+
+def test_shipyard_keystone_cache():
+    runner = CliRunner()
+    with patch.object(ShipyardClientContext, '__init__') as mock_method:
+        runner.invoke(shipyard, [
+            '--os-auth-url=OS_AUTH_URL_test', '--keystone-cache',
+            '--keystone-cache-dir=/tmp/shipyard-cache', 'commit', 'configdocs'
+        ])
+    assert mock_method.call_args[0][4] == '/tmp/shipyard-cache'
+
+    with patch.object(ShipyardClientContext, '__init__') as mock_method:
+        with patch.dict('os.environ', {'XDG_CACHE_HOME': '/tmp/xdg'}):
+            runner.invoke(shipyard, [
+                '--os-auth-url=OS_AUTH_URL_test', '--keystone-cache',
+                'commit', 'configdocs'
+            ])
+    assert mock_method.call_args[0][4] == '/tmp/xdg/shipyard'
@@ -0,0 +1,150 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from unittest import mock
+
+import responses
+
+from shipyard_client.api_client.base_client import BaseClient
+from shipyard_client.cli.watch.actions import WatchAction
+from tests.unit.cli import stubs
+
+ACTION_ID = '01BTTMFVDKZFRJM80FGD7J1AKN'
+ACTION_URL = 'http://shiptest/actions/{}'.format(ACTION_ID)
+
+
+def _note(note_id, note_val):
+    return {
+        'assoc_id': 'step/{}/preflight'.format(ACTION_ID),
+        'subject': 'preflight',
+        'sub_type': 'step metadata',
+        'note_val': note_val,
+        'verbosity': 1,
+        'note_id': note_id,
+        'note_timestamp': '2018-10-08 14:23:53.346534',
+        'resolved_url_value': None
+    }
+
+
+def _action(lifecycle, preflight_state, preflight_notes=()):
+    return {
+        'id': ACTION_ID,
+        'action_lifecycle': lifecycle,
+        'steps': [
+            {'id': 'action_xcom', 'index': 1, 'state': 'success',
+             'notes': []},
+            {'id': 'preflight', 'index': 2, 'state': preflight_state,
+             'notes': list(preflight_notes)},
+        ],
+        'notes': []
+    }
+
+
+class _ActionServer:
+    """Serves a sequence of versions of an action, answering polls with the
+    ETag of the current version with 304 Not Modified
+    """
+    def __init__(self, versions):
+        self.versions = list(versions)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        body, status = self.versions.pop(0)
+        if status != 200:
+            return (status, {}, body)
+        body = json.dumps(body)
+        etag = '"{}"'.format(hash(body))
+        if request.headers.get('If-None-Match') == etag:
+            return (304, {'ETag': etag}, '')
+        return (200, {'ETag': etag}, body)
+
+
+def _watch(server, timeout=None):
+    responses.add_callback(responses.GET, ACTION_URL, callback=server)
+    lines = []
+    watch = WatchAction(stubs.StubCliContext(), ACTION_ID, interval=1,
+                        timeout=timeout, output=lines.append)
+    with mock.patch('shipyard_client.cli.watch.actions.time.sleep'):
+        response = watch.invoke_and_return_resp()
+    return watch, lines, response
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_watch_action_complete(*args):
+    processing = _action('Processing', 'running')
+    server = _ActionServer([
+        (processing, 200),
+        (processing, 200),
+        (_action('Processing', 'running', [_note('N1', 'checking')]), 200),
+        (_action('Complete', 'success', [_note('N1', 'checking')]), 200),
+    ])
+    watch, lines, response = _watch(server)
+    assert watch.exit_code == 0
+    assert lines == [
+        'action/{}: Processing'.format(ACTION_ID),
+        'step/{}/action_xcom: success'.format(ACTION_ID),
+        'step/{}/preflight: running'.format(ACTION_ID),
+        '> step metadata:preflight(2018-10-08 14:23:53.346534): checking',
+        'action/{}: Complete'.format(ACTION_ID),
+        'step/{}/preflight: success'.format(ACTION_ID),
+    ]
+    assert response == 'Finished watching action/{}: Complete'.format(
+        ACTION_ID)
+    # polls after the first are conditional
+    assert 'If-None-Match' not in server.requests[0].headers
+    assert server.requests[1].headers['If-None-Match']
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_watch_action_failed(*args):
+    server = _ActionServer([
+        (_action('Failed', 'failed'), 200),
+    ])
+    watch, lines, response = _watch(server)
+    assert watch.exit_code == 1
+    assert 'step/{}/preflight: failed'.format(ACTION_ID) in lines
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_watch_action_timeout(*args):
+    server = _ActionServer([
+        (_action('Processing', 'running'), 200),
+    ])
+    watch, lines, response = _watch(server, timeout=0)
+    assert watch.exit_code == 2
+    assert lines[-1] == 'Timed out watching action/{}'.format(ACTION_ID)
+    assert 'Processing' in response
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_watch_action_not_found(*args):
+    api_resp = stubs.gen_err_resp(message='Not Found',
+                                  sub_error_count=0,
+                                  sub_info_count=0,
+                                  reason='It does not exist',
+                                  code=404)
+    server = _ActionServer([(api_resp, 404)])
+    watch, lines, response = _watch(server)
+    assert watch.exit_code == 2
+    assert lines == []
+    assert 'Error: Not Found' in response
@@ -0,0 +1,71 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest.mock import patch, ANY
+
+from click.testing import CliRunner
+
+from shipyard_client.cli.watch.actions import WatchAction
+from shipyard_client.cli.commands import shipyard
+
+auth_vars = ('--os-project-domain-name=OS_PROJECT_DOMAIN_NAME_test '
+             '--os-user-domain-name=OS_USER_DOMAIN_NAME_test '
+             '--os-project-name=OS_PROJECT_NAME_test '
+             '--os-username=OS_USERNAME_test '
+             '--os-password=OS_PASSWORD_test '
+             '--os-auth-url=OS_AUTH_URL_test')
+
+ACTION_ID = '01BTG32JW87G0YKA1K29TKNAFX'
+
+
+def _failing_watch(self):
+    self.exit_code = 1
+    return 'Finished watching'
+
+
+def test_watch_action():
+    """test watch action, exiting with the code of the watch"""
+    runner = CliRunner()
+    with patch.object(WatchAction, '__init__',
+                      return_value=None) as mock_init, \
+            patch.object(WatchAction, 'invoke_and_return_resp',
+                         _failing_watch):
+        results = runner.invoke(
+            shipyard, [auth_vars, 'watch', 'action', ACTION_ID,
+                       '--interval=5', '--timeout=60'])
+    mock_init.assert_called_once_with(ANY, ACTION_ID, 5, 60, output=ANY)
+    assert results.exit_code == 1
+    assert 'Finished watching' in results.output
+
+
+def test_watch_action_namespace():
+    """test watch of a namespaced action"""
+    runner = CliRunner()
+    with patch.object(WatchAction, '__init__') as mock_init:
+        runner.invoke(shipyard,
+                      [auth_vars, 'watch', 'action/{}'.format(ACTION_ID)])
+    mock_init.assert_called_once_with(ANY, ACTION_ID, 10, None, output=ANY)
+
+
+def test_watch_action_negative():
+    """test watch action with invalid values"""
+    runner = CliRunner()
+    results = runner.invoke(
+        shipyard, [auth_vars, 'watch', 'action', 'invalid action id'])
+    assert 'Error' in results.output
+    results = runner.invoke(
+        shipyard, [auth_vars, 'watch', 'action', ACTION_ID, '--interval=0'])
+    assert 'Error' in results.output
+    results = runner.invoke(
+        shipyard, [auth_vars, 'watch', 'step/{}'.format(ACTION_ID)])
+    assert 'Error' in results.output